@@ -83,6 +83,39 @@ options:
         environment variable.
       - If this is not set and a profile is specified,  ~/.aliyun/config.json will be used.
     type: str
+  alicloud_cache_ttl:
+    description:
+      - The number of seconds the responses of Describe, List and Get API calls are cached and reused by the later
+        lookups with the same account, region, action and parameters. Any other call issued through the same
+        connection drops the cached responses of its account and region. It can also be sourced from the
+        ALICLOUD_CACHE_TTL environment variable.
+      - The attribute and status lookups which are polled while waiting for a resource, and the lookups which follow a
+        change through the same connection, are never answered from the cache.
+      - If this is not set or not greater than 0, the responses are not cached.
+    type: int
+  alicloud_cache_dir:
+    description:
+      - The directory on which the cached responses are shared among the tasks of a run. It can also be sourced from
+        the ALICLOUD_CACHE_DIR environment variable.
+      - If this is not set, the responses are only cached for the duration of one task.
+    type: path
+  alicloud_broker_socket:
+    description:
+      - The path of the UNIX socket of a local broker started with
+        C(python -m ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_broker --socket <path>).
+        The broker keeps connections, STS credentials and describe responses across tasks. It can also be sourced
+        from the ALICLOUD_BROKER_SOCKET environment variable.
+      - If the broker can not be connected to, the API is called directly. A request the broker fails to answer
+        fails the task rather than being made again, as it may have been made already.
+    type: path
+  alicloud_profiling_dir:
+    description:
+      - The directory the module writes its cProfile stats and its top memory allocations to, one C(.prof) and one
+        C(.txt) file per invocation named after the module, the task and the host. It can also be sourced from the
+        ALICLOUD_PROFILING_DIR environment variable.
+      - The task is only known to the modules run on the controller by the action plugins of this collection.
+      - If this is not set, the module is not profiled.
+    type: path
   alicloud_protocol:
     description:
       - The type of protocol.
@@ -106,6 +139,22 @@ notes:
     C(ALICLOUD_ASSUME_ROLE_ARN),
     C(ALICLOUD_ASSUME_ROLE_SESSION_NAME),
     C(ALICLOUD_ASSUME_ROLE_SESSION_EXPIRATION),
+    C(ALICLOUD_CACHE_TTL),
+    C(ALICLOUD_CACHE_DIR),
+    C(ALICLOUD_BROKER_SOCKET),
   - C(ALICLOUD_REGION) or C(ALICLOUD_REGION_ID) can be typically be used to specify the
     ALICLOUD region, when required, but this can also be configured in the footmark config file
 '''
+
+    # The options shared by the info modules
+    INFO = r'''
+options:
+  fields:
+    description:
+      - The attributes returned for each resource, for example C(['id', 'private_ip_address', 'tags']). The id of
+        a resource is always returned.
+      - The calls which only fetch attributes that are not requested are skipped.
+      - All of the attributes are returned when it is not specified.
+    type: list
+    elements: str
+'''
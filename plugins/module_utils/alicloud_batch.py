@@ -0,0 +1,86 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# The number of calls made at the same time when a module does not say otherwise
+DEFAULT_MAX_CONCURRENCY = 4
+# The errors SLB answers a call with while another change of the load balancer is in progress, which the call is
+# retried after
+BUSY_ERRORS = ('SystemBusy', 'ServiceIsConfiguring', 'OperationBusy', 'Operation.Conflict', 'Throttling')
+# How many times a call answered with one of BUSY_ERRORS is made at most, and the seconds waited before the first retry,
+# doubled before each next one
+BUSY_ATTEMPTS = 5
+BUSY_DELAY = 1
+
+
+def chunks(items, size):
+    """ Split items into lists of at most size items, in order """
+    items = list(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def run_batches(func, batches, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    """ Call func with each of batches, up to max_concurrency calls at the same time.
+
+    Every call is made even when some of them fail. Return the results of the calls which succeeded and the
+    exceptions of the ones which failed, both in the order of batches.
+    """
+    batches = list(batches)
+    results, errors = [], []
+    if not batches:
+        return results, errors
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_concurrency or 1, len(batches))))
+    try:
+        for future in [executor.submit(func, batch) for batch in batches]:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                errors.append(e)
+    finally:
+        executor.shutdown(wait=True)
+    return results, errors
+
+
+def call_when_free(func, **kwargs):
+    """ Call func with kwargs, retrying it with backoff while it is answered with one of BUSY_ERRORS.
+
+    Batches which change the same load balancer at the same time are refused while the load balancer is busy with
+    one another, so they are made through this.
+    """
+    for attempt in range(BUSY_ATTEMPTS):
+        try:
+            return func(**kwargs)
+        except Exception as e:
+            # footmark keeps the error of the SDK, which has the code, when it does not parse one
+            error = getattr(e, 'error', None) or e
+            code = getattr(e, 'error_code', None) or getattr(error, 'get_error_code', lambda: None)()
+            if code not in BUSY_ERRORS or attempt == BUSY_ATTEMPTS - 1:
+                raise
+            time.sleep(BUSY_DELAY * 2 ** attempt)
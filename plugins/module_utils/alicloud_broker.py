@@ -0,0 +1,274 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+A local broker that keeps footmark connections, STS credentials and describe responses warm across the tasks
+of a run. Start it on the controller before running the playbook::
+
+    python -m ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_broker --socket ~/.ansible/alicloud.sock
+
+and point the modules at it with the alicloud_broker_socket option or the ALICLOUD_BROKER_SOCKET environment
+variable. Modules fall back to calling the API directly whenever the broker can not be connected to. Once a
+request has reached the broker it is never made again directly, so that a write is not made twice.
+"""
+
+import os
+import json
+import time
+import socket
+import struct
+import hashlib
+import argparse
+import importlib
+import threading
+from functools import partial
+
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_cache import DescribeCache, READ_ACTION_PREFIXES
+
+CREDENTIAL_ATTRIBUTES = ('acs_access_key_id', 'acs_secret_access_key', 'security_token', 'ecs_role_name')
+STS_EXPIRATION_MARGIN = 300
+# How long a module waits for the broker to answer a request, in seconds
+BROKER_TIMEOUT = 120
+
+
+class BrokerError(Exception):
+    pass
+
+
+class BrokerUnavailable(BrokerError):
+    """ The broker could not be connected to, so the request never reached it """
+    pass
+
+
+def send_message(sock, message):
+    data = json.dumps(message).encode('utf-8')
+    sock.sendall(struct.pack('!I', len(data)) + data)
+
+
+def recv_message(sock):
+    def recv_exactly(size):
+        data = b''
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                raise BrokerError('Connection closed by the broker peer.')
+            data += chunk
+        return data
+
+    size = struct.unpack('!I', recv_exactly(4))[0]
+    return json.loads(recv_exactly(size).decode('utf-8'))
+
+
+def broker_request(path, message, timeout=BROKER_TIMEOUT):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(path)
+        except socket.error as e:
+            raise BrokerUnavailable('Unable to connect to the broker on %s: %s' % (path, e))
+        send_message(sock, message)
+        return recv_message(sock)
+    finally:
+        sock.close()
+
+
+def _raise_response_error(error):
+    from aliyunsdkcore.acs_exception.exceptions import ServerException, ClientException
+    if error.get('type') == 'server':
+        raise ServerException(error.get('code'), error.get('message'), error.get('http_status'), error.get('request_id'))
+    raise ClientException(error.get('code') or 'Broker.Error', error.get('message'))
+
+
+def broker_connection(connection, params):
+    """ Send the requests of a footmark connection to the broker when one is listening on alicloud_broker_socket """
+    path = params.get('alicloud_broker_socket')
+    if not path or connection is None:
+        return connection
+    path = os.path.expanduser(path)
+    if not os.path.exists(path) or not isinstance(connection.region, str):
+        return connection
+
+    target = dict(service=connection.__class__.__module__.rsplit('.', 1)[0],
+                  product=connection.product,
+                  region=connection.region,
+                  user_agent=connection.user_agent,
+                  credentials=dict((k, getattr(connection, k)) for k in CREDENTIAL_ATTRIBUTES))
+    make_request, make_request_new = connection.make_request, connection.make_request_new
+    written = []
+
+    def forward(method, action, request_params, direct):
+        # The reads which follow a write are not answered from the cache of the broker, see DescribeCache
+        name = action or (request_params or {}).get('Action', (request_params or {}).get('action'))
+        message = dict(target, method=method, action=action, params=request_params, fresh=bool(written))
+        if not str(name).startswith(READ_ACTION_PREFIXES):
+            written.append(name)
+        try:
+            reply = broker_request(path, message)
+        except BrokerUnavailable:
+            # The broker has gone away, keep working without it.
+            return direct()
+        except (socket.error, BrokerError, ValueError) as e:
+            # The request may have been made already, making it again could repeat a write
+            _raise_response_error(dict(type='server', code='Broker.Error',
+                                       message='The broker failed while handling %s: %s' % (name, e)))
+        if 'error' in reply:
+            _raise_response_error(reply['error'])
+        return reply['body'].encode('utf-8') if reply.get('body') is not None else None
+
+    def brokered_make_request(action, params=None):
+        return forward('make_request', action, params, lambda: make_request(action, params))
+
+    def brokered_make_request_new(params):
+        return forward('make_request_new', None, params, lambda: make_request_new(params))
+
+    connection.make_request = brokered_make_request
+    connection.make_request_new = brokered_make_request_new
+    return connection
+
+
+class Broker(object):
+    """Serves the requests forwarded by broker_connection with long lived connections and caches."""
+
+    def __init__(self, path, cache_ttl=0, idle_timeout=0):
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self.cache = DescribeCache(ttl=cache_ttl) if cache_ttl > 0 else None
+        self.connections = {}
+        self.credentials = {}
+        self.lock = threading.Lock()
+        self.last_request = time.time()
+
+    def connection(self, message):
+        credentials = message.get('credentials') or {}
+        raw = json.dumps([message['service'], message['product'], message['region'], message.get('user_agent'),
+                          credentials], sort_keys=True)
+        key = hashlib.sha256(raw.encode('utf-8')).hexdigest()
+        with self.lock:
+            if key not in self.connections:
+                if not str(message['service']).startswith('footmark.'):
+                    raise BrokerError('Unsupported service %s.' % message['service'])
+                service = importlib.import_module(message['service'])
+                conn = service.connect_to_region(message['region'], user_agent=message.get('user_agent'), **credentials)
+                conn.product = message['product']
+                self.connections[key] = conn
+            return self.connections[key]
+
+    def assume_role(self, conn, params, do_request):
+        # STS credentials are reused until shortly before they expire
+        key = (DescribeCache.scope(conn), DescribeCache.key('AssumeRole', params))
+        with self.lock:
+            expires, body = self.credentials.get(key, (0, None))
+        if expires > time.time():
+            return body
+        body = do_request()
+        duration = int((params or {}).get('set_DurationSeconds') or 3600)
+        with self.lock:
+            self.credentials[key] = (time.time() + duration - STS_EXPIRATION_MARGIN, body)
+        return body
+
+    def call(self, message):
+        from aliyunsdkcore.acs_exception.exceptions import ServerException, ClientException
+        try:
+            conn = self.connection(message)
+            params = message.get('params')
+            if message['method'] == 'make_request':
+                action = message['action']
+                do_request = partial(conn.make_request, action, params)
+            else:
+                action = params.get('Action', params.get('action'))
+                do_request = partial(conn.make_request_new, params)
+
+            if action == 'AssumeRole':
+                body = self.assume_role(conn, params, do_request)
+            elif self.cache:
+                body = self.cache.request(DescribeCache.scope(conn), action, params, do_request,
+                                          fresh=message.get('fresh', False))
+            else:
+                body = do_request()
+            if isinstance(body, bytes):
+                body = body.decode('utf-8')
+            return dict(body=body)
+        except ServerException as e:
+            return dict(error=dict(type='server', code=e.get_error_code(), message=e.get_error_msg(),
+                                   http_status=e.get_http_status(), request_id=e.get_request_id()))
+        except ClientException as e:
+            return dict(error=dict(type='client', code=e.get_error_code(), message=e.get_error_msg()))
+        except Exception as e:
+            return dict(error=dict(type='client', code='Broker.Error', message=str(e)))
+
+    def handle(self, sock):
+        try:
+            message = recv_message(sock)
+            self.last_request = time.time()
+            send_message(sock, self.call(message))
+        except (socket.error, BrokerError, ValueError):
+            pass
+        finally:
+            sock.close()
+
+    def serve_forever(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        old_umask = os.umask(0o077)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            server.bind(self.path)
+        finally:
+            os.umask(old_umask)
+        server.listen(128)
+        server.settimeout(1)
+        try:
+            while not self.idle_timeout or time.time() - self.last_request < self.idle_timeout:
+                try:
+                    sock, dummy = server.accept()
+                except socket.timeout:
+                    continue
+                sock.settimeout(None)
+                worker = threading.Thread(target=self.handle, args=(sock,))
+                worker.daemon = True
+                worker.start()
+        finally:
+            server.close()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Alibaba Cloud Ansible collection broker.')
+    parser.add_argument('--socket', required=True, help='The path of the UNIX socket to listen on.')
+    parser.add_argument('--cache-ttl', type=int, default=30,
+                        help='The number of seconds describe responses are cached, 0 disables the cache.')
+    parser.add_argument('--idle-timeout', type=int, default=3600,
+                        help='Exit after this many seconds without a request, 0 means never.')
+    args = parser.parse_args()
+    Broker(os.path.expanduser(args.socket), cache_ttl=args.cache_ttl, idle_timeout=args.idle_timeout).serve_forever()
+
+
+if __name__ == '__main__':
+    main()
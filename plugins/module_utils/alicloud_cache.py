@@ -0,0 +1,189 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+
+READ_ACTION_PREFIXES = ('Describe', 'List', 'Get')
+# The reads footmark polls while it waits for a resource to change, whose answers must never be reused
+UNCACHED_ACTION_SUFFIXES = ('Attribute', 'Status')
+IGNORED_PARAMS = ('ClientToken', 'set_ClientToken')
+# The length of the part of a scope naming the account and region, which a write drops the entries of
+SCOPE_PREFIX_SIZE = 32
+
+_caches = {}
+
+
+class DescribeCache(object):
+    """A read-through cache for the raw responses of Describe/List/Get actions.
+
+    Entries are kept in memory or, when ``path`` is set, as files under ``path`` so that every task of
+    a run on the controller can share them and see each other's invalidations. An entry lives ``ttl``
+    seconds at most. Any other action issued through a cached connection drops every entry of the same
+    account and region.
+
+    The attribute and status reads footmark polls in its wait loops are never cached, and neither is any read of
+    a connection which has written, as what it reads next is what it is waiting for.
+    """
+
+    def __init__(self, path=None, ttl=0):
+        self.path = path
+        self.ttl = ttl
+        self.entries = {}
+
+    @staticmethod
+    def scope(connection):
+        """ The scope of the entries of a connection, its account and region followed by its product """
+        account = connection.acs_access_key_id or connection.ecs_role_name or ''
+        raw = '%s|%s' % (hashlib.sha256(str(account).encode('utf-8')).hexdigest(), connection.region)
+        return '%s-%s' % (hashlib.sha256(raw.encode('utf-8')).hexdigest()[:SCOPE_PREFIX_SIZE],
+                          hashlib.sha256(str(connection.product).encode('utf-8')).hexdigest()[:8])
+
+    @staticmethod
+    def key(action, params):
+        normalized = {}
+        for k, v in list((params or {}).items()):
+            if k in IGNORED_PARAMS or v is None:
+                continue
+            normalized[str(k)] = v
+        raw = json.dumps([action, normalized], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _file(self, scope, key):
+        return os.path.join(self.path, scope, key + '.json')
+
+    def get(self, scope, key):
+        if self.path:
+            try:
+                with open(self._file(scope, key), 'r') as f:
+                    expires, body = json.load(f)
+            except (IOError, OSError, ValueError):
+                return None
+        else:
+            expires, body = self.entries.get((scope, key), (0, None))
+        if expires <= time.time():
+            return None
+        return body
+
+    def set(self, scope, key, body):
+        expires = time.time() + self.ttl
+        if not self.path:
+            self.entries[(scope, key)] = (expires, body)
+            return
+        directory = os.path.join(self.path, scope)
+        try:
+            if not os.path.isdir(directory):
+                os.makedirs(directory, 0o700)
+            fd, tmp = tempfile.mkstemp(dir=directory)
+            with os.fdopen(fd, 'w') as f:
+                json.dump([expires, body], f)
+            os.rename(tmp, self._file(scope, key))
+        except (IOError, OSError):
+            # The shared cache is best effort, a failed write only costs a later request.
+            pass
+
+    def invalidate(self, scope):
+        """ Drop the entries of every product of the account and region of scope, as a write to one product
+        may change what the others describe, e.g. the free addresses of a VSwitch after RunInstances """
+        prefix = scope[:SCOPE_PREFIX_SIZE]
+        for entry in [e for e in self.entries if e[0][:SCOPE_PREFIX_SIZE] == prefix]:
+            self.entries.pop(entry)
+        if self.path and os.path.isdir(self.path):
+            for name in os.listdir(self.path):
+                if name[:SCOPE_PREFIX_SIZE] == prefix:
+                    shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+
+    @staticmethod
+    def cacheable(action):
+        action = str(action)
+        return action.startswith(READ_ACTION_PREFIXES) and not action.endswith(UNCACHED_ACTION_SUFFIXES)
+
+    def request(self, scope, action, params, do_request, fresh=False):
+        """ Answer a request from the cache when it may be. fresh asks for the answer of the API, as a
+        connection which has written does """
+        if not str(action).startswith(READ_ACTION_PREFIXES):
+            try:
+                return do_request()
+            finally:
+                self.invalidate(scope)
+        if fresh or not self.cacheable(action):
+            return do_request()
+
+        key = self.key(action, params)
+        body = self.get(scope, key)
+        if body is not None:
+            return body.encode('utf-8')
+
+        body = do_request()
+        if body is not None:
+            self.set(scope, key, body.decode('utf-8') if isinstance(body, bytes) else body)
+        return body
+
+
+def get_describe_cache(params):
+    """ Return the cache configured by the module params, or None when caching is disabled """
+    ttl = params.get('alicloud_cache_ttl')
+    if not ttl or ttl <= 0:
+        return None
+    path = params.get('alicloud_cache_dir')
+    if path:
+        path = os.path.expanduser(path)
+    if (path, ttl) not in _caches:
+        _caches[(path, ttl)] = DescribeCache(path=path, ttl=ttl)
+    return _caches[(path, ttl)]
+
+
+def cache_connection(connection, cache):
+    """ Route the describe requests of a footmark connection through the cache """
+    if cache is None or connection is None:
+        return connection
+
+    scope = cache.scope(connection)
+    make_request, make_request_new = connection.make_request, connection.make_request_new
+    written = []
+
+    def request(action, params, do_request):
+        fresh = bool(written)
+        if not str(action).startswith(READ_ACTION_PREFIXES):
+            written.append(action)
+        return cache.request(scope, action, params, do_request, fresh=fresh)
+
+    def cached_make_request(action, params=None):
+        return request(action, params, lambda: make_request(action, params))
+
+    def cached_make_request_new(params):
+        action = params.get('Action', params.get('action')) if isinstance(params, dict) else None
+        return request(action, params, lambda: make_request_new(params))
+
+    connection.make_request = cached_make_request
+    connection.make_request_new = cached_make_request_new
+    return connection
@@ -29,30 +29,34 @@
 import os
 import json
 import requests
+import importlib
 from ansible.module_utils.basic import env_fallback
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_cache import get_describe_cache, cache_connection
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_broker import broker_connection
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_profiling import profile_module
 
 try:
-    import footmark
-    import footmark.ecs
-    import footmark.slb
-    import footmark.vpc
-    import footmark.rds
-    import footmark.ess
-    import footmark.sts
-    import footmark.dns
-    import footmark.ram
-    import footmark.ros
-    import footmark.oos
-    import footmark.market
+    import footmark  # noqa: F401
     HAS_FOOTMARK = True
 except ImportError:
     HAS_FOOTMARK = False
 
+# The footmark service modules are only imported by the first connection to them,
+# a module pays for the services it uses rather than for all of them.
+FOOTMARK_SERVICES = ('ecs', 'slb', 'vpc', 'rds', 'ess', 'sts', 'dns', 'ram', 'ros', 'oos', 'market', 'oss')
+
 
 class AnsibleACSError(Exception):
     pass
 
 
+def footmark_service(name):
+    """ Return the footmark module of a service, importing it on first use """
+    if name not in FOOTMARK_SERVICES:
+        raise AnsibleACSError("Unsupported footmark service %s." % name)
+    return importlib.import_module('footmark.%s' % name)
+
+
 def acs_common_argument_spec():
     return dict(
         alicloud_access_key=dict(aliases=['access_key_id', 'access_key'], no_log=True,
@@ -81,7 +85,11 @@ def ecs_argument_spec():
                                                          aliases=['assume_role_session_expiration']),
             alicloud_assume_role=dict(type='dict', aliases=['assume_role']),
             profile=dict(fallback=(env_fallback, ['ALICLOUD_PROFILE'])),
-            shared_credentials_file=dict(fallback=(env_fallback, ['ALICLOUD_SHARED_CREDENTIALS_FILE']))
+            shared_credentials_file=dict(fallback=(env_fallback, ['ALICLOUD_SHARED_CREDENTIALS_FILE'])),
+            alicloud_cache_ttl=dict(type='int', fallback=(env_fallback, ['ALICLOUD_CACHE_TTL'])),
+            alicloud_cache_dir=dict(type='path', fallback=(env_fallback, ['ALICLOUD_CACHE_DIR'])),
+            alicloud_broker_socket=dict(type='path', fallback=(env_fallback, ['ALICLOUD_BROKER_SOCKET'])),
+            alicloud_profiling_dir=dict(type='path', fallback=(env_fallback, ['ALICLOUD_PROFILING_DIR']))
         )
     )
     return spec
@@ -109,6 +117,13 @@ def connect_to_acs(acs_module, region, **params):
     return conn
 
 
+def wrap_connection(module, conn):
+    """ Route the requests of a connection through the broker and the describe cache when they are enabled """
+    profile_module(module)
+    conn = broker_connection(conn, module.params)
+    return cache_connection(conn, get_describe_cache(module.params))
+
+
 def get_assume_role(params):
     """ Return new params """
     sts_params = get_acs_connection_info(params)
@@ -129,7 +144,8 @@ def get_assume_role(params):
     }
 
     try:
-        sts = connect_to_acs(footmark.sts, params.get('alicloud_region'), **sts_params).assume_role(**assume_role_params).read()
+        sts_conn = broker_connection(connect_to_acs(footmark_service('sts'), params.get('alicloud_region'), **sts_params), params)
+        sts = sts_conn.assume_role(**assume_role_params).read()
         sts_params['acs_access_key_id'], sts_params['acs_secret_access_key'], sts_params['security_token'] \
             = sts['access_key_id'], sts['access_key_secret'], sts['security_token']
     except AnsibleACSError as e:
@@ -194,11 +210,11 @@ def ecs_connect(module):
     region = module.params.get('alicloud_region')
     if region:
         try:
-            ecs = connect_to_acs(footmark.ecs, region, **ecs_params)
+            ecs = connect_to_acs(footmark_service('ecs'), region, **ecs_params)
         except AnsibleACSError as e:
             module.fail_json(msg=str(e))
     # Otherwise, no region so we fallback to the old connection method
-    return ecs
+    return wrap_connection(module, ecs)
 
 
 def slb_connect(module):
@@ -208,11 +224,11 @@ def slb_connect(module):
     region = module.params.get('alicloud_region')
     if region:
         try:
-            slb = connect_to_acs(footmark.slb, region, **slb_params)
+            slb = connect_to_acs(footmark_service('slb'), region, **slb_params)
         except AnsibleACSError as e:
             module.fail_json(msg=str(e))
     # Otherwise, no region so we fallback to the old connection method
-    return slb
+    return wrap_connection(module, slb)
 
 
 def dns_connect(module):
@@ -222,11 +238,11 @@ def dns_connect(module):
     region = module.params.get('alicloud_region')
     if region:
         try:
-            dns = connect_to_acs(footmark.dns, region, **dns_params)
+            dns = connect_to_acs(footmark_service('dns'), region, **dns_params)
         except AnsibleACSError as e:
             module.fail_json(msg=str(e))
     # Otherwise, no region so we fallback to the old connection method
-    return dns
+    return wrap_connection(module, dns)
 
 
 def vpc_connect(module):
@@ -236,11 +252,11 @@ def vpc_connect(module):
     region = module.params.get('alicloud_region')
     if region:
         try:
-            vpc = connect_to_acs(footmark.vpc, region, **vpc_params)
+            vpc = connect_to_acs(footmark_service('vpc'), region, **vpc_params)
         except AnsibleACSError as e:
             module.fail_json(msg=str(e))
     # Otherwise, no region so we fallback to the old connection method
-    return vpc
+    return wrap_connection(module, vpc)
 
 
 def ros_connect(module):
@@ -250,11 +266,11 @@ def ros_connect(module):
     region = module.params.get('alicloud_region')
     if region:
         try:
-            ros = connect_to_acs(footmark.ros, region, **ros_params)
+            ros = connect_to_acs(footmark_service('ros'), region, **ros_params)
         except AnsibleACSError as e:
             module.fail_json(msg=str(e))
     # Otherwise, no region so we fallback to the old connection method
-    return ros
+    return wrap_connection(module, ros)
 
 
 def rds_connect(module):
@@ -264,11 +280,11 @@ def rds_connect(module):
     region = module.params.get('alicloud_region')
     if region:
         try:
-            rds = connect_to_acs(footmark.rds, region, **rds_params)
+            rds = connect_to_acs(footmark_service('rds'), region, **rds_params)
         except AnsibleACSError as e:
             module.fail_json(msg=str(e))
     # Otherwise, no region so we fallback to the old connection method
-    return rds
+    return wrap_connection(module, rds)
 
 
 def ess_connect(module):
@@ -278,11 +294,11 @@ def ess_connect(module):
     region = module.params.get('alicloud_region')
     if region:
         try:
-            ess = connect_to_acs(footmark.ess, region, **ess_params)
+            ess = connect_to_acs(footmark_service('ess'), region, **ess_params)
         except AnsibleACSError as e:
             module.fail_json(msg=str(e))
     # Otherwise, no region so we fallback to the old connection method
-    return ess
+    return wrap_connection(module, ess)
 
 
 def sts_connect(module):
@@ -292,11 +308,11 @@ def sts_connect(module):
     region = module.params.get('alicloud_region')
     if region:
         try:
-            sts = connect_to_acs(footmark.sts, region, **sts_params)
+            sts = connect_to_acs(footmark_service('sts'), region, **sts_params)
         except AnsibleACSError as e:
             module.fail_json(msg=str(e))
     # Otherwise, no region so we fallback to the old connection method
-    return sts
+    return wrap_connection(module, sts)
 
 
 def ram_connect(module):
@@ -306,11 +322,11 @@ def ram_connect(module):
     region = module.params.get('alicloud_region')
     if region:
         try:
-            ram = connect_to_acs(footmark.ram, region, **ram_params)
+            ram = connect_to_acs(footmark_service('ram'), region, **ram_params)
         except AnsibleACSError as e:
             module.fail_json(msg=str(e))
     # Otherwise, no region so we fallback to the old connection method
-    return ram
+    return wrap_connection(module, ram)
 
 
 def market_connect(module):
@@ -320,11 +336,11 @@ def market_connect(module):
     region = module.params.get('alicloud_region')
     if region:
         try:
-            market = connect_to_acs(footmark.market, region, **market_params)
+            market = connect_to_acs(footmark_service('market'), region, **market_params)
         except AnsibleACSError as e:
             module.fail_json(msg=str(e))
     # Otherwise, no region so we fallback to the old connection method
-    return market
+    return wrap_connection(module, market)
 
 
 def oos_connect(module):
@@ -334,8 +350,8 @@ def oos_connect(module):
     region = module.params.get('alicloud_region')
     if region:
         try:
-            oos = connect_to_acs(footmark.oos, region, **oos_params)
+            oos = connect_to_acs(footmark_service('oos'), region, **oos_params)
         except AnsibleACSError as e:
             module.fail_json(msg=str(e))
     # Otherwise, no region so we fallback to the old connection method
-    return oos
+    return wrap_connection(module, oos)
@@ -0,0 +1,115 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+"""
+The options and helpers shared by the *_info modules.
+"""
+
+
+def info_argument_spec():
+    return dict(
+        fields=dict(type='list', elements='str'),
+    )
+
+
+def field_wanted(fields, *names):
+    """ Whether any of the named fields is requested, every field is when fields is empty """
+    return not fields or any(name in fields for name in names)
+
+
+def project(item, fields):
+    """ Return the requested fields of a result dict, and its id which identifies it. Every field is returned when
+    fields is empty """
+    if not fields:
+        return item
+    return dict((key, value) for key, value in item.items() if key in fields or key == 'id')
+
+
+def detailed(resource, fields):
+    """ Return the full attributes of a footmark resource through its get(), unless the attributes it already has
+    from the Describe or List call carry every requested field """
+    if fields and set(fields) <= set(resource.read()) | set(['id']):
+        return resource
+    return resource.get()
+
+
+# The filters each Describe call applies on the server side, by its footmark method. 'name' is the argument taking a
+# name, 'wildcard' whether that name may end with a '*' wildcard, 'tags' whether the call takes tags, which must all
+# match, and 'ids' the argument taking IDs along with the most IDs of one call and whether they are joined with commas.
+SERVER_FILTERS = {
+    'describe_instances': dict(name='instance_name', wildcard=True, tags=True, ids=('instance_ids', 100, False)),
+    'describe_disks': dict(name='disk_name', tags=True, ids=('disk_ids', 100, False)),
+    'describe_network_interfaces': dict(name='network_interface_name', tags=True,
+                                        ids=('network_interface_ids', 100, False)),
+    'describe_security_groups': dict(name='security_group_name', tags=True, ids=('security_group_ids', 100, False)),
+    'describe_eip_addresses': dict(tags=True, ids=('allocation_id', 50, True)),
+    'describe_vpcs': dict(name='vpc_name', tags=True, ids=('vpc_id', 20, True)),
+    'describe_vswitches': dict(name='vswitch_name', tags=True, ids=('vswitch_id', 1, True)),
+}
+
+
+def server_filters(method, filters=None, name=None, name_prefix=None, tags=None, ids=None, any_tag=False):
+    """ Move the name, name_prefix, tags and ids filters of an info module into the requests of the Describe call
+    method where it takes them. Return the request filters, one per chunk of ids, and the filters left to check on
+    the client side by client_filter. any_tag keeps the filter of the modules where matching one of the tags is
+    enough, which the API only applies for a single tag """
+    supported = SERVER_FILTERS.get(method, {})
+    request = dict(filters or {})
+    left = dict(name=name, name_prefix=name_prefix, tags=tags, ids=ids, any_tag=any_tag)
+    if supported.get('name') and not request.get(supported['name']):
+        if name:
+            request[supported['name']] = name
+            left['name'] = None
+        elif name_prefix and supported.get('wildcard') and '*' not in name_prefix:
+            request[supported['name']] = name_prefix + '*'
+            left['name_prefix'] = None
+    if tags and supported.get('tags') and not request.get('tags') and (not any_tag or len(tags) == 1):
+        request['tags'] = tags
+        left['tags'] = None
+    if not ids or not supported.get('ids'):
+        return [request], left
+    arg, size, joined = supported['ids']
+    ids = list(ids)
+    left['ids'] = None
+    return [dict(request, **{arg: ','.join(ids[i:i + size]) if joined else ids[i:i + size]})
+            for i in range(0, len(ids), size)], left
+
+
+def client_filter(left, resource):
+    """ Whether a footmark resource passes the filters server_filters left to the client side """
+    if left['ids'] and resource.id not in left['ids']:
+        return False
+    if left['name'] and resource.name != left['name']:
+        return False
+    if left['name_prefix'] and not str(resource.name).startswith(left['name_prefix']):
+        return False
+    if left['tags']:
+        tags = getattr(resource, 'tags', None) or {}
+        found = [key in tags and tags[key] == value for key, value in left['tags'].items()]
+        return any(found) if left['any_tag'] else all(found)
+    return True
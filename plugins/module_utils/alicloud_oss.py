@@ -27,11 +27,11 @@
 #
 
 from ansible.module_utils.basic import env_fallback
-from ansible.module_utils.alicloud_ecs import get_profile
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import get_profile, footmark_service
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_profiling import profile_module
 
 try:
-    import footmark
-    import footmark.oss
+    import footmark  # noqa: F401
     HAS_FOOTMARK = True
 except ImportError:
     HAS_FOOTMARK = False
@@ -58,13 +58,15 @@ def oss_bucket_argument_spec():
     spec.update(
         dict(
             alicloud_region=dict(aliases=['acs_region', 'ecs_region', 'region']),
-            bucket=dict(aliases=['bucket_name', 'name'], type='str', required='True')
+            bucket=dict(aliases=['bucket_name', 'name'], type='str', required='True'),
+            alicloud_profiling_dir=dict(type='path', fallback=(env_fallback, ['ALICLOUD_PROFILING_DIR']))
         )
     )
     return spec
 
 
 def update_credential(module):
+    profile_module(module)
     acs_params = get_profile(module.params)
     acs_params.pop("ecs_role_name")
 
@@ -92,13 +94,10 @@ def oss_connect(module):
     acs_params = update_credential(module)
     # If we have a region specified, connect to its endpoint.
     region = module.params.get('alicloud_region')
-    if region:
-        try:
-            conn = module.connect_to_oss(region, **acs_params)
-        except AnsibleACSError as e:
-            module.fail_json(msg=str(e))
-    # Otherwise, no region so we fallback to the old connection method
-    return conn
+    try:
+        return footmark_service('oss').connect_to_oss(region, **acs_params)
+    except AnsibleACSError as e:
+        module.fail_json(msg=str(e))
 
 
 def connect_to_oss_bucket(acs_module, region, **params):
@@ -111,14 +110,11 @@ def oss_bucket_connect(module):
 
     region, oss_params = get_bucket_connection_info(module)
     try:
-        return connect_to_oss_bucket(footmark.oss, region, **oss_params)
+        return connect_to_oss_bucket(footmark_service('oss'), region, **oss_params)
     except AnsibleACSError as e:
         module.fail_json(msg=str(e))
 
 
 def oss_service_connect(module):
     """ Return an oss service connection"""
-    try:
-        return oss_connect(footmark.oss)
-    except AnsibleACSError as e:
-        module.fail_json(msg=str(e))
+    return oss_connect(module)
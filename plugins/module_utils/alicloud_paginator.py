@@ -0,0 +1,128 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+from concurrent.futures import ThreadPoolExecutor
+
+PAGE_NUMBER = 'page_number'
+MARKER = 'marker'
+NEXT_TOKEN = 'next_token'
+
+# The argument names carrying the page position and the page size of each paging style
+PAGING_ARGUMENTS = {
+    PAGE_NUMBER: ('page_number', 'page_size'),
+    MARKER: ('marker', 'max_keys'),
+    NEXT_TOKEN: ('next_token', 'max_results'),
+}
+
+# The largest page size accepted by each API
+MAX_PAGE_SIZES = {
+    'describe_instances': 100,
+    'describe_disks': 100,
+    'describe_images': 100,
+    'describe_network_interfaces': 100,
+    'describe_security_groups': 50,
+    'describe_key_pairs': 50,
+    'describe_vpcs': 50,
+    'describe_vswitches': 50,
+    'describe_route_tables': 50,
+    'describe_eip_addresses': 100,
+    'describe_load_balancers': 100,
+    'list_objects': 1000,
+    'list_buckets': 1000,
+}
+
+
+class Paginator(object):
+    """Lazily iterates over the items of a paged Describe or List call.
+
+    ``fetch`` is called with ``kwargs`` and the paging arguments of one page. It returns the items of the page, or,
+    for the next-token style, a tuple of the items and the token of the next page. Page-number and marker pages are
+    followed until a short page, the marker of the next page is taken from the last item by ``next_marker``.
+
+    The next page is requested in the background while the items of the current one are consumed, and nothing more
+    is requested once the caller stops iterating.
+    """
+
+    def __init__(self, fetch, style=PAGE_NUMBER, page_size=None, api=None, position_arg=None, page_size_arg=None,
+                 first_position=None, next_marker=None, prefetch=True, **kwargs):
+        if style not in PAGING_ARGUMENTS:
+            raise ValueError('Unsupported paging style %s.' % style)
+        self.fetch = fetch
+        self.style = style
+        self.page_size = page_size or MAX_PAGE_SIZES.get(api or getattr(fetch, '__name__', None), 50)
+        self.position_arg = position_arg or PAGING_ARGUMENTS[style][0]
+        self.page_size_arg = page_size_arg or PAGING_ARGUMENTS[style][1]
+        self.first_position = first_position if first_position is not None else (1 if style == PAGE_NUMBER else None)
+        self.next_marker = next_marker or (lambda items: getattr(items[-1], 'key', None))
+        self.prefetch = prefetch
+        self.kwargs = kwargs
+
+    def _fetch_page(self, position):
+        kwargs = dict(self.kwargs)
+        kwargs[self.page_size_arg] = self.page_size
+        if position is not None:
+            kwargs[self.position_arg] = position
+        page = self.fetch(**kwargs)
+        if self.style == NEXT_TOKEN:
+            items, token = page
+            return list(items or []), token or None
+        items = list(page or [])
+        if len(items) < self.page_size:
+            return items, None
+        if self.style == PAGE_NUMBER:
+            return items, position + 1
+        return items, self.next_marker(items)
+
+    def pages(self):
+        executor = ThreadPoolExecutor(max_workers=1) if self.prefetch else None
+        try:
+            items, position = self._fetch_page(self.first_position)
+            while True:
+                pending = None
+                if position is not None and executor:
+                    pending = executor.submit(self._fetch_page, position)
+                yield items
+                if position is None:
+                    return
+                items, position = pending.result() if pending else self._fetch_page(position)
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
+
+    def __iter__(self):
+        for items in self.pages():
+            for item in items:
+                yield item
+
+    def all(self):
+        return list(self)
+
+
+def paginate(fetch, **kwargs):
+    """ Return a lazy iterator over every item of a paged call, see Paginator """
+    return iter(Paginator(fetch, **kwargs))
@@ -0,0 +1,121 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import os
+import re
+import time
+import socket
+import pstats
+import cProfile
+import tracemalloc
+
+TOP_ALLOCATIONS = 25
+TOP_FUNCTIONS = 40
+
+# Set by the action plugins for the modules they run on the controller
+TASK_VARIABLE = 'ALICLOUD_PROFILING_TASK'
+HOST_VARIABLE = 'ALICLOUD_PROFILING_HOST'
+
+
+def _slug(value):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', str(value)).strip('_')[:64] or 'unknown'
+
+
+class ModuleProfiler(object):
+    """Profiles one module invocation with cProfile and tracemalloc.
+
+    The profile starts with the first connection the module opens and stops when the module exits. Two files are
+    written under ``path``, named after the module, the task and the host: the cProfile stats, which pstats and
+    snakeviz can load, and a text report of the hottest functions and the top allocations.
+    """
+
+    def __init__(self, path, module_name, task=None, host=None):
+        self.path = path
+        self.name = '-'.join([_slug(module_name), _slug(task or 'task'), _slug(host or socket.gethostname()),
+                              time.strftime('%Y%m%dT%H%M%S'), str(os.getpid())])
+        self.profiler = cProfile.Profile()
+        self.started_tracemalloc = False
+        self.finished = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracemalloc = True
+        try:
+            self.profiler.enable()
+        except ValueError:
+            # Another profiler is active in this process, the allocations are still reported
+            self.profiler = None
+
+    def finish(self):
+        if self.finished:
+            return
+        self.finished = True
+        if self.profiler:
+            self.profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        if self.started_tracemalloc:
+            tracemalloc.stop()
+        try:
+            if not os.path.isdir(self.path):
+                os.makedirs(self.path, 0o700)
+            self.write(snapshot)
+        except (IOError, OSError):
+            # Profiling never fails the task it observes
+            pass
+
+    def write(self, snapshot):
+        base = os.path.join(self.path, self.name)
+        with open(base + '.txt', 'w') as report:
+            if self.profiler:
+                self.profiler.dump_stats(base + '.prof')
+                report.write('Hottest functions by cumulative time\n\n')
+                pstats.Stats(self.profiler, stream=report).sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+            report.write('Top %d allocations by line\n\n' % TOP_ALLOCATIONS)
+            for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]:
+                report.write('%s\n' % stat)
+
+
+def profile_module(module):
+    """ Start profiling the module when alicloud_profiling_dir is set, once per module invocation """
+    path = module.params.get('alicloud_profiling_dir')
+    if not path or getattr(module, '_alicloud_profiler', None):
+        return
+    profiler = ModuleProfiler(os.path.expanduser(path), getattr(module, '_name', 'module'),
+                              task=os.environ.get(TASK_VARIABLE), host=os.environ.get(HOST_VARIABLE))
+    module._alicloud_profiler = profiler
+
+    def finishing(exit_method):
+        def wrapper(*args, **kwargs):
+            profiler.finish()
+            return exit_method(*args, **kwargs)
+        return wrapper
+
+    module.exit_json = finishing(module.exit_json)
+    module.fail_json = finishing(module.fail_json)
+    profiler.start()
@@ -0,0 +1,72 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import time
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_batch import run_batches
+
+# The most backend servers one call adding, setting, modifying or removing the backend servers of a load balancer or of
+# a VServer group takes
+BACKEND_SERVERS_MAX_SIZE = 20
+# The health statuses of a backend server which count as healthy, unavailable means health checks are off
+HEALTHY_STATUSES = ('normal', 'unavailable')
+# How long to wait between two health checks of the servers, in seconds
+HEALTH_CHECK_DELAY = 5
+
+
+def wait_for_healthy(slb, expected, timeout, delay=HEALTH_CHECK_DELAY):
+    """ Wait until the health checks of every load balancer find its servers of expected, a dict of their IDs by load
+    balancer ID, healthy.
+
+    A server a load balancer does not report, on any of its ports, is not healthy, and neither are the servers of a
+    load balancer whose health can not be described. The load balancers are described at the same time.
+    """
+    load_balancer_ids = sorted(expected)
+    while True:
+        results, errors = run_batches(lambda lb_id: (lb_id, slb.describe_backend_servers_health_status(
+            load_balancer_id=lb_id)), load_balancer_ids, len(load_balancer_ids))
+        unhealthy = set()
+        described = set()
+        for load_balancer_id, servers in results:
+            reported, failing = set(), set()
+            for server in servers:
+                reported.add(server.server_id)
+                if str(server.server_health_status).lower() not in HEALTHY_STATUSES:
+                    failing.add(server.server_id)
+            unhealthy.update(i for i in expected[load_balancer_id] if i not in reported or i in failing)
+            described.add(load_balancer_id)
+        for load_balancer_id in set(load_balancer_ids) - described:
+            unhealthy.update(expected[load_balancer_id])
+        if not unhealthy:
+            return
+        timeout -= delay
+        if timeout <= 0:
+            if errors:
+                raise Exception("Unable to describe the health of the backend servers, error: {0}".format(
+                    '; '.join(str(e) for e in errors)))
+            raise Exception("Timeout Error: Waiting for backend servers {0} to be healthy.".format(sorted(unhealthy)))
+        time.sleep(delay)
@@ -40,6 +40,7 @@ requirements:
     - "footmark >= 1.19.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -136,6 +137,8 @@ total:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, ecs_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project, server_filters, client_filter
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_paginator import MAX_PAGE_SIZES
 
 HAS_FOOTMARK = False
 
@@ -154,6 +157,7 @@ def main():
         tags=dict(type='dict')
     )
     )
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
     if HAS_FOOTMARK is False:
         module.fail_json(msg='footmark required for this module')
@@ -167,21 +171,16 @@ def main():
     if not filters:
         filters = {}
 
-    name_prefix = module.params['name_prefix']
-    tags = module.params['tags']
-
-    for disk in ecs.describe_disks(**filters):
-        if name_prefix and not str(disk.name).startswith(name_prefix):
-            continue
-        if tags:
-            flag = False
-            for key, value in list(tags.items()):
-                if key in list(disk.tags.keys()) and value == disk.tags[key]:
-                    flag = True
-            if not flag:
+    filters.setdefault('page_size', MAX_PAGE_SIZES['describe_disks'])
+
+    requests, left = server_filters('describe_disks', filters, name_prefix=module.params['name_prefix'],
+                                    tags=module.params['tags'], any_tag=True)
+    for request in requests:
+        for disk in ecs.describe_disks(**request):
+            if not client_filter(left, disk):
                 continue
-        disks.append(disk.read())
-        disk_ids.append(disk.id)
+            disks.append(project(disk.read(), module.params['fields']))
+            disk_ids.append(disk.id)
 
     module.exit_json(changed=False, disk_ids=disk_ids, disks=disks, total=len(disks))
 
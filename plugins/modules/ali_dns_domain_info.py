@@ -33,6 +33,7 @@ requirements:
     - "footmark >= 1.15.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 author:
   - "He Guimin (@xiaozhu36)"
 """
@@ -120,6 +121,7 @@ dns:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, dns_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project
 
 HAS_FOOTMARK = False
 
@@ -137,6 +139,7 @@ def main():
         filters=dict(type='dict')
     )
     )
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -152,7 +155,7 @@ def main():
         for _dns in dns_connect(module).describe_domains(**filters):
             if domain_name and _dns.domain_name != domain_name:
                 continue
-            dns.append(_dns.read())
+            dns.append(project(_dns.read(), module.params['fields']))
             names.append(_dns.domain_name)
 
         module.exit_json(changed=False, names=names, dns=dns)
@@ -34,6 +34,7 @@ requirements:
     - "footmark >= 1.15.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -97,6 +98,7 @@ groups:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, dns_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project
 
 HAS_FOOTMARK = False
 
@@ -114,6 +116,7 @@ def main():
         group_id=dict(type='str', aliases=['id']),
     )
     )
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -130,7 +133,7 @@ def main():
                 continue
             if group_id and _dns.id != group_id:
                 continue
-            groups.append(_dns.read())
+            groups.append(project(_dns.read(), module.params['fields']))
             ids.append(_dns.id)
 
         module.exit_json(changed=False, groups=groups, ids=ids)
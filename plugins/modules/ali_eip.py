@@ -217,6 +217,7 @@ eip:
 import time
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, vpc_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_paginator import paginate
 
 HAS_FOOTMARK = False
 
@@ -230,7 +231,7 @@ except ImportError:
 def find_eip(conn, module, ip_address, instance_id, allocation_id):
     try:
         eip = None
-        eips = conn.describe_eip_addresses()
+        eips = list(paginate(conn.describe_eip_addresses))
         if not ip_address and not instance_id and not allocation_id:
             return eip, eips
         for e in eips:
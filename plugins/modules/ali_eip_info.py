@@ -50,6 +50,7 @@ requirements:
     - "footmark >= 1.13.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -161,6 +162,8 @@ ids:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, vpc_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project, server_filters, client_filter
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_paginator import paginate
 
 HAS_FOOTMARK = False
 
@@ -183,6 +186,7 @@ def main():
         )
     )
 
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -203,27 +207,20 @@ def main():
             continue
         new_filters[key] = value
 
-    name_prefix = module.params["name_prefix"]
     address_prefix = module.params["ip_address_prefix"]
-    tags = module.params["tags"]
+    requests, left = server_filters('describe_eip_addresses', new_filters, name_prefix=module.params["name_prefix"],
+                                    tags=module.params["tags"], ids=eip_ids, any_tag=True)
 
     try:
-        for eip in vpc_connect(module).describe_eip_addresses(**new_filters):
-            if name_prefix and not str(eip.name).startswith(name_prefix):
-                continue
-            if address_prefix and not str(eip.IpAddress).startswith(address_prefix):
-                continue
-            if eip_ids and eip.allocation_id not in eip_ids:
-                continue
-            if tags:
-                flag = False
-                for key, value in list(tags.items()):
-                    if key in list(eip.tags.keys()) and value == eip.tags[key]:
-                        flag = True
-                if not flag:
+        vpc = vpc_connect(module)
+        for request in requests:
+            for eip in paginate(vpc.describe_eip_addresses, **request):
+                if address_prefix and not str(eip.IpAddress).startswith(address_prefix):
                     continue
-            eips.append(eip.read())
-            ids.append(eip.id)
+                if not client_filter(left, eip):
+                    continue
+                eips.append(project(eip.read(), module.params['fields']))
+                ids.append(eip.id)
 
         module.exit_json(changed=False, ids=ids, eips=eips)
     except Exception as e:
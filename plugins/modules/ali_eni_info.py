@@ -46,6 +46,7 @@ requirements:
     - "footmark >= 1.13.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -161,6 +162,7 @@ ids:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, ecs_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project
 
 HAS_FOOTMARK = False
 
@@ -180,6 +182,7 @@ def main():
         filters=dict(type='dict'),
     )
     )
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -210,7 +213,7 @@ def main():
         for eni in ecs_connect(module).describe_network_interfaces(**filters):
             if name_prefix and not str(eni.name).startswith(name_prefix):
                 continue
-            interfaces.append(eni.read())
+            interfaces.append(project(eni.read(), module.params['fields']))
             ids.append(eni.id)
         module.exit_json(changed=False, ids=ids, interfaces=interfaces)
     except Exception as e:
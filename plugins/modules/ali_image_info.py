@@ -38,6 +38,7 @@ requirements:
     - "footmark >= 1.15.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -149,6 +150,7 @@ total:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, ecs_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project
 
 HAS_FOOTMARK = False
 
@@ -198,6 +200,7 @@ def main():
         image_names=dict(type='list', elements='str', aliases=['names']),
     )
     )
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
     if HAS_FOOTMARK is False:
         module.fail_json(msg="Package 'footmark' required for this module.")
@@ -218,19 +221,19 @@ def main():
         if image_ids:
             image_id = ",".join(image_ids)
             for image in ecs.get_all_images(image_id=image_id):
-                result.append(get_info(image))
+                result.append(project(get_info(image), module.params['fields']))
                 ids.append(image.image_id)
 
         elif image_names:
             for name in image_names:
                 for image in ecs.get_all_images(image_name=name):
                     if image:
-                        result.append(get_info(image))
+                        result.append(project(get_info(image), module.params['fields']))
                         ids.append(image.image_id)
 
         else:
             for image in ecs.get_all_images():
-                result.append(get_info(image))
+                result.append(project(get_info(image), module.params['fields']))
                 ids.append(image.image_id)
 
         module.exit_json(changed=False, image_ids=ids, images=result, total=len(result))
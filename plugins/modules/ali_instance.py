@@ -21,6 +21,7 @@ options:
     state:
       description:
         - The state of the instance after operating.
+        - C(state=restarted) reboots the running instances and starts the stopped ones, so all of them end up running.
       default: 'present'
       choices: ['present', 'running', 'stopped', 'restarted', 'absent']
       type: str
@@ -125,6 +126,86 @@ options:
         The specified count_tag must already exist or be passed in as the I(tags) option.
         If it is not specified, it will be replaced by I(instance_name).
       type: str
+    placements:
+      description:
+        - A list of candidate placements for the new instances, each a dict of C(zone_id) and C(vswitch_id).
+          The new instances are spread evenly over the placements in batches of at most 100 instances, and a batch
+          whose zone is out of stock is launched in the next placement instead.
+        - If it is not specified, the new instances are launched in I(availability_zone) and I(vswitch_id).
+      type: list
+      elements: dict
+      suboptions:
+        zone_id:
+          description:
+            - The availability zone of the placement.
+          type: str
+        vswitch_id:
+          description:
+            - The vswitch of the placement, which decides the zone when it is specified.
+          type: str
+    max_concurrency:
+      description:
+        - The largest number of batches of new instances launched at the same time.
+      default: 4
+      type: int
+    wait:
+      description:
+        - Whether to wait for the instances to be running or stopped after C(state=running), C(state=stopped) or
+          C(state=restarted). All of the instances are polled together.
+        - After C(state=restarted) the wait lasts until the rebooted instances have gone through the reboot and are
+          running again, not only until they are seen running.
+      default: False
+      type: bool
+    wait_timeout:
+      description:
+        - How long before the wait gives up, in seconds.
+      default: 300
+      type: int
+    rolling_update:
+      description:
+        - Replace the instances whose image or instance type differ from I(image_id) or I(instance_type) one batch after
+          another when C(state=present). The replacements of a batch are launched at the same time, and they are running
+          and healthy before the instances they replace are released.
+      type: dict
+      suboptions:
+        batch_size:
+          description:
+            - The number of instances replaced at a time, as a number like C(2) or as a percentage of the instances like
+              C(25%).
+          default: '1'
+          type: str
+        load_balancer_ids:
+          description:
+            - The IDs of the load balancers whose default backend servers are the instances. The instances of a batch
+              get the weight 0 and drain while their replacements are launched, and the replacements are added with
+              I(weight) and have to pass the health checks of every load balancer.
+            - When a batch fails before its instances are removed from the load balancers, they get their former
+              weights back and the replacements of the batch are removed from the load balancers.
+          type: list
+          elements: str
+        weight:
+          description:
+            - The backend server weight of the replacements.
+          default: 100
+          type: int
+        drain_timeout:
+          description:
+            - How long the instances of a batch drain after their weight is set to 0, in seconds.
+          default: 30
+          type: int
+        health_check_timeout:
+          description:
+            - How long before the wait for the replacements of a batch to run and to be healthy gives up, in seconds.
+          default: 300
+          type: int
+    scale_in_strategy:
+      description:
+        - Which instances are terminated when I(count) is lower than the number of the existing instances.
+        - C(newest) and C(oldest) go by the creation time. C(zone_balance) terminates the newest instances of the zone
+          with the most instances first.
+      default: 'newest'
+      choices: ['newest', 'oldest', 'zone_balance']
+      type: str
     allocate_public_ip:
       description:
         - Whether allocate a public ip for the new instance.
@@ -294,6 +375,37 @@ EXAMPLES = '''
         host_name: '{{ host_name }}'
         password: '{{ password }}'
 
+    - name: launch 300 instances over three vswitches, skipping the zones which are out of stock
+      alibaba.alicloud.ali_instance:
+        alicloud_access_key: '{{ alicloud_access_key }}'
+        alicloud_secret_key: '{{ alicloud_secret_key }}'
+        alicloud_region: '{{ alicloud_region }}'
+        image: '{{ image }}'
+        instance_type: '{{ instance_type }}'
+        security_groups: '{{ security_groups }}'
+        instance_name: web
+        count: 300
+        placements:
+          - vswitch_id: vsw-abcd1234
+          - vswitch_id: vsw-efgh5678
+          - vswitch_id: vsw-ijkl9012
+
+    - name: replace the instances of an old image two at a time behind a load balancer
+      alibaba.alicloud.ali_instance:
+        alicloud_access_key: '{{ alicloud_access_key }}'
+        alicloud_secret_key: '{{ alicloud_secret_key }}'
+        alicloud_region: '{{ alicloud_region }}'
+        image: '{{ image }}'
+        instance_type: '{{ instance_type }}'
+        vswitch_id: '{{ vswitch_id }}'
+        security_groups: '{{ security_groups }}'
+        instance_name: web
+        count: 10
+        rolling_update:
+          batch_size: 2
+          load_balancer_ids: ['lb-abcd1234']
+          drain_timeout: 60
+
     - name: start instance
       alibaba.alicloud.ali_instance:
         alicloud_access_key: '{{ alicloud_access_key }}'
@@ -589,14 +701,46 @@ ids:
     returned: always
     type: list
     sample: [i-12345er, i-3245fs]
+outcomes:
+    description: The outcome of each instance started, stopped or rebooted by the task.
+    returned: when C(state=running), C(state=stopped) or C(state=restarted)
+    type: list
+    elements: dict
+    contains:
+        id:
+            description: The ID of the instance.
+            type: str
+            sample: i-12345er
+        code:
+            description: The result code of the instance, C(200) when it succeeded.
+            type: str
+            sample: "200"
+        message:
+            description: The result message of the instance.
+            type: str
+            sample: success
+        previous_status:
+            description: The status of the instance before the operation.
+            type: str
+            sample: Running
+        current_status:
+            description: The status of the instance right after the operation.
+            type: str
+            sample: Stopping
 '''
 
 import re
+import json
+import base64
+import hashlib
 from ast import literal_eval
 import time
+import threading
 import traceback
 from ansible.module_utils.basic import AnsibleModule, missing_required_lib
-from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, ecs_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, ecs_connect, slb_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_batch import chunks, run_batches
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_slb import BACKEND_SERVERS_MAX_SIZE, wait_for_healthy
 
 HAS_FOOTMARK = False
 FOOTMARK_IMP_ERR = None
@@ -607,6 +751,125 @@ except ImportError:
     FOOTMARK_IMP_ERR = traceback.format_exc()
     HAS_FOOTMARK = False
 
+# The most instances one RunInstances call launches
+RUN_INSTANCES_MAX_AMOUNT = 100
+# The RunInstances errors which mean that a zone can not supply the instances at the moment
+NO_STOCK_ERRORS = ('OperationDenied.NoStock', 'Zone.NotOnSale', 'Zone.NotOpen', 'InvalidResourceType.NotSupported')
+# The most instance ids one DeleteInstances or DescribeInstances call takes
+INSTANCE_IDS_MAX_SIZE = 100
+
+
+def select_victims(instances, amount, strategy):
+    """
+    Return the instances to terminate when scaling in by amount. The order of instances created at the same time is
+    decided by their ids, so that the same instances are chosen on every run.
+    """
+    ordered = sorted(instances, key=lambda inst: (inst.creation_time, inst.id), reverse=strategy != 'oldest')
+    if strategy != 'zone_balance':
+        return ordered[:amount]
+    zones = {}
+    for inst in ordered:
+        zones.setdefault(inst.zone_id, []).append(inst)
+    victims = []
+    for dummy in range(amount):
+        zone = min(zones, key=lambda z: (-len(zones[z]), z))
+        victims.append(zones[zone].pop(0))
+        if not zones[zone]:
+            zones.pop(zone)
+    return victims
+
+
+def wait_for_instances(ecs, ids, status=None, delay=5, timeout=300):
+    """
+    Wait until every instance has the status, or has gone when status is None. Each round polls all of the
+    instances at once, INSTANCE_IDS_MAX_SIZE per DescribeInstances call.
+    """
+    pending = list(ids)
+    while True:
+        found = []
+        for batch in chunks(pending, INSTANCE_IDS_MAX_SIZE):
+            found.extend(ecs.describe_instances(instance_ids=batch, page_size=INSTANCE_IDS_MAX_SIZE))
+        pending = [inst.id for inst in found if status is None or str(inst.status).lower() != status]
+        if not pending:
+            return
+        timeout -= delay
+        if timeout <= 0:
+            raise Exception("Timeout Error: Waiting for instances {0} to be {1}.".format(pending, status or 'deleted'))
+        time.sleep(delay)
+
+
+def wait_for_reboot(ecs, started, delay=5, timeout=300):
+    """
+    Wait until the rebooted instances are running again. started maps each instance to its start time before the
+    reboot. An instance can still be running for a while after RebootInstances, so it only counts as rebooted once it
+    has been seen in another status or has a new start time.
+    """
+    rebooted = set()
+    pending = list(started)
+    while True:
+        found = []
+        for batch in chunks(pending, INSTANCE_IDS_MAX_SIZE):
+            found.extend(ecs.describe_instances(instance_ids=batch, page_size=INSTANCE_IDS_MAX_SIZE))
+        for inst in found:
+            if str(inst.status).lower() != 'running' or getattr(inst, 'start_time', None) != started[inst.id]:
+                rebooted.add(inst.id)
+        pending = [inst.id for inst in found if inst.id not in rebooted or str(inst.status).lower() != 'running']
+        if not pending:
+            return
+        timeout -= delay
+        if timeout <= 0:
+            raise Exception("Timeout Error: Waiting for instances {0} to be rebooted.".format(pending))
+        time.sleep(delay)
+
+
+def operate_instances(ecs, action, ids, **params):
+    """
+    Send a StartInstances, StopInstances or RebootInstances call per INSTANCE_IDS_MAX_SIZE ids and return the outcome of
+    each instance. The calls go ahead with the instances that can be operated, an instance in the wrong status only
+    fails its own outcome.
+    """
+    outcomes = []
+    for batch in chunks(ids, INSTANCE_IDS_MAX_SIZE):
+        params.update(Action=action, instance_ids=batch, batch_optimization='SuccessFirst')
+        body = ecs.make_request_new(ecs.build_request_params(params))
+        for response in json.loads(body)['InstanceResponses']['InstanceResponse']:
+            outcomes.append(dict(id=response['InstanceId'], code=str(response.get('Code')), message=response.get('Message'),
+                                 previous_status=response.get('PreviousStatus'),
+                                 current_status=response.get('CurrentStatus')))
+    return outcomes
+
+
+def change_instances_status(module, ecs, action, ids, status, wait=False, started=None, **params):
+    """
+    Operate the instances in batches, wait for them to have the status when asked to and return their outcomes. A
+    reboot passes the start times of the instances as started, to wait for the reboot itself to be over.
+    """
+    outcomes = []
+    try:
+        if ids:
+            outcomes = operate_instances(ecs, action, ids, **params)
+        succeeded = [o['id'] for o in outcomes if o['code'] == '200']
+        if succeeded and (wait or module.params['wait']):
+            if started is not None:
+                wait_for_reboot(ecs, dict((i, started.get(i)) for i in succeeded), timeout=module.params['wait_timeout'])
+            else:
+                wait_for_instances(ecs, succeeded, status, timeout=module.params['wait_timeout'])
+    except Exception as e:
+        module.fail_json(msg='{0} got an error: {1}'.format(action, e), outcomes=outcomes)
+    failed = [o for o in outcomes if o['code'] != '200']
+    if failed:
+        module.fail_json(msg='{0} failed on {1} of {2} instances: {3}'.format(
+            action, len(failed), len(outcomes), '; '.join('{0} {1}'.format(o['id'], o['message']) for o in failed)),
+            changed=len(failed) < len(outcomes), outcomes=outcomes)
+    return outcomes
+
+
+def terminate_instances(ecs, ids, force):
+    """ Delete the instances with one DeleteInstances call per INSTANCE_IDS_MAX_SIZE ids and wait until they are gone """
+    for batch in chunks(ids, INSTANCE_IDS_MAX_SIZE):
+        ecs.get_status_new(ecs.build_request_params(dict(Action='DeleteInstances', instance_ids=batch, force=force)))
+    wait_for_instances(ecs, ids)
+
 
 def get_instances_info(connection, ids):
     result = []
@@ -620,9 +883,8 @@ def get_instances_info(connection, ids):
     return result
 
 
-def run_instance(module, ecs, exact_count):
-    if exact_count <= 0:
-        return None
+def launch_instances(module, ecs, exact_count):
+    """ Launch exact_count instances and return the ones launched, with the errors of the batches which failed """
     zone_id = module.params['availability_zone']
     image_id = module.params['image_id']
     instance_type = module.params['instance_type']
@@ -670,31 +932,81 @@ def run_instance(module, ecs, exact_count):
     if len(security_groups) <= 0:
         module.fail_json(msg='Expected the parameter security_groups is non-empty when create new ECS instances, aborting')
 
-    client_token = "Ansible-Alicloud-{0}-{1}".format(hash(str(module.params)), str(time.time()))
+    params = dict(image_id=image_id, instance_type=instance_type, security_group_id=security_groups[0],
+                  instance_name=instance_name, description=description, internet_charge_type=internet_charge_type,
+                  internet_max_bandwidth_out=max_bandwidth_out, internet_max_bandwidth_in=max_bandwidth_in,
+                  host_name=host_name, password=password, io_optimized='optimized',
+                  system_disk_category=system_disk_category, system_disk_size=system_disk_size,
+                  system_disk_disk_name=system_disk_name, system_disk_description=system_disk_description,
+                  instance_charge_type=instance_charge_type, period=period, period_unit="Month", auto_renew=auto_renew,
+                  auto_renew_period=auto_renew_period, key_pair_name=key_name, user_data=user_data,
+                  ram_role_name=ram_role_name, spot_price_limit=spot_price_limit, spot_strategy=spot_strategy,
+                  unique_suffix=unique_suffix, tags=merged_tags)
+    placements = module.params['placements'] or [dict(zone_id=zone_id, vswitch_id=vswitch_id)]
+    client_token = "Ansible-Alicloud-{0}".format(hash(str(module.params)))
+    launched_at = str(time.time())
 
-    try:
-        # call to create_instance method from footmark
-        instances = ecs.run_instances(image_id=image_id, instance_type=instance_type, security_group_id=security_groups[0],
-                                      zone_id=zone_id, instance_name=instance_name, description=description,
-                                      internet_charge_type=internet_charge_type, internet_max_bandwidth_out=max_bandwidth_out,
-                                      internet_max_bandwidth_in=max_bandwidth_in, host_name=host_name, password=password,
-                                      io_optimized='optimized', system_disk_category=system_disk_category,
-                                      system_disk_size=system_disk_size, system_disk_disk_name=system_disk_name,
-                                      system_disk_description=system_disk_description, vswitch_id=vswitch_id,
-                                      amount=exact_count, instance_charge_type=instance_charge_type, period=period, period_unit="Month",
-                                      auto_renew=auto_renew, auto_renew_period=auto_renew_period, key_pair_name=key_name,
-                                      user_data=user_data, client_token=client_token, ram_role_name=ram_role_name,
-                                      spot_price_limit=spot_price_limit, spot_strategy=spot_strategy, unique_suffix=unique_suffix,
-                                      tags=merged_tags)
+    # Spread the instances evenly over batches, one batch per placement at least and RUN_INSTANCES_MAX_AMOUNT
+    # instances per batch at most.
+    total = max(-(-exact_count // RUN_INSTANCES_MAX_AMOUNT), min(len(placements), exact_count))
+    amounts = [exact_count // total + (1 if i < exact_count % total else 0) for i in range(total)]
 
-    except Exception as e:
-        module.fail_json(msg='Unable to create instance, error: {0}'.format(e))
+    sold_out = {}
+    lock = threading.Lock()
+
+    def launch(index):
+        # A batch starts from its own placement and moves on to the next one while the zone is out of stock
+        for attempt in range(len(placements)):
+            placement = placements[(index + attempt) % len(placements)]
+            key = (placement.get('zone_id'), placement.get('vswitch_id'))
+            with lock:
+                if key in sold_out:
+                    continue
+            try:
+                return ecs.run_instances(zone_id=key[0], vswitch_id=key[1], amount=amounts[index],
+                                         client_token="{0}-{1}.{2}-{3}".format(client_token, index, attempt, launched_at),
+                                         **params)
+            except Exception as e:
+                code = getattr(e, 'error_code', None) or getattr(e, 'get_error_code', lambda: None)()
+                if code not in NO_STOCK_ERRORS:
+                    raise
+                with lock:
+                    sold_out[key] = code
+        raise Exception("None of the placements has the stock of {0} instances: {1}".format(
+            amounts[index], ', '.join('{0} {1}'.format(k[1] or k[0], v) for k, v in sold_out.items())))
+
+    results, errors = run_batches(launch, range(total), module.params['max_concurrency'])
+    return [inst for launched in results for inst in launched], [str(e) for e in errors]
 
+
+def run_instance(module, ecs, exact_count):
+    if exact_count <= 0:
+        return None
+    instances, errors = launch_instances(module, ecs, exact_count)
+    if errors:
+        module.fail_json(msg='Unable to create instance, error: {0}'.format('; '.join(errors)),
+                         ids=[inst.id for inst in instances])
     return instances
 
 
+def user_data_digest(user_data):
+    """
+    Return the digest of user data as the instance keeps it. footmark sends user data which is already base64 text as
+    it is, and encodes anything else.
+    """
+    if isinstance(user_data, str):
+        user_data = user_data.encode('utf-8')
+    try:
+        if base64.b64encode(base64.b64decode(user_data)) == user_data:
+            user_data = base64.b64decode(user_data)
+    except ValueError:
+        pass
+    return hashlib.sha256(user_data).hexdigest()
+
+
 def modify_instance(module, instance):
-    # According to state to modify instance's some special attribute
+    # According to state to modify instance's some special attribute, only the attributes which differ from the
+    # described ones are sent.
     state = module.params["state"]
     name = module.params['instance_name']
     unique_suffix = module.params['unique_suffix']
@@ -713,23 +1025,132 @@ def modify_instance(module, instance):
     if not host_name:
         host_name = instance.host_name
 
+    attributes = {}
+    if name != instance.name:
+        attributes['name'] = name
+    if description != instance.description:
+        attributes['description'] = description
+    if host_name != instance.host_name:
+        attributes['host_name'] = host_name
+
     # password can be modified only when restart instance
-    password = ""
-    if state == "restarted":
-        password = module.params['password']
+    if state == "restarted" and module.params['password']:
+        attributes['password'] = module.params['password']
 
-    # userdata can be modified only when instance is stopped
-    setattr(instance, "user_data", instance.describe_user_data())
-    user_data = instance.user_data
-    if state == "stopped":
-        user_data = module.params['user_data'].encode()
+    # userdata can be modified only when instance is stopped, so it is only described then
+    if state == "stopped" and module.params['user_data']:
+        setattr(instance, "user_data", instance.describe_user_data())
+        if user_data_digest(module.params['user_data']) != hashlib.sha256(instance.user_data).hexdigest():
+            attributes['user_data'] = module.params['user_data'].encode()
 
+    if not attributes:
+        return False
     try:
-        return instance.modify(name=name, description=description, host_name=host_name, password=password, user_data=user_data)
+        return instance.modify(**attributes)
     except Exception as e:
         module.fail_json(msg="Modify instance {0} attribute got an error: {1}".format(instance.id, e))
 
 
+def is_outdated(module, instance):
+    """ Whether the instance was launched from another image or with another instance type than the desired ones """
+    image_id = module.params['image_id']
+    instance_type = module.params['instance_type']
+    return bool(image_id and instance.image_id != image_id or instance_type and instance.instance_type != instance_type)
+
+
+def batch_length(batch_size, total):
+    """ Return the length of a batch given as a number or as a percentage of total, one at least """
+    size = str(batch_size).strip()
+    if size.endswith('%'):
+        return max(1, int(total * float(size[:-1]) / 100))
+    return max(1, int(size))
+
+
+def set_backend_weights(slb, load_balancer_ids, ids, weight):
+    """
+    Set the weight of the instances which are backend servers of the load balancers. Return the servers as they were
+    before, per load balancer, to set them back with restore_backend_weights.
+    """
+    former = {}
+    for load_balancer_id in load_balancer_ids:
+        load_balancer = slb.describe_load_balancer_attribute(load_balancer_id=load_balancer_id)
+        former[load_balancer_id] = [dict(server_id=s['server_id'], weight=int(s['weight']))
+                                    for s in load_balancer.backend_servers['backend_server'] if s['server_id'] in ids]
+        servers = [dict(server_id=s['server_id'], weight=weight) for s in former[load_balancer_id]]
+        for batch in chunks(servers, BACKEND_SERVERS_MAX_SIZE):
+            slb.set_backend_servers(load_balancer_id=load_balancer_id, backend_servers=batch)
+    return former
+
+
+def restore_backend_weights(slb, former):
+    """ Set back the weights returned by set_backend_weights """
+    for load_balancer_id, servers in former.items():
+        for batch in chunks(servers, BACKEND_SERVERS_MAX_SIZE):
+            slb.set_backend_servers(load_balancer_id=load_balancer_id, backend_servers=batch)
+
+
+def detach_backend_servers(slb, load_balancer_ids, ids):
+    """ Remove the instances from the load balancers which have them as backend servers """
+    for load_balancer_id in load_balancer_ids:
+        load_balancer = slb.describe_load_balancer_attribute(load_balancer_id=load_balancer_id)
+        attached = [s['server_id'] for s in load_balancer.backend_servers['backend_server'] if s['server_id'] in ids]
+        for batch in chunks(attached, BACKEND_SERVERS_MAX_SIZE):
+            slb.remove_backend_servers(load_balancer_id=load_balancer_id, backend_server_ids=batch)
+
+
+def roll_instances(module, ecs, outdated, total):
+    """
+    Replace the outdated instances batch by batch and return the replacements. The instances of a batch drain from the
+    load balancers while their replacements are launched, and they are only released once the replacements are healthy.
+    When a batch fails before that, its instances get their weights back and its replacements leave the load balancers.
+    """
+    options = module.params['rolling_update']
+    load_balancer_ids = options['load_balancer_ids'] or []
+    slb = slb_connect(module) if load_balancer_ids else None
+    try:
+        size = batch_length(options['batch_size'], total)
+    except ValueError:
+        module.fail_json(msg="The rolling_update batch_size {0} is neither a number nor a percentage.".format(options['batch_size']))
+
+    replacements = []
+    for batch in chunks(outdated, size):
+        old_ids, new_ids, former = [inst.id for inst in batch], [], None
+        try:
+            drained_at = time.time() + options['drain_timeout']
+            if slb:
+                former = set_backend_weights(slb, load_balancer_ids, old_ids, 0)
+            new_instances, errors = launch_instances(module, ecs, len(batch))
+            replacements.extend(new_instances)
+            new_ids = [inst.id for inst in new_instances]
+            if errors:
+                raise Exception('Unable to create instance, error: {0}'.format('; '.join(errors)))
+            wait_for_instances(ecs, new_ids, 'running', timeout=options['health_check_timeout'])
+            if slb:
+                servers = [dict(server_id=i, weight=options['weight']) for i in new_ids]
+                for load_balancer_id in load_balancer_ids:
+                    for servers_batch in chunks(servers, BACKEND_SERVERS_MAX_SIZE):
+                        slb.add_backend_servers(load_balancer_id=load_balancer_id, backend_servers=servers_batch)
+                wait_for_healthy(slb, dict((lb_id, set(new_ids)) for lb_id in load_balancer_ids),
+                                 options['health_check_timeout'])
+                if drained_at > time.time():
+                    time.sleep(drained_at - time.time())
+                for load_balancer_id in load_balancer_ids:
+                    for ids_batch in chunks(old_ids, BACKEND_SERVERS_MAX_SIZE):
+                        slb.remove_backend_servers(load_balancer_id=load_balancer_id, backend_server_ids=ids_batch)
+                former = None
+            terminate_instances(ecs, old_ids, True)
+        except Exception as e:
+            msg = "Replace instances {0} got an error: {1}".format(old_ids, e)
+            if former is not None:
+                try:
+                    detach_backend_servers(slb, load_balancer_ids, new_ids)
+                    restore_backend_weights(slb, former)
+                except Exception as restore_error:
+                    msg += ", and putting the load balancers back got an error: {0}".format(restore_error)
+            module.fail_json(msg=msg, ids=[inst.id for inst in replacements])
+    return replacements
+
+
 def wait_for_instance_modify_charge(ecs, instance_ids, charge_type, delay=10, timeout=300):
     """
     To verify instance charge type has become expected after modify instance charge type
@@ -760,6 +1181,21 @@ def main():
         image_id=dict(type='str', aliases=['image']),
         count=dict(type='int', default=1),
         count_tag=dict(type='str'),
+        placements=dict(type='list', elements='dict', options=dict(
+            zone_id=dict(type='str'),
+            vswitch_id=dict(type='str')
+        )),
+        max_concurrency=dict(type='int', default=4),
+        wait=dict(type='bool', default=False),
+        wait_timeout=dict(type='int', default=300),
+        rolling_update=dict(type='dict', options=dict(
+            batch_size=dict(type='str', default='1'),
+            load_balancer_ids=dict(type='list', elements='str'),
+            weight=dict(type='int', default=100),
+            drain_timeout=dict(type='int', default=30),
+            health_check_timeout=dict(type='int', default=300)
+        )),
+        scale_in_strategy=dict(type='str', default='newest', choices=['newest', 'oldest', 'zone_balance']),
         vswitch_id=dict(type='str', aliases=['subnet_id']),
         instance_name=dict(type='str', aliases=['name']),
         host_name=dict(type='str'),
@@ -814,6 +1250,7 @@ def main():
     if instance_charge_type == "PrePaid":
         module.params['spot_strategy'] = ''
     changed = False
+    outcomes = []
 
     instances = []
     if instance_ids:
@@ -839,9 +1276,9 @@ def main():
                 if inst.status != 'stopped' and not force:
                     module.fail_json(msg="Instance is running, and please stop it or set 'force' as True.")
                 targets.append(inst.id)
-            if ecs.delete_instances(instance_ids=targets, force=force):
-                changed = True
-                ids.extend(targets)
+            terminate_instances(ecs, targets, force)
+            changed = True
+            ids.extend(targets)
 
             module.exit_json(changed=changed, ids=ids, instances=[])
         except Exception as e:
@@ -855,17 +1292,17 @@ def main():
     if state == 'present':
         if not instance_ids:
             if len(instances) > count:
-                for i in range(0, len(instances) - count):
-                    inst = instances[len(instances) - 1]
-                    if inst.status != 'stopped' and not force:
-                        module.fail_json(msg="That to delete instance {0} is failed results from it is running, "
-                                             "and please stop it or set 'force' as True.".format(inst.id))
-                    try:
-                        if inst.terminate(force=force):
-                            changed = True
-                    except Exception as e:
-                        module.fail_json(msg="Delete instance {0} got an error: {1}".format(inst.id, e))
-                    instances.pop(len(instances) - 1)
+                victims = select_victims(instances, len(instances) - count, module.params['scale_in_strategy'])
+                running = [inst.id for inst in victims if inst.status != 'stopped']
+                if running and not force:
+                    module.fail_json(msg="That to delete instances {0} is failed results from they are running, "
+                                         "and please stop them or set 'force' as True.".format(running))
+                try:
+                    terminate_instances(ecs, [inst.id for inst in victims], force)
+                except Exception as e:
+                    module.fail_json(msg="Delete instances {0} got an error: {1}".format([inst.id for inst in victims], e))
+                changed = True
+                instances = [inst for inst in instances if inst not in victims]
             else:
                 try:
                     if host_name and re.search(r"-\[\d+,\d+\]-", host_name):
@@ -878,6 +1315,13 @@ def main():
                 except Exception as e:
                     module.fail_json(msg="Create new instances got an error: {0}".format(e))
 
+        if module.params['rolling_update']:
+            outdated = [inst for inst in instances if is_outdated(module, inst)]
+            if outdated:
+                replacements = roll_instances(module, ecs, outdated, len(instances))
+                instances = [inst for inst in instances if inst not in outdated] + replacements
+                changed = True
+
         # Security Group join/leave begin
         security_groups = module.params['security_groups']
         if security_groups:
@@ -935,46 +1379,31 @@ def main():
         if len(instances) < 1:
             module.fail_json(msg='Please specify ECS instances that you want to operate by using '
                                  'parameters instance_ids, tags or instance_name, aborting')
+        for inst in instances:
+            if state != 'stopped' and modify_instance(module, inst):
+                changed = True
+            ids.append(inst.id)
         if state == 'running':
-            try:
-                targets = []
-                for inst in instances:
-                    if modify_instance(module, inst):
-                        changed = True
-                    if inst.status != "running":
-                        targets.append(inst.id)
-                    ids.append(inst.id)
-                if targets and ecs.start_instances(instance_ids=targets):
-                    changed = True
-                    ids.extend(targets)
-            except Exception as e:
-                module.fail_json(msg='Start instances got an error: {0}'.format(e))
+            targets = [inst.id for inst in instances if inst.status != "running"]
+            outcomes = change_instances_status(module, ecs, 'StartInstances', targets, 'running')
         elif state == 'stopped':
-            try:
-                targets = []
-                for inst in instances:
-                    if inst.status != "stopped":
-                        targets.append(inst.id)
-                if targets and ecs.stop_instances(instance_ids=targets, force_stop=force):
+            targets = [inst.id for inst in instances if inst.status != "stopped"]
+            # The user data can only be modified once the instances have stopped
+            outcomes = change_instances_status(module, ecs, 'StopInstances', targets, 'stopped',
+                                               wait=bool(module.params['user_data']), force_stop=force)
+            for inst in instances:
+                if modify_instance(module, inst):
                     changed = True
-                    ids.extend(targets)
-                for inst in instances:
-                    if modify_instance(module, inst):
-                        changed = True
-            except Exception as e:
-                module.fail_json(msg='Stop instances got an error: {0}'.format(e))
         elif state == 'restarted':
-            try:
-                targets = []
-                for inst in instances:
-                    if modify_instance(module, inst):
-                        changed = True
-                        targets.append(inst.id)
-                if ecs.reboot_instances(instance_ids=targets, force_stop=module.params['force']):
-                    changed = True
-                    ids.extend(targets)
-            except Exception as e:
-                module.fail_json(msg='Reboot instances got an error: {0}'.format(e))
+            # The running instances are rebooted and the stopped ones are started
+            targets = [inst.id for inst in instances if inst.status == "running"]
+            started = dict((inst.id, getattr(inst, 'start_time', None)) for inst in instances if inst.id in targets)
+            outcomes = change_instances_status(module, ecs, 'RebootInstances', targets, 'running', started=started,
+                                               force_reboot=force)
+            stopped = [inst.id for inst in instances if inst.status == "stopped"]
+            outcomes.extend(change_instances_status(module, ecs, 'StartInstances', stopped, 'running'))
+        if outcomes:
+            changed = True
 
     tags = module.params['tags']
     if module.params['purge_tags']:
@@ -986,7 +1415,7 @@ def main():
                     changed = True
             except Exception as e:
                 module.fail_json(msg="{0}".format(e))
-        module.exit_json(changed=changed, instances=get_instances_info(ecs, ids))
+        module.exit_json(changed=changed, instances=get_instances_info(ecs, ids), outcomes=outcomes)
 
     if tags:
         for inst in instances:
@@ -995,7 +1424,7 @@ def main():
                     changed = True
             except Exception as e:
                 module.fail_json(msg="{0}".format(e))
-    module.exit_json(changed=changed, instances=get_instances_info(ecs, ids))
+    module.exit_json(changed=changed, instances=get_instances_info(ecs, ids), outcomes=outcomes)
 
 
 if __name__ == '__main__':
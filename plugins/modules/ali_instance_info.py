@@ -61,6 +61,7 @@ requirements:
     - "footmark >= 1.13.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -86,6 +87,10 @@ EXAMPLES = '''
   alibaba.alicloud.ali_instance_info:
     tags:
       Test: "add"
+
+- name: Find the private ip addresses and tags of all instances, without their disks and user data
+  alibaba.alicloud.ali_instance_info:
+    fields: ['private_ip_address', 'tags']
 '''
 
 RETURN = '''
@@ -340,6 +345,8 @@ ids:
 import traceback
 from ansible.module_utils.basic import AnsibleModule, missing_required_lib
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, ecs_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, field_wanted, project, server_filters, client_filter
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_paginator import MAX_PAGE_SIZES
 
 HAS_FOOTMARK = False
 FOOTMARK_IMP_ERR = None
@@ -362,6 +369,7 @@ def main():
         filters=dict(type='dict')
     )
     )
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
     if module._name == 'ali_instance_facts':
         module.deprecate("The 'ali_instance_facts' module has been renamed to 'ali_instance_info'", version='2.13')
@@ -377,6 +385,7 @@ def main():
     name_prefix = module.params['name_prefix']
     names = module.params['instance_names']
     zone_id = module.params['availability_zone']
+    fields = module.params['fields']
     if ids and (not isinstance(ids, list) or len(ids) < 1):
         module.fail_json(msg='instance_ids should be a list of instances, aborting')
 
@@ -393,24 +402,24 @@ def main():
             for id in value:
                 if id not in ids:
                     ids.append(value)
-    if ids:
-        filters['instance_ids'] = ids
-    if module.params['tags']:
-        filters['tags'] = module.params['tags']
     if zone_id:
         filters['zone_id'] = zone_id
     if names:
         filters['instance_name'] = names[0]
+    filters.setdefault('page_size', MAX_PAGE_SIZES['describe_instances'])
 
-    for inst in ecs.describe_instances(**filters):
-        if name_prefix:
-            if not str(inst.instance_name).startswith(name_prefix):
+    requests, left = server_filters('describe_instances', filters, name_prefix=name_prefix, tags=module.params['tags'],
+                                    ids=ids)
+    for request in requests:
+        for inst in ecs.describe_instances(**request):
+            if not client_filter(left, inst):
                 continue
-        volumes = ecs.describe_disks(instance_id=inst.id)
-        setattr(inst, 'block_device_mappings', volumes)
-        setattr(inst, 'user_data', inst.describe_user_data())
-        instances.append(inst.read())
-        instance_ids.append(inst.id)
+            if field_wanted(fields, 'block_device_mappings'):
+                setattr(inst, 'block_device_mappings', ecs.describe_disks(instance_id=inst.id))
+            if field_wanted(fields, 'user_data'):
+                setattr(inst, 'user_data', inst.describe_user_data())
+            instances.append(project(inst.read(), fields))
+            instance_ids.append(inst.id)
 
     module.exit_json(changed=False, ids=instance_ids, instances=instances)
 
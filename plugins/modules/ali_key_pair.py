@@ -119,7 +119,7 @@ key:
 
 import time
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.alicloud_ecs import ecs_argument_spec, ecs_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, ecs_connect
 
 HAS_FOOTMARK = False
 
@@ -178,9 +178,11 @@ def main():
     if str(key_pair_name).startswith('http://') or str(key_pair_name).startswith('https://'):
         module.fail_json(msg='key pair name can not start with http:// or https://')
 
-    if key_pair and force:
+    # Only an imported public key can differ from the existing one
+    if key_pair and force and public_key:
         try:
             key_pair.delete()
+            key_pair = None
         except ECSResponseError as ex:
             module.fail_json(msg='Unable to force delete key_pair: {0}, error: {1}'.format(key_pair.name, ex))
 
@@ -193,10 +195,12 @@ def main():
                 key_pair = ecs.import_key_pair(**params)
             else:
                 key_pair = ecs.create_key_pair(**params)
-            module.exit_json(changed=True, key=key_pair)
+            module.exit_json(changed=True, key=key_pair.read())
         except ECSResponseError as e:
             module.fail_json(msg='Unable to create key pair, error: {0}'.format(e))
 
+    module.exit_json(changed=changed, key=key_pair.read())
+
 
 if __name__ == '__main__':
     main()
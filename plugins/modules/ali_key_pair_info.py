@@ -31,6 +31,7 @@ requirements:
     - "footmark"
 extends_documentation_fragment:
     - alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -75,7 +76,8 @@ key_pairs:
 
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.alicloud_ecs import ecs_argument_spec, ecs_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, ecs_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project
 
 HAS_FOOTMARK = False
 
@@ -93,6 +95,7 @@ def main():
         key_pair_finger_print=dict(type="str")
        )
     )
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -111,7 +114,7 @@ def main():
     key_pairs = []
     try:
         for key_pair in ecs_connect(module).describe_key_pairs(**filters):
-            key_pairs.append(key_pair.read())
+            key_pairs.append(project(key_pair.read(), module.params['fields']))
 
     except ECSResponseError as e:
         module.fail_json(msg='Error in describe_key_pairs: {0}'.format(e))
@@ -65,6 +65,7 @@ requirements:
     - "footmark >= 1.18.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -132,7 +133,8 @@ products:
                       sample: m-2ze0ua7jvif73kxxxxx
 '''
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.alicloud_ecs import ecs_argument_spec, market_connect, ecs_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, market_connect, ecs_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project, detailed
 
 HAS_FOOTMARK = False
 
@@ -157,6 +159,7 @@ def main():
         ids=dict(typr='list', elements='str')
     )
     )
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -197,7 +200,8 @@ def main():
                 continue
             if ids and product.code not in ids:
                 continue
-            products.append(product.get().read_with_region_name(region_local_name))
+            products.append(project(detailed(product, module.params['fields']).read_with_region_name(region_local_name),
+                                    module.params['fields']))
         module.exit_json(changed=False, products=products)
     except Exception as e:
         module.fail_json(msg=str("Unable to get products, error:{0}".format(e)))
@@ -33,6 +33,7 @@ requirements:
     - "footmark >= 1.20.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 author:
   - "He Guimin (@xiaozhu36)"
   - "Li Xue (@lixue323)"
@@ -181,6 +182,7 @@ executions:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, oos_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project
 
 HAS_FOOTMARK = False
 
@@ -198,6 +200,7 @@ def main():
         name_prefix=dict(type='str', aliases=['name']),
     )
     )
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -213,7 +216,7 @@ def main():
         for e in oos_connect(module).list_executions(**filters):
             if name_prefix and not str(e.name).startswith(name_prefix):
                 continue
-            executions.append(e.read())
+            executions.append(project(e.read(), module.params['fields']))
             ids.append(e.id)
         module.exit_json(changed=False, ids=ids, executions=executions)
     except Exception as e:
@@ -37,6 +37,7 @@ requirements:
     - "footmark >= 1.20.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 author:
   - "He Guimin (@xiaozhu36)"
   - "Li Xue (@lixue323)"
@@ -182,6 +183,7 @@ templates:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, oos_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project, detailed
 
 HAS_FOOTMARK = False
 
@@ -200,6 +202,7 @@ def main():
         tags=dict(type='dict')
     )
     )
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -223,8 +226,8 @@ def main():
                         flag = True
                 if not flag:
                     continue
-            templates.append(template.get().read())
-            names.append(template.get().name)
+            templates.append(project(detailed(template, module.params['fields']).read(), module.params['fields']))
+            names.append(template.name)
         module.exit_json(changed=False, names=names, templates=templates)
         # module.exit_json(changed=False, names=names, templates=templates)
     except Exception as e:
@@ -127,7 +127,7 @@ buckets:
 
 # import module snippets
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.alicloud_oss import oss_bucket_argument_spec, oss_bucket_connect, oss_service_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_oss import oss_bucket_argument_spec, oss_bucket_connect, oss_service_connect
 
 HAS_FOOTMARK = False
 
@@ -30,6 +30,7 @@ requirements:
     - "footmark"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -101,7 +102,8 @@ total:
 
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.alicloud_oss import oss_bucket_argument_spec, oss_bucket_connect, oss_service_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_oss import oss_bucket_argument_spec, oss_bucket_connect, oss_service_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project
 
 HAS_FOOTMARK = False
 
@@ -129,6 +131,7 @@ def main():
             bucket_prefix=dict(type="str")
         )
     )
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -143,7 +146,7 @@ def main():
         for name in keys:
             module.params['bucket'] = name
             bucket = oss_bucket_connect(module)
-            buckets.append(get_info(bucket))
+            buckets.append(project(get_info(bucket), module.params['fields']))
             bucket_names.append(bucket.name)
 
         module.exit_json(changed=False, bucket_names=bucket_names, buckets=buckets, total=len(buckets))
@@ -250,7 +250,8 @@ objects:
 '''
 # import module snippets
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.alicloud_oss import oss_bucket_argument_spec, oss_bucket_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_oss import oss_bucket_argument_spec, oss_bucket_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_paginator import paginate, MARKER
 import time
 
 HAS_FOOTMARK = False
@@ -339,15 +340,9 @@ def main():
 
     elif mode == 'list':
         objects = []
-        max_keys = 500
         try:
-            while True:
-                results = oss_bucket.list_objects(prefix=object_key, max_keys=max_keys)
-                for obj in results:
-                    objects.append(get_object_info(obj))
-
-                if len(results) < max_keys:
-                    break
+            for obj in paginate(oss_bucket.list_objects, style=MARKER, prefix=object_key):
+                objects.append(get_object_info(obj))
             module.exit_json(changed=False, objects=objects)
         except Exception as e:
             module.fail_json(msg="Unable to retrieve all objects, and got an error: {0}".format(e))
@@ -29,6 +29,7 @@ requirements:
     - "footmark"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -106,7 +107,9 @@ total:
 '''
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.alicloud_oss import oss_bucket_argument_spec, oss_bucket_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_oss import oss_bucket_argument_spec, oss_bucket_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_paginator import paginate, MARKER
 import time
 
 HAS_FOOTMARK = False
@@ -140,6 +143,7 @@ def main():
         bucket=dict(type='str', required=True),
         object=dict(type='str', aliases=['key', 'object_name']),
     ))
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -148,19 +152,13 @@ def main():
     object_key = module.params['object']
     objects = []
     object_names = []
-    max_keys = 500
 
     try:
         oss_bucket = oss_bucket_connect(module)
 
-        while True:
-            results = oss_bucket.list_objects(prefix=object_key, max_keys=max_keys)
-            for obj in results:
-                objects.append(get_info(obj))
-                object_names.append(obj.key)
-
-            if len(results) < max_keys:
-                break
+        for obj in paginate(oss_bucket.list_objects, style=MARKER, prefix=object_key):
+            objects.append(project(get_info(obj), module.params['fields']))
+            object_names.append(obj.key)
         module.exit_json(changed=False, object_names=object_names, objects=objects, total=len(objects))
     except Exception as e:
         module.fail_json(msg="Unable to describe bucket objects, and got an error: {0}".format(e))
@@ -30,6 +30,7 @@ requirements:
     - "footmark >= 1.17.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -68,6 +69,7 @@ users:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, ram_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project
 
 HAS_FOOTMARK = False
 
@@ -83,6 +85,7 @@ def main():
     argument_spec.update(dict(
         user_name=dict(type='str', aliases=['name'])
     ))
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -90,7 +93,7 @@ def main():
     try:
         access_key = []
         for access in ram_connect(module).list_access_keys(**module.params):
-            access_key.append(access.read())
+            access_key.append(project(access.read(), module.params['fields']))
         module.exit_json(changed=False, access_keys=access_key)
     except Exception as e:
         module.fail_json(msg=str("Unable to list access_keys, error:{0}".format(e)))
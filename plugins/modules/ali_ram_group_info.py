@@ -28,6 +28,7 @@ requirements:
     - "footmark >= 1.17.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -76,6 +77,7 @@ users:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, ram_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project
 
 HAS_FOOTMARK = False
 
@@ -91,6 +93,7 @@ def main():
     argument_spec.update(dict(
         name_prefix=dict(type='str'))
     )
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -103,7 +106,7 @@ def main():
         for group in ram_connect(module).list_groups():
             if name_prefix and not group.name.startswith(name_prefix):
                 continue
-            groups.append(group.read())
+            groups.append(project(group.read(), module.params['fields']))
         module.exit_json(changed=False, groups=groups)
     except Exception as e:
         module.fail_json(msg=str("Unable to list groups, error:{0}".format(e)))
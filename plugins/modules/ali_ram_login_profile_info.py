@@ -30,6 +30,7 @@ requirements:
     - "footmark >= 1.17.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -69,6 +70,7 @@ users:
 '''
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, ram_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project
 
 HAS_FOOTMARK = False
 
@@ -84,6 +86,7 @@ def main():
     argument_spec.update(dict(
         user_name=dict(type='str', required=True, aliases=['name'])
     ))
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -94,7 +97,7 @@ def main():
         profile = ram_connect(module).get_login_profile(user_name=user_name)
         if not profile:
             module.exit_json(changed=False, profile=None)
-        module.exit_json(changed=False, profile=profile.read())
+        module.exit_json(changed=False, profile=project(profile.read(), module.params['fields']))
     except Exception as e:
         module.fail_json(msg=str("Unable to get profile, error:{0}".format(e)))
 
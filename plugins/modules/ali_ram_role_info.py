@@ -28,6 +28,7 @@ requirements:
     - "footmark >= 1.17.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -79,6 +80,7 @@ roles:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, ram_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project, detailed
 
 HAS_FOOTMARK = False
 
@@ -94,6 +96,7 @@ def main():
     argument_spec.update(dict(
         name_prefix=dict(type='str'))
     )
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -107,7 +110,7 @@ def main():
         for role in ram_connect(module).list_roles(**filters):
             if name_prefix and not role.role_name.startswith(name_prefix):
                 continue
-            roles.append(role.get().read())
+            roles.append(project(detailed(role, module.params['fields']).read(), module.params['fields']))
         module.exit_json(changed=False, roles=roles)
     except Exception as e:
         module.fail_json(msg=str("Unable to list roles, error:{0}".format(e)))
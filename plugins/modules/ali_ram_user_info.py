@@ -33,6 +33,7 @@ requirements:
     - "footmark >= 1.17.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -112,6 +113,7 @@ users:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, ram_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project
 
 HAS_FOOTMARK = False
 
@@ -128,6 +130,7 @@ def main():
         name_prefix=dict(type='str')),
         user_ids=dict(type='list', elements='str')
     )
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -142,7 +145,7 @@ def main():
                 continue
             if user_ids and user.user_id not in user_ids:
                 continue
-            users.append(user.read())
+            users.append(project(user.read(), module.params['fields']))
         module.exit_json(changed=False, users=users)
     except Exception as e:
         module.fail_json(msg=str("Unable to list users, error:{0}".format(e)))
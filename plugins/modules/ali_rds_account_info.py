@@ -34,6 +34,7 @@ requirements:
     - "footmark >= 1.16.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 """
 
 EXAMPLES = """
@@ -103,6 +104,7 @@ rds_accounts:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import get_acs_connection_info, ecs_argument_spec, rds_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project
 
 HAS_FOOTMARK = False
 
@@ -120,6 +122,7 @@ def main():
         name_prefix=dict(type='str')
     ))
 
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -134,7 +137,7 @@ def main():
         for account in rds.describe_accounts(db_instance_id=db_instance_id):
             if name_prefix and not account.name.startswith(name_prefix):
                 continue
-            result.append(account.read())
+            result.append(project(account.read(), module.params['fields']))
         module.exit_json(changed=False, rds_accounts=result)
     except Exception as e:
         module.fail_json(msg="Unable to describe rds accounts, and got an error: {0}.".format(e))
@@ -207,7 +207,8 @@ def main():
 
     if state == 'present':
         try:
-            create_backup = rds.create_backup(**module.params)
+            # footmark describes the new backup, which is the only one with its ID
+            create_backup = rds.create_backup(**module.params)[0]
             module.exit_json(changed=True, backup=create_backup.read())
         except Exception as e:
             module.fail_json(msg=str("Unable to create backup error:{0}".format(e)))
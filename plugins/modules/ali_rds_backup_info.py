@@ -41,6 +41,7 @@ requirements:
     - "footmark >= 1.16.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -132,6 +133,7 @@ backups:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, rds_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project
 
 HAS_FOOTMARK = False
 
@@ -150,6 +152,7 @@ def main():
         backup_status=dict(type='str', choice=['Success', 'Failed']),
         backup_mode=dict(type='str', choice=['Automated', 'Manual'])
     ))
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -166,7 +169,7 @@ def main():
                 continue
             if backup_mode and backup.mode.lower() != backup_status.lower():
                 continue
-            result.append(backup.read())
+            result.append(project(backup.read(), module.params['fields']))
 
     except Exception as e:
         module.fail_json(msg="Unable to describe rds backup, and got an error: {0}.".format(e))
@@ -40,6 +40,7 @@ requirements:
     - "footmark >= 1.16.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -113,6 +114,7 @@ databases:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, rds_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project
 
 HAS_FOOTMARK = False
 
@@ -130,6 +132,7 @@ def main():
         name_prefix=dict(type='str'),
         db_status=dict(type='str', aliases=['status'])
     ))
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
     rds = rds_connect(module)
     name_prefix = module.params['name_prefix']
@@ -145,7 +148,7 @@ def main():
                 continue
             if db_status and db.dbstatus.lower() != db_status.lower():
                 continue
-            result.append(db.read())
+            result.append(project(db.read(), module.params['fields']))
         module.exit_json(changed=False, databases=result)
     except Exception as e:
         module.fail_json(msg="Unable to describe rds database, and got an error: {0}.".format(e))
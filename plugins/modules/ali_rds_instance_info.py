@@ -38,6 +38,7 @@ requirements:
     - "footmark >= 1.16.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -280,6 +281,7 @@ instances:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, rds_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project, detailed
 
 HAS_FOOTMARK = False
 
@@ -297,6 +299,7 @@ def main():
         db_instance_ids=dict(type='list', elements='str'),
         tags=dict(type='dict')
     ))
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
     rds = rds_connect(module)
     name_prefix = module.params['name_prefix']
@@ -312,7 +315,7 @@ def main():
                 continue
             if db_instance_ids and rds_instance.read()['id'] not in db_instance_ids:
                 continue
-            result.append(rds_instance.get().read())
+            result.append(project(detailed(rds_instance, module.params['fields']).read(), module.params['fields']))
         module.exit_json(changed=False, instances=result)
     except Exception as e:
         module.fail_json(msg="Unable to describe rds db instance, and got an error: {0}.".format(e))
@@ -39,6 +39,7 @@ requirements:
     - "footmark >= 1.20.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 """
 
 EXAMPLES = """
@@ -128,6 +129,7 @@ stacks:
 """
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, ros_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project
 
 HAS_FOOTMARK = False
 
@@ -149,6 +151,7 @@ def main():
         )
     )
 
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -173,7 +176,7 @@ def main():
                 else:
                     stack_info = ros_conn.list_stacks(**filters)[0]
                 if stack_info.get('stack_id') not in ros_ids:
-                    ros_infos.append(stack_info)
+                    ros_infos.append(project(stack_info, module.params['fields']))
                     ros_ids.append(stack_info.get('stack_id'))
         elif name_prefix:
             all_stack_infos = ros_conn.list_stacks(**filters)
@@ -182,7 +185,7 @@ def main():
                         'stack_id') not in ros_ids:
                     if outputs:
                         stack_info = ros_conn.get_stack(stack_id=stack_info.get('stack_id'))
-                    ros_infos.append(stack_info)
+                    ros_infos.append(project(stack_info, module.params['fields']))
                     ros_ids.append(stack_info.get('stack_id'))
         module.exit_json(ids=ros_ids, stacks=ros_infos, changed=False)
     except Exception as e:
@@ -149,6 +149,7 @@ total:
 # import module snippets
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, vpc_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_paginator import paginate
 
 HAS_FOOTMARK = False
 
@@ -219,19 +220,11 @@ def main():
     route_entry = None
 
     try:
-        page = 1
-        pagesize = 50
-        while True:
-            entries = vpc.get_all_route_entries(router_id=router_id, router_type='VRouter', pagenumber=page, pagesize=pagesize)
-            if entries and len(entries) > 0:
-                for entry in entries:
-                    route_table_id = entry.route_table_id
-                    if destination_cidrblock and entry.destination_cidrblock == destination_cidrblock:
-                        route_entry = entry
-
-            if not entries or len(entries) < pagesize:
+        for entry in paginate(vpc.get_all_route_entries, api='describe_route_tables', router_id=router_id, router_type='VRouter'):
+            route_table_id = entry.route_table_id
+            if destination_cidrblock and entry.destination_cidrblock == destination_cidrblock:
+                route_entry = entry
                 break
-            page += 1
 
     except VPCResponseError as e:
         module.fail_json(msg='Unable to retrieve route entries, error: {0}'.format(e))
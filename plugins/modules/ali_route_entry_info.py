@@ -34,6 +34,7 @@ requirements:
     - "footmark >= 1.15.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -109,6 +110,7 @@ total:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, vpc_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project
 
 HAS_FOOTMARK = False
 
@@ -146,6 +148,7 @@ def main():
         route_table_id=dict(type='str')
     )
     )
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -163,7 +166,7 @@ def main():
         if vrouter_id:
             vrouter_entries = vpc_conn.get_all_route_entries(router_id=vrouter_id, route_table_id=route_table_id)
             for vrouter_entry in vrouter_entries:
-                result.append(get_info(vrouter_entry))
+                result.append(project(get_info(vrouter_entry), module.params['fields']))
     except Exception as e:
         module.fail_json(msg="Unable to describe vrouter entries, and got an error: {0}.".format(e))
 
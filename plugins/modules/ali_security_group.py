@@ -29,7 +29,7 @@ options:
         uppercase/lowercase letter or a Chinese character and can contain numerals, "_", "." or "-".
         It cannot begin with http:// or https://.
         This is used in combination with C(vpc_id) to determine if a Securty Group already exists.
-    required: True
+      - One of I(name) and I(groups) is required.
     aliases: ['group_name']
     type: str
   description:
@@ -64,6 +64,9 @@ options:
   purge_rules:
     description:
       - Purge existing rules on security group that are not found in rules
+      - A rule is found when all of its attributes other than "description" match. A rule which leaves out
+        "nic_type", "policy" or "priority" matches the API defaults "intranet", "accept" and 1. A rule found with
+        another "description" is kept and given the description.
     default: True
     type: bool
   purge_rules_egress:
@@ -71,6 +74,15 @@ options:
       - Purge existing rules_egress on security group that are not found in rules_egress
     default: True
     type: bool
+  compact_rules:
+    description:
+      - Replace the rules and rules_egress with the fewest rules which allow the same traffic before they are
+        enforced. The TCP and UDP rules which only differ by overlapping or adjacent port ranges become one rule,
+        and so do the rules which only differ by CIDR blocks that can be merged, e.g. 10.0.0.0/25 and
+        10.0.0.128/25 become 10.0.0.0/24.
+      - This keeps a group which is given a rule per host or per port well under the rule limit of a group.
+    default: False
+    type: bool
   security_group_id:
     description:
       - Security group ID.
@@ -95,6 +107,69 @@ options:
         There will be conflict when I(multi_ok=True) and I(recent=True).
     default: False
     type: bool
+  groups:
+    description:
+      - A list of security groups to manage in one task, instead of the one group of I(name). The groups are found
+        with a single listing, of their VPC when they all have the same I(vpc_id), and up to I(max_concurrency) of
+        them are changed at the same time.
+      - Each group takes the options below, and the ones it leaves out default to the options of the module of the
+        same name. I(multi_ok) and I(recent) apply to every group.
+    type: list
+    elements: dict
+    suboptions:
+      name:
+        description:
+          - Name of the security group.
+        required: True
+        type: str
+      description:
+        description:
+          - Description of the security group.
+        type: str
+      vpc_id:
+        description:
+          - ID of the VPC of the security group.
+        type: str
+      security_group_id:
+        description:
+          - Security group ID.
+        type: str
+      state:
+        description:
+          - Create, delete the security group.
+        choices: ['present', 'absent']
+        type: str
+      tags:
+        description:
+          - A hash/dictionaries of security group tags.
+        type: dict
+      rules:
+        description:
+          - List of firewall inbound rules to enforce in the group, see I(rules).
+        type: list
+        elements: dict
+      rules_egress:
+        description:
+          - List of firewall outbound rules to enforce in the group, see I(rules_egress).
+        type: list
+        elements: dict
+      purge_rules:
+        description:
+          - Purge existing rules on the group that are not found in rules.
+        type: bool
+      purge_rules_egress:
+        description:
+          - Purge existing rules_egress on the group that are not found in rules_egress.
+        type: bool
+      compact_rules:
+        description:
+          - Replace the rules with the fewest rules which allow the same traffic, see I(compact_rules).
+        type: bool
+  max_concurrency:
+    description:
+      - The largest number of groups of I(groups) changed at the same time.
+    default: 4
+    type: int
 requirements:
     - "python >= 3.6"
     - "footmark >= 1.13.0"
@@ -131,12 +206,37 @@ EXAMPLES = '''
     name: 'AliyunSG'
     vpc_id: 'vpc-123csecd'
     state: absent
+
+- name: Allow SSH from hosts and HTTP on ports, merged into 10.0.0.0/30 on 22 and 0.0.0.0/0 on 80-90
+  alibaba.alicloud.ali_security_group:
+    name: 'AliyunSG'
+    vpc_id: 'vpc-123csecd'
+    compact_rules: True
+    rules:
+      - {ip_protocol: tcp, port_range: 22/22, source_cidr_ip: 10.0.0.0/31}
+      - {ip_protocol: tcp, port_range: 22/22, source_cidr_ip: 10.0.0.2/32}
+      - {ip_protocol: tcp, port_range: 22/22, source_cidr_ip: 10.0.0.3/32}
+      - {ip_protocol: tcp, port_range: 80/85, source_cidr_ip: 0.0.0.0/0}
+      - {ip_protocol: tcp, port_range: 86/90, source_cidr_ip: 0.0.0.0/0}
+
+- name: Manage the groups of a VPC in one task
+  alibaba.alicloud.ali_security_group:
+    vpc_id: 'vpc-123csecd'
+    groups:
+      - name: 'web'
+        rules:
+          - {ip_protocol: tcp, port_range: 443/443, source_cidr_ip: 0.0.0.0/0}
+      - name: 'db'
+        rules:
+          - {ip_protocol: tcp, port_range: 3306/3306, source_cidr_ip: 172.16.0.0/12}
+      - name: 'legacy'
+        state: absent
 '''
 
 RETURN = '''
 group:
     description: Dictionary of security group values
-    returned: always
+    returned: when I(name) is given
     type: complex
     contains:
         description:
@@ -220,15 +320,43 @@ group:
                   source_group_owner_account: "None"
             type: list
             returned: always
+groups:
+    description: The result of each group of I(groups), in the same order.
+    returned: when I(groups) is given
+    type: complex
+    contains:
+        name:
+            description: Security group name.
+            returned: always
+            type: str
+            sample: "web"
+        changed:
+            description: Whether the group was changed.
+            returned: always
+            type: bool
+            sample: true
+        group:
+            description: Dictionary of security group values, as I(group) returns them.
+            returned: when the group was managed without an error
+            type: dict
+        msg:
+            description: The error the group failed with.
+            returned: when the group failed
+            type: str
+            sample: "Creating a security group is failed. Error: ..."
 '''
 
 import time
+import ipaddress
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, ecs_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_paginator import paginate
 
 
 try:
-    from footmark.exception import ECSResponseError
+    import footmark  # noqa: F401
 
     HAS_FOOTMARK = True
 except ImportError:
@@ -241,6 +369,16 @@ VALID_INGRESS_PARAMS = ["ip_protocol", "port_range", "source_port_range", "nic_t
 VALID_EGRESS_PARAMS = ["ip_protocol", "port_range", "source_port_range", "nic_type", "policy",
                        "dest_cidr_ip", "source_cidr_ip", "priority", "description",
                        "dest_group_id", "dest_group_owner_account", "dest_group_owner_id"]
+# The rule attributes which identify a rule, the others, like its description, only describe it
+RULE_KEY_PARAMS = ["ip_protocol", "port_range", "source_port_range", "nic_type", "policy", "source_cidr_ip",
+                   "dest_cidr_ip", "source_group_id", "dest_group_id", "source_group_owner_account",
+                   "dest_group_owner_account", "priority"]
+# The values the API gives the identifying attributes of a rule which does not specify them
+RULE_DEFAULTS = dict(nic_type='intranet', policy='accept', priority='1')
+# The most rules one AuthorizeSecurityGroup or RevokeSecurityGroup call takes
+PERMISSIONS_MAX_SIZE = 100
+# The options of a group of the groups option which default to the options of the module
+GROUP_DEFAULT_OPTIONS = ['state', 'vpc_id', 'tags', 'purge_rules', 'purge_rules_egress', 'compact_rules']
 
 
 def validate_group_rule_keys(module, rule, direction):
@@ -264,40 +402,134 @@ def validate_group_rule_keys(module, rule, direction):
     rule['ip_protocol'] = str(rule['ip_protocol']).upper()
 
 
-def purge_rules(module, group, existing_rule, rules, direction):
+def rule_key(rule):
+    """ Return a hashable key of a rule, made of the attributes which identify it, in the form the API returns them """
+    key = []
+    for name in RULE_KEY_PARAMS:
+        value = rule.get(name)
+        if value in (None, '', 'None'):
+            value = RULE_DEFAULTS.get(name, '')
+        key.append(str(value).lower())
+    return tuple(key)
 
-    if not isinstance(existing_rule, dict):
-        module.fail_json(msg='Invalid existing rule type [{0}].'.format(type(existing_rule)))
 
-    if not isinstance(rules, list):
-        module.fail_json(msg='Invalid rules type [{0}]. The specified rules should be a list.'.format(type(rules)))
+def port_interval(rule):
+    """ Return the first and last port of a TCP or UDP rule, or None for the rules whose ports can not be merged """
+    if str(rule.get('ip_protocol')).upper() not in ('TCP', 'UDP'):
+        return None
+    try:
+        start, end = [int(p) for p in str(rule['port_range']).split('/')]
+    except ValueError:
+        return None
+    return (start, end) if 0 < start <= end else None
 
-    VALID_PARAMS = VALID_INGRESS_PARAMS
-    if direction == "egress":
-        VALID_PARAMS = VALID_EGRESS_PARAMS
 
-    # Find the rules which is not in the specified rules
-    find = False
+def rule_group_key(rule, *names):
+    """ Return a hashable key of a rule made of all of its attributes but the named ones """
+    return tuple(sorted((k, str(v)) for k, v in rule.items() if k not in names and v not in (None, '')))
+
+
+def merge_ports(rules):
+    """ Merge the TCP and UDP rules which only differ by overlapping or adjacent port ranges. The rules are swept in
+    the order of their first port, and each one either extends the interval before it or starts a new one """
+    merged = []
+    groups = OrderedDict()
     for rule in rules:
-        for key in VALID_PARAMS:
-            if not rule.get(key):
-                continue
-            if existing_rule.get(key) != rule.get(key):
-                find = False
-                break
-            find = True
-        if find:
-            break
-    # If it is not found, there will not purge anythind
-    if not find:
-        return group.revoke(existing_rule, direction)
-    return False
+        interval = port_interval(rule)
+        if interval is None:
+            merged.append(rule)
+        else:
+            groups.setdefault(rule_group_key(rule, 'port_range'), []).append((interval, rule))
+    for members in groups.values():
+        if len(members) == 1:
+            merged.append(members[0][1])
+            continue
+        intervals = []
+        for (start, end), rule in sorted(members, key=lambda m: m[0]):
+            if intervals and start <= intervals[-1][1] + 1:
+                intervals[-1][1] = max(intervals[-1][1], end)
+            else:
+                intervals.append([start, end, rule])
+        merged.extend(dict(rule, port_range='%d/%d' % (start, end)) for start, end, rule in intervals)
+    return merged
+
+
+def merge_cidrs(rules, field):
+    """ Merge the rules which only differ by CIDR blocks, into the fewest blocks which cover the same addresses """
+    merged = []
+    groups = OrderedDict()
+    for rule in rules:
+        try:
+            network = ipaddress.ip_network(str(rule.get(field)))
+        except ValueError:
+            merged.append(rule)
+            continue
+        groups.setdefault((network.version,) + rule_group_key(rule, field), []).append((network, rule))
+    for members in groups.values():
+        networks = list(ipaddress.collapse_addresses(n for n, rule in members))
+        if len(networks) == len(members):
+            merged.extend(rule for n, rule in members)
+        else:
+            merged.extend(dict(members[0][1], **{field: str(n)}) for n in networks)
+    return merged
+
+
+def compact_rules(rules, direction):
+    """ Return the fewest rules which allow the same traffic as rules, merging their ports and their CIDR blocks in
+    turn until neither makes the rules fewer """
+    field = 'dest_cidr_ip' if direction == 'egress' else 'source_cidr_ip'
+    while True:
+        compacted = merge_cidrs(merge_ports(rules), field)
+        if len(compacted) == len(rules):
+            return compacted
+        rules = compacted
+
+
+def diff_rules(group, rules, direction, purge):
+    """ Return the rules which are missing from the group, the rules the group has with another description and, when
+    purging, the rules of the group which are not specified """
+    existing = dict((rule_key(p), p) for p in group.permissions if p.get('direction') == direction)
+    wanted = dict((rule_key(r), r) for r in rules)
+    missing = [r for k, r in wanted.items() if k not in existing]
+    described = [r for k, r in wanted.items() if k in existing and r.get('description') not in (None, '') and
+                 str(r['description']) != str(existing[k].get('description') or '')]
+    extra = [p for k, p in existing.items() if k not in wanted] if purge else []
+    return missing, described, extra
+
+
+def change_rules(conn, group, rules, direction, revoke=False):
+    """ Authorize or revoke rules with the Permissions.N form of the API, up to PERMISSIONS_MAX_SIZE rules a call """
+    valid_params = VALID_EGRESS_PARAMS if direction == 'egress' else VALID_INGRESS_PARAMS
+    if revoke:
+        call = conn.revoke_security_group_egress if direction == 'egress' else conn.revoke_security_group
+    else:
+        call = conn.authorize_security_group_egress if direction == 'egress' else conn.authorize_security_group
+    permissions = []
+    for rule in rules:
+        permissions.append(dict((''.join(w.capitalize() for w in k.split('_')), str(v)) for k, v in rule.items()
+                                if k in valid_params and v not in (None, '', 'None')))
+    for i in range(0, len(permissions), PERMISSIONS_MAX_SIZE):
+        call(security_group_id=group.id, permissions=permissions[i:i + PERMISSIONS_MAX_SIZE])
+    return bool(permissions)
+
+
+def describe_rules(conn, group, rules, direction):
+    """ Set the description of rules the group has, one ModifySecurityGroupRule or ModifySecurityGroupEgressRule call
+    a rule since the API takes no more """
+    valid_params = VALID_EGRESS_PARAMS if direction == 'egress' else VALID_INGRESS_PARAMS
+    action = 'ModifySecurityGroupEgressRule' if direction == 'egress' else 'ModifySecurityGroupRule'
+    for rule in rules:
+        params = dict((k, str(v)) for k, v in rule.items() if k in valid_params and v not in (None, '', 'None'))
+        conn.get_status_new(conn.build_request_params(dict(params, Action=action, security_group_id=group.id)))
+    return bool(rules)
 
 
 def group_exists(conn, module, vpc_id, name, security_group_id, multi, recent):
     """Returns None or a security group object depending on the existence of a security group.
     When supplied with a vpc_id and Name, it will check them to determine if it is a match
     otherwise it will assume the Security Group does not exist and thus return None.
+    The name and the ID are filtered by the API, and the listing stops at the second match unless the recent one is
+    wanted, since the other matches do not change the outcome.
     """
     if multi:
         return None
@@ -307,31 +539,152 @@ def group_exists(conn, module, vpc_id, name, security_group_id, multi, recent):
         filters['vpc_id'] = vpc_id
     if security_group_id:
         filters['security_group_id'] = security_group_id
+    if name:
+        filters['security_group_name'] = name
     try:
-        for g in conn.describe_security_groups(**filters):
+        for g in paginate(conn.describe_security_groups, **filters):
             if name and g.security_group_name != name:
                 continue
-            matching_groups.append(g.get())
+            matching_groups.append(g)
+            if len(matching_groups) > 1 and not recent:
+                break
     except Exception as e:
         module.fail_json(msg="Failed to describe Security Groups: {0}".format(e))
 
-    if len(matching_groups) == 1:
-        return matching_groups[0]
-    elif len(matching_groups) > 1:
-        if recent:
-            return matching_groups[-1]
+    if len(matching_groups) > 1 and not recent:
         module.fail_json(msg='Currently there are {0} Security Groups that have the same name and '
                              'vpc id you specified. If you would like to create anyway '
                              'please pass True to the multi_ok param. Or, please pass True to the recent '
                              'param to choose the recent one.'.format(len(matching_groups)))
+    if matching_groups:
+        return matching_groups[-1].get()
     return None
 
 
+def ensure_group(conn, params, group, result):
+    """ Bring a group in line with params, creating it when group is None. result is updated as the changes are made,
+    so that it tells what changed even when an error is raised """
+    if params['state'] == 'absent':
+        result['group'] = {}
+        if group:
+            try:
+                result['changed'] = group.delete()
+            except Exception as e:
+                raise Exception("Deleting security group {0} is failed. Error: {1}".format(group.id, e))
+        return
+
+    if not group:
+        try:
+            group = conn.create_security_group(**dict(
+                params, security_group_name=params['name'],
+                client_token="Ansible-Alicloud-%s-%s" % (hash(str(params)), str(time.time()))))
+            result['changed'] = True
+        except Exception as e:
+            raise Exception('Creating a security group is failed. Error: {0}'.format(e))
+
+    description = params['description']
+    if not description:
+        description = group.description
+    if group.modify(name=params['name'], description=description):
+        result['changed'] = True
+
+    for direction, option in (('ingress', 'rules'), ('egress', 'rules_egress')):
+        rules = params[option]
+        if not rules:
+            continue
+        if params['compact_rules']:
+            rules = compact_rules(rules, direction)
+        missing, described, extra = diff_rules(group, rules, direction, params['purge_' + option])
+        try:
+            if change_rules(conn, group, extra, direction, revoke=True):
+                result['changed'] = True
+            if change_rules(conn, group, missing, direction):
+                result['changed'] = True
+            if describe_rules(conn, group, described, direction):
+                result['changed'] = True
+        except Exception as e:
+            raise Exception("Changing the {0} rules of security group {1} is failed. "
+                            "Error: {2}".format(direction, group.id, e))
+
+    if result['changed']:
+        group = group.get()
+    result['group'] = group.read()
+
+
+def validate_group(module, params):
+    """ Check the name, the description and the rules of a group before anything is changed """
+    for option in ('name', 'description'):
+        if str(params[option]).startswith('http://') or str(params[option]).startswith('https://'):
+            module.fail_json(msg='{0} can not start with http:// or https://'.format(option))
+    for direction, option in (('ingress', 'rules'), ('egress', 'rules_egress')):
+        for rule in params[option] or []:
+            validate_group_rule_keys(module, rule, direction)
+
+
+def ensure_groups(conn, module):
+    """ Manage all of the groups of the groups option. The groups are found with one listing, of their VPC when they
+    share one, and up to max_concurrency of them are changed at the same time """
+    specs = []
+    for spec in module.params['groups']:
+        spec = dict(spec)
+        for option in GROUP_DEFAULT_OPTIONS:
+            if spec.get(option) is None:
+                spec[option] = module.params[option]
+        validate_group(module, spec)
+        specs.append(spec)
+
+    vpc_ids = set(spec['vpc_id'] for spec in specs)
+    filters = {'vpc_id': vpc_ids.pop()} if len(vpc_ids) == 1 and None not in vpc_ids else {}
+    by_id, by_name = {}, {}
+    try:
+        for g in paginate(conn.describe_security_groups, **filters):
+            by_id[g.id] = g
+            by_name.setdefault(g.security_group_name, []).append(g)
+    except Exception as e:
+        module.fail_json(msg="Failed to describe Security Groups: {0}".format(e))
+
+    results = [dict(name=spec['name'], changed=False) for spec in specs]
+    work = []
+    for spec, result in zip(specs, results):
+        matching_groups = []
+        if not module.params['multi_ok']:
+            matching_groups = [g for g in by_name.get(spec['name'], [])
+                               if (not spec['vpc_id'] or g.vpc_id == spec['vpc_id'])
+                               and (not spec['security_group_id'] or g.id == spec['security_group_id'])]
+        if len(matching_groups) > 1 and not module.params['recent']:
+            result['msg'] = 'Currently there are {0} Security Groups that have the same name and vpc id ' \
+                            'you specified.'.format(len(matching_groups))
+            continue
+        work.append((spec, matching_groups[-1] if matching_groups else None, result))
+
+    def apply(spec, group, result):
+        if group and spec['state'] == 'present':
+            group = group.get()
+        ensure_group(conn, spec, group, result)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(module.params['max_concurrency'], len(work))))
+    try:
+        for future, result in [(executor.submit(apply, *w), w[2]) for w in work]:
+            try:
+                future.result()
+            except Exception as e:
+                result['msg'] = str(e)
+    finally:
+        executor.shutdown(wait=True)
+
+    changed = any(result['changed'] for result in results)
+    errors = ['{0}: {1}'.format(result['name'], result['msg']) for result in results if 'msg' in result]
+    if errors:
+        module.fail_json(changed=changed, groups=results,
+                         msg='Managing security groups is failed. Error: {0}'.format('; '.join(errors)))
+    module.exit_json(changed=changed, groups=results)
+
+
 def main():
     argument_spec = ecs_argument_spec()
     argument_spec.update(dict(
         state=dict(default='present', type='str', choices=['present', 'absent']),
-        name=dict(type='str', required=True, aliases=['group_name']),
+        name=dict(type='str', aliases=['group_name']),
         description=dict(type='str'),
         vpc_id=dict(type='str'),
         security_group_id=dict(type='str', aliases=['id', 'group_id']),
@@ -340,90 +693,52 @@ def main():
         rules_egress=dict(type='list', elements='dict'),
         purge_rules=dict(type='bool', default=True),
         purge_rules_egress=dict(type='bool', default=True),
+        compact_rules=dict(type='bool', default=False),
         multi_ok=dict(type='bool', default=False),
-        recent=dict(type='bool', default=False)
+        recent=dict(type='bool', default=False),
+        groups=dict(type='list', elements='dict', options=dict(
+            name=dict(type='str', required=True),
+            description=dict(type='str'),
+            vpc_id=dict(type='str'),
+            security_group_id=dict(type='str'),
+            state=dict(type='str', choices=['present', 'absent']),
+            tags=dict(type='dict'),
+            rules=dict(type='list', elements='dict'),
+            rules_egress=dict(type='list', elements='dict'),
+            purge_rules=dict(type='bool'),
+            purge_rules_egress=dict(type='bool'),
+            compact_rules=dict(type='bool')
+        )),
+        max_concurrency=dict(type='int', default=4)
     ))
 
-    module = AnsibleModule(argument_spec=argument_spec)
+    module = AnsibleModule(argument_spec=argument_spec, mutually_exclusive=[['name', 'groups']],
+                           required_one_of=[['name', 'groups']])
 
     if HAS_FOOTMARK is False:
         module.fail_json(msg='footmark is required for the module ali_security_group.')
 
     ecs = ecs_connect(module)
 
-    state = module.params['state']
-    security_group_id = module.params['security_group_id']
-    group_name = module.params['name']
-    if str(group_name).startswith('http://') or str(group_name).startswith('https://'):
-        module.fail_json(msg='Name can not start with http:// or https://')
-    description = module.params['description']
-    if str(description).startswith('http://') or str(description).startswith('https://'):
-        module.fail_json(msg='description can not start with http:// or https://')
     multi = module.params['multi_ok']
     recent = module.params['recent']
 
     if multi and recent:
         module.fail_json(msg='multi_ok and recent can not be True at the same time.')
 
-    changed = False
+    if module.params['groups']:
+        ensure_groups(ecs, module)
 
-    group = group_exists(ecs, module, module.params['vpc_id'], group_name, security_group_id, multi, recent)
-
-    if state == 'absent':
-        if not group:
-            module.exit_json(changed=changed, group={})
-        try:
-            module.exit_json(changed=group.delete(), group={})
-        except ECSResponseError as e:
-            module.fail_json(msg="Deleting security group {0} is failed. Error: {1}".format(group.id, e))
+    validate_group(module, module.params)
+    group = group_exists(ecs, module, module.params['vpc_id'], module.params['name'],
+                         module.params['security_group_id'], multi, recent)
 
-    if not group:
-        try:
-            params = module.params
-            params['security_group_name'] = group_name
-            params['client_token'] = "Ansible-Alicloud-%s-%s" % (hash(str(module.params)), str(time.time()))
-            group = ecs.create_security_group(**params)
-            changed = True
-        except ECSResponseError as e:
-            module.fail_json(changed=changed, msg='Creating a security group is failed. Error: {0}'.format(e))
-
-    if not description:
-        description = group.description
-    if group.modify(name=group_name, description=description):
-        changed = True
-
-    # validating rules if provided
-    ingress_rules = module.params['rules']
-    if ingress_rules:
-        direction = 'ingress'
-        for rule in ingress_rules:
-            validate_group_rule_keys(module, rule, direction)
-        if module.params['purge_rules']:
-            for existing in group.permissions:
-                if existing['direction'] != direction:
-                    continue
-                if purge_rules(module, group, existing, ingress_rules, direction):
-                    changed = True
-        for rule in ingress_rules:
-            if group.authorize(rule, direction):
-                changed = True
-
-    egress_rules = module.params['rules_egress']
-    if egress_rules:
-        direction = 'egress'
-        for rule in egress_rules:
-            validate_group_rule_keys(module, rule, direction)
-        if module.params['purge_rules_egress']:
-            for existing in group.permissions:
-                if existing['direction'] != direction:
-                    continue
-                if purge_rules(module, group, existing, egress_rules, direction):
-                    changed = True
-        for rule in egress_rules:
-            if group.authorize(rule, direction):
-                changed = True
-
-    module.exit_json(changed=changed, group=group.get().read())
+    result = dict(changed=False)
+    try:
+        ensure_group(ecs, module.params, group, result)
+    except Exception as e:
+        module.fail_json(changed=result['changed'], msg=str(e))
+    module.exit_json(**result)
 
 
 if __name__ == '__main__':
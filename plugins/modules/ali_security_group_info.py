@@ -53,6 +53,7 @@ requirements:
     - "footmark >= 1.13.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -179,6 +180,8 @@ groups:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, ecs_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project, detailed
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_paginator import paginate
 
 
 try:
@@ -198,6 +201,7 @@ def main():
         filters=dict(type='dict')
     ))
 
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -229,12 +233,12 @@ def main():
     groups = []
     ids = []
     try:
-        for sg in ecs.describe_security_groups(**filters):
+        for sg in paginate(ecs.describe_security_groups, **filters):
             if name and sg.security_group_name != name:
                 continue
             if name_prefix and not str(sg.security_group_name).startswith(name_prefix):
                 continue
-            groups.append(sg.get().read())
+            groups.append(project(detailed(sg, module.params['fields']).read(), module.params['fields']))
             ids.append(sg.id)
     except ECSResponseError as e:
         module.fail_json(msg='Error in describe_security_groups: {0}'.format(e))
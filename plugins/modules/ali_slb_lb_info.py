@@ -42,6 +42,22 @@ options:
     description:
       - A hash/dictionaries of eip tags. C({"key":"value"})
     type: dict
+  details:
+    description:
+      - The details to add to each load balancer, which take calls of their own. C(listeners) adds its listeners and
+        its default backend servers, C(vserver_groups) its VServer groups and C(health) the health of its backend
+        servers.
+      - The details of all of the load balancers are read at the same time, up to I(max_concurrency) calls, and only
+        the ones which I(fields) asks for when it is set.
+    type: list
+    elements: str
+    choices: ['listeners', 'vserver_groups', 'health']
+  max_concurrency:
+    description:
+      - The largest number of calls made at the same time, to read the chunks of I(load_balancer_ids) or the
+        I(details).
+    default: 4
+    type: int
 author:
     - "He Guimin (@xiaozhu36)"
 requirements:
@@ -49,6 +65,7 @@ requirements:
     - "footmark >= 1.16.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -63,6 +80,11 @@ EXAMPLES = '''
 
 - name: Retrieving all slbs
   alibaba.alicloud.ali_slb_lb_info:
+
+- name: Retrieving slbs with their listeners and the health of their backend servers
+  alibaba.alicloud.ali_slb_lb_info:
+    name_prefix: 'ansible-slb'
+    details: ['listeners', 'health']
 '''
 
 RETURN = '''
@@ -99,7 +121,7 @@ load_balancers:
             sample: "internet"
         backend_servers:
             description: The load balancer's backend servers
-            returned: always
+            returned: when I(details) has C(listeners)
             type: complex
             contains:
                 server_id:
@@ -142,6 +164,11 @@ load_balancers:
             returned: always
             type: str
             sample: "lb-2zea9ohgtf"
+        health:
+            description: The health of the backend servers of the load balancer, by listener.
+            returned: when I(details) has C(health)
+            type: list
+            sample: [{"server_id": "i-vqunci342", "port": 80, "listener_port": 80, "server_health_status": "normal"}]
         internet_charge_type:
             description: The load balancer internet charge type
             returned: always
@@ -149,7 +176,7 @@ load_balancers:
             sample: "PayByTraffic"
         listeners:
             description: The listeners of the load balancer.
-            returned: always
+            returned: when I(details) has C(listeners)
             type: complex
             contains:
                 listener_port:
@@ -223,6 +250,11 @@ load_balancers:
             returned: always
             type: dict
             sample: {}
+        vserver_groups:
+            description: The VServer groups of the load balancer, as returned by ali_slb_vsg_info.
+            returned: when I(details) has C(vserver_groups)
+            type: list
+            sample: [{"id": "rsp-2zehblhcv", "name": "vsg1", "backend_servers": []}]
         vpc_id:
             description: The vpc of the load balancer belongs.
             returned: always
@@ -237,6 +269,9 @@ load_balancers:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, slb_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project, field_wanted
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_paginator import paginate
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_batch import chunks, run_batches
 
 HAS_FOOTMARK = False
 
@@ -247,6 +282,29 @@ try:
 except ImportError:
     HAS_FOOTMARK = False
 
+# The most load balancer IDs one DescribeLoadBalancers call takes
+LOAD_BALANCER_IDS_MAX_SIZE = 10
+# The fields of a load balancer each of the details fills in
+DETAIL_FIELDS = {
+    'listeners': ['listeners', 'backend_servers'],
+    'vserver_groups': ['vserver_groups'],
+    'health': ['health'],
+}
+
+
+def describe_detail(slb, load_balancer_id, detail):
+    """ Return the fields one of the details fills in for a load balancer """
+    if detail == 'listeners':
+        attributes = slb.describe_load_balancer_attribute(load_balancer_id=load_balancer_id).read()
+        return dict((name, attributes.get(name) or []) for name in DETAIL_FIELDS[detail])
+    if detail == 'vserver_groups':
+        groups = slb.describe_vserver_groups(load_balancer_id=load_balancer_id)
+        return dict(vserver_groups=[group.read() for group in groups or []])
+    servers = slb.describe_backend_servers_health_status(load_balancer_id=load_balancer_id)
+    return dict(health=[dict(server_id=s.server_id, port=getattr(s, 'port', None),
+                             listener_port=getattr(s, 'listener_port', None),
+                             server_health_status=s.server_health_status) for s in servers or []])
+
 
 def main():
     argument_spec = ecs_argument_spec()
@@ -255,9 +313,12 @@ def main():
         load_balancer_ids=dict(type='list', aliases=['ids']),
         name_prefix=dict(type='str'),
         filters=dict(type='dict'),
-        tags=dict(type='dict')
+        tags=dict(type='dict'),
+        details=dict(type='list', elements='str', choices=['listeners', 'vserver_groups', 'health']),
+        max_concurrency=dict(type='int', default=4)
     ))
 
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -268,6 +329,8 @@ def main():
         lb_ids = []
     name_prefix = module.params['name_prefix']
     filters = module.params['filters']
+    fields = module.params['fields']
+    max_concurrency = module.params['max_concurrency']
 
     if not filters:
         filters = {}
@@ -292,27 +355,34 @@ def main():
     try:
         slb = slb_connect(module)
         if len(lb_ids) > 0:
-            for index in range(0, len(lb_ids), 10):
-                ids_tmp = lb_ids[index:index + 10]
-                if not ids_tmp:
-                    break
-                filters['load_balancer_id'] = ",".join(ids_tmp)
-
-                for lb in slb.describe_load_balancers(**filters):
-                    if name_prefix and not str(lb.load_balancer_name).startswith(name_prefix):
-                        continue
-                    lbs.append(lb.read())
-                    ids.append(lb.load_balancer_id)
-                    names.append(lb.load_balancer_name)
+            # The chunks of IDs are read at the same time, and their load balancers kept in the order of the chunks
+            requests = [dict(filters, load_balancer_id=",".join(ids_tmp))
+                        for ids_tmp in chunks(lb_ids, LOAD_BALANCER_IDS_MAX_SIZE)]
+            pages, errors = run_batches(lambda request: slb.describe_load_balancers(**request), requests, max_concurrency)
+            if errors:
+                raise errors[0]
+            found = [lb for page in pages for lb in page]
         else:
-            for lb in slb.describe_load_balancers(**filters):
-                if name_prefix and not str(lb.load_balancer_name).startswith(name_prefix):
-                    continue
-                lbs.append(lb.read())
-                ids.append(lb.load_balancer_id)
-                names.append(lb.load_balancer_name)
+            found = paginate(slb.describe_load_balancers, **filters)
+
+        for lb in found:
+            if name_prefix and not str(lb.load_balancer_name).startswith(name_prefix):
+                continue
+            lbs.append(lb.read())
+            ids.append(lb.load_balancer_id)
+            names.append(lb.load_balancer_name)
+
+        # The details of every load balancer are read together, rather than one load balancer after another
+        details = [d for d in module.params['details'] or [] if field_wanted(fields, *DETAIL_FIELDS[d])]
+        batches = [(lb, detail) for lb in lbs for detail in details]
+        results, errors = run_batches(lambda batch: describe_detail(slb, batch[0]['load_balancer_id'], batch[1]),
+                                      batches, max_concurrency)
+        if errors:
+            raise errors[0]
+        for (lb, detail), result in zip(batches, results):
+            lb.update(result)
 
-        module.exit_json(changed=False, load_balancers=lbs, ids=ids, names=names)
+        module.exit_json(changed=False, load_balancers=[project(lb, fields) for lb in lbs], ids=ids, names=names)
     except Exception as e:
         module.fail_json(msg="Unable to describe server load balancers, and got an error: {0}.".format(e))
 
@@ -19,8 +19,7 @@ description:
 options:
   state:
     description:
-      - The state of the load balancer listener after operating.
-    required: true
+      - The state of the load balancer listener after operating. Required with I(listener_port).
     choices: [ 'present', 'absent', 'running', 'stopped']
     type: str
   load_balancer_id:
@@ -38,7 +37,7 @@ options:
   listener_port:
     description:
       - Port used by the Server Load Balancer instance frontend, Value(1-65535).
-    required: true
+      - One of I(listener_port) and I(listeners) is required.
     type: int
     aliases: ['frontend_port']
   bandwidth:
@@ -148,6 +147,122 @@ options:
     description:
       - Server certificate ID
     type: str
+  listeners:
+    description:
+      - A list of listeners of the load balancer to manage in one task, instead of the one listener of I(listener_port).
+        The listeners are read at the start of the task, only the ones whose attributes differ are set, and up to
+        I(max_concurrency) listeners are created, changed, started, stopped or deleted at the same time.
+      - Each listener takes the options below, and the ones it leaves out default to the options of the module of the
+        same name.
+    type: list
+    elements: dict
+    suboptions:
+      listener_port:
+        description:
+          - Port used by the Server Load Balancer instance frontend, Value(1-65535).
+        required: True
+        type: int
+      state:
+        description:
+          - The state of the listener, see I(state). Default to I(state), or C(present) without it.
+        choices: ['present', 'absent', 'running', 'stopped']
+        type: str
+      protocol:
+        description:
+          - The protocol of the listener, see I(protocol).
+        choices: ['http', 'https', 'tcp', 'udp']
+        type: str
+      backend_server_port:
+        description:
+          - See I(backend_server_port).
+        type: int
+      bandwidth:
+        description:
+          - See I(bandwidth).
+        type: int
+      scheduler:
+        description:
+          - See I(scheduler).
+        choices: ['wlc', 'wrr']
+        type: str
+      sticky_session:
+        description:
+          - See I(sticky_session).
+        choices: ['on', 'off']
+        type: str
+      sticky_session_type:
+        description:
+          - See I(sticky_session_type).
+        choices: ['server', 'insert']
+        type: str
+      cookie_timeout:
+        description:
+          - See I(cookie_timeout).
+        type: str
+      cookie:
+        description:
+          - See I(cookie).
+        type: str
+      persistence_timeout:
+        description:
+          - See I(persistence_timeout).
+        type: int
+      health_check:
+        description:
+          - See I(health_check).
+        choices: ['on', 'off']
+        type: str
+      health_check_type:
+        description:
+          - See I(health_check_type).
+        choices: ['tcp', 'http']
+        type: str
+      health_check_domain:
+        description:
+          - See I(health_check_domain).
+        type: str
+      health_check_uri:
+        description:
+          - See I(health_check_uri).
+        type: str
+      health_check_connect_port:
+        description:
+          - See I(health_check_connect_port).
+        type: int
+      healthy_threshold:
+        description:
+          - See I(healthy_threshold).
+        type: int
+      unhealthy_threshold:
+        description:
+          - See I(unhealthy_threshold).
+        type: int
+      health_check_timeout:
+        description:
+          - See I(health_check_timeout).
+        type: int
+      health_check_interval:
+        description:
+          - See I(health_check_interval).
+        type: int
+      health_check_http_code:
+        description:
+          - See I(health_check_http_code).
+        choices: ['http_2xx','http_3xx', 'http_4xx', 'http_5xx']
+        type: str
+      vserver_group_id:
+        description:
+          - See I(vserver_group_id).
+        type: str
+      server_certificate_id:
+        description:
+          - See I(server_certificate_id).
+        type: str
+  max_concurrency:
+    description:
+      - The largest number of listeners of I(listeners) read or changed at the same time.
+    default: 4
+    type: int
 requirements:
     - "python >= 3.6"
     - "footmark >= 1.15.0"
@@ -202,12 +317,27 @@ EXAMPLES = """
     load_balancer_id: '{{ load_balancer_id }}'
     listener_port: '{{ listener_port }}'
     state: absent
+
+# Manage many listeners of a load balancer in one task
+- name: create, change and delete listeners
+  alibaba.alicloud.ali_slb_listener:
+    load_balancer_id: '{{ load_balancer_id }}'
+    protocol: tcp
+    bandwidth: 10
+    listeners:
+      - listener_port: 80
+        backend_server_port: 8080
+        protocol: http
+      - listener_port: 3306
+        backend_server_port: 3306
+      - listener_port: 8443
+        state: absent
 """
 RETURN = '''
 listener:
     description:
         - The info of load balancer listener
-    returned: when success
+    returned: when I(listener_port) is given
     type: dict
     sample: {
         "backend_server_port": 80,
@@ -218,10 +348,23 @@ listener:
         "status": "running",
         "sticky_session": "off",
     }
+listeners:
+    description:
+        - The info of each listener of I(listeners), in the same order, as in I(listener).
+    returned: when I(listeners) is given
+    type: list
+    sample: [{
+        "backend_server_port": 8080,
+        "bandwidth": 10,
+        "listener_port": 80,
+        "schedule": null,
+        "status": "running"
+    }]
 '''
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, slb_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_batch import run_batches
 
 
 HAS_ECS = False
@@ -233,6 +376,34 @@ try:
 except ImportError:
     HAS_FOOTMARK = False
 
+# The attributes of a listener which are compared with the ones it has to find out whether to set them
+LISTENER_ATTRIBUTES = ['bandwidth', 'scheduler', 'sticky_session', 'sticky_session_type', 'cookie_timeout', 'cookie',
+                       'persistence_timeout', 'health_check', 'health_check_type', 'health_check_domain',
+                       'health_check_uri', 'health_check_connect_port', 'healthy_threshold', 'unhealthy_threshold',
+                       'health_check_timeout', 'health_check_interval', 'health_check_http_code', 'vserver_group_id',
+                       'server_certificate_id']
+# The options a listener of listeners defaults to the module options of the same name for
+LISTENER_DEFAULT_OPTIONS = ['state', 'protocol', 'backend_server_port'] + LISTENER_ATTRIBUTES
+# The attributes a listener of each protocol has
+LISTENER_PROTOCOL_ATTRIBUTES = {
+    'http': ['bandwidth', 'scheduler', 'vserver_group_id', 'sticky_session', 'health_check'],
+    'tcp': ['bandwidth', 'scheduler', 'vserver_group_id', 'persistence_timeout', 'health_check_type',
+            'health_check_connect_port', 'healthy_threshold', 'unhealthy_threshold', 'health_check_interval'],
+    'udp': ['bandwidth', 'scheduler', 'vserver_group_id', 'persistence_timeout', 'health_check_connect_port',
+            'healthy_threshold', 'unhealthy_threshold', 'health_check_interval'],
+}
+LISTENER_PROTOCOL_ATTRIBUTES['https'] = LISTENER_PROTOCOL_ATTRIBUTES['http'] + ['server_certificate_id']
+# The attributes a listener only has while another of its attributes has a value, by that attribute and value
+LISTENER_DEPENDENT_ATTRIBUTES = {
+    ('sticky_session', 'on'): ['sticky_session_type'],
+    ('sticky_session_type', 'insert'): ['cookie_timeout'],
+    ('sticky_session_type', 'server'): ['cookie'],
+    ('health_check', 'on'): ['health_check_domain', 'health_check_uri', 'health_check_connect_port', 'healthy_threshold',
+                             'unhealthy_threshold', 'health_check_timeout', 'health_check_interval',
+                             'health_check_http_code'],
+    ('health_check_type', 'http'): ['health_check_domain', 'health_check_uri', 'health_check_http_code'],
+}
+
 
 def get_info(obj):
     """
@@ -255,11 +426,77 @@ def get_info(obj):
     return result
 
 
+def get_created_info(listener):
+    """ Return the info of a listener which has just been created, as get_info does, without reading it again """
+    return dict(listener_port=listener['listener_port'],
+                backend_server_port=listener['backend_server_port'],
+                bandwidth=listener['bandwidth'],
+                status='running',
+                schedule=None,
+                server_certificate_id=listener['server_certificate_id'],
+                sticky_session=listener['sticky_session'],
+                persistence_timeout=listener['persistence_timeout'])
+
+
+def protocol_attributes(listener):
+    """ Return the attributes a listener of its protocol has with the values it is given """
+    attributes = list(LISTENER_PROTOCOL_ATTRIBUTES[listener['protocol']])
+    # The attributes which depend on others are looked at in turn, they can have dependent attributes of their own
+    for attribute in attributes:
+        attributes.extend(a for a in LISTENER_DEPENDENT_ATTRIBUTES.get((attribute, listener[attribute]), [])
+                          if a not in attributes)
+    return attributes
+
+
+def changed_attributes(current, listener):
+    """ Return the attributes of a listener which differ from the ones of the existing one. footmark does not send
+    empty attributes, so they are not compared, and an attribute the existing listener does not have differs """
+    return [a for a in protocol_attributes(listener) if listener[a] and
+            str(getattr(current, a, None)) != str(listener[a])]
+
+
+def ensure_listener(slb, load_balancer_id, listener, current):
+    """ Bring a listener to its state and return whether it changed, with its info """
+    attributes = dict((a, listener[a]) for a in LISTENER_ATTRIBUTES)
+    state = listener['state']
+    if not current:
+        if state == 'absent':
+            return False, dict(listener_port=listener['listener_port'])
+        attributes.pop('health_check_type')
+        changed = slb.create_load_balancer_listener(load_balancer_id=load_balancer_id,
+                                                    listener_port=listener['listener_port'],
+                                                    backend_server_port=listener['backend_server_port'],
+                                                    protocol=listener['protocol'],
+                                                    **attributes)
+        return changed, get_created_info(listener)
+
+    changed = False
+    if state == "present":
+        if changed_attributes(current, listener):
+            # A VServer group id only takes effect along with VServerGroup on
+            changed = current.set_attribute(load_balancer_id=load_balancer_id, protocol=listener['protocol'],
+                                            vserver_group='on' if listener['vserver_group_id'] else '', **attributes)
+            for key, value in attributes.items():
+                if value is not None:
+                    setattr(current, key, value)
+    elif state == "absent":
+        changed = current.delete(load_balancer_id)
+    elif state == "running":
+        if current.status == "stopped":
+            changed = current.start(load_balancer_id)
+            current.status = "running"
+    elif state == "stopped":
+        if current.status == "running":
+            changed = current.stop(load_balancer_id)
+            current.status = "stopped"
+    return changed, get_info(current)
+
+
 def main():
     argument_spec = ecs_argument_spec()
     argument_spec.update(dict(
-        listener_port=dict(type='int', required=True, aliases=['frontend_port']),
-        state=dict(type='str', required=True, choices=['present', 'absent', 'stopped', 'running']),
+        listener_port=dict(type='int', aliases=['frontend_port']),
+        state=dict(type='str', choices=['present', 'absent', 'stopped', 'running']),
         load_balancer_id=dict(type='str', required=True, aliases=['id']),
         backend_server_port=dict(type='int', aliases=['backend_port']),
         bandwidth=dict(type='int'),
@@ -282,105 +519,101 @@ def main():
         persistence_timeout=dict(type='int', default=0),
         server_certificate_id=dict(type='str'),
         health_check_type=dict(type='str', default='tcp', choices=['tcp', 'http']),
+        listeners=dict(type='list', elements='dict', options=dict(
+            listener_port=dict(type='int', required=True),
+            state=dict(type='str', choices=['present', 'absent', 'stopped', 'running']),
+            protocol=dict(type='str', choices=['http', 'https', 'tcp', 'udp']),
+            backend_server_port=dict(type='int'),
+            bandwidth=dict(type='int'),
+            scheduler=dict(type='str', choices=['wrr', 'wlc']),
+            sticky_session=dict(type='str', choices=['on', 'off']),
+            sticky_session_type=dict(type='str', choices=['insert', 'server']),
+            cookie_timeout=dict(type='str'),
+            cookie=dict(type='str'),
+            persistence_timeout=dict(type='int'),
+            health_check=dict(type='str', choices=['on', 'off']),
+            health_check_type=dict(type='str', choices=['tcp', 'http']),
+            health_check_domain=dict(type='str'),
+            health_check_uri=dict(type='str'),
+            health_check_connect_port=dict(type='int'),
+            healthy_threshold=dict(type='int'),
+            unhealthy_threshold=dict(type='int'),
+            health_check_timeout=dict(type='int'),
+            health_check_interval=dict(type='int'),
+            health_check_http_code=dict(type='str', choices=['http_2xx', 'http_3xx', 'http_4xx', 'http_5xx']),
+            vserver_group_id=dict(type='str'),
+            server_certificate_id=dict(type='str')
+        )),
+        max_concurrency=dict(type='int', default=4)
     ))
 
-    module = AnsibleModule(argument_spec=argument_spec)
+    module = AnsibleModule(argument_spec=argument_spec,
+                           mutually_exclusive=[['listener_port', 'listeners']],
+                           required_one_of=[['listener_port', 'listeners']],
+                           required_by={'listener_port': 'state'})
 
     if HAS_FOOTMARK is False:
         module.fail_json(msg='footmark required for the module ali_slb_listener.')
 
     slb = slb_connect(module)
-    state = module.params['state']
     load_balancer_id = module.params['load_balancer_id']
-    listener_port = module.params['listener_port']
-    backend_server_port = module.params['backend_server_port']
-    bandwidth = module.params['bandwidth']
-    sticky_session = module.params['sticky_session']
-    protocol = module.params['protocol']
-    health_check = module.params['health_check']
-    scheduler = module.params['scheduler']
-    sticky_session_type = module.params['sticky_session_type']
-    cookie_timeout = module.params['cookie_timeout']
-    cookie = module.params['cookie']
-    health_check_domain = module.params['health_check_domain']
-    health_check_uri = module.params['health_check_uri']
-    health_check_connect_port = module.params['health_check_connect_port']
-    healthy_threshold = module.params['healthy_threshold']
-    unhealthy_threshold = module.params['unhealthy_threshold']
-    health_check_timeout = module.params['health_check_timeout']
-    health_check_interval = module.params['health_check_interval']
-    health_check_http_code = module.params['health_check_http_code']
-    vserver_group_id = module.params['vserver_group_id']
-    server_certificate_id = module.params['server_certificate_id']
-    persistence_timeout = module.params['persistence_timeout']
-    health_check_type = module.params['health_check_type']
-
-    current_listener = slb.describe_load_balancer_listener_attribute(load_balancer_id, listener_port, protocol)
-    changed = False
-    if state == "present":
-        if current_listener:
-            changed = current_listener.set_attribute(load_balancer_id=load_balancer_id,
-                                                     bandwidth=bandwidth,
-                                                     sticky_session=sticky_session,
-                                                     protocol=protocol,
-                                                     health_check=health_check,
-                                                     scheduler=scheduler,
-                                                     sticky_session_type=sticky_session_type,
-                                                     cookie_timeout=cookie_timeout,
-                                                     cookie=cookie,
-                                                     health_check_domain=health_check_domain,
-                                                     health_check_uri=health_check_uri,
-                                                     health_check_connect_port=health_check_connect_port,
-                                                     healthy_threshold=healthy_threshold,
-                                                     unhealthy_threshold=unhealthy_threshold,
-                                                     health_check_timeout=health_check_timeout,
-                                                     health_check_interval=health_check_interval,
-                                                     health_check_http_code=health_check_http_code,
-                                                     vserver_group_id=vserver_group_id,
-                                                     server_certificate_id=server_certificate_id,
-                                                     persistence_timeout=persistence_timeout,
-                                                     health_check_type=health_check_type)
-            module.exit_json(changed=changed, listener=get_info(current_listener.describe_attribute(load_balancer_id, protocol)))
-        else:
-            changed = slb.create_load_balancer_listener(load_balancer_id=load_balancer_id,
-                                                        listener_port=listener_port,
-                                                        backend_server_port=backend_server_port,
-                                                        bandwidth=bandwidth,
-                                                        sticky_session=sticky_session,
-                                                        protocol=protocol,
-                                                        health_check=health_check,
-                                                        scheduler=scheduler,
-                                                        sticky_session_type=sticky_session_type,
-                                                        cookie_timeout=cookie_timeout,
-                                                        cookie=cookie,
-                                                        health_check_domain=health_check_domain,
-                                                        health_check_uri=health_check_uri,
-                                                        health_check_connect_port=health_check_connect_port,
-                                                        healthy_threshold=healthy_threshold,
-                                                        unhealthy_threshold=unhealthy_threshold,
-                                                        health_check_timeout=health_check_timeout,
-                                                        health_check_interval=health_check_interval,
-                                                        health_check_http_code=health_check_http_code,
-                                                        vserver_group_id=vserver_group_id,
-                                                        server_certificate_id=server_certificate_id,
-                                                        persistence_timeout=persistence_timeout)
-            new_current_listener = slb.describe_load_balancer_listener_attribute(load_balancer_id, listener_port, protocol)
-            module.exit_json(changed=changed, listener=get_info(new_current_listener))
-    if not current_listener:
-        module.fail_json(msg="The specified load balancer listener is not exist. Please check your load_balancer_id or listener_port and try again.")
-    if state == "absent":
-        changed = current_listener.delete(load_balancer_id)
-        module.exit_json(changed=changed, listener=get_info(current_listener))
-    if state == "running":
-        if current_listener.status == "stopped":
-            # start
-            changed = current_listener.start(load_balancer_id)
-        module.exit_json(changed=changed, listener=get_info(current_listener.describe_attribute(load_balancer_id, protocol)))
-    if state == "stopped":
-        if current_listener.status == "running":
-            # stop
-            changed = current_listener.stop(load_balancer_id)
-        module.exit_json(changed=changed, listener=get_info(current_listener.describe_attribute(load_balancer_id, protocol)))
+    max_concurrency = module.params['max_concurrency']
+
+    listeners = []
+    for listener in module.params['listeners'] or [dict(listener_port=module.params['listener_port'])]:
+        listener = dict(listener)
+        for option in LISTENER_DEFAULT_OPTIONS:
+            if listener.get(option) is None:
+                listener[option] = module.params[option]
+        listener['state'] = listener['state'] or 'present'
+        listeners.append(listener)
+    ports = [listener['listener_port'] for listener in listeners]
+    if len(set(ports)) != len(ports):
+        module.fail_json(msg='The listener ports {0} are given more than once.'.format(
+            sorted(set(p for p in ports if ports.count(p) > 1))))
+
+    # The protocols of the listeners the load balancer has tell which of them exist and how to describe them
+    try:
+        load_balancer = slb.describe_load_balancer_attribute(load_balancer_id=load_balancer_id)
+    except Exception as e:
+        module.fail_json(msg='Unable to describe the load balancer {0}, error: {1}'.format(load_balancer_id, e))
+    if not load_balancer:
+        module.fail_json(msg='The specified load balancer {0} is not exist.'.format(load_balancer_id))
+    protocols = {}
+    for pp in (load_balancer.listener_ports_and_protocol or {}).get('listener_port_and_protocol') or []:
+        protocols[int(pp.get('listener_port'))] = pp.get('listener_protocol')
+
+    for listener in listeners:
+        port = listener['listener_port']
+        if port in protocols:
+            if listener['protocol'] and listener['protocol'] != protocols[port]:
+                module.fail_json(msg='The listener {0} is a {1} listener, it can not be changed to {2}.'.format(
+                    port, protocols[port], listener['protocol']))
+            listener['protocol'] = protocols[port]
+        elif listener['state'] in ('running', 'stopped'):
+            module.fail_json(msg="The specified load balancer listener is not exist. Please check your load_balancer_id "
+                                 "or listener_port {0} and try again.".format(port))
+        elif listener['state'] == 'present' and not listener['protocol']:
+            module.fail_json(msg='The protocol of the listener {0} is required to create it.'.format(port))
+
+    existing = [listener for listener in listeners if listener['listener_port'] in protocols]
+    currents, errors = run_batches(lambda listener: slb.describe_load_balancer_listener_attribute(
+        load_balancer_id, listener['listener_port'], listener['protocol']), existing, max_concurrency)
+    if errors:
+        module.fail_json(msg='Unable to describe the listeners, error: {0}'.format('; '.join(str(e) for e in errors)))
+    currents = dict((listener['listener_port'], current) for listener, current in zip(existing, currents))
+
+    results, errors = run_batches(lambda listener: ensure_listener(slb, load_balancer_id, listener,
+                                                                   currents.get(listener['listener_port'])),
+                                  listeners, max_concurrency)
+    changed = any(result[0] for result in results)
+    if errors:
+        module.fail_json(changed=changed, msg='Unable to operate the listeners, error: {0}'.format(
+            '; '.join(str(e) for e in errors)))
+
+    if module.params['listeners']:
+        module.exit_json(changed=changed, listeners=[result[1] for result in results])
+    module.exit_json(changed=changed, listener=results[0][1])
 
 
 if __name__ == "__main__":
@@ -43,6 +43,7 @@ requirements:
     - "footmark >= 1.15.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 """
 
 EXAMPLES = """
@@ -74,6 +75,7 @@ listener:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, slb_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project
 
 HAS_ECS = False
 HAS_FOOTMARK = False
@@ -114,6 +116,7 @@ def main():
         load_balancer_id=dict(type='str', required=True, aliases=['lb_id']),
         listener_type=dict(type='str', required=True, choices=['http', 'https', 'tcp', 'udp'])
     ))
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -137,7 +140,7 @@ def main():
             if listener is None:
                 module.fail_json(msg="Unable to describe slb listeners, no listeners found")
             else:
-                module.exit_json(changed=False, listener=get_info(listener))
+                module.exit_json(changed=False, listener=project(get_info(listener), module.params['fields']))
         else:
             module.fail_json(msg="Unable to describe slb listeners, invalid load balancer id")
     except Exception as e:
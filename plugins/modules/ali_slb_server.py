@@ -56,6 +56,12 @@ options:
           - The type of backend server in the load balancer.
         choices: ['ecs', 'eni']
         default: 'ecs'
+  max_concurrency:
+    description:
+      - The largest number of calls adding, setting or removing backend servers made at the same time. Each call
+        takes up to 20 servers, so that any number of servers can be given.
+    default: 4
+    type: int
 requirements:
     - "python >= 3.6"
     - "footmark >= 1.19.0"
@@ -122,23 +128,27 @@ load_balancer_id:
     type: str
     sample: "lb-2zeyfm5a14c9ffxvxmvco"
 "backend_servers":
-    description: Details about the backened-servers that were added.
+    description: The backend servers of the load balancer afterwards, with their weights.
     returned: when success
     type: list
     sample: [
         {
-            "health_status": "abnormal",
-            "id": "i-2zeau2evvbnwufq0fa7q"
+            "id": "i-2zeau2evvbnwufq0fa7q",
+            "weight": 100
         },
         {
-            "health_status": "abnormal",
-            "id": "i-2zehasnejqr6g6agys5a"
+            "id": "i-2zehasnejqr6g6agys5a",
+            "weight": 50
         }
     ]
 '''
 
+import json
+from collections import OrderedDict
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, slb_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_batch import call_when_free, chunks, run_batches
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_slb import BACKEND_SERVERS_MAX_SIZE
 
 try:
     from footmark.exception import SLBResponseError
@@ -179,91 +189,97 @@ def get_backen_server_status(server):
     return {'id': server.id, 'health_status': server.status}
 
 
+def describe_backend_servers(module, slb, load_balancer_id):
+    """
+    Return the backend servers of an slb by their IDs, in the form the module returns them, with the types of the
+    servers by their IDs
+    """
+    try:
+        load_balancer_info = slb.describe_load_balancer_attribute(load_balancer_id=load_balancer_id)
+    except SLBResponseError as ex:
+        module.fail_json(msg='Unable to describe the backend servers, error: {0}'.format(ex))
+
+    # Verifying if server load balancer Object is present
+    if not load_balancer_info:
+        module.fail_json(msg="Could not find provided load balancer instance")
+
+    servers = load_balancer_info.backend_servers['backend_server']
+    return (OrderedDict((s['server_id'], {'id': s['server_id'], 'weight': int(s['weight'])}) for s in servers),
+            dict((s['server_id'], s.get('type') or 'ecs') for s in servers))
+
+
+def send_backend_servers(slb, action, load_balancer_id, backend_servers):
+    """ Make an AddBackendServers or SetBackendServers call. footmark leaves the types of the servers out of these
+    calls, so the request is built here. """
+    servers = [dict(ServerId=s['server_id'], Weight=str(s['weight']), Type=s.get('type') or 'ecs')
+               for s in backend_servers]
+    params = dict(Action=action, load_balancer_id=load_balancer_id, backend_servers=json.dumps(servers))
+    return slb.get_status_new(slb.build_request_params(params))
+
+
 def add_set_backend_servers(module, slb, load_balancer_id, backend_servers):
     """
-    Add and/or Set backend servers to an slb
+    Add and/or Set backend servers to an slb. The servers are told apart by their IDs, only the servers which are
+    missing are added and only the ones whose weight or type differs are set, up to BACKEND_SERVERS_MAX_SIZE servers a
+    call.
 
     :param module: Ansible module object
     :param slb: authenticated slb connection object
     :param load_balancer_id: load balancer id to add/set backend servers to
     :param backend_servers: backend severs information to add/set
-    :return: returns changed state, current added backend servers and custom message.
+    :return: returns changed state and the backend servers of the load balancer afterwards.
     """
 
-    changed = False
-    server_id_param = 'server_id'
-    backend_servers_to_set = []
-    backend_servers_to_add = []
-    result = []
-    current_backend_servers = []
-    changed_after_add = False
-    changed_after_set = False
+    current_backend_servers, types = describe_backend_servers(module, slb, load_balancer_id)
+    wanted = OrderedDict((s['server_id'], s) for s in backend_servers)
+    backend_servers_to_add = [s for server_id, s in wanted.items() if server_id not in current_backend_servers]
+    backend_servers_to_set = [s for server_id, s in wanted.items() if server_id in current_backend_servers and
+                              (int(s['weight']) != current_backend_servers[server_id]['weight'] or
+                               (s.get('type') or 'ecs') != types[server_id])]
 
-    try:
-
-        load_balancer_info = slb.describe_load_balancer_attribute(load_balancer_id=load_balancer_id)
-
-        # Verifying if server load balancer Object is present
-        if load_balancer_info:
-            existing_backend_servers = str(load_balancer_info.backend_servers['backend_server'])
-
-            # Segregating existing backend servers from new backend servers from the provided backend servers
-            for backend_server in backend_servers:
-
-                backend_server_string = backend_server[server_id_param] + '\''
-                if backend_server_string in existing_backend_servers:
-                    backend_servers_to_set.append(backend_server)
-                else:
-                    backend_servers_to_add.append(backend_server)
-
-                    # Adding new backend servers if provided
-            if len(backend_servers_to_add) > 0:
-                current_backend_servers.extend(slb.add_backend_servers(load_balancer_id=load_balancer_id, backend_servers=backend_servers_to_add))
-                changed = True
-                # Setting exisiting backend servers if provided
-            if len(backend_servers_to_set) > 0:
-                backen_servers = slb.set_backend_servers(load_balancer_id=load_balancer_id, backend_servers=backend_servers_to_set)
-                changed = True
-                # If backend server result after set action is available then clearing actual list
-                # and adding new result to it.
-                if len(backen_servers) > 0:
-                    # Below operation clears list using slice operation
-                    current_backend_servers[:] = []
-                    current_backend_servers.extend(backen_servers)
-
-            if changed_after_add or changed_after_set:
-                changed = True
-
-        else:
-            module.fail_json(msg="Could not find provided load balancer instance")
+    batches = [('AddBackendServers', batch) for batch in chunks(backend_servers_to_add, BACKEND_SERVERS_MAX_SIZE)]
+    batches += [('SetBackendServers', batch) for batch in chunks(backend_servers_to_set, BACKEND_SERVERS_MAX_SIZE)]
+    results, errors = run_batches(lambda b: call_when_free(send_backend_servers, slb=slb, action=b[0],
+                                                           load_balancer_id=load_balancer_id, backend_servers=b[1]),
+                                  batches, module.params['max_concurrency'])
+    if errors:
+        module.fail_json(changed=bool(results), msg='Unable to add backend servers, error: {0}'.format(
+            '; '.join(str(e) for e in errors)))
 
-    except SLBResponseError as ex:
-        module.fail_json(msg='Unable to add backend servers, error: {0}'.format(ex))
-
-    return changed, current_backend_servers
+    # The servers of the load balancer afterwards are known without describing it again
+    for server in backend_servers_to_add + backend_servers_to_set:
+        current_backend_servers[server['server_id']] = {'id': server['server_id'], 'weight': int(server['weight'])}
+    return bool(batches), list(current_backend_servers.values())
 
 
 def remove_backend_servers(module, slb, load_balancer_id, backend_servers):
     """
-    Remove backend servers from an slb
+    Remove backend servers from an slb, up to BACKEND_SERVERS_MAX_SIZE servers a call. Only the servers the slb has
+    are removed.
 
     :param module: Ansible module object
     :param slb: authenticated slb connection object
     :param load_balancer_id: load balancer id to remove backend servers from
     :param backend_servers: list of backend server ids to remove from slb
-    :return: returns changed state, current added backend servers and custom message.
+    :return: returns changed state and the backend servers left in the load balancer.
     """
 
-    changed = False
-
-    try:
-        backend_servers = slb.remove_backend_servers(load_balancer_id=load_balancer_id, backend_server_ids=backend_servers)
-        changed = True
+    current_backend_servers = describe_backend_servers(module, slb, load_balancer_id)[0]
+    backend_servers_to_remove = [server_id for server_id in OrderedDict.fromkeys(backend_servers)
+                                 if server_id in current_backend_servers]
 
-    except SLBResponseError as ex:
-        module.fail_json(msg='Unable to remove backend servers, error: {0}'.format(ex))
+    results, errors = run_batches(lambda batch: call_when_free(slb.remove_backend_servers,
+                                                               load_balancer_id=load_balancer_id,
+                                                               backend_server_ids=batch),
+                                  chunks(backend_servers_to_remove, BACKEND_SERVERS_MAX_SIZE),
+                                  module.params['max_concurrency'])
+    if errors:
+        module.fail_json(changed=bool(results), msg='Unable to remove backend servers, error: {0}'.format(
+            '; '.join(str(e) for e in errors)))
 
-    return changed, backend_servers
+    for server_id in backend_servers_to_remove:
+        current_backend_servers.pop(server_id)
+    return bool(backend_servers_to_remove), list(current_backend_servers.values())
 
 
 def describe_backend_servers_health_status(module, slb, load_balancer_id=None, listener_ports=None):
@@ -323,6 +339,8 @@ def validate_backend_server_info(module, backend_servers, default_weight):
                     module.fail_json(msg="'weight': field value is invalid. Expect to [0-100].")
             except Exception as e:
                 module.fail_json(msg="'weight': field value is invalid. Expect to positive integer [0-100].")
+        else:
+            backend_server['weight'] = default_weight
 
 
 def get_verify_listener_ports(module, listener_ports=None):
@@ -354,6 +372,7 @@ def main():
         state=dict(choices=['present', 'absent'], default='present', type='str'),
         backend_servers=dict(required=True, type='list', elements='dict', aliases=['servers']),
         load_balancer_id=dict(required=True, aliases=['lb_id'], type='str'),
+        max_concurrency=dict(type='int', default=4),
     ))
 
     module = AnsibleModule(argument_spec=argument_spec)
@@ -374,10 +393,7 @@ def main():
             validate_backend_server_info(module, backend_servers, 100)
             changed, current_backend_servers = add_set_backend_servers(module, slb, load_balancer_id, backend_servers)
 
-            result_servers = []
-            for server in current_backend_servers:
-                result_servers.append(get_backen_server_weight(server))
-            module.exit_json(changed=changed, backend_servers=result_servers, load_balancer_id=load_balancer_id)
+            module.exit_json(changed=changed, backend_servers=current_backend_servers, load_balancer_id=load_balancer_id)
         else:
             module.fail_json(msg='backend servers information is mandatory to state=present')
 
@@ -386,11 +402,9 @@ def main():
         if not isinstance(backend_servers, list):
             module.fail_json(msg='Invalid backend_server parameter type [%s] for state=absent.' % type(backend_servers))
 
-        changed, backend_servers = remove_backend_servers(module, slb, load_balancer_id, backend_servers)
-        result_servers = []
-        for server in backend_servers:
-            result_servers.append(get_backen_server_weight(server))
-        module.exit_json(changed=changed, backend_servers=result_servers, load_balancer_id=load_balancer_id)
+        server_ids = [server['server_id'] for server in backend_servers]
+        changed, current_backend_servers = remove_backend_servers(module, slb, load_balancer_id, server_ids)
+        module.exit_json(changed=changed, backend_servers=current_backend_servers, load_balancer_id=load_balancer_id)
     else:
         module.fail_json(msg='backend server ID(s) information is mandatory to state=absent')
 
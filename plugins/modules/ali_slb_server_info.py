@@ -17,19 +17,50 @@ short_description: Gather facts on backend server of Alibaba Cloud SLB.
 description:
      - This module fetches data from the Open API in Alicloud.
        The module must be called from within the SLB backend server itself.
+     - The health status of every load balancer and listener port is queried at the same time, up to
+       I(max_concurrency) queries at once.
 options:
     load_balancer_id:
       description:
         - ID of server load balancer.
-      required: true
+        - One of I(load_balancer_id) and I(load_balancer_ids) is required.
       aliases: ["lb_id" ]
       type: str
+    load_balancer_ids:
+      description:
+        - IDs of server load balancers, whose backend servers are gathered together.
+        - One of I(load_balancer_id) and I(load_balancer_ids) is required.
+      aliases: ["lb_ids"]
+      type: list
+      elements: str
     listener_ports:
       description:
         - A list of backend server listening ports.
       aliases: ["ports"]
       type: list
       elements: int
+    wait_for_healthy:
+      description:
+        - Wait until at least this share, from 0 to 1, of the backend servers of each load balancer is healthy, e.g.
+          C(1) for all of them. A backend server whose listener has health checks off counts as healthy.
+        - A load balancer which reports no backend servers, e.g. because it has no listeners yet, is not healthy.
+        - Only the load balancers which are still short of it are queried again, every I(wait_delay) seconds.
+      type: float
+    wait_delay:
+      description:
+        - How long to wait between two queries of the load balancers which are not healthy yet, in seconds.
+      default: 5
+      type: int
+    wait_timeout:
+      description:
+        - How long before the wait for I(wait_for_healthy) gives up, in seconds.
+      default: 300
+      type: int
+    max_concurrency:
+      description:
+        - The largest number of health status queries made at the same time.
+      default: 8
+      type: int
 author:
     - "He Guimin (@xiaozhu36)"
 requirements:
@@ -37,6 +68,7 @@ requirements:
     - "footmark >= 1.15.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 """
 
 EXAMPLES = '''
@@ -50,14 +82,43 @@ EXAMPLES = '''
   alibaba.alicloud.ali_slb_server_info:
     load_balancer_id: '{{ load_balancer_id }}'
     listener_ports: '{{ ports }}'
+
+- name: Wait for the backend servers of all of the load balancers of a deployment to be healthy
+  alibaba.alicloud.ali_slb_server_info:
+    load_balancer_ids: '{{ load_balancer_ids }}'
+    wait_for_healthy: 1
+    wait_timeout: 600
 '''
 
 RETURN = '''
 load_balancer_id:
     description: ID of the load balancer.
-    returned: when success
+    returned: when I(load_balancer_id) is given
     type: str
     sample: "lb-dj1jywbux1zslfna6pvnv"
+load_balancers:
+    description: The health of the backend servers of each load balancer.
+    returned: when success
+    type: list
+    sample: [
+        {
+            "load_balancer_id": "lb-dj1jywbux1zslfna6pvnv",
+            "total": 3,
+            "healthy": 2,
+            "statuses": {"normal": 2, "abnormal": 1}
+        }
+    ]
+servers:
+    description: The health of each backend server over all of the load balancers and listener ports.
+    returned: when success
+    type: list
+    sample: [
+        {
+            "id": "i-2ze35dldjc05dcvezgwk",
+            "healthy": false,
+            "unhealthy": ["lb-dj1jywbux1zslfna6pvnv:80"]
+        }
+    ]
 "backend_servers":
     description: Details about the backened-servers that were added.
     returned: when success
@@ -65,6 +126,7 @@ load_balancer_id:
     sample: [
         {
             "id": "i-2ze35dldjc05dcvezgwk",
+            "load_balancer_id": "lb-dj1jywbux1zslfna6pvnv",
             "listener_port": 80,
             "port": 80,
             "server_health_status": "unavailable"
@@ -84,8 +146,13 @@ load_balancer_id:
     ]
 '''
 
+import time
+from collections import OrderedDict
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, slb_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_batch import run_batches
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_slb import HEALTHY_STATUSES
 
 try:
     from footmark.exception import SLBResponseError
@@ -95,63 +162,123 @@ except ImportError:
     HAS_FOOTMARK = False
 
 
-def get_info(backend_server):
+def get_info(backend_server, load_balancer_id):
     """
     get info from backend server object
     :param backend_server: backend server object
+    :param load_balancer_id: the ID of the load balancer of the backend server
     :return: info of backend server
     """
     return {
         'id': backend_server.server_id,
+        'load_balancer_id': load_balancer_id,
         'port': backend_server.port,
         'listener_port': backend_server.listener_port,
         'server_health_status': backend_server.server_health_status,
     }
 
 
+def describe_health(module, slb, load_balancer_ids, ports):
+    """ Return the backend servers of the load balancers, querying every load balancer and port at the same time """
+    queries = [(lb_id, port) for lb_id in load_balancer_ids for port in ports or [None]]
+
+    def query(q):
+        if q[1] is None:
+            servers = slb.describe_backend_servers_health_status(load_balancer_id=q[0])
+        else:
+            servers = slb.describe_backend_servers_health_status(load_balancer_id=q[0], port=q[1])
+        return [get_info(server, q[0]) for server in servers]
+
+    results, errors = run_batches(query, queries, module.params['max_concurrency'])
+    if errors:
+        module.fail_json(msg="Unable to list slb backend server health status, and got an error: {0}.".format(
+            '; '.join(str(e) for e in errors)))
+    return [server for servers in results for server in servers]
+
+
+def healthy(server):
+    return str(server['server_health_status']).lower() in HEALTHY_STATUSES
+
+
+def summarize(load_balancer_ids, backend_servers):
+    """ Return the health of the backend servers of each load balancer and of each backend server """
+    load_balancers = OrderedDict((lb_id, dict(load_balancer_id=lb_id, total=0, healthy=0, statuses={}))
+                                 for lb_id in load_balancer_ids)
+    servers = OrderedDict()
+    for server in backend_servers:
+        summary = load_balancers[server['load_balancer_id']]
+        status = str(server['server_health_status']).lower()
+        summary['total'] += 1
+        summary['statuses'][status] = summary['statuses'].get(status, 0) + 1
+        entry = servers.setdefault(server['id'], dict(id=server['id'], healthy=True, unhealthy=[]))
+        if healthy(server):
+            summary['healthy'] += 1
+        else:
+            entry['healthy'] = False
+            entry['unhealthy'].append('{0}:{1}'.format(server['load_balancer_id'], server['listener_port']))
+    return list(load_balancers.values()), list(servers.values())
+
+
+def short_of(summary, threshold):
+    """ Return whether a load balancer has too few healthy backend servers, which it has when it reports none """
+    return not summary['total'] or summary['healthy'] < threshold * summary['total']
+
+
 def main():
     argument_spec = ecs_argument_spec()
     argument_spec.update(dict(
-        load_balancer_id=dict(required=True, aliases=['lb_id']),
+        load_balancer_id=dict(aliases=['lb_id']),
+        load_balancer_ids=dict(type='list', elements='str', aliases=['lb_ids']),
         listener_ports=dict(type='list', elements='int', aliases=['ports']),
+        wait_for_healthy=dict(type='float'),
+        wait_delay=dict(type='int', default=5),
+        wait_timeout=dict(type='int', default=300),
+        max_concurrency=dict(type='int', default=8),
     ))
 
-    module = AnsibleModule(argument_spec=argument_spec)
+    argument_spec.update(info_argument_spec())
+    module = AnsibleModule(argument_spec=argument_spec, required_one_of=[['load_balancer_id', 'load_balancer_ids']])
 
     if HAS_FOOTMARK is False:
         module.fail_json(msg="Package 'footmark' required for this module.")
 
     load_balancer_id = module.params['load_balancer_id']
+    load_balancer_ids = list(module.params['load_balancer_ids'] or [])
+    if load_balancer_id and load_balancer_id not in load_balancer_ids:
+        load_balancer_ids.insert(0, load_balancer_id)
     ports = module.params['listener_ports']
-    result = []
+    threshold = module.params['wait_for_healthy']
 
     if ports and (not isinstance(ports, list) or len(ports)) < 1:
         module.fail_json(msg='backend_server_ports should be a list of backend server ports, aborting')
+    if threshold is not None and not 0 <= threshold <= 1:
+        module.fail_json(msg="'wait_for_healthy': field value is invalid. Expect to [0-1].")
 
-    try:
-        slb = slb_connect(module)
-
-        # check whether server load balancer exist or not
-        laod_balancer = slb.describe_load_balancers(load_balancer_id=load_balancer_id)
-        if laod_balancer and len(laod_balancer) == 1:
-            if ports:
-                # list slb servers by port no.
-                for port in ports:
-                    for backend_server in slb.describe_backend_servers_health_status(
-                            load_balancer_id=load_balancer_id, port=port):
-                        result.append(get_info(backend_server))
+    # An invalid load balancer id makes its health status query fail, so the load balancers are not described first
+    slb = slb_connect(module)
+    backend_servers = describe_health(module, slb, load_balancer_ids, ports)
+    load_balancers, servers = summarize(load_balancer_ids, backend_servers)
 
-            else:
-                # list all slb servers
-                for backend_server in slb.describe_backend_servers_health_status(load_balancer_id=load_balancer_id):
-                    result.append(get_info(backend_server))
+    if threshold is not None:
+        timeout = module.params['wait_timeout']
+        waiting = [s['load_balancer_id'] for s in load_balancers if short_of(s, threshold)]
+        while waiting:
+            timeout -= module.params['wait_delay']
+            if timeout <= 0:
+                module.fail_json(msg="Timeout Error: Waiting for the backend servers of {0} to be healthy.".format(
+                    ', '.join(waiting)), load_balancers=load_balancers, servers=servers)
+            time.sleep(module.params['wait_delay'])
+            # Only the load balancers which are not healthy yet are queried again
+            backend_servers = [s for s in backend_servers if s['load_balancer_id'] not in waiting]
+            backend_servers += describe_health(module, slb, waiting, ports)
+            load_balancers, servers = summarize(load_balancer_ids, backend_servers)
+            waiting = [s['load_balancer_id'] for s in load_balancers if short_of(s, threshold)]
 
-            module.exit_json(changed=False, load_balancer_id=load_balancer_id, backend_servers=result)
-
-        else:
-            module.fail_json(msg="Unable to list slb backend server health status, invalid load balancer id")
-    except Exception as e:
-        module.fail_json(msg="Unable to list slb backend server health status, and got an error: {0}.".format(e))
+    result = dict(changed=False, load_balancers=load_balancers, servers=servers,
+                  backend_servers=[project(s, module.params['fields']) for s in backend_servers])
+    if load_balancer_id:
+        result['load_balancer_id'] = load_balancer_id
+    module.exit_json(**result)
 
 
 if __name__ == '__main__':
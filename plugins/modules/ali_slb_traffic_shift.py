@@ -0,0 +1,279 @@
+#!/usr/bin/python
+# Copyright (c) 2017-present Alibaba Group Holding Limited. <xiaozhu36>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+DOCUMENTATION = '''
+---
+module: ali_slb_traffic_shift
+short_description: Shift the traffic of load balancers from a set of backend servers to another in steps.
+description:
+  - Move the weight of the backend servers of load balancers and VServer groups from one set of servers to another
+    in I(steps) steps, I(interval) seconds apart, e.g. for a blue/green cutover.
+  - At each step the servers of I(to_servers) get a larger share of I(weight) and the servers of I(from_servers) the
+    rest, until I(to_servers) have all of it. The weights of a step are set on every load balancer and VServer group
+    at the same time.
+  - A shift which stopped half way goes on from the step it reached, and a shift which is done changes nothing. A step
+    counts as reached when every server of I(to_servers) has at least its weight and every server of I(from_servers)
+    at most its weight, so servers of I(to_servers) attached with any weight are shifted from the first step.
+options:
+  load_balancer_ids:
+    description:
+      - The IDs of the load balancers whose default backend servers are shifted.
+      - One of I(load_balancer_ids) and I(vserver_group_ids) is required.
+    aliases: ['lb_ids']
+    type: list
+    elements: str
+  vserver_group_ids:
+    description:
+      - The IDs of the VServer groups whose backend servers are shifted. A server of a group on several ports gets the
+        same weight on each of them.
+      - One of I(load_balancer_ids) and I(vserver_group_ids) is required.
+    aliases: ['group_ids']
+    type: list
+    elements: str
+  from_servers:
+    description:
+      - The IDs of the backend servers the traffic moves away from. Their weight goes from I(weight) down to 0.
+    required: True
+    type: list
+    elements: str
+  to_servers:
+    description:
+      - The IDs of the backend servers the traffic moves to. Their weight goes from 0 up to I(weight).
+    required: True
+    type: list
+    elements: str
+  weight:
+    description:
+      - The weight shared by a server of I(from_servers) and a server of I(to_servers) at each step.
+    default: 100
+    type: int
+  steps:
+    description:
+      - The number of steps of the shift.
+    default: 4
+    type: int
+  interval:
+    description:
+      - How long to wait between two steps, in seconds.
+    default: 60
+    type: int
+  wait_for_healthy:
+    description:
+      - Whether the servers of I(to_servers) have to pass the health checks of the load balancers before each step.
+        A server whose listeners have health checks off counts as healthy, and a server a load balancer does not report
+        the health of, e.g. for it has no listeners, does not.
+    default: False
+    type: bool
+  health_check_timeout:
+    description:
+      - How long before the wait for I(to_servers) to be healthy gives up at a step, in seconds.
+    default: 300
+    type: int
+  max_concurrency:
+    description:
+      - The largest number of calls setting weights made at the same time. Each call takes up to 20 servers.
+    default: 4
+    type: int
+requirements:
+    - "python >= 3.6"
+    - "footmark >= 1.19.0"
+extends_documentation_fragment:
+    - alibaba.alicloud.alicloud
+author:
+  - "He Guimin (@xiaozhu36)"
+'''
+
+EXAMPLES = '''
+# Note: These examples do not set authentication details, see the Alibaba Cloud Guide for details.
+- name: Move the traffic from blue to green in 5 steps, a minute apart, once green is healthy
+  alibaba.alicloud.ali_slb_traffic_shift:
+    load_balancer_ids: ['lb-cnqnc234']
+    vserver_group_ids: ['rsp-2zehblhcv']
+    from_servers: ['i-blue1', 'i-blue2']
+    to_servers: ['i-green1', 'i-green2']
+    steps: 5
+    interval: 60
+    wait_for_healthy: True
+'''
+
+RETURN = '''
+steps:
+    description: The steps taken by this run, with the weights they set.
+    returned: always
+    type: list
+    sample: [{"step": 3, "from_weight": 50, "to_weight": 50}, {"step": 4, "from_weight": 0, "to_weight": 100}]
+targets:
+    description: The backend servers of each load balancer and VServer group after the shift.
+    returned: always
+    type: complex
+    contains:
+        id:
+            description: The ID of the load balancer or of the VServer group.
+            returned: always
+            type: str
+            sample: "lb-cnqnc234"
+        load_balancer_id:
+            description: The ID of the load balancer of the target.
+            returned: always
+            type: str
+            sample: "lb-cnqnc234"
+        backend_servers:
+            description: The backend servers of the target with their weights, and their ports in a VServer group.
+            returned: always
+            type: list
+            sample: [{"server_id": "i-green1", "weight": 100}]
+'''
+
+import time
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, slb_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_batch import call_when_free, chunks, run_batches
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_slb import BACKEND_SERVERS_MAX_SIZE, wait_for_healthy
+
+HAS_FOOTMARK = False
+
+try:
+    import footmark  # noqa: F401
+    HAS_FOOTMARK = True
+except ImportError:
+    HAS_FOOTMARK = False
+
+
+def describe_target(slb, target):
+    """ Fill in the load balancer and the backend servers of a load balancer or a VServer group target """
+    if target['vserver_group']:
+        group = slb.describe_vserver_group_attribute(vserver_group_id=target['id'])
+        target['load_balancer_id'] = group.load_balancer_id
+        servers = group.backend_servers['backend_server'] if group.backend_servers else []
+        target['backend_servers'] = [dict(server_id=s['server_id'], port=s['port'], type=s.get('type', 'ecs'),
+                                          weight=int(s['weight'])) for s in servers]
+    else:
+        load_balancer = slb.describe_load_balancer_attribute(load_balancer_id=target['id'])
+        target['load_balancer_id'] = target['id']
+        servers = load_balancer.backend_servers['backend_server'] if load_balancer.backend_servers else []
+        target['backend_servers'] = [dict(server_id=s['server_id'], weight=int(s['weight'])) for s in servers]
+    return target
+
+
+def set_weights(slb, target, servers):
+    """ Set the weights of some of the backend servers of a target in one call, retried while the load balancer is busy
+    with the other calls of the step """
+    if target['vserver_group']:
+        return call_when_free(slb.set_vserver_group_attribute, vserver_group_id=target['id'], backend_servers=[
+            dict(ServerId=s['server_id'], Port=s['port'], Type=s['type'], Weight=s['weight']) for s in servers])
+    return call_when_free(slb.set_backend_servers, load_balancer_id=target['id'], backend_servers=servers)
+
+
+def step_weights(weight, steps, step):
+    """ Return the weights of a server of from_servers and of a server of to_servers at a step """
+    to_weight = int(round(float(weight) * step / steps))
+    return weight - to_weight, to_weight
+
+
+def main():
+    argument_spec = ecs_argument_spec()
+    argument_spec.update(dict(
+        load_balancer_ids=dict(type='list', elements='str', aliases=['lb_ids']),
+        vserver_group_ids=dict(type='list', elements='str', aliases=['group_ids']),
+        from_servers=dict(type='list', elements='str', required=True),
+        to_servers=dict(type='list', elements='str', required=True),
+        weight=dict(type='int', default=100),
+        steps=dict(type='int', default=4),
+        interval=dict(type='int', default=60),
+        wait_for_healthy=dict(type='bool', default=False),
+        health_check_timeout=dict(type='int', default=300),
+        max_concurrency=dict(type='int', default=4)
+    ))
+
+    module = AnsibleModule(argument_spec=argument_spec,
+                           required_one_of=[['load_balancer_ids', 'vserver_group_ids']])
+
+    if HAS_FOOTMARK is False:
+        module.fail_json(msg='footmark required for the module ali_slb_traffic_shift.')
+
+    weight = module.params['weight']
+    steps = module.params['steps']
+    if weight < 0 or weight > 100:
+        module.fail_json(msg="'weight': field value is invalid. Expect to [0-100].")
+    if steps < 1:
+        module.fail_json(msg="'steps': field value is invalid. Expect to a positive integer.")
+    from_servers = set(module.params['from_servers'])
+    to_servers = set(module.params['to_servers'])
+    if from_servers & to_servers:
+        module.fail_json(msg='The servers {0} are both in from_servers and in to_servers.'.format(
+            sorted(from_servers & to_servers)))
+
+    slb = slb_connect(module)
+    max_concurrency = module.params['max_concurrency']
+    targets = [dict(id=i, vserver_group=False) for i in module.params['load_balancer_ids'] or []]
+    targets += [dict(id=i, vserver_group=True) for i in module.params['vserver_group_ids'] or []]
+    targets, errors = run_batches(lambda target: describe_target(slb, target), targets, max_concurrency)
+    if errors:
+        module.fail_json(msg='Unable to describe the backend servers, error: {0}'.format('; '.join(str(e) for e in errors)))
+
+    shifted = [s for t in targets for s in t['backend_servers'] if s['server_id'] in from_servers | to_servers]
+    if not [s for s in shifted if s['server_id'] in to_servers]:
+        module.fail_json(msg='None of the to_servers is a backend server of the load balancers or VServer groups.')
+
+    # A step whose weights to_servers already have at least and from_servers at most was taken by an earlier run
+    to_current = min(s['weight'] for s in shifted if s['server_id'] in to_servers)
+    from_current = max([s['weight'] for s in shifted if s['server_id'] in from_servers] or [0])
+    expected = {}
+    for target in targets:
+        expected.setdefault(target['load_balancer_id'], set()).update(
+            s['server_id'] for s in target['backend_servers'] if s['server_id'] in to_servers)
+    taken = []
+    for step in range(1, steps + 1):
+        from_weight, to_weight = step_weights(weight, steps, step)
+        if to_weight <= to_current and from_weight >= from_current:
+            continue
+        batches = []
+        for target in targets:
+            servers = [dict(s, weight=to_weight if s['server_id'] in to_servers else from_weight)
+                       for s in target['backend_servers']
+                       if s['server_id'] in from_servers | to_servers and
+                       s['weight'] != (to_weight if s['server_id'] in to_servers else from_weight)]
+            batches.extend((target, batch) for batch in chunks(servers, BACKEND_SERVERS_MAX_SIZE))
+        if not batches:
+            continue
+
+        if taken:
+            time.sleep(module.params['interval'])
+        try:
+            if module.params['wait_for_healthy']:
+                wait_for_healthy(slb, dict((k, v) for k, v in expected.items() if v),
+                                 module.params['health_check_timeout'])
+        except Exception as e:
+            module.fail_json(changed=bool(taken), steps=taken, msg='Shifting the traffic stopped before step {0}: '
+                                                                   '{1}'.format(step, e))
+
+        # All of the weights of a step are set at the same time
+        results, errors = run_batches(lambda b: set_weights(slb, b[0], b[1]), batches, max_concurrency)
+        if errors:
+            module.fail_json(changed=bool(taken or results), steps=taken,
+                             msg='Unable to set the weights of step {0}, error: {1}'.format(
+                                 step, '; '.join(str(e) for e in errors)))
+        for target in targets:
+            for server in target['backend_servers']:
+                if server['server_id'] in to_servers:
+                    server['weight'] = to_weight
+                elif server['server_id'] in from_servers:
+                    server['weight'] = from_weight
+        taken.append(dict(step=step, from_weight=from_weight, to_weight=to_weight))
+
+    module.exit_json(changed=bool(taken), steps=taken,
+                     targets=[dict(id=t['id'], load_balancer_id=t['load_balancer_id'],
+                                   backend_servers=t['backend_servers']) for t in targets])
+
+
+if __name__ == '__main__':
+    main()
@@ -67,6 +67,12 @@ options:
           with the same I(name). Specify this as true if you want duplicate Load Balancers created.
       default: False
       type: bool
+    max_concurrency:
+      description:
+        - The largest number of calls adding, modifying or removing backend servers made at the same time. Each call
+          takes up to 20 servers, so that any number of servers can be given.
+      default: 4
+      type: int
 requirements:
     - "python >= 3.6"
     - "footmark >= 1.19.0"
@@ -183,8 +189,11 @@ vserver_group:
             sample: {}
 '''
 
+from collections import OrderedDict
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, slb_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_batch import call_when_free, chunks, run_batches
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_slb import BACKEND_SERVERS_MAX_SIZE
 
 
 HAS_FOOTMARK = False
@@ -236,37 +245,55 @@ def format_backend_servers(servers):
     return backend_servers
 
 
+def server_key(server):
+    """ Return the key a backend server is told apart by, its ID and its port, since a group can have an instance on
+    several ports """
+    return server['server_id'], str(server.get('port'))
+
+
 def filter_backend_servers(existing, inputting):
-    old = []
+    """ Return the pairs of the servers to modify, as they are and as they should be, the servers to add and the
+    servers which are not given. The servers are told apart by their IDs and ports """
+    existing = OrderedDict((server_key(s), s) for s in existing)
+    modified = []
     new = []
-    removed = []
-    existingList = []
-    inputtingList = []
-    oldList = []
-    inputting = parse_server_ids(inputting)
-
-    for s in existing:
-        existingList.append(s['server_id'])
-
-    for s in inputting:
-        inputtingList.append(s['server_id'])
-
-    for s in inputting:
-        if s['server_id'] in existingList:
-            old.append(s)
-            oldList.append([s['server_id']])
+    wanted = OrderedDict((server_key(s), s) for s in parse_server_ids(inputting))
+    for key, s in wanted.items():
+        if key not in existing:
+            new.append(s)
             continue
-        new.append(s)
-
-    for s in existing:
-        key = s['server_id']
-        if key in inputtingList:
-            if key not in oldList:
-                old.append(s)
-            continue
-        removed.append(s)
-
-    return old, new, removed
+        old = dict((k, v) for k, v in existing[key].items() if k in VALID_SERVER_PARAMS)
+        if [k for k, v in s.items() if k in old and str(old[k]) != str(v)]:
+            modified.append((old, dict(old, **s)))
+    removed = [dict(server_id=s['server_id'], port=s['port']) for key, s in existing.items() if key not in wanted]
+    return modified, new, removed
+
+
+def change_backend_servers(module, slb, group, modified, new, removed):
+    """ Modify, add and remove backend servers of a group, up to BACKEND_SERVERS_MAX_SIZE servers a call and up to
+    max_concurrency calls at the same time, each retried while the load balancer is busy with the others. Return
+    whether any call was made """
+    def modify(batch):
+        return call_when_free(slb.modify_vserver_group_backend_servers, vserver_group_id=group.id,
+                              old_backend_servers=format_backend_servers([old for old, new in batch]),
+                              new_backend_servers=format_backend_servers([new for old, new in batch]))
+
+    def add(batch):
+        return call_when_free(slb.add_vserver_group_backend_servers, vserver_group_id=group.id,
+                              backend_servers=format_backend_servers(batch))
+
+    def remove(batch):
+        return call_when_free(slb.remove_vserver_group_backend_servers, vserver_group_id=group.id,
+                              backend_servers=format_backend_servers(batch))
+
+    batches = [(modify, b) for b in chunks(modified, BACKEND_SERVERS_MAX_SIZE)]
+    batches += [(add, b) for b in chunks(new, BACKEND_SERVERS_MAX_SIZE)]
+    batches += [(remove, b) for b in chunks(removed, BACKEND_SERVERS_MAX_SIZE)]
+    results, errors = run_batches(lambda b: b[0](b[1]), batches, module.params['max_concurrency'])
+    if errors:
+        module.fail_json(changed=bool(results), msg='Changing backend servers failed: {0}'.format(
+            '; '.join(str(e) for e in errors)))
+    return bool(batches)
 
 
 def main():
@@ -278,7 +305,8 @@ def main():
         backend_servers=dict(type='list', elements='dict'),
         vserver_group_id=dict(type='str', aliases=['group_id']),
         purge_backend_servers=dict(type='bool', default=False),
-        multi_ok=dict(type='bool', default=False)
+        multi_ok=dict(type='bool', default=False),
+        max_concurrency=dict(type='int', default=4)
     ))
 
     module = AnsibleModule(argument_spec=argument_spec,
@@ -326,39 +354,28 @@ def main():
 
     backend_servers = module.params['backend_servers']
     check_backend_servers(module, backend_servers)
+    backend_servers = parse_server_ids(backend_servers)
 
     if not matching:
         try:
+            # A group is created with as many servers as CreateVServerGroup takes, and the others are added to it
             params = module.params
-            params['backend_servers'] = format_backend_servers(backend_servers[:20])
+            params['backend_servers'] = format_backend_servers(backend_servers[:BACKEND_SERVERS_MAX_SIZE])
             matching = slb.create_vserver_group(**params)
             changed = True
         except Exception as e:
             module.fail_json(msg=str("Unable to create vserver group error:{0}".format(e)))
 
     if backend_servers:
-        old, new, removed = filter_backend_servers(matching.backend_servers['backend_server'], backend_servers)
-        if old:
-            try:
-                if matching.modify(backend_servers=old):
-                    changed = True
-            except Exception as e:
-                module.fail_json(msg='Modify backend servers failed: {0}'.format(e))
-
-        if new:
-            try:
-                if matching.add(backend_servers=new):
-                    changed = True
-            except Exception as e:
-                module.fail_json(msg='Add backend servers failed: {0}'.format(e))
+        modified, new, removed = filter_backend_servers(matching.backend_servers['backend_server'], backend_servers)
+        if not module.params['purge_backend_servers']:
+            removed = []
+        if change_backend_servers(module, slb, matching, modified, new, removed):
+            changed = True
 
-        if module.params['purge_backend_servers'] and removed:
-            try:
-                if matching.remove(backend_servers=removed):
-                    changed = True
-            except Exception as e:
-                module.fail_json(msg='Remove backend servers failed: {0}'.format(e))
-    module.exit_json(changed=changed, vserver_group=matching.get().read())
+    if changed:
+        matching = matching.get()
+    module.exit_json(changed=changed, vserver_group=matching.read())
 
 
 if __name__ == '__main__':
@@ -41,6 +41,7 @@ requirements:
     - "footmark >= 1.19.0"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -132,6 +133,7 @@ vserver_groups:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, slb_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project
 
 HAS_FOOTMARK = False
 
@@ -149,6 +151,7 @@ def main():
         vserver_group_ids=dict(type='list', elements='str', aliases=['group_ids', 'ids']),
         name_prefix=dict(type='str')
     ))
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -171,7 +174,7 @@ def main():
                     continue
                 if name_prefix and not str(group.name).startswith(name_prefix):
                     continue
-                vsgs.append(group.read())
+                vsgs.append(project(group.read(), module.params['fields']))
                 ids.append(group.id)
                 names.append(group.name)
 
@@ -180,6 +180,7 @@ vpc:
 import time
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, vpc_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_paginator import paginate
 
 HAS_FOOTMARK = False
 
@@ -199,7 +200,7 @@ def vpc_exists(module, vpc, vpc_id, name, cidr_block, multi, recent):
         return None
     matching_vpcs = []
     try:
-        for v in vpc.describe_vpcs():
+        for v in paginate(vpc.describe_vpcs):
             if cidr_block and v.cidr_block != cidr_block:
                 continue
             if name and v.vpc_name != name:
@@ -55,6 +55,7 @@ requirements:
     - "footmark >= 1.14.1"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -154,6 +155,8 @@ vpcs:
 '''
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, vpc_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project, server_filters, client_filter
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_paginator import paginate
 
 HAS_FOOTMARK = False
 
@@ -175,6 +178,7 @@ def main():
         tags=dict(type='dict')
     )
     )
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -191,36 +195,23 @@ def main():
         if key in ["VpcId", "vpc_id", "vpc-id"] and value not in vpc_ids:
             vpc_ids.append(value)
 
-    name = module.params['vpc_name']
-    name_prefix = module.params['name_prefix']
     cidr_prefix = module.params['cidr_prefix']
-    tags = module.params['tags']
+    requests, left = server_filters('describe_vpcs', filters, name=module.params['vpc_name'],
+                                    name_prefix=module.params['name_prefix'], tags=module.params['tags'], ids=vpc_ids,
+                                    any_tag=True)
 
     try:
+        vpc_conn = vpc_connect(module)
         vpcs = []
         ids = []
-        while True:
-            if vpc_ids:
-                filters['vpc_id'] = vpc_ids[0]
-                vpc_ids.pop(0)
-            for vpc in vpc_connect(module).describe_vpcs(**filters):
-                if name and vpc.vpc_name != name:
-                    continue
-                if name_prefix and not str(vpc.vpc_name).startswith(name_prefix):
-                    continue
+        for request in requests:
+            for vpc in paginate(vpc_conn.describe_vpcs, **request):
                 if cidr_prefix and not str(vpc.cidr_block).startswith(cidr_prefix):
                     continue
-                if tags:
-                    flag = False
-                    for key, value in list(tags.items()):
-                        if key in list(vpc.tags.keys()) and value == vpc.tags[key]:
-                            flag = True
-                    if not flag:
-                        continue
-                vpcs.append(vpc.read())
+                if not client_filter(left, vpc):
+                    continue
+                vpcs.append(project(vpc.read(), module.params['fields']))
                 ids.append(vpc.id)
-            if not vpc_ids:
-                break
 
         module.exit_json(changed=False, ids=ids, vpcs=vpcs)
     except Exception as e:
@@ -169,6 +169,7 @@ vswitch:
 import time
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, vpc_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_paginator import paginate
 
 HAS_FOOTMARK = False
 
@@ -181,7 +182,7 @@ except ImportError:
 
 def vswitch_exists(conn, module, vswitch_id, vpc_id, cidr):
     try:
-        for vsw in conn.describe_vswitches():
+        for vsw in paginate(conn.describe_vswitches):
             if cidr and vsw.cidr_block != cidr:
                 continue
             if vpc_id and vpc_id != vsw.vpc_id:
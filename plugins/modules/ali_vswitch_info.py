@@ -60,6 +60,7 @@ requirements:
     - "footmark >= 1.14.1"
 extends_documentation_fragment:
     - alibaba.alicloud.alicloud
+    - alibaba.alicloud.alicloud.info
 '''
 
 EXAMPLES = '''
@@ -159,6 +160,8 @@ vswitches:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_ecs import ecs_argument_spec, vpc_connect
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_info import info_argument_spec, project, server_filters, client_filter
+from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_paginator import paginate
 
 HAS_FOOTMARK = False
 
@@ -182,6 +185,7 @@ def main():
     )
     )
 
+    argument_spec.update(info_argument_spec())
     module = AnsibleModule(argument_spec=argument_spec)
 
     if HAS_FOOTMARK is False:
@@ -198,39 +202,26 @@ def main():
         if key in ["VSwitchId", "vswitch_id", "vswitch-id"] and value not in vswitch_ids:
             vswitch_ids.append(value)
 
-    name = module.params['vswitch_name']
     cidr_block = module.params['cidr_block']
-    name_prefix = module.params['name_prefix']
     cidr_prefix = module.params['cidr_prefix']
-    tags = module.params['tags']
+    requests, left = server_filters('describe_vswitches', filters, name=module.params['vswitch_name'],
+                                    name_prefix=module.params['name_prefix'], tags=module.params['tags'],
+                                    ids=vswitch_ids, any_tag=True)
 
     try:
+        vpc_conn = vpc_connect(module)
         vswitches = []
         ids = []
-        while True:
-            if vswitch_ids:
-                filters['vswitch_id'] = vswitch_ids[0]
-                vswitch_ids.pop(0)
-            for vsw in vpc_connect(module).describe_vswitches(**filters):
-                if name and vsw.vswitch_name != name:
-                    continue
+        for request in requests:
+            for vsw in paginate(vpc_conn.describe_vswitches, **request):
                 if cidr_block and vsw.cidr_block != cidr_block:
                     continue
-                if name_prefix and not str(vsw.vswitch_name).startswith(name_prefix):
-                    continue
                 if cidr_prefix and not str(vsw.cidr_block).startswith(cidr_prefix):
                     continue
-                if tags:
-                    flag = False
-                    for key, value in list(tags.items()):
-                        if key in list(vsw.tags.keys()) and value == vsw.tags[key]:
-                            flag = True
-                    if not flag:
-                        continue
-                vswitches.append(vsw.read())
+                if not client_filter(left, vsw):
+                    continue
+                vswitches.append(project(vsw.read(), module.params['fields']))
                 ids.append(vsw.id)
-            if not vswitch_ids:
-                break
 
         module.exit_json(changed=False, ids=ids, vswitches=vswitches)
     except Exception as e:
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import io
+import os
+import json
+import importlib
+import traceback
+from collections.abc import Sequence
+from contextlib import contextmanager, redirect_stdout
+
+from ansible.module_utils import basic
+from ansible.module_utils._text import to_bytes, to_native
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible.plugins.action import ActionBase
+from ansible.utils.display import Display
+from ansible.vars.clean import remove_internal_keys
+
+display = Display()
+
+MODULES_PACKAGE = 'ansible_collections.alibaba.alicloud.plugins.modules'
+PROFILING_TAGS = ('ALICLOUD_PROFILING_TASK', 'ALICLOUD_PROFILING_HOST')
+
+
+@contextmanager
+def module_args(args):
+    """ Expose the arguments to the AnsibleModule created by a module running in this process """
+    old_args, old_profile = basic._ANSIBLE_ARGS, getattr(basic, '_ANSIBLE_PROFILE', None)
+    basic._ANSIBLE_ARGS = to_bytes(json.dumps({'ANSIBLE_MODULE_ARGS': args}))
+    if hasattr(basic, '_ANSIBLE_PROFILE'):
+        basic._ANSIBLE_PROFILE = 'legacy'
+    try:
+        yield
+    finally:
+        basic._ANSIBLE_ARGS = old_args
+        if hasattr(basic, '_ANSIBLE_PROFILE'):
+            basic._ANSIBLE_PROFILE = old_profile
+
+
+@contextmanager
+def profiling_tags(task, host):
+    """ Tell the profiling hook of module_utils which task and host the module runs for """
+    old_values = [os.environ.get(name) for name in PROFILING_TAGS]
+    for name, value in zip(PROFILING_TAGS, (task, host)):
+        os.environ[name] = to_native(value or '')
+    try:
+        yield
+    finally:
+        for name, value in zip(PROFILING_TAGS, old_values):
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+class AlicloudActionModule(ActionBase):
+    """Runs an Alibaba Cloud module inside the controller process.
+
+    The modules only talk to the cloud APIs, so when a task targets the controller there is no need to package the
+    module with AnsiballZ and start a new interpreter for it. The module is imported once and its main() is called
+    with the task arguments. Tasks delegated to other hosts, async or become tasks, and controllers without footmark
+    use the normal module execution. Setting ALICLOUD_IN_PROCESS to false disables this altogether.
+    """
+
+    def _runs_in_process(self):
+        if not boolean(os.environ.get('ALICLOUD_IN_PROCESS', True), strict=False):
+            return False
+        if self._connection.transport != 'local' or self._task.async_val or self._play_context.become:
+            return False
+        try:
+            import footmark  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def _execute_module_in_process(self, module_name, task_vars):
+        args = dict(self._task.args)
+        self._update_module_args(module_name, args, task_vars)
+        stdout = io.StringIO()
+        try:
+            module = importlib.import_module('%s.%s' % (MODULES_PACKAGE, module_name.split('.')[-1]))
+            host = (task_vars or {}).get('inventory_hostname')
+            with module_args(args), profiling_tags(self._task.get_name(), host), redirect_stdout(stdout):
+                try:
+                    module.main()
+                except SystemExit:
+                    pass
+        except Exception as e:
+            return dict(failed=True, msg='Running module %s in process failed: %s' % (module_name, to_native(e)),
+                        exception=traceback.format_exc())
+
+        return self._parse_module_output(stdout.getvalue())
+
+    def _parse_module_output(self, output):
+        """ Turn the output of a module run in process into its result, as _execute_module does with the output of a
+        module run by an interpreter """
+        res = dict(rc=0, stdout=output, stderr='')
+        try:
+            data = self._parse_returned_data(res, 'legacy')
+        except TypeError:
+            # ansible-core before 2.19 has no serialization profiles
+            data = self._parse_returned_data(res)
+
+        data.pop('_ansible_suppress_tmpdir_delete', None)
+        if 'results' in data and (not isinstance(data['results'], Sequence) or isinstance(data['results'], str)):
+            data['ansible_module_results'] = data.pop('results')
+            display.warning("Found internal 'results' key in module return, renamed to 'ansible_module_results'.")
+        remove_internal_keys(data)
+        for name in ('stdout', 'stderr'):
+            if name in data and name + '_lines' not in data:
+                data[name + '_lines'] = (data[name] or u'').splitlines()
+        return data
+
+    def run(self, tmp=None, task_vars=None):
+        result = super(AlicloudActionModule, self).run(tmp, task_vars)
+        del tmp
+
+        module_name = getattr(self._task, 'resolved_action', None) or self._task.action
+        if not self._runs_in_process():
+            result.update(self._execute_module(module_name=module_name, task_vars=task_vars))
+            return result
+
+        display.vvv('Running %s in process on the controller' % module_name)
+        result.update(self._execute_module_in_process(module_name, task_vars))
+        return result
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Measure the startup cost of every module of the collection: the time spent importing the module together with the
+footmark services it connects to, and the size of the collection's share of its AnsiballZ payload, that is the
+module and the module_utils it pulls in, zipped the way AnsiballZ does.
+
+Run it from a checkout, e.g. before and after a change::
+
+    python tests/benchmarks/module_startup.py --repeat 5 > startup.txt
+"""
+
+import os
+import re
+import sys
+import ast
+import json
+import shutil
+import zipfile
+import argparse
+import tempfile
+import subprocess
+
+COLLECTION = 'ansible_collections.alibaba.alicloud'
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CONNECT_PATTERN = re.compile(r'\b(\w+)_connect\(')
+SERVICES = {'ecs': 'ecs', 'slb': 'slb', 'vpc': 'vpc', 'rds': 'rds', 'ess': 'ess', 'sts': 'sts', 'dns': 'dns',
+            'ram': 'ram', 'ros': 'ros', 'oos': 'oos', 'market': 'market', 'oss_bucket': 'oss', 'oss_service': 'oss'}
+
+IMPORT_TIMER = """
+import sys, time
+start = time.time()
+__import__(sys.argv[1])
+for service in sys.argv[2:]:
+    __import__('footmark.' + service)
+print(time.time() - start)
+"""
+
+
+def module_utils_of(path, seen=None):
+    """ Return the collection module_utils files imported by a file, recursively """
+    seen = set() if seen is None else seen
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    for node in ast.walk(tree):
+        names = []
+        if isinstance(node, ast.ImportFrom) and node.module:
+            names = [node.module]
+        elif isinstance(node, ast.Import):
+            names = [n.name for n in node.names]
+        for name in names:
+            if not name.startswith(COLLECTION + '.plugins.module_utils.'):
+                continue
+            util = os.path.join(ROOT, *name[len(COLLECTION) + 1:].split('.')) + '.py'
+            if os.path.exists(util) and util not in seen:
+                seen.add(util)
+                module_utils_of(util, seen)
+    return seen
+
+
+def payload_size(path):
+    fd, archive = tempfile.mkstemp(suffix='.zip')
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as z:
+            for f in [path] + sorted(module_utils_of(path)):
+                z.write(f, os.path.relpath(f, ROOT))
+        return os.path.getsize(archive)
+    finally:
+        os.remove(archive)
+
+
+def import_time(collections_path, name, services, repeat):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([collections_path, os.environ.get('PYTHONPATH', '')]))
+    samples = []
+    for dummy in range(repeat):
+        out = subprocess.check_output([sys.executable, '-c', IMPORT_TIMER, name] + services, env=env)
+        samples.append(float(out))
+    return min(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3, help='Imports per module, the fastest one is reported.')
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON.')
+    parser.add_argument('modules', nargs='*', help='Module names, all of them by default.')
+    args = parser.parse_args()
+
+    # Expose the checkout as ansible_collections.alibaba.alicloud
+    collections_path = tempfile.mkdtemp()
+    os.makedirs(os.path.join(collections_path, 'ansible_collections', 'alibaba'))
+    os.symlink(ROOT, os.path.join(collections_path, 'ansible_collections', 'alibaba', 'alicloud'))
+
+    modules_dir = os.path.join(ROOT, 'plugins', 'modules')
+    names = args.modules or sorted(f[:-3] for f in os.listdir(modules_dir) if f.startswith('ali_') and f.endswith('.py'))
+    results = []
+    try:
+        for name in names:
+            path = os.path.join(modules_dir, name + '.py')
+            with open(path) as f:
+                services = sorted(set(SERVICES[s] for s in CONNECT_PATTERN.findall(f.read()) if s in SERVICES))
+            results.append(dict(module=name, services=services, payload_bytes=payload_size(path),
+                                import_seconds=import_time(collections_path, '%s.plugins.modules.%s' % (COLLECTION, name),
+                                                           services, args.repeat)))
+    finally:
+        shutil.rmtree(collections_path)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print('%-32s %12s %14s' % ('module', 'import (ms)', 'payload (B)'))
+    for r in results:
+        print('%-32s %12.1f %14d' % (r['module'], r['import_seconds'] * 1000, r['payload_bytes']))
+    print('%-32s %12.1f %14d' % ('total', sum(r['import_seconds'] for r in results) * 1000,
+                                 sum(r['payload_bytes'] for r in results)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Runs the modules of the collection in process against the fake cloud of tests/fake_alicloud, without credentials or
+network access. The checkout is exposed as the ansible_collections.alibaba.alicloud package through a temporary
+directory, so the tests run from any checkout directory.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import importlib
+from contextlib import redirect_stdout
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COLLECTIONS_PATH = tempfile.mkdtemp(prefix='alicloud-collections-')
+os.makedirs(os.path.join(COLLECTIONS_PATH, 'ansible_collections', 'alibaba'))
+os.symlink(ROOT, os.path.join(COLLECTIONS_PATH, 'ansible_collections', 'alibaba', 'alicloud'))
+sys.path.insert(0, COLLECTIONS_PATH)
+
+from fake_alicloud import FakeAlicloud  # noqa: E402
+
+MODULES_PACKAGE = 'ansible_collections.alibaba.alicloud.plugins.modules'
+PROXY_VARIABLES = ('HTTP_PROXY', 'HTTPS_PROXY', 'http_proxy', 'https_proxy')
+ALICLOUD_VARIABLES = ('ALICLOUD_ACCESS_KEY', 'ALICLOUD_SECRET_KEY', 'ALICLOUD_SECURITY_TOKEN', 'ALICLOUD_REGION',
+                      'ALICLOUD_PROFILE', 'ALICLOUD_ASSUME_ROLE_ARN', 'ALICLOUD_BROKER_SOCKET', 'ALICLOUD_CACHE_TTL',
+                      'ALICLOUD_CACHE_DIR', 'ALICLOUD_ECS_ROLE_NAME', 'ALICLOUD_PROFILING_DIR')
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(COLLECTIONS_PATH, ignore_errors=True)
+
+
+class ModuleRunner(object):
+    """Calls the main() of a module with the given arguments and returns the result it exits with."""
+
+    defaults = dict(alicloud_access_key='fake-access-key', alicloud_secret_key='fake-secret-key',
+                    alicloud_region='cn-hangzhou')
+
+    def __init__(self, cloud):
+        self.cloud = cloud
+
+    def __call__(self, name, args):
+        from ansible_collections.alibaba.alicloud.plugins.plugin_utils.alicloud_action import module_args
+
+        module = importlib.import_module('%s.%s' % (MODULES_PACKAGE, name))
+        params = dict(self.defaults)
+        params.update(args)
+        params.update(_ansible_module_name=name, _ansible_check_mode=False, _ansible_no_log=False,
+                      _ansible_diff=False, _ansible_tmpdir=tempfile.gettempdir(),
+                      _ansible_remote_tmp=tempfile.gettempdir(), _ansible_keep_remote_files=False)
+        stdout = io.StringIO()
+        with module_args(params), redirect_stdout(stdout):
+            try:
+                module.main()
+            except SystemExit:
+                pass
+        output = stdout.getvalue()
+        try:
+            return json.loads(output[output.index('{'):])
+        except ValueError:
+            raise AssertionError('%s did not exit with a result: %s' % (name, output))
+
+
+@pytest.fixture
+def cloud(monkeypatch):
+    """ A fresh fake cloud which footmark and oss2 reach through HTTP_PROXY, with waits made instant """
+    fake = FakeAlicloud().start()
+    for name in PROXY_VARIABLES:
+        monkeypatch.setenv(name, fake.proxy)
+    monkeypatch.setenv('ALIBABA_CLOUD_CA_BUNDLE', fake.ca_bundle)
+    for name in ('NO_PROXY', 'no_proxy') + ALICLOUD_VARIABLES:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    yield fake
+    fake.stop()
+
+
+@pytest.fixture
+def run_module(cloud):
+    return ModuleRunner(cloud)
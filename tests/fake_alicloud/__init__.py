@@ -0,0 +1,5 @@
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from .cloud import FakeAlicloud, Call
+from .engine import ApiError
@@ -0,0 +1,217 @@
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The fake cloud is an HTTP proxy: footmark and oss2 are pointed at it with HTTP_PROXY and send it the requests meant
+for the real endpoints, which are answered from in-memory state. The products whose SDK requests insist on HTTPS, like
+RAM, tunnel through it with CONNECT and are answered with a self-signed certificate for *.aliyuncs.com, which the SDK
+trusts through ALIBABA_CLOUD_CA_BUNDLE.
+"""
+
+import os
+import ssl
+import json
+import random
+import datetime
+import tempfile
+import threading
+from collections import namedtuple
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlsplit, parse_qsl
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urlsplit, parse_qsl
+
+from .engine import ApiError, new_id
+from .services import SERVICES
+from .oss import OssService
+
+Call = namedtuple('Call', ['service', 'action', 'params', 'status', 'request_bytes', 'response_bytes'])
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+_CERTIFICATE = {}
+
+
+def certificate(region):
+    """ The path of a self-signed certificate for the endpoints of the region, made once per process """
+    if region not in _CERTIFICATE:
+        from cryptography import x509
+        from cryptography.x509.oid import NameOID
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, u'aliyuncs.com')])
+        today = datetime.datetime.utcnow()
+        names = [u'aliyuncs.com', u'*.aliyuncs.com', u'*.%s.aliyuncs.com' % region]
+        cert = x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(key.public_key()) \
+            .serial_number(x509.random_serial_number()) \
+            .not_valid_before(today - datetime.timedelta(days=1)).not_valid_after(today + datetime.timedelta(days=30)) \
+            .add_extension(x509.SubjectAlternativeName([x509.DNSName(n) for n in names]), critical=False) \
+            .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True) \
+            .add_extension(x509.SubjectKeyIdentifier.from_public_key(key.public_key()), critical=False) \
+            .sign(key, hashes.SHA256())
+        fd, path = tempfile.mkstemp(prefix='fake-alicloud-', suffix='.pem')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.TraditionalOpenSSL,
+                                      serialization.NoEncryption()))
+            f.write(cert.public_bytes(serialization.Encoding.PEM))
+        _CERTIFICATE[region] = path
+    return _CERTIFICATE[region]
+
+
+class FakeAlicloud(object):
+    """A stateful stand-in for the Alibaba Cloud endpoints.
+
+    :param latency: seconds added to every request, or a dict of seconds per action.
+    :param throttle_rate: the probability of answering a request with a Throttling error.
+    :param throttle_every: answer every Nth request with a Throttling error.
+    """
+
+    def __init__(self, region='cn-hangzhou', latency=0, throttle_rate=0, throttle_every=0, seed=0):
+        self.region = region
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.throttle_every = throttle_every
+        self.random = random.Random(seed)
+        self.lock = threading.RLock()
+        self.calls = []
+        self.services = dict((name, cls(self)) for name, cls in SERVICES.items())
+        self.services['oss'] = OssService(self)
+        self.server = None
+        self.thread = None
+
+    def __getitem__(self, name):
+        return self.services[name]
+
+    @property
+    def proxy(self):
+        return 'http://%s:%d' % self.server.server_address
+
+    @property
+    def ca_bundle(self):
+        return certificate(self.region)
+
+    def start(self, port=0):
+        cloud = self
+
+        class Handler(_Handler):
+            pass
+        Handler.cloud = cloud
+        Handler.tls = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        Handler.tls.load_cert_chain(self.ca_bundle)
+        self.server = _Server(('127.0.0.1', port), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def reset_calls(self):
+        with self.lock:
+            del self.calls[:]
+
+    def _delay(self, action):
+        latency = self.latency.get(action, 0) if isinstance(self.latency, dict) else self.latency
+        if latency:
+            threading.Event().wait(latency)
+
+    def _throttled(self):
+        if self.throttle_every and len(self.calls) % self.throttle_every == 0:
+            return True
+        return self.throttle_rate and self.random.random() < self.throttle_rate
+
+    def call(self, host, method, path, params, body, request_headers=None, request_bytes=None):
+        """ Answer one request and return the status, the headers and the body of the response """
+        if request_bytes is None:
+            request_bytes = len(path) + len(body or b'')
+        service = service_of(host)
+        action = params.get('Action') or '%s %s' % (method, path)
+        self._delay(action)
+        with self.lock:
+            if self._throttled():
+                status, headers, data = error_response(ApiError('Throttling', 'Request was denied due to request throttling.', 400))
+            elif service == 'oss':
+                status, headers, data = self.services['oss'].handle_http(host, method, path, params, body, request_headers or {})
+                action = self.services['oss'].last_action
+            elif service not in self.services:
+                status, headers, data = error_response(ApiError('InvalidProduct', 'Unknown endpoint %s.' % host, 404))
+            else:
+                try:
+                    result = self.services[service].handle(action, params)
+                    result = dict(result or {})
+                    result.setdefault('RequestId', new_id('req-'))
+                    status, headers, data = 200, {'Content-Type': 'application/json'}, json.dumps(result, sort_keys=True).encode('utf-8')
+                except ApiError as e:
+                    status, headers, data = error_response(e)
+                except Exception as e:
+                    # A bug of the fake, reported to the client rather than dropping the connection
+                    status, headers, data = error_response(ApiError('InternalError', repr(e), 500))
+            self.calls.append(Call(service, action, params, status, request_bytes, len(data)))
+        return status, headers, data
+
+
+def service_of(host):
+    name = host.split(':')[0].split('.')
+    if len(name) > 2 and name[1].startswith('oss-') or name[0].startswith('oss-'):
+        return 'oss'
+    product = name[0].split('-')[0]
+    return {'alidns': 'dns'}.get(product, product)
+
+
+def error_response(error):
+    body = dict(RequestId=new_id('req-'), HostId='fake.aliyuncs.com', Code=error.code, Message=error.message)
+    return error.status, {'Content-Type': 'application/json'}, json.dumps(body).encode('utf-8')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    cloud = None
+    tls = None
+    protocol_version = 'HTTP/1.1'
+
+    def do_CONNECT(self):
+        """ Open the tunnel and keep reading the requests from it, over TLS """
+        self.send_response(200, 'Connection established')
+        self.end_headers()
+        self.wfile.flush()
+        self.connection = self.tls.wrap_socket(self.connection, server_side=True)
+        self.rfile = self.connection.makefile('rb', self.rbufsize)
+        self.wfile = self.connection.makefile('wb', 0)
+        self.close_connection = False
+
+    def _handle(self):
+        url = urlsplit(self.path)
+        host = url.netloc or self.headers.get('Host', '')
+        body = b''
+        if self.headers.get('Content-Length'):
+            body = self.rfile.read(int(self.headers['Content-Length']))
+        params = dict(parse_qsl(url.query, keep_blank_values=True))
+        if body and 'application/x-www-form-urlencoded' in str(self.headers.get('Content-Type')):
+            params.update(parse_qsl(body.decode('utf-8'), keep_blank_values=True))
+        status, headers, data = self.cloud.call(host, self.command, url.path, params, body, dict(self.headers.items()),
+                                                request_bytes=len(self.path) + len(body))
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = _handle
+
+    def log_message(self, *args):
+        pass
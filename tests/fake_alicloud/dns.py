@@ -0,0 +1,96 @@
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The fake of Alibaba Cloud DNS: domains, addressed by their names, and the groups they belong to.
+"""
+
+from collections import OrderedDict
+
+from .engine import Service, ApiError, new_id, now
+
+DNS_SERVERS = ['dns1.hichina.com', 'dns2.hichina.com']
+
+
+class DnsService(Service):
+
+    def __init__(self, cloud):
+        super(DnsService, self).__init__(cloud)
+        self.domains = OrderedDict()
+        self.groups = OrderedDict()
+
+    def domain(self, params):
+        name = params.get('DomainName')
+        if name not in self.domains:
+            raise ApiError('InvalidDomainName.NoExist', 'The domain name %s does not exist.' % name)
+        return self.domains[name]
+
+    def group(self, group_id):
+        if group_id not in self.groups:
+            raise ApiError('InvalidGroupId.NoExist', 'The group %s does not exist.' % group_id)
+        return self.groups[group_id]
+
+    def AddDomain(self, params):
+        name = params.get('DomainName')
+        if name in self.domains:
+            raise ApiError('DomainAddedByOthers', 'The domain name %s has been added.' % name)
+        group = self.group(params['GroupId']) if params.get('GroupId') else dict(GroupId='', GroupName='')
+        self.domains[name] = OrderedDict([
+            ('DomainId', new_id('')), ('DomainName', name), ('GroupId', group['GroupId']),
+            ('GroupName', group['GroupName']), ('Remark', ''), ('AliDomain', False), ('RecordCount', 0),
+            ('VersionCode', 'mianfei'), ('PunyCode', name), ('CreateTime', now()),
+            ('ResourceGroupId', params.get('ResourceGroupId', '')), ('DnsServers', dict(DnsServer=DNS_SERVERS))])
+        return dict((k, self.domains[name][k]) for k in ('DomainId', 'DomainName', 'GroupId', 'GroupName',
+                                                         'DnsServers'))
+
+    def DescribeDomains(self, params):
+        domains = [d for d in self.domains.values()
+                   if not params.get('KeyWord') or params['KeyWord'] in d['DomainName']]
+        if params.get('GroupId'):
+            domains = [d for d in domains if d['GroupId'] == params['GroupId']]
+        params = dict(params, PageSize=params.get('PageSize') or 20)
+        return self.page(domains, params, 'Domains', 'Domain', max_size=100)
+
+    def DescribeDomainInfo(self, params):
+        return self.domain(params)
+
+    def UpdateDomainRemark(self, params):
+        self.domain(params)['Remark'] = params.get('Remark', '')
+        return {}
+
+    def ChangeDomainGroup(self, params):
+        domain = self.domain(params)
+        group = self.group(params.get('GroupId'))
+        domain.update(GroupId=group['GroupId'], GroupName=group['GroupName'])
+        return dict(GroupId=group['GroupId'], GroupName=group['GroupName'])
+
+    def DeleteDomain(self, params):
+        domain = self.domains.pop(self.domain(params)['DomainName'])
+        return dict(DomainName=domain['DomainName'])
+
+    def AddDomainGroup(self, params):
+        group = OrderedDict([('GroupId', new_id('')), ('GroupName', params.get('GroupName'))])
+        self.groups[group['GroupId']] = group
+        return dict(group)
+
+    def DescribeDomainGroups(self, params):
+        groups = [dict(g, DomainCount=sum(1 for d in self.domains.values() if d['GroupId'] == g['GroupId']))
+                  for g in self.groups.values()
+                  if not params.get('KeyWord') or params['KeyWord'] in g['GroupName']]
+        params = dict(params, PageSize=params.get('PageSize') or 20)
+        return self.page(groups, params, 'DomainGroups', 'DomainGroup', max_size=100)
+
+    def UpdateDomainGroup(self, params):
+        group = self.group(params.get('GroupId'))
+        group['GroupName'] = params.get('GroupName', group['GroupName'])
+        for domain in self.domains.values():
+            if domain['GroupId'] == group['GroupId']:
+                domain['GroupName'] = group['GroupName']
+        return dict(group)
+
+    def DeleteDomainGroup(self, params):
+        group = self.group(params.get('GroupId'))
+        if any(d['GroupId'] == group['GroupId'] for d in self.domains.values()):
+            raise ApiError('Fobidden.NotEmptyGroup', 'The group still has domains.')
+        self.groups.pop(group['GroupId'])
+        return dict(GroupName=group['GroupName'])
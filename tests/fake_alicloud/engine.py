@@ -0,0 +1,289 @@
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The generic part of the fake API: resources declared by the services are created, described, modified and deleted
+by their usual RPC actions, and any action a service implements itself as a method named after it takes precedence.
+"""
+
+import re
+import ast
+import json
+import time
+import itertools
+from collections import OrderedDict
+
+# The parameters every RPC request carries which are not part of a resource
+COMMON_PARAMS = ('Action', 'Version', 'Format', 'Timestamp', 'SignatureMethod', 'SignatureType', 'SignatureVersion',
+                 'SignatureNonce', 'AccessKeyId', 'Signature', 'ClientToken', 'SecurityToken', 'on', 'RegionId',
+                 'PageNumber', 'PageSize', 'MaxResults', 'NextToken', 'Marker', 'MaxItems', 'DryRun')
+
+TAG_PARAM = re.compile(r'^Tags?\.(\d+)\.(Key|Value)$')
+TAG_KEY_PARAM = re.compile(r'^Tag(\d+)(Key|Value)$')
+
+_ids = itertools.count(1)
+
+
+class ApiError(Exception):
+    def __init__(self, code, message=None, status=400):
+        super(ApiError, self).__init__(message or code)
+        self.code = code
+        self.message = message or code
+        self.status = status
+
+
+def new_id(prefix):
+    return '%s%012x' % (prefix, next(_ids) * 7919 % (16 ** 12))
+
+
+def now():
+    return time.strftime('%Y-%m-%dT%H:%MZ', time.gmtime())
+
+
+def id_list(value):
+    """ Return the IDs of a parameter given as a JSON or Python list, a comma separated string or a single ID """
+    if value is None or value == '':
+        return []
+    if isinstance(value, list):
+        return value
+    value = str(value).strip()
+    if value.startswith('['):
+        try:
+            return [str(v) for v in json.loads(value)]
+        except ValueError:
+            pass
+    return [v.strip().strip('"\'') for v in value.strip('[]').split(',') if v.strip()]
+
+
+def repeat_list(params, name):
+    """ Return the values of a repeated parameter, given as Name.1, Name.2 and so on, in their numbered order """
+    prefix = name + '.'
+    numbered = [(int(k[len(prefix):]), v) for k, v in params.items() if k.startswith(prefix) and k[len(prefix):].isdigit()]
+    return [v for dummy, v in sorted(numbered)]
+
+
+def literal(value):
+    """ Return a JSON parameter as a Python value. The API parses it leniently, as the Python literals footmark
+    sends when it is given a list or a dict, and returns None for a value that is neither. """
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except ValueError:
+        try:
+            return ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            return None
+
+
+def tags_of(params):
+    """ Return the tags given as Tag.N.Key/Tag.N.Value or TagNKey/TagNValue parameters """
+    tags = {}
+    for key, value in params.items():
+        match = TAG_PARAM.match(key) or TAG_KEY_PARAM.match(key)
+        if match:
+            tags.setdefault(match.group(1), {})[match.group(2)] = value
+    return OrderedDict((t['Key'], t.get('Value', '')) for n, t in sorted(tags.items()) if t.get('Key'))
+
+
+def tag_list(tags, fields=('TagKey', 'TagValue')):
+    return dict(Tag=[dict(((fields[0], k), (fields[1], v))) for k, v in tags.items()])
+
+
+class Resource(object):
+    """Declares a kind of resource of a service.
+
+    By default the actions are the usual ones: Create<Name>, Describe<Plural>, Describe<Name>Attribute,
+    Modify<Name>Attribute and Delete<Name>, and the describe response lists the items as {Plural: {Name: [...]}}.
+    """
+
+    def __init__(self, name, prefix, plural=None, id_field=None, create=None, describe=None, attribute=None,
+                 delete=None, modify=None, defaults=None, filters=None, page_size=50, parent=None, tag_type=None):
+        self.name = name
+        self.prefix = prefix
+        self.plural = plural or name + 's'
+        self.id_field = id_field or name + 'Id'
+        self.create = create if create is not None else 'Create' + name
+        self.describe = describe if describe is not None else 'Describe' + self.plural
+        self.attribute = attribute if attribute is not None else 'Describe%sAttribute' % name
+        self.delete = delete if delete is not None else 'Delete' + name
+        self.modify = modify if modify is not None else ['Modify%sAttribute' % name]
+        self.defaults = defaults or {}
+        # Request parameters filtering the described items by another attribute, e.g. {'LoadBalancerName': ...}
+        self.filters = filters or {}
+        self.page_size = page_size
+        self.parent = parent
+        self.tag_type = tag_type or name.lower()
+
+
+class Service(object):
+    """A stateful fake of one product.
+
+    ``resources`` declares the generic resources. An action can be implemented as a method of the service named
+    after it, taking the request parameters and returning the response body.
+    """
+
+    resources = ()
+    # The names of the key and the value of the tags in the responses, e.g. ('Key', 'Value') for VPC
+    tag_fields = ('TagKey', 'TagValue')
+
+    def __init__(self, cloud):
+        self.cloud = cloud
+        self.store = OrderedDict((r.name, OrderedDict()) for r in self.resources)
+        self.by_action = {}
+        for r in self.resources:
+            for action in [r.create, r.describe, r.attribute, r.delete] + list(r.modify):
+                if action:
+                    self.by_action.setdefault(action, r)
+
+    def resource(self, name):
+        for r in self.resources:
+            if r.name == name:
+                return r
+        raise KeyError(name)
+
+    def handle(self, action, params):
+        method = getattr(self, action, None)
+        if method is not None and callable(method) and action[0].isupper():
+            return method(params)
+        resource = self.by_action.get(action)
+        if resource is None:
+            raise ApiError('InvalidAction.NotFound', 'The specified action %s is not supported by the fake.' % action, 404)
+        if action == resource.create:
+            return self.create(resource, params)
+        if action == resource.describe:
+            return self.describe(resource, params)
+        if action == resource.attribute:
+            return self.get(resource, params[resource.id_field])
+        if action == resource.delete:
+            self.remove(resource, params.get(resource.id_field))
+            return {}
+        return self.modify(resource, params)
+
+    # Generic resource handling
+
+    def items(self, name):
+        return self.store[name]
+
+    def find(self, name, item_id):
+        return self.store[name].get(item_id)
+
+    def get(self, resource, item_id, code=None):
+        resource = self.resource(resource) if isinstance(resource, str) else resource
+        item = self.store[resource.name].get(item_id)
+        if item is None:
+            raise ApiError(code or 'Invalid%sId.NotFound' % resource.name,
+                           'The specified %s %s does not exist.' % (resource.name, item_id), 404)
+        return item
+
+    def new_item(self, resource, params, item_id=None):
+        resource = self.resource(resource) if isinstance(resource, str) else resource
+        item = OrderedDict()
+        for key, value in resource.defaults.items():
+            item[key] = value(params) if callable(value) else value
+        for key, value in params.items():
+            if key in COMMON_PARAMS or TAG_PARAM.match(key) or TAG_KEY_PARAM.match(key) or key.startswith('Tag.'):
+                continue
+            item[key] = value
+        item[resource.id_field] = item_id or new_id(resource.prefix)
+        item.setdefault('RegionId', params.get('RegionId', self.cloud.region))
+        item.setdefault('CreationTime', now())
+        item['Tags'] = tag_list(tags_of(params), self.tag_fields)
+        self.store[resource.name][item[resource.id_field]] = item
+        return item
+
+    def create(self, resource, params):
+        item = self.new_item(resource, params)
+        return {resource.id_field: item[resource.id_field]}
+
+    def remove(self, resource, item_id):
+        resource = self.resource(resource) if isinstance(resource, str) else resource
+        self.get(resource, item_id)
+        return self.store[resource.name].pop(item_id)
+
+    def modify(self, resource, params):
+        item = self.get(resource, params.get(resource.id_field))
+        for key, value in params.items():
+            if key not in COMMON_PARAMS and key != resource.id_field:
+                item[key] = value
+        return {}
+
+    def matches(self, resource, item, params):
+        ids = []
+        for key in (resource.id_field, resource.id_field + 's'):
+            ids.extend(id_list(params.get(key)))
+        if ids and item[resource.id_field] not in ids:
+            return False
+        for param, field in resource.filters.items():
+            if params.get(param) not in (None, '') and str(item.get(field)) != str(params[param]):
+                return False
+        wanted = tags_of(params)
+        if wanted:
+            tags = self.tags(item)
+            for key, value in wanted.items():
+                if key not in tags or (value and tags[key] != value):
+                    return False
+        return True
+
+    def describe(self, resource, params, items=None):
+        items = [i for i in (self.store[resource.name].values() if items is None else items)
+                 if self.matches(resource, i, params)]
+        return self.page(items, params, resource.plural, resource.name, resource.page_size)
+
+    def page(self, items, params, plural, name, max_size=50):
+        number = int(params.get('PageNumber') or 1)
+        size = min(int(params.get('PageSize') or 10), max_size)
+        selected = items[(number - 1) * size:number * size]
+        return {plural: {name: selected}, 'TotalCount': len(items), 'PageNumber': number, 'PageSize': size}
+
+    def token_page(self, items, params, plural, name, max_size=100, size_param='MaxResults', token_param='NextToken'):
+        start = int(params.get(token_param) or 0)
+        size = min(int(params.get(size_param) or max_size), max_size)
+        body = {plural: {name: items[start:start + size]}, 'TotalCount': len(items)}
+        if start + size < len(items):
+            body[token_param] = str(start + size)
+        return body
+
+    # Tags
+
+    def tags(self, item):
+        key, value = self.tag_fields
+        return OrderedDict((t[key], t[value]) for t in item.get('Tags', {}).get('Tag', []))
+
+    def tagged(self, resource_id):
+        for name, items in self.store.items():
+            if resource_id in items:
+                return self.resource(name), items[resource_id]
+        return None, None
+
+    def TagResources(self, params):
+        for resource_id in [v for k, v in sorted(params.items()) if k.startswith('ResourceId.')]:
+            resource, item = self.tagged(resource_id)
+            if item is None:
+                raise ApiError('InvalidResourceId.NotFound', 'The resource %s does not exist.' % resource_id, 404)
+            tags = self.tags(item)
+            tags.update(tags_of(params))
+            item['Tags'] = tag_list(tags, self.tag_fields)
+        return {}
+
+    def UntagResources(self, params):
+        keys = [v for k, v in params.items() if k.startswith('TagKey.')]
+        for resource_id in [v for k, v in sorted(params.items()) if k.startswith('ResourceId.')]:
+            resource, item = self.tagged(resource_id)
+            if item is None:
+                raise ApiError('InvalidResourceId.NotFound', 'The resource %s does not exist.' % resource_id, 404)
+            remove_all = str(params.get('All')).lower() == 'true' or not keys
+            item['Tags'] = tag_list(OrderedDict((k, v) for k, v in self.tags(item).items()
+                                                if not remove_all and k not in keys), self.tag_fields)
+        return {}
+
+    def ListTagResources(self, params):
+        result = []
+        for resource_id in [v for k, v in sorted(params.items()) if k.startswith('ResourceId.')]:
+            resource, item = self.tagged(resource_id)
+            if item is None:
+                continue
+            for key, value in self.tags(item).items():
+                result.append(dict(ResourceId=resource_id, ResourceType=params.get('ResourceType', resource.tag_type),
+                                   TagKey=key, TagValue=value))
+        return self.token_page(result, params, 'TagResources', 'TagResource', 50)
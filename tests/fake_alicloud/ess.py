@@ -0,0 +1,255 @@
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The fake of Auto Scaling: scaling groups with their configurations, instances, rules and the scheduled tasks running
+the rules. The 2014-08-28 API addresses several resources with numbered parameters, e.g. ScalingGroupId1..20.
+"""
+
+from collections import OrderedDict
+
+from .engine import Service, ApiError, new_id, now, id_list
+
+
+def numbered(params, name, limit=20):
+    """ The values of the numbered parameters name1..limit, also accepting the name.N form of newer versions """
+    values = []
+    for i in range(1, limit + 1):
+        for key in ('%s%d' % (name, i), '%s.%d' % (name, i)):
+            if params.get(key):
+                values.append(params[key])
+    return values
+
+
+class EssService(Service):
+
+    def __init__(self, cloud):
+        super(EssService, self).__init__(cloud)
+        self.groups = OrderedDict()
+        self.configurations = OrderedDict()
+        self.instances = OrderedDict()
+        self.rules = OrderedDict()
+        self.tasks = OrderedDict()
+
+    def lookup(self, store, item_id, code):
+        if item_id not in store:
+            raise ApiError(code, 'The specified resource %s is not found.' % item_id, 404)
+        return store[item_id]
+
+    def listed(self, items, params, plural, name, ids=(), names=(), id_field=None, name_field=None):
+        if ids:
+            items = [i for i in items if i[id_field] in ids]
+        if names:
+            items = [i for i in items if i[name_field] in names]
+        return self.page(items, params, plural, name, max_size=50)
+
+    # Scaling groups
+
+    def CreateScalingGroup(self, params):
+        group_id = new_id('asg-')
+        policies = numbered(params, 'RemovalPolicy', 2) or ['OldestScalingConfiguration', 'OldestInstance']
+        self.groups[group_id] = OrderedDict([
+            ('ScalingGroupId', group_id), ('ScalingGroupName', params.get('ScalingGroupName') or group_id),
+            ('RegionId', self.cloud.region), ('LifecycleState', 'Inactive'),
+            ('MaxSize', int(params.get('MaxSize', 0))), ('MinSize', int(params.get('MinSize', 0))),
+            ('DefaultCooldown', int(params.get('DefaultCooldown') or 300)),
+            ('RemovalPolicies', dict(RemovalPolicy=policies)), ('ActiveScalingConfigurationId', ''),
+            ('LoadBalancerIds', dict(LoadBalancerId=id_list(params.get('LoadBalancerIds')))),
+            ('DBInstanceIds', dict(DBInstanceId=id_list(params.get('DBInstanceIds')))),
+            ('VSwitchIds', dict(VSwitchId=id_list(params.get('VSwitchIds')))), ('CreationTime', now()),
+            ('TotalCapacity', 0), ('ActiveCapacity', 0), ('PendingCapacity', 0), ('RemovingCapacity', 0)])
+        return dict(ScalingGroupId=group_id)
+
+    def DescribeScalingGroups(self, params):
+        return self.listed(list(self.groups.values()), params, 'ScalingGroups', 'ScalingGroup',
+                           numbered(params, 'ScalingGroupId'), numbered(params, 'ScalingGroupName'),
+                           'ScalingGroupId', 'ScalingGroupName')
+
+    def ModifyScalingGroup(self, params):
+        group = self.lookup(self.groups, params.get('ScalingGroupId'), 'InvalidScalingGroupId.NotFound')
+        for field in ('MaxSize', 'MinSize', 'DefaultCooldown'):
+            if params.get(field) is not None:
+                group[field] = int(params[field])
+        if params.get('ScalingGroupName'):
+            group['ScalingGroupName'] = params['ScalingGroupName']
+        if numbered(params, 'RemovalPolicy', 2):
+            group['RemovalPolicies'] = dict(RemovalPolicy=numbered(params, 'RemovalPolicy', 2))
+        if params.get('ActiveScalingConfigurationId'):
+            self.lookup(self.configurations, params['ActiveScalingConfigurationId'],
+                        'InvalidScalingConfigurationId.NotFound')
+            group['ActiveScalingConfigurationId'] = params['ActiveScalingConfigurationId']
+        return {}
+
+    def EnableScalingGroup(self, params):
+        group = self.lookup(self.groups, params.get('ScalingGroupId'), 'InvalidScalingGroupId.NotFound')
+        configuration_id = params.get('ActiveScalingConfigurationId') or group['ActiveScalingConfigurationId']
+        if not configuration_id:
+            configurations = [c for c in self.configurations.values() if c['ScalingGroupId'] == group['ScalingGroupId']]
+            if not configurations:
+                raise ApiError('IncorrectScalingGroup.ActiveScalingConfigurationNotExist',
+                               'The scaling group has no scaling configuration.')
+            configuration_id = configurations[0]['ScalingConfigurationId']
+        group.update(LifecycleState='Active', ActiveScalingConfigurationId=configuration_id)
+        for configuration in self.configurations.values():
+            if configuration['ScalingGroupId'] == group['ScalingGroupId']:
+                configuration['LifecycleState'] = 'Active' if configuration['ScalingConfigurationId'] == configuration_id else 'Inactive'
+        return {}
+
+    def DisableScalingGroup(self, params):
+        self.lookup(self.groups, params.get('ScalingGroupId'), 'InvalidScalingGroupId.NotFound')['LifecycleState'] = 'Inactive'
+        return {}
+
+    def DeleteScalingGroup(self, params):
+        group = self.lookup(self.groups, params.get('ScalingGroupId'), 'InvalidScalingGroupId.NotFound')
+        members = [i for i in self.instances.values() if i['ScalingGroupId'] == group['ScalingGroupId']]
+        if members and str(params.get('ForceDelete')).lower() != 'true':
+            raise ApiError('IncorrectScalingGroupStatus', 'The scaling group still has instances.')
+        for store in (self.instances, self.configurations, self.rules):
+            for item_id in [k for k, v in store.items() if v['ScalingGroupId'] == group['ScalingGroupId']]:
+                store.pop(item_id)
+        self.groups.pop(group['ScalingGroupId'])
+        return {}
+
+    # Scaling configurations
+
+    def CreateScalingConfiguration(self, params):
+        group = self.lookup(self.groups, params.get('ScalingGroupId'), 'InvalidScalingGroupId.NotFound')
+        for field in ('ImageId', 'InstanceType'):
+            if not params.get(field):
+                raise ApiError('MissingParameter', 'The input parameter "%s" that is mandatory for processing this request is not supplied.' % field)
+        configuration_id = new_id('asc-')
+        self.configurations[configuration_id] = OrderedDict([
+            ('ScalingConfigurationId', configuration_id), ('ScalingGroupId', group['ScalingGroupId']),
+            ('ScalingConfigurationName', params.get('ScalingConfigurationName') or configuration_id),
+            ('ImageId', params['ImageId']), ('InstanceType', params['InstanceType']),
+            ('SecurityGroupId', params.get('SecurityGroupId', '')), ('LifecycleState', 'Inactive'),
+            ('InternetChargeType', params.get('InternetChargeType', 'PayByBandwidth')),
+            ('InternetMaxBandwidthIn', int(params.get('InternetMaxBandwidthIn') or 200)),
+            ('InternetMaxBandwidthOut', int(params.get('InternetMaxBandwidthOut') or 0)),
+            ('SystemDiskCategory', params.get('SystemDisk.Category', 'cloud_efficiency')),
+            ('SystemDiskSize', int(params.get('SystemDisk.Size') or 40)), ('DataDisks', dict(DataDisk=[])),
+            ('KeyPairName', params.get('KeyPairName', '')), ('RamRoleName', params.get('RamRoleName', '')),
+            ('UserData', params.get('UserData', '')), ('CreationTime', now())])
+        return dict(ScalingConfigurationId=configuration_id)
+
+    def DescribeScalingConfigurations(self, params):
+        items = [c for c in self.configurations.values()
+                 if not params.get('ScalingGroupId') or c['ScalingGroupId'] == params['ScalingGroupId']]
+        return self.listed(items, params, 'ScalingConfigurations', 'ScalingConfiguration',
+                           numbered(params, 'ScalingConfigurationId', 10), numbered(params, 'ScalingConfigurationName', 10),
+                           'ScalingConfigurationId', 'ScalingConfigurationName')
+
+    def DeleteScalingConfiguration(self, params):
+        configuration = self.lookup(self.configurations, params.get('ScalingConfigurationId'),
+                                    'InvalidScalingConfigurationId.NotFound')
+        if configuration['LifecycleState'] == 'Active':
+            raise ApiError('IncorrectScalingConfigurationLifecycleState', 'An active scaling configuration cannot be deleted.')
+        self.configurations.pop(configuration['ScalingConfigurationId'])
+        return {}
+
+    # Scaling instances
+
+    def AttachInstances(self, params):
+        group = self.lookup(self.groups, params.get('ScalingGroupId'), 'InvalidScalingGroupId.NotFound')
+        if group['LifecycleState'] != 'Active':
+            raise ApiError('IncorrectScalingGroupStatus', 'The current status of the specified scaling group does not support this action.')
+        ecs = self.cloud['ecs']
+        for instance_id in numbered(params, 'InstanceId'):
+            ecs.get('Instance', instance_id)
+            if instance_id in self.instances:
+                raise ApiError('IncorrectInstanceStatus', 'The instance %s is already in a scaling group.' % instance_id)
+            self.instances[instance_id] = OrderedDict([
+                ('InstanceId', instance_id), ('ScalingGroupId', group['ScalingGroupId']),
+                ('ScalingConfigurationId', ''), ('HealthStatus', 'Healthy'), ('LifecycleState', 'InService'),
+                ('CreationType', 'Attached'), ('CreationTime', now())])
+        return dict(ScalingActivityId=new_id('asa-'))
+
+    def RemoveInstances(self, params):
+        self.lookup(self.groups, params.get('ScalingGroupId'), 'InvalidScalingGroupId.NotFound')
+        for instance_id in numbered(params, 'InstanceId'):
+            self.lookup(self.instances, instance_id, 'InvalidInstanceId.NotFound')
+            self.instances.pop(instance_id)
+        return dict(ScalingActivityId=new_id('asa-'))
+
+    def DescribeScalingInstances(self, params):
+        items = [i for i in self.instances.values()
+                 if all(not params.get(f) or i[f] == params[f]
+                        for f in ('ScalingGroupId', 'ScalingConfigurationId', 'HealthStatus', 'LifecycleState', 'CreationType'))]
+        return self.listed(items, params, 'ScalingInstances', 'ScalingInstance',
+                           numbered(params, 'InstanceId'), id_field='InstanceId')
+
+    # Scaling rules
+
+    def CreateScalingRule(self, params):
+        group = self.lookup(self.groups, params.get('ScalingGroupId'), 'InvalidScalingGroupId.NotFound')
+        rule_id = new_id('asr-')
+        self.rules[rule_id] = OrderedDict([
+            ('ScalingRuleId', rule_id), ('ScalingGroupId', group['ScalingGroupId']),
+            ('ScalingRuleName', params.get('ScalingRuleName') or rule_id),
+            ('ScalingRuleAri', 'ari:acs:ess:%s:1234567890:scalingrule/%s' % (self.cloud.region, rule_id)),
+            ('AdjustmentType', params.get('AdjustmentType')), ('AdjustmentValue', int(params.get('AdjustmentValue', 0))),
+            ('Cooldown', int(params.get('Cooldown') or 0))])
+        return dict(ScalingRuleId=rule_id, ScalingRuleAri=self.rules[rule_id]['ScalingRuleAri'])
+
+    def DescribeScalingRules(self, params):
+        items = [r for r in self.rules.values()
+                 if not params.get('ScalingGroupId') or r['ScalingGroupId'] == params['ScalingGroupId']]
+        aris = numbered(params, 'ScalingRuleAri', 10)
+        if aris:
+            items = [r for r in items if r['ScalingRuleAri'] in aris]
+        return self.listed(items, params, 'ScalingRules', 'ScalingRule', numbered(params, 'ScalingRuleId', 10),
+                           numbered(params, 'ScalingRuleName', 10), 'ScalingRuleId', 'ScalingRuleName')
+
+    def ModifyScalingRule(self, params):
+        rule = self.lookup(self.rules, params.get('ScalingRuleId'), 'InvalidScalingRuleId.NotFound')
+        for field in ('AdjustmentType', 'ScalingRuleName'):
+            if params.get(field):
+                rule[field] = params[field]
+        for field in ('AdjustmentValue', 'Cooldown'):
+            if params.get(field) is not None:
+                rule[field] = int(params[field])
+        return {}
+
+    def DeleteScalingRule(self, params):
+        self.rules.pop(self.lookup(self.rules, params.get('ScalingRuleId'), 'InvalidScalingRuleId.NotFound')['ScalingRuleId'])
+        return {}
+
+    # Scheduled tasks
+
+    def CreateScheduledTask(self, params):
+        if not any(r['ScalingRuleAri'] == params.get('ScheduledAction') for r in self.rules.values()):
+            raise ApiError('InvalidScheduledAction', 'The scaling rule %s does not exist.' % params.get('ScheduledAction'))
+        task_id = new_id('')
+        self.tasks[task_id] = OrderedDict([
+            ('ScheduledTaskId', task_id), ('ScheduledTaskName', params.get('ScheduledTaskName') or task_id),
+            ('Description', params.get('Description', '')), ('ScheduledAction', params['ScheduledAction']),
+            ('LaunchTime', params.get('LaunchTime')), ('LaunchExpirationTime', int(params.get('LaunchExpirationTime') or 600)),
+            ('RecurrenceType', params.get('RecurrenceType', '')), ('RecurrenceValue', params.get('RecurrenceValue', '')),
+            ('RecurrenceEndTime', params.get('RecurrenceEndTime', '')),
+            ('TaskEnabled', str(params.get('TaskEnabled', True)).lower() == 'true')])
+        return dict(ScheduledTaskId=task_id)
+
+    def DescribeScheduledTasks(self, params):
+        items = list(self.tasks.values())
+        aris = numbered(params, 'ScheduledAction', 10)
+        if aris:
+            items = [t for t in items if t['ScheduledAction'] in aris]
+        return self.listed(items, params, 'ScheduledTasks', 'ScheduledTask', numbered(params, 'ScheduledTaskId'),
+                           numbered(params, 'ScheduledTaskName'), 'ScheduledTaskId', 'ScheduledTaskName')
+
+    def ModifyScheduledTask(self, params):
+        task = self.lookup(self.tasks, params.get('ScheduledTaskId'), 'InvalidScheduledTaskId.NotFound')
+        if params.get('ScalingRuleAri'):
+            task['ScheduledAction'] = params['ScalingRuleAri']
+        for field in ('LaunchTime', 'ScheduledTaskName', 'Description', 'RecurrenceType', 'RecurrenceValue', 'RecurrenceEndTime'):
+            if params.get(field):
+                task[field] = params[field]
+        if params.get('LaunchExpirationTime') is not None:
+            task['LaunchExpirationTime'] = int(params['LaunchExpirationTime'])
+        if params.get('TaskEnabled') is not None:
+            task['TaskEnabled'] = str(params['TaskEnabled']).lower() == 'true'
+        return {}
+
+    def DeleteScheduledTask(self, params):
+        self.tasks.pop(self.lookup(self.tasks, params.get('ScheduledTaskId'), 'InvalidScheduledTaskId.NotFound')['ScheduledTaskId'])
+        return {}
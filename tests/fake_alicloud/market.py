@@ -0,0 +1,53 @@
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The fake of the Alibaba Cloud Marketplace: a fixed catalog of image products, whose image ids are offered in every
+region the ECS fake knows about.
+"""
+
+from collections import OrderedDict
+
+from .engine import Service, ApiError
+
+
+def catalog(regions):
+    products = []
+    for i, (name, price) in enumerate([('CentOS 7.9', '0'), ('Ubuntu 20.04 LAMP', '0.5'),
+                                       ('Windows Server 2019 IIS', '1.25'), ('Docker CE on CentOS', '0.35')]):
+        code = 'cmjj%06d' % (i + 1)
+        values = [OrderedDict([('DisplayName', '%s %s' % (region, name)), ('Value', 'm-%s%03d' % (region[-4:], i)),
+                               ('Remark', '')]) for region in regions]
+        products.append(OrderedDict([
+            ('Code', code), ('Name', name), ('Type', 'MIRROR'), ('SupplierId', 1000 + i),
+            ('SupplierName', 'Fake Supplier %d' % i), ('SuggestedPrice', price), ('Score', '5.0'),
+            ('ShortDescription', name), ('Tags', ''), ('DeliveryWay', 'IMAGE'), ('ImageUrl', ''),
+            ('ProductSkus', dict(ProductSku=[dict(Code='yuncode%06d' % i, Name=name, Modules=dict(Module=[
+                dict(Code='img_id', Name='Image', Id=i, Properties=dict(Property=[
+                    dict(Key='img_id', Name='Image', ShowType='none', DisplayUnit='',
+                         PropertyValues=dict(PropertyValue=values))]))]))]))]))
+    return products
+
+
+class MarketService(Service):
+
+    def __init__(self, cloud):
+        super(MarketService, self).__init__(cloud)
+        self.products = None
+
+    def catalog(self):
+        if self.products is None:
+            regions = self.cloud['ecs'].DescribeRegions({})['Regions']['Region']
+            self.products = OrderedDict((p['Code'], p) for p in catalog([r['LocalName'] for r in regions]))
+        return self.products
+
+    def DescribeProducts(self, params):
+        items = [dict((k, v) for k, v in p.items() if k != 'ProductSkus') for p in self.catalog().values()
+                 if not params.get('SearchTerm') or params['SearchTerm'] in p['Name']]
+        return self.page(items, params, 'ProductItems', 'ProductItem', max_size=50)
+
+    def DescribeProduct(self, params):
+        code = params.get('Code')
+        if code not in self.catalog():
+            raise ApiError('PRODUCT_NOT_FOUND', 'The product %s does not exist.' % code, 404)
+        return self.catalog()[code]
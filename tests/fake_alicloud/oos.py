@@ -0,0 +1,156 @@
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The fake of Operation Orchestration: templates, addressed by their names, and their executions. An execution in the
+Automatic mode succeeds at once, one in the Debug mode keeps running until it is notified or cancelled.
+"""
+
+import json
+import hashlib
+from collections import OrderedDict
+
+from .engine import Service, ApiError, new_id, now, id_list, literal
+
+
+def mapping(value):
+    """ A JSON object parameter as a dict """
+    return dict(literal(value) or {})
+
+
+class OosService(Service):
+
+    def __init__(self, cloud):
+        super(OosService, self).__init__(cloud)
+        self.templates = OrderedDict()
+        self.executions = OrderedDict()
+
+    def template(self, params):
+        name = params.get('TemplateName')
+        if name not in self.templates:
+            raise ApiError('EntityNotExists.Template', 'The template %s does not exist.' % name, 404)
+        return self.templates[name]
+
+    def template_view(self, template):
+        return dict((k, v) for k, v in template.items() if k != 'Content')
+
+    def CreateTemplate(self, params):
+        name = params.get('TemplateName')
+        if name in self.templates:
+            raise ApiError('EntityAlreadyExists.Template', 'The template %s already exists.' % name, 409)
+        content = params.get('Content', '')
+        self.templates[name] = OrderedDict([
+            ('TemplateId', new_id('t-')), ('TemplateName', name), ('TemplateVersion', 'v1'),
+            ('Description', json.loads(content or '{}').get('Description', '')), ('Hash', hashlib.sha256(content.encode('utf-8')).hexdigest()),
+            ('ShareType', 'Private'), ('CreatedBy', 'fake'), ('CreatedDate', now()), ('UpdatedDate', now()),
+            ('Tags', mapping(params.get('Tags'))), ('Content', content)])
+        return dict(Template=self.template_view(self.templates[name]))
+
+    def GetTemplate(self, params):
+        template = self.template(params)
+        return dict(Template=self.template_view(template), Content=template['Content'])
+
+    def ListTemplates(self, params):
+        templates = [self.template_view(t) for t in self.templates.values()
+                     if not params.get('TemplateName') or params['TemplateName'] in t['TemplateName']]
+        tags = mapping(params.get('Tags'))
+        templates = [t for t in templates if all(t['Tags'].get(k) == v for k, v in tags.items())]
+        body = self.token_page(templates, params, 'Templates', 'Template', max_size=100)
+        body['Templates'] = body['Templates']['Template']
+        return body
+
+    def UpdateTemplate(self, params):
+        template = self.template(params)
+        if params.get('Content') and params['Content'] != template['Content']:
+            version = int(template['TemplateVersion'][1:]) + 1
+            template.update(Content=params['Content'], TemplateVersion='v%d' % version, UpdatedDate=now(),
+                            Hash=hashlib.sha256(params['Content'].encode('utf-8')).hexdigest())
+        return dict(Template=self.template_view(template))
+
+    def DeleteTemplate(self, params):
+        template = self.template(params)
+        if any(e['TemplateName'] == template['TemplateName'] and e['Status'] == 'Running' for e in self.executions.values()):
+            raise ApiError('DeleteConflict.Template', 'The template has running executions.', 409)
+        self.templates.pop(template['TemplateName'])
+        return {}
+
+    # Tags of the templates, addressed by their names
+
+    def tagged_templates(self, params):
+        if params.get('ResourceType', 'template').lower() != 'template':
+            raise ApiError('InvalidParameter.ResourceType', 'The resource type must be template.')
+        return [self.template(dict(TemplateName=name)) for name in id_list(params.get('ResourceIds'))]
+
+    def TagResources(self, params):
+        for template in self.tagged_templates(params):
+            template['Tags'].update(mapping(params.get('Tags')))
+        return {}
+
+    def UntagResources(self, params):
+        keys = id_list(params.get('TagKeys'))
+        for template in self.tagged_templates(params):
+            for key in keys:
+                template['Tags'].pop(key, None)
+        return {}
+
+    def ListTagResources(self, params):
+        wanted = mapping(params.get('Tags'))
+        resources = [OrderedDict([('ResourceId', t['TemplateName']), ('ResourceType', 'ALIYUN::OOS::TEMPLATE'),
+                                  ('TagKey', k), ('TagValue', v)])
+                     for t in self.tagged_templates(params) for k, v in t['Tags'].items()
+                     if not wanted or k in wanted]
+        return dict(TagResources=dict(TagResource=resources))
+
+    # Executions
+
+    def execution(self, execution_id):
+        if execution_id not in self.executions:
+            raise ApiError('EntityNotExists.Execution', 'The execution %s does not exist.' % execution_id, 404)
+        return self.executions[execution_id]
+
+    def StartExecution(self, params):
+        template = self.template(params)
+        mode = params.get('Mode') or 'Automatic'
+        execution_id = new_id('exec-')
+        self.executions[execution_id] = OrderedDict([
+            ('ExecutionId', execution_id), ('TemplateName', template['TemplateName']),
+            ('TemplateId', template['TemplateId']), ('TemplateVersion', template['TemplateVersion']),
+            ('Mode', mode), ('LoopMode', params.get('LoopMode', 'Automatic')),
+            ('SafetyCheck', params.get('SafetyCheck', 'ConfirmEveryHighRiskAction')),
+            ('Parameters', mapping(params.get('Parameters'))), ('Outputs', {}), ('Tags', mapping(params.get('Tags'))),
+            ('Description', params.get('Description', '')), ('ParentExecutionId', params.get('ParentExecutionId', '')),
+            ('Status', 'Running' if mode == 'Debug' else 'Success'), ('StatusMessage', ''),
+            ('ExecutedBy', 'fake'), ('StartDate', now()), ('EndDate', '' if mode == 'Debug' else now()),
+            ('CreateDate', now()), ('UpdateDate', now())])
+        return dict(Execution=self.executions[execution_id])
+
+    def ListExecutions(self, params):
+        executions = [e for e in self.executions.values()
+                      if all(not params.get(f) or e[f] == params[f]
+                             for f in ('ExecutionId', 'TemplateName', 'Status', 'ExecutedBy', 'Mode'))]
+        body = self.token_page(executions, params, 'Executions', 'Execution', max_size=100)
+        body['Executions'] = body['Executions']['Execution']
+        return body
+
+    def CancelExecution(self, params):
+        execution = self.execution(params.get('ExecutionId'))
+        if execution['Status'] == 'Running':
+            execution.update(Status='Cancelled', EndDate=now())
+        return {}
+
+    def NotifyExecution(self, params):
+        execution = self.execution(params.get('ExecutionId'))
+        notify_type = params.get('NotifyType')
+        if not notify_type:
+            raise ApiError('MissingParameter', 'The NotifyType is required.')
+        if execution['Status'] == 'Running' and notify_type in ('Approve', 'CompleteExecution'):
+            execution.update(Status=params.get('ExecutionStatus') or 'Success', EndDate=now())
+        elif execution['Status'] == 'Running' and notify_type == 'Reject':
+            execution.update(Status='Failed', EndDate=now())
+        return {}
+
+    def DeleteExecutions(self, params):
+        for execution_id in id_list(params.get('ExecutionIds')):
+            self.execution(execution_id)
+            self.executions.pop(execution_id)
+        return {}
@@ -0,0 +1,216 @@
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The fake of the OSS REST API, as oss2 talks to it: the service endpoint oss-<region>.aliyuncs.com lists the buckets
+and the virtual hosted <bucket>.oss-<region>.aliyuncs.com endpoints serve the buckets and their objects.
+"""
+
+import time
+import base64
+import hashlib
+from collections import OrderedDict
+from xml.sax.saxutils import escape
+
+try:
+    from urllib.parse import unquote
+except ImportError:
+    from urllib import unquote
+
+from .engine import ApiError, new_id
+
+OWNER = '<Owner><ID>1234567890</ID><DisplayName>1234567890</DisplayName></Owner>'
+
+
+def iso_time(seconds):
+    return time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(seconds))
+
+
+def xml(root, body):
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n<%s>%s</%s>' % (root, body, root)).encode('utf-8')
+
+
+def element(name, value):
+    return '<%s>%s</%s>' % (name, escape(str(value)), name)
+
+
+class OssService(object):
+    """A stateful fake of OSS. ``last_action`` names the operation of the last request, e.g. PutObject."""
+
+    def __init__(self, cloud):
+        self.cloud = cloud
+        self.buckets = OrderedDict()
+        self.last_action = None
+        self.headers = {}
+
+    def handle_http(self, host, method, path, params, body, headers):
+        # The requests are answered one at a time, under the lock of the cloud
+        self.headers = dict((k.lower(), v) for k, v in headers.items())
+        host = host.split(':')[0]
+        bucket = host.split('.')[0] if not host.startswith('oss-') else None
+        key = unquote(path.lstrip('/'))
+        try:
+            if bucket is None:
+                return self.respond('ListBuckets', 200, self.list_buckets(params))
+            if not key:
+                return self.bucket_request(bucket, method, params, body)
+            return self.object_request(bucket, key, method, params, body)
+        except ApiError as e:
+            return self.error(method, e)
+
+    def respond(self, action, status, body=b'', headers=None):
+        self.last_action = action
+        headers = dict(headers or {})
+        headers.setdefault('Content-Type', 'application/xml')
+        headers['x-oss-request-id'] = new_id('')
+        return status, headers, body
+
+    def error(self, method, e):
+        body = xml('Error', element('Code', e.code) + element('Message', e.message) +
+                   element('RequestId', new_id('')) + element('HostId', 'fake.aliyuncs.com'))
+        status, headers, data = self.respond(self.last_action or 'Error', e.status, body)
+        if method == 'HEAD':
+            headers['x-oss-err'] = base64.b64encode(body).decode('utf-8')
+        return status, headers, data
+
+    def bucket(self, name):
+        if name not in self.buckets:
+            self.last_action = 'GetBucket'
+            raise ApiError('NoSuchBucket', 'The specified bucket does not exist.', 404)
+        return self.buckets[name]
+
+    # Buckets
+
+    def list_buckets(self, params):
+        prefix, marker = params.get('prefix') or '', params.get('marker') or ''
+        max_keys = int(params.get('max-keys') or 100)
+        names = [n for n in sorted(self.buckets) if n.startswith(prefix) and n > marker]
+        body = OWNER + '<Buckets>'
+        for name in names[:max_keys]:
+            body += '<Bucket>%s%s%s%s%s%s</Bucket>' % (
+                element('CreationDate', iso_time(self.buckets[name]['created'])),
+                element('ExtranetEndpoint', 'oss-%s.aliyuncs.com' % self.cloud.region),
+                element('IntranetEndpoint', 'oss-%s-internal.aliyuncs.com' % self.cloud.region),
+                element('Location', 'oss-%s' % self.cloud.region), element('Name', name),
+                element('StorageClass', 'Standard'))
+        body += '</Buckets>'
+        truncated = len(names) > max_keys
+        body += element('IsTruncated', str(truncated).lower())
+        if truncated:
+            body += element('NextMarker', names[max_keys - 1])
+        return xml('ListAllMyBucketsResult', body)
+
+    def bucket_request(self, name, method, params, body):
+        if method == 'PUT' and 'acl' in params:
+            self.bucket(name)['acl'] = self.headers.get('x-oss-acl', 'private')
+            return self.respond('PutBucketAcl', 200)
+        if method == 'PUT':
+            if name in self.buckets:
+                raise ApiError('BucketAlreadyExists', 'The requested bucket name is not available.', 409)
+            self.buckets[name] = dict(acl=self.headers.get('x-oss-acl', 'private'), created=time.time(),
+                                      objects=OrderedDict())
+            return self.respond('PutBucket', 200)
+        if method == 'DELETE':
+            if self.bucket(name)['objects']:
+                raise ApiError('BucketNotEmpty', 'The bucket you tried to delete is not empty.', 409)
+            self.buckets.pop(name)
+            return self.respond('DeleteBucket', 204)
+        if 'acl' in params:
+            acl = '<AccessControlList><Grant>%s</Grant></AccessControlList>' % self.bucket(name)['acl']
+            return self.respond('GetBucketAcl', 200, xml('AccessControlPolicy', OWNER + acl))
+        if 'location' in params:
+            self.bucket(name)
+            return self.respond('GetBucketLocation', 200, xml('LocationConstraint', 'oss-%s' % self.cloud.region))
+        return self.respond('ListObjects', 200, self.list_objects(name, params))
+
+    # Objects
+
+    def list_objects(self, name, params):
+        objects = self.bucket(name)['objects']
+        prefix, marker = params.get('prefix') or '', params.get('marker') or ''
+        max_keys = int(params.get('max-keys') or 100)
+        keys = [k for k in sorted(objects) if k.startswith(prefix) and k > marker]
+        body = element('Name', name) + element('Prefix', prefix) + element('Marker', marker)
+        body += element('MaxKeys', max_keys) + element('Delimiter', '')
+        truncated = len(keys) > max_keys
+        body += element('IsTruncated', str(truncated).lower())
+        if truncated:
+            body += element('NextMarker', keys[max_keys - 1])
+        for key in keys[:max_keys]:
+            obj = objects[key]
+            body += '<Contents>%s%s%s%s%s%s%s</Contents>' % (
+                element('Key', key), element('LastModified', iso_time(obj['modified'])),
+                element('ETag', '"%s"' % obj['etag']), element('Type', obj['type']), element('Size', len(obj['data'])),
+                element('StorageClass', 'Standard'), OWNER)
+        return xml('ListBucketResult', body)
+
+    def object_headers(self, obj):
+        headers = {'ETag': '"%s"' % obj['etag'], 'x-oss-object-type': obj['type'],
+                   'Last-Modified': time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime(obj['modified'])),
+                   'Content-Type': obj['headers'].get('content-type', 'application/octet-stream')}
+        headers.update((k, v) for k, v in obj['headers'].items() if k.lower().startswith('x-oss-meta-'))
+        if obj['type'] == 'Appendable':
+            headers['x-oss-next-append-position'] = str(len(obj['data']))
+        return headers
+
+    def get_object(self, bucket, key):
+        obj = self.bucket(bucket)['objects'].get(key)
+        if obj is None:
+            raise ApiError('NoSuchKey', 'The specified key does not exist.', 404)
+        return obj
+
+    def store(self, bucket, key, data, kind):
+        obj = dict(data=data, type=kind, modified=time.time(), etag=hashlib.md5(data).hexdigest().upper(),
+                   acl='default', headers=dict((k, v) for k, v in self.headers.items()
+                                               if k.lower().startswith('x-oss-meta-') or k == 'content-type'))
+        self.bucket(bucket)['objects'][key] = obj
+        return obj
+
+    def object_request(self, bucket, key, method, params, body):
+        if method == 'PUT' and 'acl' in params:
+            self.get_object(bucket, key)['acl'] = self.headers.get('x-oss-object-acl', 'default')
+            return self.respond('PutObjectAcl', 200)
+        if method == 'PUT' and self.headers.get('x-oss-copy-source'):
+            source = unquote(self.headers['x-oss-copy-source']).lstrip('/').split('/', 1)
+            obj = dict(self.get_object(source[0], source[1]))
+            obj['headers'] = dict((k, v) for k, v in self.headers.items()
+                                  if k.lower().startswith('x-oss-meta-') or k == 'content-type')
+            obj['modified'] = time.time()
+            self.bucket(bucket)['objects'][key] = obj
+            body = xml('CopyObjectResult', element('ETag', '"%s"' % obj['etag']) +
+                       element('LastModified', iso_time(obj['modified'])))
+            return self.respond('CopyObject', 200, body)
+        if method == 'PUT':
+            obj = self.store(bucket, key, body or b'', 'Normal')
+            return self.respond('PutObject', 200, headers={'ETag': '"%s"' % obj['etag']})
+        if method == 'POST' and 'append' in params:
+            objects = self.bucket(bucket)['objects']
+            current = objects.get(key)
+            position = int(params.get('position') or 0)
+            if current is not None and (current['type'] != 'Appendable' or len(current['data']) != position):
+                raise ApiError('PositionNotEqualToLength', 'Position is not equal to file length.', 409)
+            obj = self.store(bucket, key, (current['data'] if current else b'') + (body or b''), 'Appendable')
+            return self.respond('AppendObject', 200, headers={'ETag': '"%s"' % obj['etag'],
+                                                              'x-oss-next-append-position': str(len(obj['data']))})
+        if method == 'DELETE':
+            self.bucket(bucket)['objects'].pop(key, None)
+            return self.respond('DeleteObject', 204)
+        if method == 'HEAD':
+            obj = self.get_object(bucket, key)
+            return self.respond('GetObjectMeta' if 'objectMeta' in params else 'HeadObject', 200,
+                                headers=self.object_headers(obj))
+        if 'acl' in params:
+            acl = '<AccessControlList><Grant>%s</Grant></AccessControlList>' % self.get_object(bucket, key)['acl']
+            return self.respond('GetObjectAcl', 200, xml('AccessControlPolicy', OWNER + acl))
+        obj = self.get_object(bucket, key)
+        data = obj['data']
+        status = 200
+        headers = self.object_headers(obj)
+        byte_range = self.headers.get('range')
+        if byte_range and byte_range.startswith('bytes='):
+            start, end = byte_range[6:].split('-')
+            start = int(start or 0)
+            end = int(end) if end else len(data) - 1
+            headers['Content-Range'] = 'bytes %d-%d/%d' % (start, end, len(data))
+            data, status = data[start:end + 1], 206
+        return self.respond('GetObject', status, data, headers)
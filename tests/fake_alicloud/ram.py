@@ -0,0 +1,342 @@
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The fake of RAM: users with their login profiles and access keys, groups, roles and policies, all named and listed
+with IsTruncated and Marker.
+"""
+
+from collections import OrderedDict
+
+from .engine import Service, ApiError, new_id, now
+
+SYSTEM_POLICIES = ('AdministratorAccess', 'AliyunECSFullAccess', 'AliyunOSSReadOnlyAccess')
+
+
+def not_found(kind, name):
+    return ApiError('EntityNotExist.%s' % kind, 'The %s %s does not exist.' % (kind.lower(), name), 404)
+
+
+class RamService(Service):
+
+    def __init__(self, cloud):
+        super(RamService, self).__init__(cloud)
+        self.users = OrderedDict()
+        self.groups = OrderedDict()
+        self.roles = OrderedDict()
+        self.policies = OrderedDict()
+        # The users of a group, and the policies attached to users, groups and roles, e.g. {('User', 'u1'): [...]}
+        self.members = {}
+        self.attachments = {}
+        for name in SYSTEM_POLICIES:
+            self.policies[('System', name)] = OrderedDict([
+                ('PolicyName', name), ('PolicyType', 'System'), ('Description', name), ('DefaultVersion', 'v1'),
+                ('AttachmentCount', 0), ('CreateDate', now()), ('UpdateDate', now())])
+
+    def marker_page(self, items, params, plural, name):
+        start = int(params.get('Marker') or 0)
+        size = int(params.get('MaxItems') or 100)
+        body = {plural: {name: items[start:start + size]}, 'IsTruncated': start + size < len(items)}
+        if body['IsTruncated']:
+            body['Marker'] = str(start + size)
+        return body
+
+    def named(self, store, kind, name):
+        if name not in store:
+            raise not_found(kind, name)
+        return store[name]
+
+    def create_named(self, store, kind, name, item):
+        if not name:
+            raise ApiError('MissingParameter', 'The %sName is required.' % kind)
+        if name in store:
+            raise ApiError('EntityAlreadyExists.%s' % kind, 'The %s %s already exists.' % (kind.lower(), name), 409)
+        store[name] = item
+        return item
+
+    # Users
+
+    def CreateUser(self, params):
+        user = self.create_named(self.users, 'User', params.get('UserName'), OrderedDict([
+            ('UserId', new_id('')), ('UserName', params.get('UserName')),
+            ('DisplayName', params.get('DisplayName', '')), ('MobilePhone', params.get('MobilePhone', '')),
+            ('Email', params.get('Email', '')), ('Comments', params.get('Comments', '')),
+            ('CreateDate', now()), ('UpdateDate', now())]))
+        user['AccessKeys'] = []
+        user['LoginProfile'] = None
+        return dict(User=self.user_view(user))
+
+    def user_view(self, user):
+        return dict((k, v) for k, v in user.items() if k not in ('AccessKeys', 'LoginProfile'))
+
+    def GetUser(self, params):
+        return dict(User=self.user_view(self.named(self.users, 'User', params.get('UserName'))))
+
+    def ListUsers(self, params):
+        return self.marker_page([self.user_view(u) for u in self.users.values()], params, 'Users', 'User')
+
+    def UpdateUser(self, params):
+        user = self.named(self.users, 'User', params.get('UserName'))
+        for field in ('DisplayName', 'MobilePhone', 'Email', 'Comments'):
+            if params.get('New' + field) is not None:
+                user[field] = params['New' + field]
+        new_name = params.get('NewUserName')
+        if new_name and new_name != user['UserName']:
+            self.users.pop(user['UserName'])
+            user['UserName'] = new_name
+            self.users[new_name] = user
+        user['UpdateDate'] = now()
+        return dict(User=self.user_view(user))
+
+    def DeleteUser(self, params):
+        user = self.named(self.users, 'User', params.get('UserName'))
+        if user['AccessKeys'] or self.attachments.get(('User', user['UserName'])):
+            raise ApiError('DeleteConflict.User.AccessKey', 'The user has access keys or attached policies.', 409)
+        self.users.pop(user['UserName'])
+        for members in self.members.values():
+            if user['UserName'] in members:
+                members.remove(user['UserName'])
+        return {}
+
+    # Login profiles
+
+    def profile(self, params):
+        user = self.named(self.users, 'User', params.get('UserName'))
+        if user['LoginProfile'] is None:
+            raise ApiError('EntityNotExist.User.LoginProfile', 'The login profile of the user does not exist.', 404)
+        return user['LoginProfile']
+
+    def CreateLoginProfile(self, params):
+        user = self.named(self.users, 'User', params.get('UserName'))
+        if user['LoginProfile'] is not None:
+            raise ApiError('EntityAlreadyExists.User.LoginProfile', 'The login profile already exists.', 409)
+        user['LoginProfile'] = OrderedDict([
+            ('UserName', user['UserName']),
+            ('PasswordResetRequired', str(params.get('PasswordResetRequired')).lower() == 'true'),
+            ('MFABindRequired', str(params.get('MFABindRequired')).lower() == 'true'), ('CreateDate', now())])
+        return dict(LoginProfile=user['LoginProfile'])
+
+    def GetLoginProfile(self, params):
+        return dict(LoginProfile=self.profile(params))
+
+    def UpdateLoginProfile(self, params):
+        profile = self.profile(params)
+        for field in ('PasswordResetRequired', 'MFABindRequired'):
+            if params.get(field) is not None:
+                profile[field] = str(params[field]).lower() == 'true'
+        return {}
+
+    def DeleteLoginProfile(self, params):
+        self.profile(params)
+        self.users[params['UserName']]['LoginProfile'] = None
+        return {}
+
+    # Access keys
+
+    def CreateAccessKey(self, params):
+        user = self.named(self.users, 'User', params.get('UserName'))
+        if len(user['AccessKeys']) >= 2:
+            raise ApiError('LimitExceeded.User.AccessKey', 'A user can have at most 2 access keys.', 409)
+        key = OrderedDict([('AccessKeyId', 'LTAI' + new_id('')), ('Status', 'Active'), ('CreateDate', now())])
+        user['AccessKeys'].append(key)
+        return dict(AccessKey=dict(key, AccessKeySecret=new_id('secret')))
+
+    def access_key(self, params):
+        user = self.named(self.users, 'User', params.get('UserName'))
+        for key in user['AccessKeys']:
+            if key['AccessKeyId'] == params.get('UserAccessKeyId'):
+                return user, key
+        raise not_found('AccessKey', params.get('UserAccessKeyId'))
+
+    def ListAccessKeys(self, params):
+        user = self.named(self.users, 'User', params.get('UserName'))
+        return dict(AccessKeys=dict(AccessKey=[dict(k) for k in user['AccessKeys']]))
+
+    def UpdateAccessKey(self, params):
+        user, key = self.access_key(params)
+        key['Status'] = params.get('Status', key['Status'])
+        return {}
+
+    def DeleteAccessKey(self, params):
+        user, key = self.access_key(params)
+        user['AccessKeys'].remove(key)
+        return {}
+
+    # Groups
+
+    def CreateGroup(self, params):
+        group = self.create_named(self.groups, 'Group', params.get('GroupName'), OrderedDict([
+            ('GroupId', new_id('')), ('GroupName', params.get('GroupName')),
+            ('Comments', params.get('Comments', '')), ('CreateDate', now()), ('UpdateDate', now())]))
+        self.members[group['GroupName']] = []
+        return dict(Group=group)
+
+    def ListGroups(self, params):
+        return self.marker_page(list(self.groups.values()), params, 'Groups', 'Group')
+
+    def GetGroup(self, params):
+        return dict(Group=self.named(self.groups, 'Group', params.get('GroupName')))
+
+    def UpdateGroup(self, params):
+        group = self.named(self.groups, 'Group', params.get('GroupName'))
+        if params.get('NewComments') is not None:
+            group['Comments'] = params['NewComments']
+        new_name = params.get('NewGroupName')
+        if new_name and new_name != group['GroupName']:
+            self.groups.pop(group['GroupName'])
+            self.members[new_name] = self.members.pop(group['GroupName'])
+            group['GroupName'] = new_name
+            self.groups[new_name] = group
+        return dict(Group=group)
+
+    def DeleteGroup(self, params):
+        group = self.named(self.groups, 'Group', params.get('GroupName'))
+        if self.members[group['GroupName']]:
+            raise ApiError('DeleteConflict.Group.User', 'The group still has users.', 409)
+        self.groups.pop(group['GroupName'])
+        self.members.pop(group['GroupName'])
+        return {}
+
+    def AddUserToGroup(self, params):
+        group = self.named(self.groups, 'Group', params.get('GroupName'))
+        user = self.named(self.users, 'User', params.get('UserName'))
+        if user['UserName'] in self.members[group['GroupName']]:
+            raise ApiError('EntityAlreadyExists.User.Group', 'The user is already in the group.', 409)
+        self.members[group['GroupName']].append(user['UserName'])
+        return {}
+
+    def RemoveUserFromGroup(self, params):
+        group = self.named(self.groups, 'Group', params.get('GroupName'))
+        if params.get('UserName') not in self.members[group['GroupName']]:
+            raise not_found('User.Group', params.get('UserName'))
+        self.members[group['GroupName']].remove(params['UserName'])
+        return {}
+
+    def ListUsersForGroup(self, params):
+        group = self.named(self.groups, 'Group', params.get('GroupName'))
+        users = [dict(UserName=name, DisplayName=self.users[name]['DisplayName'], JoinDate=now())
+                 for name in self.members[group['GroupName']]]
+        return self.marker_page(users, params, 'Users', 'User')
+
+    # Roles
+
+    def CreateRole(self, params):
+        name = params.get('RoleName')
+        role = self.create_named(self.roles, 'Role', name, OrderedDict([
+            ('RoleId', new_id('')), ('RoleName', name), ('Arn', 'acs:ram::1234567890:role/%s' % str(name).lower()),
+            ('Description', params.get('Description', '')),
+            ('AssumeRolePolicyDocument', params.get('AssumeRolePolicyDocument', '')),
+            ('MaxSessionDuration', int(params.get('MaxSessionDuration') or 3600)),
+            ('CreateDate', now()), ('UpdateDate', now())]))
+        return dict(Role=role)
+
+    def GetRole(self, params):
+        return dict(Role=self.named(self.roles, 'Role', params.get('RoleName')))
+
+    def ListRoles(self, params):
+        roles = [dict((k, v) for k, v in r.items() if k != 'AssumeRolePolicyDocument') for r in self.roles.values()]
+        return self.marker_page(roles, params, 'Roles', 'Role')
+
+    def UpdateRole(self, params):
+        role = self.named(self.roles, 'Role', params.get('RoleName'))
+        if params.get('NewAssumeRolePolicyDocument'):
+            role['AssumeRolePolicyDocument'] = params['NewAssumeRolePolicyDocument']
+        role['UpdateDate'] = now()
+        return dict(Role=role)
+
+    def DeleteRole(self, params):
+        role = self.named(self.roles, 'Role', params.get('RoleName'))
+        if self.attachments.get(('Role', role['RoleName'])):
+            raise ApiError('DeleteConflict.Role.Policy', 'The role still has attached policies.', 409)
+        self.roles.pop(role['RoleName'])
+        return {}
+
+    # Policies
+
+    def policy(self, params):
+        key = (params.get('PolicyType') or 'Custom', params.get('PolicyName'))
+        if key not in self.policies:
+            raise not_found('Policy', params.get('PolicyName'))
+        return self.policies[key]
+
+    def CreatePolicy(self, params):
+        key = ('Custom', params.get('PolicyName'))
+        if key in self.policies:
+            raise ApiError('EntityAlreadyExists.Policy', 'The policy already exists.', 409)
+        self.policies[key] = OrderedDict([
+            ('PolicyName', params.get('PolicyName')), ('PolicyType', 'Custom'),
+            ('Description', params.get('Description', '')), ('DefaultVersion', 'v1'), ('AttachmentCount', 0),
+            ('CreateDate', now()), ('UpdateDate', now()), ('PolicyDocument', params.get('PolicyDocument', ''))])
+        return dict(Policy=self.policy_view(self.policies[key]))
+
+    def policy_view(self, policy):
+        return dict((k, v) for k, v in policy.items() if k != 'PolicyDocument')
+
+    def GetPolicy(self, params):
+        policy = self.policy(params)
+        return dict(Policy=self.policy_view(policy), DefaultPolicyVersion=dict(
+            VersionId='v1', IsDefaultVersion=True, PolicyDocument=policy.get('PolicyDocument', ''),
+            CreateDate=policy['CreateDate']))
+
+    def ListPolicies(self, params):
+        policies = [self.policy_view(p) for p in self.policies.values()
+                    if not params.get('PolicyType') or p['PolicyType'] == params['PolicyType']]
+        return self.marker_page(policies, params, 'Policies', 'Policy')
+
+    def DeletePolicy(self, params):
+        policy = self.policy(dict(params, PolicyType='Custom'))
+        if policy['AttachmentCount']:
+            raise ApiError('DeleteConflict.Policy.User', 'The policy is still attached.', 409)
+        self.policies.pop(('Custom', policy['PolicyName']))
+        return {}
+
+    def attach(self, kind, params):
+        name = params.get(kind + 'Name')
+        self.named(dict(User=self.users, Group=self.groups, Role=self.roles)[kind], kind, name)
+        policy = self.policy(params)
+        attached = self.attachments.setdefault((kind, name), [])
+        if policy in attached:
+            raise ApiError('EntityAlreadyExists.%s.Policy' % kind, 'The policy is already attached.', 409)
+        attached.append(policy)
+        policy['AttachmentCount'] += 1
+        return {}
+
+    def detach(self, kind, params):
+        policy = self.policy(params)
+        attached = self.attachments.get((kind, params.get(kind + 'Name')), [])
+        if policy not in attached:
+            raise not_found('%s.Policy' % kind, policy['PolicyName'])
+        attached.remove(policy)
+        policy['AttachmentCount'] -= 1
+        return {}
+
+    def listed(self, kind, params):
+        attached = self.attachments.get((kind, params.get(kind + 'Name')), [])
+        return dict(Policies=dict(Policy=[dict(self.policy_view(p), AttachDate=now()) for p in attached]))
+
+    def AttachPolicyToUser(self, params):
+        return self.attach('User', params)
+
+    def AttachPolicyToGroup(self, params):
+        return self.attach('Group', params)
+
+    def AttachPolicyToRole(self, params):
+        return self.attach('Role', params)
+
+    def DetachPolicyFromUser(self, params):
+        return self.detach('User', params)
+
+    def DetachPolicyFromGroup(self, params):
+        return self.detach('Group', params)
+
+    def DetachPolicyFromRole(self, params):
+        return self.detach('Role', params)
+
+    def ListPoliciesForUser(self, params):
+        return self.listed('User', params)
+
+    def ListPoliciesForGroup(self, params):
+        return self.listed('Group', params)
+
+    def ListPoliciesForRole(self, params):
+        return self.listed('Role', params)
@@ -0,0 +1,281 @@
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The fake of RDS: the DB instances with their connection strings, databases, accounts and backups. Every operation
+completes at once, so the instances are always Running and the backup jobs finished.
+"""
+
+from collections import OrderedDict
+
+from .engine import Service, Resource, ApiError, new_id, now, id_list
+
+
+class RdsService(Service):
+    resources = (
+        Resource('DBInstance', 'rm-', page_size=100, create='', describe='', attribute='', delete='', modify=[],
+                 filters={'Engine': 'Engine', 'DBInstanceType': 'DBInstanceType', 'VpcId': 'VpcId',
+                          'VSwitchId': 'VSwitchId', 'InstanceNetworkType': 'InstanceNetworkType',
+                          'DBInstanceStatus': 'DBInstanceStatus', 'ZoneId': 'ZoneId'},
+                 tag_type='INSTANCE'),
+        Resource('Backup', '', create='', describe='', attribute='', delete='', modify=[]),
+    )
+
+    def __init__(self, cloud):
+        super(RdsService, self).__init__(cloud)
+        # The databases, accounts and connection strings of an instance, by the ID of the instance
+        self.databases = {}
+        self.accounts = {}
+        self.net_infos = {}
+        self.backup_jobs = OrderedDict()
+
+    def instance(self, params):
+        return self.get('DBInstance', params.get('DBInstanceId'), 'InvalidDBInstanceId.NotFound')
+
+    # Instances
+
+    def CreateDBInstance(self, params):
+        for name in ('Engine', 'EngineVersion', 'DBInstanceClass', 'DBInstanceStorage', 'DBInstanceNetType',
+                     'SecurityIPList', 'PayType'):
+            if not params.get(name):
+                raise ApiError('MissingParameter', 'The input parameter "%s" that is mandatory for processing '
+                                                   'this request is not supplied.' % name)
+        vswitch_id = params.get('VSwitchId') or ''
+        if vswitch_id and self.cloud.services['vpc'].find('VSwitch', vswitch_id) is None:
+            raise ApiError('InvalidVSwitchId.NotFound', 'The specified VSwitchId does not exist.', 404)
+        instance_id = new_id('rm-')
+        connection_string = '%s.mysql.rds.aliyuncs.com' % instance_id
+        item = self.new_item('DBInstance', OrderedDict([
+            ('DBInstanceDescription', params.get('DBInstanceDescription') or instance_id),
+            ('DBInstanceStatus', 'Running'), ('DBInstanceType', 'Primary'), ('Engine', params['Engine']),
+            ('EngineVersion', params['EngineVersion']), ('DBInstanceClass', params['DBInstanceClass']),
+            ('DBInstanceStorage', int(params['DBInstanceStorage'])), ('DBInstanceNetType', params['DBInstanceNetType']),
+            ('InstanceNetworkType', 'VPC' if vswitch_id else 'Classic'), ('VpcId', params.get('VPCId') or ''),
+            ('VSwitchId', vswitch_id), ('ZoneId', params.get('ZoneId') or self.cloud.region + '-b'),
+            ('PayType', 'Postpaid' if params['PayType'] == 'Postpaid' else 'Prepaid'),
+            ('ConnectionMode', params.get('ConnectionMode') or 'Standard'), ('ConnectionString', connection_string),
+            ('Port', '3306'), ('SecurityIPList', params['SecurityIPList']), ('LockMode', 'Unlock'),
+            ('CreateTime', now()), ('ExpireTime', ''), ('MutriORsignle', False)]), item_id=instance_id)
+        item.pop('Tags')
+        self.databases[instance_id] = OrderedDict()
+        self.accounts[instance_id] = OrderedDict()
+        self.net_infos[instance_id] = [OrderedDict([('ConnectionString', connection_string), ('IPAddress', '172.16.0.1'),
+                                                    ('IPType', 'Private'), ('Port', '3306')])]
+        return dict(DBInstanceId=instance_id, ConnectionString=connection_string, Port='3306', OrderId=new_id(''))
+
+    def DescribeDBInstances(self, params):
+        params = dict(params)
+        if params.get('DBInstanceId'):
+            params['DBInstanceIds'] = params.pop('DBInstanceId')
+        body = self.describe(self.resource('DBInstance'), params)
+        items = body.pop('DBInstances')['DBInstance']
+        return dict(Items=dict(DBInstance=[self.summary(i) for i in items]), TotalRecordCount=body['TotalCount'],
+                    PageNumber=body['PageNumber'], PageRecordCount=len(items))
+
+    def summary(self, item):
+        return dict((k, v) for k, v in item.items() if k not in ('SecurityIPList', 'ConnectionString', 'Port'))
+
+    def DescribeDBInstanceAttribute(self, params):
+        return dict(Items=dict(DBInstanceAttribute=[dict(self.instance(params))]))
+
+    def DescribeDBInstanceNetInfo(self, params):
+        self.instance(params)
+        return dict(DBInstanceNetInfos=dict(DBInstanceNetInfo=self.net_infos[params['DBInstanceId']]),
+                    InstanceNetworkType=self.instance(params)['InstanceNetworkType'])
+
+    def AllocateInstancePublicConnection(self, params):
+        item = self.instance(params)
+        for info in self.net_infos[item['DBInstanceId']]:
+            if info['IPType'] == 'Public':
+                raise ApiError('NetTypeExists', 'The public connection string already exists.')
+        self.net_infos[item['DBInstanceId']].append(OrderedDict([
+            ('ConnectionString', '%s.mysql.rds.aliyuncs.com' % params.get('ConnectionStringPrefix')),
+            ('IPAddress', '47.98.0.1'), ('IPType', 'Public'), ('Port', str(params.get('Port') or '3306'))]))
+        return {}
+
+    def ModifyDBInstanceConnectionString(self, params):
+        item = self.instance(params)
+        for info in self.net_infos[item['DBInstanceId']]:
+            if info['ConnectionString'] == params.get('CurrentConnectionString'):
+                info['ConnectionString'] = '%s.mysql.rds.aliyuncs.com' % params.get('ConnectionStringPrefix')
+                info['Port'] = str(params.get('Port') or info['Port'])
+                return {}
+        raise ApiError('InvalidCurrentConnectionString.NotFound', 'The current connection string does not exist.', 404)
+
+    def ReleaseInstancePublicConnection(self, params):
+        item = self.instance(params)
+        infos = self.net_infos[item['DBInstanceId']]
+        self.net_infos[item['DBInstanceId']] = [i for i in infos
+                                                if i['ConnectionString'] != params.get('CurrentConnectionString')]
+        return {}
+
+    def ModifyDBInstanceDescription(self, params):
+        self.instance(params)['DBInstanceDescription'] = params.get('DBInstanceDescription')
+        return {}
+
+    def ModifyDBInstanceSpec(self, params):
+        item = self.instance(params)
+        if params.get('DBInstanceClass'):
+            item['DBInstanceClass'] = params['DBInstanceClass']
+        if params.get('DBInstanceStorage'):
+            item['DBInstanceStorage'] = int(params['DBInstanceStorage'])
+        return {}
+
+    def ModifyDBInstanceNetworkType(self, params):
+        item = self.instance(params)
+        item['InstanceNetworkType'] = params.get('InstanceNetworkType', item['InstanceNetworkType'])
+        item['VpcId'] = params.get('VPCId', item['VpcId'])
+        item['VSwitchId'] = params.get('VSwitchId', item['VSwitchId'])
+        return {}
+
+    def RestartDBInstance(self, params):
+        self.instance(params)
+        return {}
+
+    def DeleteDBInstance(self, params):
+        item = self.instance(params)
+        self.remove('DBInstance', item['DBInstanceId'])
+        for store in (self.databases, self.accounts, self.net_infos):
+            store.pop(item['DBInstanceId'], None)
+        return {}
+
+    # Databases
+
+    def database(self, params):
+        database = self.databases[self.instance(params)['DBInstanceId']].get(params.get('DBName'))
+        if database is None:
+            raise ApiError('InvalidDBName.NotFound', 'The specified database does not exist.', 404)
+        return database
+
+    def CreateDatabase(self, params):
+        databases = self.databases[self.instance(params)['DBInstanceId']]
+        if params.get('DBName') in databases:
+            raise ApiError('InvalidDBName.Duplicate', 'The specified database already exists.')
+        databases[params['DBName']] = OrderedDict([
+            ('DBName', params['DBName']), ('DBInstanceId', params['DBInstanceId']), ('DBStatus', 'Running'),
+            ('DBDescription', params.get('DBDescription', '')), ('Engine', self.instance(params)['Engine']),
+            ('CharacterSetName', params.get('CharacterSetName', 'utf8')), ('Accounts', {'AccountPrivilegeInfo': []})])
+        return {}
+
+    def DescribeDatabases(self, params):
+        databases = self.databases[self.instance(params)['DBInstanceId']].values()
+        result = [d for d in databases if (not params.get('DBName') or d['DBName'] == params['DBName']) and
+                  (not params.get('DBStatus') or d['DBStatus'] == params['DBStatus'])]
+        return dict(Databases=dict(Database=result))
+
+    def ModifyDBDescription(self, params):
+        self.database(params)['DBDescription'] = params.get('DBDescription', '')
+        return {}
+
+    def DeleteDatabase(self, params):
+        self.database(params)
+        self.databases[params['DBInstanceId']].pop(params['DBName'])
+        return {}
+
+    def CopyDatabaseBetweenInstances(self, params):
+        self.instance(params)
+        target = self.instance(dict(DBInstanceId=params.get('TargetDBInstanceId')))
+        names = params.get('DbNames') or params.get('DBNames') or '{}'
+        for source, name in [p.split(':') for p in names.strip('{}').replace("'", '').replace('"', '').split(',')
+                             if ':' in p]:
+            database = dict(self.database(dict(DBInstanceId=params['DBInstanceId'], DBName=source.strip())))
+            database.update(DBName=name.strip(), DBInstanceId=target['DBInstanceId'])
+            self.databases[target['DBInstanceId']][name.strip()] = database
+        return {}
+
+    # Accounts
+
+    def account(self, params):
+        account = self.accounts[self.instance(params)['DBInstanceId']].get(params.get('AccountName'))
+        if account is None:
+            raise ApiError('InvalidAccountName.NotFound', 'The specified account does not exist.', 404)
+        return account
+
+    def CreateAccount(self, params):
+        accounts = self.accounts[self.instance(params)['DBInstanceId']]
+        if params.get('AccountName') in accounts:
+            raise ApiError('InvalidAccountName.Duplicate', 'The specified account already exists.')
+        if not params.get('AccountPassword'):
+            raise ApiError('MissingAccountPassword', 'The AccountPassword is required.')
+        accounts[params['AccountName']] = OrderedDict([
+            ('AccountName', params['AccountName']), ('DBInstanceId', params['DBInstanceId']),
+            ('AccountStatus', 'Available'), ('AccountType', params.get('AccountType', 'Normal')),
+            ('AccountDescription', params.get('AccountDescription', '')),
+            ('PrivExceeded', '0'), ('DatabasePrivileges', {'DatabasePrivilege': []})])
+        return {}
+
+    def DescribeAccounts(self, params):
+        accounts = self.accounts[self.instance(params)['DBInstanceId']].values()
+        return dict(Accounts=dict(DBInstanceAccount=[a for a in accounts if not params.get('AccountName') or
+                                                     a['AccountName'] == params['AccountName']]))
+
+    def ModifyAccountDescription(self, params):
+        self.account(params)['AccountDescription'] = params.get('AccountDescription', '')
+        return {}
+
+    def ResetAccountPassword(self, params):
+        self.account(params)
+        return {}
+
+    def GrantAccountPrivilege(self, params):
+        account = self.account(params)
+        privileges = account['DatabasePrivileges']['DatabasePrivilege']
+        for name in id_list(params.get('DBName')):
+            self.database(dict(DBInstanceId=params['DBInstanceId'], DBName=name))
+            privileges[:] = [p for p in privileges if p['DBName'] != name]
+            privileges.append(OrderedDict([('DBName', name), ('AccountPrivilege', params.get('AccountPrivilege')),
+                                           ('AccountPrivilegeDetail', '')]))
+        return {}
+
+    def RevokeAccountPrivilege(self, params):
+        account = self.account(params)
+        names = id_list(params.get('DBName'))
+        privileges = account['DatabasePrivileges']['DatabasePrivilege']
+        privileges[:] = [p for p in privileges if p['DBName'] not in names]
+        return {}
+
+    def DeleteAccount(self, params):
+        self.account(params)
+        self.accounts[params['DBInstanceId']].pop(params['AccountName'])
+        return {}
+
+    # Backups, which finish as soon as they are created
+
+    def CreateBackup(self, params):
+        item = self.instance(params)
+        backup_id = str(len(self.items('Backup')) + 100000)
+        self.items('Backup')[backup_id] = OrderedDict([
+            ('BackupId', backup_id), ('DBInstanceId', item['DBInstanceId']), ('BackupStatus', 'Success'),
+            ('BackupMode', 'Manual'), ('BackupMethod', params.get('BackupMethod', 'Physical')),
+            ('BackupType', 'FullBackup'), ('BackupScale', 'DBInstance'), ('BackupDBNames', params.get('DBName', '')),
+            ('BackupStartTime', now()), ('BackupEndTime', now()), ('BackupSize', 1048576),
+            ('BackupLocation', 'oss'), ('HostInstanceID', '1')])
+        job_id = str(len(self.backup_jobs) + 200000)
+        # footmark waits for the lower case status of the job
+        self.backup_jobs[job_id] = OrderedDict([('BackupJobId', job_id), ('BackupId', backup_id),
+                                                ('BackupStatus', 'finished'), ('BackupProgressStatus', 'Finished'),
+                                                ('JobMode', 'Manual'), ('Process', '100%'), ('TaskAction', 'Backup')])
+        return dict(BackupJobId=job_id)
+
+    def DescribeBackupTasks(self, params):
+        self.instance(params)
+        jobs = [j for j in self.backup_jobs.values()
+                if not params.get('BackupJobId') or j['BackupJobId'] == str(params['BackupJobId'])]
+        return dict(Items=dict(BackupJob=jobs))
+
+    def DescribeBackups(self, params):
+        self.instance(params)
+        ids = id_list(params.get('BackupId'))
+        backups = [b for b in self.items('Backup').values()
+                   if b['DBInstanceId'] == params['DBInstanceId'] and (not ids or b['BackupId'] in ids) and
+                   (not params.get('BackupStatus') or b['BackupStatus'] == params['BackupStatus']) and
+                   (not params.get('BackupMode') or b['BackupMode'] == params['BackupMode'])]
+        body = self.page(backups, params, 'Items', 'Backup', 100)
+        return dict(Items=body['Items'], TotalRecordCount=body['TotalCount'], PageNumber=body['PageNumber'],
+                    PageRecordCount=len(body['Items']['Backup']))
+
+    def DeleteBackup(self, params):
+        self.instance(params)
+        for backup_id in id_list(params.get('BackupId')):
+            self.remove('Backup', backup_id)
+        return {}
@@ -0,0 +1,88 @@
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The fake of Resource Orchestration: stacks complete as soon as they are created or updated, and their outputs are
+the values the template declares.
+"""
+
+import json
+from collections import OrderedDict
+
+from .engine import Service, ApiError, new_id, now
+
+
+def parameters_of(params):
+    parameters = []
+    for i in range(1, 201):
+        key = params.get('Parameters.%d.ParameterKey' % i)
+        if key is None:
+            break
+        parameters.append(OrderedDict([('ParameterKey', key),
+                                       ('ParameterValue', params.get('Parameters.%d.ParameterValue' % i))]))
+    return parameters
+
+
+def outputs_of(template_body):
+    try:
+        outputs = json.loads(template_body or '{}').get('Outputs') or {}
+    except ValueError:
+        raise ApiError('InvalidTemplate', 'The template is not a valid JSON or YAML document.')
+    return [OrderedDict([('OutputKey', key), ('OutputValue', str(value.get('Value'))),
+                         ('Description', value.get('Description', ''))]) for key, value in outputs.items()]
+
+
+class RosService(Service):
+
+    def __init__(self, cloud):
+        super(RosService, self).__init__(cloud)
+        self.stacks = OrderedDict()
+
+    def stack(self, params):
+        stack_id = params.get('StackId')
+        if stack_id not in self.stacks:
+            raise ApiError('StackNotFound', 'The Stack (%s) could not be found.' % stack_id, 404)
+        return self.stacks[stack_id]
+
+    def CreateStack(self, params):
+        name = params.get('StackName')
+        if any(s['StackName'] == name for s in self.stacks.values()):
+            raise ApiError('StackExists', 'The Stack (%s) already exists.' % name, 409)
+        stack_id = new_id('')
+        self.stacks[stack_id] = OrderedDict([
+            ('StackId', stack_id), ('StackName', name), ('RegionId', self.cloud.region),
+            ('Status', 'CREATE_COMPLETE'), ('StatusReason', 'Stack CREATE completed successfully'),
+            ('CreateTime', now()), ('UpdateTime', ''),
+            ('DisableRollback', str(params.get('DisableRollback')).lower() == 'true'),
+            ('TimeoutInMinutes', int(params.get('TimeoutInMinutes') or 60)),
+            ('TemplateBody', params.get('TemplateBody', '')), ('Parameters', parameters_of(params)),
+            ('Outputs', outputs_of(params.get('TemplateBody')))])
+        return dict(StackId=stack_id)
+
+    def GetStack(self, params):
+        return dict((k, v) for k, v in self.stack(params).items() if k != 'TemplateBody')
+
+    def ListStacks(self, params):
+        names = [params[k] for k in sorted(params) if k.startswith('StackName.')]
+        stacks = [dict((k, v) for k, v in s.items() if k not in ('TemplateBody', 'Parameters', 'Outputs'))
+                  for s in self.stacks.values()
+                  if (not names or s['StackName'] in names)
+                  and (not params.get('StackId') or s['StackId'] == params['StackId'])]
+        # The stacks are a plain list in the responses of the 2019-09-10 API
+        body = self.page(stacks, params, 'Stacks', 'Stack', max_size=50)
+        body['Stacks'] = body['Stacks']['Stack']
+        return body
+
+    def UpdateStack(self, params):
+        stack = self.stack(params)
+        body = params.get('TemplateBody') or stack['TemplateBody']
+        parameters = parameters_of(params) or stack['Parameters']
+        if body == stack['TemplateBody'] and parameters == stack['Parameters']:
+            raise ApiError('NotSupported', 'Update the completely same stack %s is not supported.' % stack['StackName'])
+        stack.update(TemplateBody=body, Parameters=parameters, Outputs=outputs_of(body), UpdateTime=now(),
+                     Status='UPDATE_COMPLETE', StatusReason='Stack successfully updated')
+        return dict(StackId=stack['StackId'])
+
+    def DeleteStack(self, params):
+        self.stacks.pop(self.stack(params)['StackId'])
+        return {}
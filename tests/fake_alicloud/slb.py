@@ -0,0 +1,366 @@
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The fake of SLB: load balancers with their listeners and default backend servers, and the virtual server groups.
+The health of a backend server follows the status of its ECS instance unless ``health`` overrides it.
+"""
+
+import json
+from collections import OrderedDict
+
+from .engine import Service, Resource, ApiError, now, id_list, literal
+
+LISTENER_PROTOCOLS = ('HTTP', 'HTTPS', 'TCP', 'UDP')
+# The listener attributes which are not taken from the request as they are
+LISTENER_DEFAULTS = OrderedDict([('Bandwidth', -1), ('Scheduler', 'wrr'), ('StickySession', 'off'),
+                                 ('HealthCheck', 'on'), ('HealthyThreshold', 3), ('UnhealthyThreshold', 3),
+                                 ('HealthCheckTimeout', 5), ('HealthCheckInterval', 2), ('PersistenceTimeout', 0),
+                                 ('HealthCheckHttpCode', 'http_2xx'), ('HealthCheckURI', '/'), ('HealthCheckType', 'tcp')])
+# The attributes the describe action of a listener answers with, those of every protocol and those of each one
+LISTENER_COMMON_FIELDS = ('ListenerPort', 'ListenerProtocol', 'BackendServerPort', 'Bandwidth', 'Status', 'Scheduler',
+                          'VServerGroupId', 'HealthCheck', 'HealthCheckConnectPort', 'HealthyThreshold',
+                          'UnhealthyThreshold', 'HealthCheckInterval')
+LISTENER_FIELDS = {
+    'http': ('StickySession', 'StickySessionType', 'CookieTimeout', 'Cookie', 'HealthCheckDomain', 'HealthCheckURI',
+             'HealthCheckTimeout', 'HealthCheckHttpCode'),
+    'tcp': ('PersistenceTimeout', 'HealthCheckType', 'HealthCheckDomain', 'HealthCheckURI', 'HealthCheckConnectTimeout',
+            'HealthCheckHttpCode'),
+    'udp': ('PersistenceTimeout', 'HealthCheckConnectTimeout'),
+}
+LISTENER_FIELDS['https'] = LISTENER_FIELDS['http'] + ('ServerCertificateId',)
+# The most backend servers a single request may add, set or remove
+MAX_BACKEND_SERVERS = 20
+
+
+def backend_servers_of(value):
+    """ Return the backend servers of a BackendServers parameter, a list of IDs or of dicts """
+    servers = literal(value) if value else []
+    if not isinstance(servers, list):
+        servers = id_list(value)
+    servers = [s if isinstance(s, dict) else dict(ServerId=s) for s in servers]
+    if not all(s.get('ServerId') for s in servers):
+        raise ApiError('InvalidParameter.BackendServers', 'The ServerId of a backend server is required.')
+    if len(servers) > MAX_BACKEND_SERVERS:
+        raise ApiError('InvalidParameter.BackendServers',
+                       'At most %d backend servers can be specified in a request.' % MAX_BACKEND_SERVERS)
+    return servers
+
+
+class SlbService(Service):
+    resources = (
+        Resource('LoadBalancer', 'lb-', page_size=100, create='', attribute='', delete='', modify=[],
+                 filters={'LoadBalancerName': 'LoadBalancerName', 'VpcId': 'VpcId', 'VSwitchId': 'VSwitchId',
+                          'Address': 'Address', 'AddressType': 'AddressType', 'NetworkType': 'NetworkType',
+                          'LoadBalancerStatus': 'LoadBalancerStatus', 'MasterZoneId': 'MasterZoneId'},
+                 tag_type='instance'),
+        Resource('VServerGroup', 'rsp-', create='', describe='', attribute='', delete='', modify=[]),
+    )
+
+    def __init__(self, cloud):
+        super(SlbService, self).__init__(cloud)
+        # The health status forced on backend servers by their IDs, e.g. {'i-1': 'abnormal'}, '*' stands for any other
+        self.health = {}
+        # The listeners by their ports and the default backend servers, by the IDs of the load balancers
+        self.listeners = {}
+        self.backend_servers = {}
+
+    def load_balancer(self, params):
+        return self.get('LoadBalancer', params.get('LoadBalancerId'), 'InvalidLoadBalancerId.NotFound')
+
+    def check_servers(self, servers):
+        instances = self.cloud.services['ecs'].items('Instance')
+        for server in servers:
+            if server.get('Type', 'ecs') == 'ecs' and server.get('ServerId') not in instances:
+                raise ApiError('InvalidParameter.BackendServers',
+                               'The backend server %s does not exist.' % server.get('ServerId'))
+
+    # Load balancers
+
+    def CreateLoadBalancer(self, params):
+        vswitch_id = params.get('VSwitchId')
+        vpc_id = ''
+        if vswitch_id:
+            vswitch = self.cloud.services['vpc'].find('VSwitch', vswitch_id)
+            if vswitch is None:
+                raise ApiError('InvalidVSwitchId.NotFound', 'The specified VSwitchId does not exist.', 404)
+            vpc_id = vswitch['VpcId']
+        address_type = params.get('AddressType') or 'internet'
+        count = len(self.items('LoadBalancer'))
+        address = '%s.%d.%d' % ('47.96' if address_type == 'internet' else '172.16', count // 250 % 250,
+                                count % 250 + 2)
+        charge_type = str(params.get('InternetChargeType') or 'paybytraffic').lower()
+        item = self.new_item('LoadBalancer', dict(
+            LoadBalancerName=params.get('LoadBalancerName') or '', LoadBalancerStatus='active',
+            Address=address,
+            AddressType=address_type, VpcId=vpc_id, VSwitchId=vswitch_id or '',
+            NetworkType='vpc' if vswitch_id else 'classic', InternetChargeType=charge_type,
+            InternetChargeTypeAlias='PayByBandwidth' if charge_type == 'paybybandwidth' else 'PayByTraffic',
+            Bandwidth=int(params.get('Bandwidth') or 1), LoadBalancerSpec=params.get('LoadBalancerSpec', ''),
+            MasterZoneId=params.get('MasterZoneId') or self.cloud.region + '-b',
+            SlaveZoneId=params.get('SlaveZoneId') or self.cloud.region + '-d', PayType='PayOnDemand',
+            CreateTime=now(), CreateTimeStamp=0, ResourceGroupId='rg-default'))
+        item['Tags'] = {'Tag': []}
+        self.listeners[item['LoadBalancerId']] = OrderedDict()
+        self.backend_servers[item['LoadBalancerId']] = []
+        return dict(LoadBalancerId=item['LoadBalancerId'], Address=item['Address'], VpcId=vpc_id,
+                    VSwitchId=item['VSwitchId'], NetworkType=item['NetworkType'],
+                    LoadBalancerName=item['LoadBalancerName'])
+
+    def DescribeLoadBalancers(self, params):
+        resource = self.resource('LoadBalancer')
+        params = dict(params)
+        if params.get('LoadBalancerId'):
+            params['LoadBalancerIds'] = params.pop('LoadBalancerId')
+        items = list(self.items('LoadBalancer').values())
+        if params.get('Tags'):
+            wanted = [(t.get('tagKey') or t.get('TagKey'), t.get('tagValue') or t.get('TagValue'))
+                      for t in json.loads(params.pop('Tags'))]
+            items = [i for i in items if all(self.tags(i).get(k) == v for k, v in wanted)]
+        return self.describe(resource, params, items)
+
+    def DescribeLoadBalancerAttribute(self, params):
+        item = dict(self.load_balancer(params))
+        listeners = self.listeners[item['LoadBalancerId']]
+        item['ListenerPorts'] = {'ListenerPort': list(listeners)}
+        item['ListenerPortsAndProtocol'] = {'ListenerPortAndProtocol': [
+            dict(ListenerPort=port, ListenerProtocol=listener['ListenerProtocol'])
+            for port, listener in listeners.items()]}
+        item['ListenerPortsAndProtocal'] = {'ListenerPortAndProtocal': [
+            dict(ListenerPort=port, ListenerProtocal=listener['ListenerProtocol'])
+            for port, listener in listeners.items()]}
+        item['BackendServers'] = {'BackendServer': [dict(s) for s in self.backend_servers[item['LoadBalancerId']]]}
+        return item
+
+    def SetLoadBalancerStatus(self, params):
+        self.load_balancer(params)['LoadBalancerStatus'] = params.get('LoadBalancerStatus')
+        return {}
+
+    def SetLoadBalancerName(self, params):
+        self.load_balancer(params)['LoadBalancerName'] = params.get('LoadBalancerName')
+        return {}
+
+    def ModifyLoadBalancerInternetSpec(self, params):
+        item = self.load_balancer(params)
+        if params.get('InternetChargeType'):
+            item['InternetChargeType'] = str(params['InternetChargeType']).lower()
+            item['InternetChargeTypeAlias'] = ('PayByBandwidth' if item['InternetChargeType'] == 'paybybandwidth'
+                                               else 'PayByTraffic')
+        if params.get('Bandwidth'):
+            item['Bandwidth'] = int(params['Bandwidth'])
+        return {}
+
+    def DeleteLoadBalancer(self, params):
+        item = self.load_balancer(params)
+        self.remove('LoadBalancer', item['LoadBalancerId'])
+        self.listeners.pop(item['LoadBalancerId'], None)
+        self.backend_servers.pop(item['LoadBalancerId'], None)
+        for group_id, group in list(self.items('VServerGroup').items()):
+            if group['LoadBalancerId'] == item['LoadBalancerId']:
+                self.items('VServerGroup').pop(group_id)
+        return {}
+
+    # Listeners, answered by the actions of their protocol, e.g. CreateLoadBalancerHTTPListener
+
+    def handle(self, action, params):
+        for protocol in LISTENER_PROTOCOLS:
+            for verb in ('Create', 'Set', 'Describe'):
+                prefix = '%sLoadBalancer%sListener' % (verb, protocol)
+                if action in (prefix, prefix + 'Attribute'):
+                    return getattr(self, verb.lower() + '_listener')(protocol.lower(), params)
+        return super(SlbService, self).handle(action, params)
+
+    def listener(self, params, protocol=None):
+        listeners = self.listeners[self.load_balancer(params)['LoadBalancerId']]
+        listener = listeners.get(int(params.get('ListenerPort') or 0))
+        if listener is None or protocol and listener['ListenerProtocol'] != protocol:
+            raise ApiError('InvalidParameter', 'The specified listener does not exist.', 400)
+        return listener
+
+    def update_listener(self, listener, params):
+        for key, value in params.items():
+            if key not in ('Action', 'Version', 'Format', 'Timestamp', 'SignatureMethod', 'SignatureType',
+                           'SignatureVersion', 'SignatureNonce', 'AccessKeyId', 'Signature', 'ClientToken',
+                           'RegionId', 'LoadBalancerId', 'ListenerPort'):
+                listener[key] = int(value) if str(value).lstrip('-').isdigit() else value
+
+    def create_listener(self, protocol, params):
+        listeners = self.listeners[self.load_balancer(params)['LoadBalancerId']]
+        port = int(params.get('ListenerPort') or 0)
+        if port in listeners:
+            raise ApiError('ListenerAlreadyExists', 'The listener with the specified port already exists.')
+        if params.get('VServerGroupId'):
+            self.get('VServerGroup', params['VServerGroupId'], 'InvalidParameter.VServerGroupId')
+        listener = OrderedDict(LISTENER_DEFAULTS)
+        listener.update(ListenerPort=port, ListenerProtocol=protocol, Status='stopped')
+        self.update_listener(listener, params)
+        listeners[port] = listener
+        return {}
+
+    def set_listener(self, protocol, params):
+        # A listener only takes a VServer group along with VServerGroup on
+        if params.get('VServerGroupId'):
+            if params.get('VServerGroup') != 'on':
+                params = dict((k, v) for k, v in params.items() if k != 'VServerGroupId')
+            else:
+                self.get('VServerGroup', params['VServerGroupId'], 'InvalidParameter.VServerGroupId')
+        self.update_listener(self.listener(params, protocol), params)
+        return {}
+
+    def describe_listener(self, protocol, params):
+        # A listener only has the attributes of its protocol, whatever the requests which made it sent
+        fields = LISTENER_COMMON_FIELDS + LISTENER_FIELDS[protocol]
+        return dict((k, v) for k, v in self.listener(params, protocol).items() if k in fields)
+
+    def StartLoadBalancerListener(self, params):
+        self.listener(params)['Status'] = 'running'
+        return {}
+
+    def StopLoadBalancerListener(self, params):
+        self.listener(params)['Status'] = 'stopped'
+        return {}
+
+    def DeleteLoadBalancerListener(self, params):
+        self.listener(params)
+        self.listeners[params['LoadBalancerId']].pop(int(params['ListenerPort']))
+        return {}
+
+    # The default backend servers
+
+    def backend_server_list(self, load_balancer_id):
+        return {'LoadBalancerId': load_balancer_id,
+                'BackendServers': {'BackendServer': [dict(s) for s in self.backend_servers[load_balancer_id]]}}
+
+    def AddBackendServers(self, params):
+        load_balancer_id = self.load_balancer(params)['LoadBalancerId']
+        servers = backend_servers_of(params.get('BackendServers'))
+        self.check_servers(servers)
+        current = self.backend_servers[load_balancer_id]
+        for server in servers:
+            existing = [s for s in current if s['ServerId'] == server['ServerId']]
+            if existing:
+                existing[0]['Weight'] = int(server.get('Weight', existing[0]['Weight']))
+                continue
+            current.append(OrderedDict([('ServerId', server['ServerId']), ('Weight', int(server.get('Weight', 100))),
+                                        ('Type', server.get('Type', 'ecs'))]))
+        return self.backend_server_list(load_balancer_id)
+
+    def SetBackendServers(self, params):
+        load_balancer_id = self.load_balancer(params)['LoadBalancerId']
+        current = dict((s['ServerId'], s) for s in self.backend_servers[load_balancer_id])
+        for server in backend_servers_of(params.get('BackendServers')):
+            if server['ServerId'] not in current:
+                raise ApiError('InvalidParameter.BackendServers',
+                               'The backend server %s is not added to the load balancer.' % server['ServerId'])
+            current[server['ServerId']]['Weight'] = int(server.get('Weight', 100))
+            current[server['ServerId']]['Type'] = server.get('Type', current[server['ServerId']]['Type'])
+        return self.backend_server_list(load_balancer_id)
+
+    def RemoveBackendServers(self, params):
+        load_balancer_id = self.load_balancer(params)['LoadBalancerId']
+        removed = set(s['ServerId'] for s in backend_servers_of(params.get('BackendServers')))
+        self.backend_servers[load_balancer_id] = [s for s in self.backend_servers[load_balancer_id]
+                                                  if s['ServerId'] not in removed]
+        return self.backend_server_list(load_balancer_id)
+
+    def health_of(self, server_id, listener):
+        if listener['Status'] != 'running':
+            return 'unavailable'
+        if server_id in self.health or '*' in self.health:
+            return self.health.get(server_id, self.health.get('*'))
+        instance = self.cloud.services['ecs'].find('Instance', server_id)
+        return 'normal' if instance and instance['Status'] == 'Running' else 'abnormal'
+
+    def DescribeHealthStatus(self, params):
+        load_balancer_id = self.load_balancer(params)['LoadBalancerId']
+        result = []
+        for port, listener in self.listeners[load_balancer_id].items():
+            if params.get('ListenerPort') and int(params['ListenerPort']) != port:
+                continue
+            if listener.get('VServerGroupId'):
+                group = self.find('VServerGroup', listener['VServerGroupId'])
+                servers = [(s['ServerId'], s['Port']) for s in group['BackendServers']['BackendServer']] if group else []
+            else:
+                servers = [(s['ServerId'], listener.get('BackendServerPort', port))
+                           for s in self.backend_servers[load_balancer_id]]
+            for server_id, server_port in servers:
+                result.append(OrderedDict([('ServerId', server_id), ('Port', server_port), ('ListenerPort', port),
+                                           ('Protocol', listener['ListenerProtocol']),
+                                           ('ServerHealthStatus', self.health_of(server_id, listener))]))
+        return {'BackendServers': {'BackendServer': result}}
+
+    # Virtual server groups
+
+    def group(self, params):
+        return self.get('VServerGroup', params.get('VServerGroupId'), 'InvalidParameter.VServerGroupId')
+
+    def group_servers(self, params, key='BackendServers'):
+        servers = backend_servers_of(params.get(key))
+        self.check_servers(servers)
+        return [OrderedDict([('ServerId', s['ServerId']), ('Port', int(s.get('Port', 80))),
+                             ('Weight', int(s.get('Weight', 100))), ('Type', s.get('Type', 'ecs')),
+                             ('Description', s.get('Description', ''))]) for s in servers]
+
+    def CreateVServerGroup(self, params):
+        load_balancer = self.load_balancer(params)
+        group = self.new_item('VServerGroup', dict(VServerGroupName=params.get('VServerGroupName', ''),
+                                                   LoadBalancerId=load_balancer['LoadBalancerId']))
+        group.pop('CreationTime')
+        group.pop('Tags')
+        group['BackendServers'] = {'BackendServer': self.group_servers(params)}
+        return dict(VServerGroupId=group['VServerGroupId'], BackendServers=group['BackendServers'])
+
+    def DescribeVServerGroups(self, params):
+        load_balancer_id = self.load_balancer(params)['LoadBalancerId']
+        groups = [dict(VServerGroupId=g['VServerGroupId'], VServerGroupName=g['VServerGroupName'])
+                  for g in self.items('VServerGroup').values() if g['LoadBalancerId'] == load_balancer_id]
+        return {'VServerGroups': {'VServerGroup': groups}}
+
+    def DescribeVServerGroupAttribute(self, params):
+        group = self.group(params)
+        return json.loads(json.dumps(group))
+
+    def SetVServerGroupAttribute(self, params):
+        group = self.group(params)
+        if params.get('VServerGroupName'):
+            group['VServerGroupName'] = params['VServerGroupName']
+        current = group['BackendServers']['BackendServer']
+        for server in self.group_servers(params):
+            for existing in current:
+                if (existing['ServerId'], existing['Port']) == (server['ServerId'], server['Port']):
+                    existing['Weight'] = server['Weight']
+        return dict(VServerGroupId=group['VServerGroupId'], BackendServers=group['BackendServers'])
+
+    def AddVServerGroupBackendServers(self, params):
+        group = self.group(params)
+        current = group['BackendServers']['BackendServer']
+        for server in self.group_servers(params):
+            if not [s for s in current if (s['ServerId'], s['Port']) == (server['ServerId'], server['Port'])]:
+                current.append(server)
+        return dict(VServerGroupId=group['VServerGroupId'], BackendServers=group['BackendServers'])
+
+    def RemoveVServerGroupBackendServers(self, params):
+        group = self.group(params)
+        removed = [(s['ServerId'], s['Port']) for s in self.group_servers(params)]
+        group['BackendServers']['BackendServer'] = [s for s in group['BackendServers']['BackendServer']
+                                                    if (s['ServerId'], s['Port']) not in removed]
+        return dict(VServerGroupId=group['VServerGroupId'], BackendServers=group['BackendServers'])
+
+    def ModifyVServerGroupBackendServers(self, params):
+        group = self.group(params)
+        old = self.group_servers(params, 'OldBackendServers')
+        new = self.group_servers(params, 'NewBackendServers')
+        current = group['BackendServers']['BackendServer']
+        for before, after in zip(old, new):
+            for index, existing in enumerate(current):
+                if (existing['ServerId'], existing['Port']) == (before['ServerId'], before['Port']):
+                    current[index] = after
+        return dict(VServerGroupId=group['VServerGroupId'], BackendServers=group['BackendServers'])
+
+    def DeleteVServerGroup(self, params):
+        group = self.group(params)
+        for listener in self.listeners.get(group['LoadBalancerId'], {}).values():
+            if listener.get('VServerGroupId') == group['VServerGroupId']:
+                raise ApiError('ResourceInUse.VServerGroup', 'The virtual server group is in use by a listener.')
+        self.remove('VServerGroup', group['VServerGroupId'])
+        return {}
@@ -0,0 +1,29 @@
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The resources most scenarios start from.
+"""
+
+IMAGE_ID = 'ubuntu_18_04_64_20G_alibase_20190624.vhd'
+ZONE_ID = 'cn-hangzhou-g'
+
+
+def ok(result):
+    assert not result.get('failed'), result.get('msg')
+    return result
+
+
+def network(run_module):
+    vpc = ok(run_module('ali_vpc', dict(name='vpc1', cidr_block='172.16.0.0/12')))['vpc']
+    vswitch = ok(run_module('ali_vswitch', dict(name='vsw1', cidr_block='172.16.1.0/24', vpc_id=vpc['id'],
+                                                zone_id=ZONE_ID)))['vswitch']
+    group = ok(run_module('ali_security_group', dict(name='sg1', vpc_id=vpc['id'])))['group']
+    return vpc, vswitch, group
+
+
+def instances(run_module, vswitch, group, count=2):
+    result = ok(run_module('ali_instance', dict(image_id=IMAGE_ID, instance_type='ecs.g6.large', count=count,
+                                                vswitch_id=vswitch['id'], security_groups=[group['id']],
+                                                instance_name='web')))
+    return [i['id'] for i in result['instances']]
@@ -0,0 +1,95 @@
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The local broker of module_utils, reached through alicloud_broker_socket.
+"""
+
+import os
+import socket
+import tempfile
+import threading
+
+import pytest
+
+from helpers import ok
+
+
+@pytest.fixture
+def socket_path():
+    # The path of a UNIX socket is limited to about 100 characters, which tmp_path may exceed
+    directory = tempfile.mkdtemp(prefix='broker-')
+    yield os.path.join(directory, 'broker.sock')
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+
+
+def serve(server, handle):
+    """ Answer the connections to a listening socket with handle, until it is closed """
+    def accept():
+        while True:
+            try:
+                sock, dummy = server.accept()
+            except (socket.error, OSError):
+                return
+            try:
+                handle(sock)
+            finally:
+                sock.close()
+    worker = threading.Thread(target=accept)
+    worker.daemon = True
+    worker.start()
+
+
+def listen(path):
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(8)
+    return server
+
+
+def test_broker_serves_the_module(run_module, cloud, socket_path):
+    from ansible_collections.alibaba.alicloud.plugins.module_utils.alicloud_broker import Broker
+
+    broker = Broker(socket_path, cache_ttl=60)
+    server = listen(socket_path)
+    serve(server, broker.handle)
+    try:
+        args = dict(name='vpc1', cidr_block='172.16.0.0/12', alicloud_broker_socket=socket_path)
+        assert ok(run_module('ali_vpc', args))['changed']
+        assert not ok(run_module('ali_vpc', args))['changed']
+        assert len(ok(run_module('ali_vpc_info', dict(alicloud_broker_socket=socket_path)))['vpcs']) == 1
+        assert broker.connections
+    finally:
+        server.close()
+
+
+def test_module_calls_the_api_without_a_broker(run_module, cloud, socket_path):
+    # The socket file of a broker which has gone away
+    listen(socket_path).close()
+    assert os.path.exists(socket_path)
+    args = dict(name='vpc1', cidr_block='172.16.0.0/12', alicloud_broker_socket=socket_path)
+    assert ok(run_module('ali_vpc', args))['changed']
+
+
+def test_module_does_not_repeat_a_request_the_broker_dropped(run_module, cloud, socket_path):
+    from ansible_collections.alibaba.alicloud.plugins.module_utils import alicloud_broker
+
+    broker = alicloud_broker.Broker(socket_path)
+
+    # A broker which answers the reads and dies once it has read a write
+    def handle(sock):
+        message = alicloud_broker.recv_message(sock)
+        action = message['action'] or message['params'].get('Action')
+        if str(action).startswith('Describe'):
+            alicloud_broker.send_message(sock, broker.call(message))
+
+    server = listen(socket_path)
+    serve(server, handle)
+    try:
+        with pytest.raises(Exception, match='broker failed while handling CreateVpc'):
+            run_module('ali_vpc', dict(name='vpc1', cidr_block='172.16.0.0/12', alicloud_broker_socket=socket_path))
+    finally:
+        server.close()
+    assert [c for c in cloud.calls if c.action == 'CreateVpc'] == []
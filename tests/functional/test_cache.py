@@ -0,0 +1,99 @@
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The describe cache of module_utils, enabled by alicloud_cache_ttl.
+"""
+
+import pytest
+
+from helpers import ok
+
+
+@pytest.fixture
+def alicloud_cache(cloud):
+    from ansible_collections.alibaba.alicloud.plugins.module_utils import alicloud_cache
+    return alicloud_cache
+
+
+class Connection(object):
+    """ The attributes and requests of a footmark connection the cache uses, answering with the calls made """
+
+    def __init__(self, product='Ecs', region='cn-hangzhou', access_key='key'):
+        self.product = product
+        self.region = region
+        self.acs_access_key_id = access_key
+        self.ecs_role_name = None
+        self.calls = []
+
+    def make_request(self, action, params=None):
+        self.calls.append(action)
+        return ('%s %d' % (action, len(self.calls))).encode('utf-8')
+
+    def make_request_new(self, params):
+        return Connection.make_request(self, params['Action'], params)
+
+
+def request(cache, conn, action, params=None):
+    return cache.request(cache.scope(conn), action, params, lambda: conn.make_request(action, params))
+
+
+@pytest.mark.parametrize('shared', [False, True])
+def test_cache_hit_miss_and_expiry(alicloud_cache, tmp_path, monkeypatch, shared):
+    cache = alicloud_cache.DescribeCache(path=str(tmp_path) if shared else None, ttl=60)
+    conn = Connection()
+    assert request(cache, conn, 'DescribeVpcs', dict(PageNumber=1)) == b'DescribeVpcs 1'
+    assert request(cache, conn, 'DescribeVpcs', dict(PageNumber=1, ClientToken='t')) == b'DescribeVpcs 1'
+    assert request(cache, conn, 'DescribeVpcs', dict(PageNumber=2)) == b'DescribeVpcs 2'
+    assert conn.calls == ['DescribeVpcs'] * 2
+
+    now = alicloud_cache.time.time()
+    monkeypatch.setattr(alicloud_cache.time, 'time', lambda: now + 61)
+    assert request(cache, conn, 'DescribeVpcs', dict(PageNumber=1)) == b'DescribeVpcs 3'
+
+
+@pytest.mark.parametrize('shared', [False, True])
+def test_cache_invalidation(alicloud_cache, tmp_path, shared):
+    cache = alicloud_cache.DescribeCache(path=str(tmp_path) if shared else None, ttl=60)
+    ecs, vpc, other_region = Connection('Ecs'), Connection('Vpc'), Connection('Vpc', region='cn-beijing')
+    for conn in (ecs, vpc, other_region):
+        request(cache, conn, 'DescribeVSwitches')
+
+    # A write drops the entries of every product of its account and region, and only those
+    request(cache, ecs, 'RunInstances')
+    request(cache, vpc, 'DescribeVSwitches')
+    request(cache, other_region, 'DescribeVSwitches')
+    assert vpc.calls == ['DescribeVSwitches'] * 2 and other_region.calls == ['DescribeVSwitches']
+
+
+def test_cache_skips_polled_reads(alicloud_cache):
+    cache = alicloud_cache.DescribeCache(ttl=300)
+    conn = Connection('Vpc')
+    for action in ('DescribeVpcAttribute', 'DescribeVpcAttribute', 'DescribeHealthStatus', 'DescribeHealthStatus'):
+        request(cache, conn, action)
+    assert len(conn.calls) == 4
+
+
+def test_cached_connection_reads_afresh_after_a_write(alicloud_cache):
+    cache = alicloud_cache.DescribeCache(ttl=300)
+    reader, writer = Connection('Vpc'), Connection('Vpc')
+    alicloud_cache.cache_connection(reader, cache)
+    alicloud_cache.cache_connection(writer, cache)
+    reader.make_request('DescribeVpcs')
+    writer.make_request('DescribeVpcs')
+    assert writer.calls == []
+
+    writer.make_request_new(dict(Action='CreateVpc'))
+    writer.make_request('DescribeVpcs')
+    writer.make_request('DescribeVpcs')
+    reader.make_request('DescribeVpcs')
+    reader.make_request('DescribeVpcs')
+    assert writer.calls == ['CreateVpc', 'DescribeVpcs', 'DescribeVpcs'] and reader.calls == ['DescribeVpcs'] * 2
+
+
+def test_module_waits_through_the_cache(run_module, cloud, tmp_path):
+    args = dict(name='vpc1', cidr_block='172.16.0.0/12', alicloud_cache_ttl=300, alicloud_cache_dir=str(tmp_path))
+    assert ok(run_module('ali_vpc', args))['changed']
+    actions = [c.action for c in cloud.calls]
+    assert 'DescribeVpcAttribute' in actions[actions.index('CreateVpc'):]
+    assert not ok(run_module('ali_vpc', args))['changed']
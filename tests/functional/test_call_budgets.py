@@ -0,0 +1,383 @@
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The API calls and the bytes every module spends on its create, no-op, modify, delete and info scenarios, held to the
+budgets of call_budgets.json. A change which makes a scenario call the API more often fails here; one which makes it
+cheaper should lower the budget in the same change, by running
+
+    ALICLOUD_UPDATE_CALL_BUDGETS=true python -m pytest tests/functional/test_call_budgets.py
+"""
+
+import os
+import json
+from collections import OrderedDict
+
+import pytest
+
+from helpers import IMAGE_ID, ZONE_ID, ok, network, instances
+
+BUDGETS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'call_budgets.json')
+UPDATE_BUDGETS = os.environ.get('ALICLOUD_UPDATE_CALL_BUDGETS', '').lower() in ('1', 'true', 'yes')
+
+# Request sizes move with the lengths of generated names and ids, call counts don't
+BYTES_TOLERANCE = 1.1
+
+SCENARIOS = OrderedDict()
+
+
+def scenario(func):
+    SCENARIOS[func.__name__] = func
+    return func
+
+
+def load_budgets():
+    if not os.path.exists(BUDGETS_FILE):
+        return {}
+    with open(BUDGETS_FILE) as f:
+        return json.load(f)
+
+
+class Meter(object):
+    """Runs a module as one step of a scenario and records the calls and the bytes it spent."""
+
+    def __init__(self, cloud, run_module):
+        self.cloud = cloud
+        self.run_module = run_module
+        self.usage = OrderedDict()
+
+    def __call__(self, step, name, args):
+        self.cloud.reset_calls()
+        result = ok(self.run_module(name, args))
+        calls = list(self.cloud.calls)
+        self.usage['%s %s' % (name, step)] = [len(calls), sum(c.request_bytes + c.response_bytes for c in calls)]
+        return result
+
+
+@pytest.fixture(scope='module')
+def budgets():
+    recorded = load_budgets()
+    yield recorded
+    if UPDATE_BUDGETS:
+        with open(BUDGETS_FILE, 'w') as f:
+            json.dump(OrderedDict(sorted(recorded.items())), f, indent=2)
+            f.write('\n')
+
+
+@pytest.fixture
+def meter(cloud, run_module):
+    return Meter(cloud, run_module)
+
+
+# ECS and VPC
+
+@scenario
+def vpc(meter, run_module, tmp_path):
+    args = dict(name='vpc1', cidr_block='172.16.0.0/12')
+    vpc = meter('create', 'ali_vpc', args)['vpc']
+    meter('no-op', 'ali_vpc', args)
+    meter('modify', 'ali_vpc', dict(args, description='modified'))
+    meter('info', 'ali_vpc_info', dict(name_prefix='vpc'))
+    meter('info by id', 'ali_vpc_info', dict(vpc_ids=[vpc['id']]))
+    meter('delete', 'ali_vpc', dict(args, state='absent'))
+
+
+@scenario
+def vswitch(meter, run_module, tmp_path):
+    vpc = ok(run_module('ali_vpc', dict(name='vpc1', cidr_block='172.16.0.0/12')))['vpc']
+    args = dict(name='vsw1', cidr_block='172.16.1.0/24', vpc_id=vpc['id'], zone_id=ZONE_ID)
+    meter('create', 'ali_vswitch', args)
+    meter('no-op', 'ali_vswitch', args)
+    meter('modify', 'ali_vswitch', dict(args, description='modified'))
+    meter('info', 'ali_vswitch_info', dict(name_prefix='vsw'))
+    meter('delete', 'ali_vswitch', dict(cidr_block='172.16.1.0/24', vpc_id=vpc['id'], state='absent'))
+
+
+@scenario
+def security_group(meter, run_module, tmp_path):
+    vpc = ok(run_module('ali_vpc', dict(name='vpc1', cidr_block='172.16.0.0/12')))['vpc']
+    rules = [dict(ip_protocol='TCP', port_range='%d/%d' % (port, port), source_cidr_ip='0.0.0.0/0', priority='1')
+             for port in (22, 80, 443)]
+    args = dict(name='sg1', vpc_id=vpc['id'], rules=rules)
+    meter('create', 'ali_security_group', args)
+    meter('no-op', 'ali_security_group', args)
+    meter('modify', 'ali_security_group', dict(args, rules=rules[:2], description='modified'))
+    meter('info', 'ali_security_group_info', dict(name_prefix='sg'))
+    groups = [dict(name='sg%d' % i, rules=rules) for i in range(1, 4)]
+    meter('groups', 'ali_security_group', dict(vpc_id=vpc['id'], groups=groups))
+    meter('groups no-op', 'ali_security_group', dict(vpc_id=vpc['id'], groups=groups))
+    meter('delete', 'ali_security_group', dict(name='sg1', vpc_id=vpc['id'], state='absent'))
+
+
+@scenario
+def eip(meter, run_module, tmp_path):
+    eip = meter('create', 'ali_eip', dict(name='eip1', bandwidth=5))['eip']
+    meter('no-op', 'ali_eip', dict(ip_address=eip['ip_address'], bandwidth=5))
+    meter('modify', 'ali_eip', dict(ip_address=eip['ip_address'], bandwidth=10))
+    meter('info', 'ali_eip_info', dict(name_prefix='eip'))
+    meter('delete', 'ali_eip', dict(ip_address=eip['ip_address'], state='absent'))
+
+
+@scenario
+def instance(meter, run_module, tmp_path):
+    vpc, vswitch, group = network(run_module)
+    args = dict(image_id=IMAGE_ID, instance_type='ecs.g6.large', count=3, vswitch_id=vswitch['id'],
+                security_groups=[group['id']], instance_name='web', tags={'app': 'web'})
+    ids = [i['id'] for i in meter('create', 'ali_instance', args)['instances']]
+    meter('no-op', 'ali_instance', args)
+    meter('modify', 'ali_instance', dict(args, description='modified'))
+    meter('stop', 'ali_instance', dict(instance_ids=ids, state='stopped'))
+    meter('start', 'ali_instance', dict(instance_ids=ids, state='running'))
+    meter('info', 'ali_instance_info', dict(name_prefix='web'))
+    meter('info by id', 'ali_instance_info', dict(instance_ids=ids))
+    meter('delete', 'ali_instance', dict(instance_ids=ids, state='absent', force=True))
+
+
+@scenario
+def disk(meter, run_module, tmp_path):
+    vpc, vswitch, group = network(run_module)
+    ids = instances(run_module, vswitch, group, count=1)
+    args = dict(zone_id=ZONE_ID, disk_name='disk1', size=20, disk_category='cloud_ssd')
+    disk = meter('create', 'ali_disk', args)['disk']
+    meter('attach', 'ali_disk', dict(zone_id=ZONE_ID, disk_name='disk1', instance_id=ids[0]))
+    meter('info', 'ali_disk_info', dict(name_prefix='disk'))
+    meter('detach', 'ali_disk', dict(disk_id=disk['id'], instance_id=ids[0], state='absent'))
+    meter('delete', 'ali_disk', dict(disk_id=disk['id'], state='absent'))
+
+
+@scenario
+def eni(meter, run_module, tmp_path):
+    vpc, vswitch, group = network(run_module)
+    args = dict(vswitch_id=vswitch['id'], security_groups=[group['id']], name='eni1')
+    eni = meter('create', 'ali_eni', args)['interface']
+    meter('no-op', 'ali_eni', dict(args, eni_id=eni['id']))
+    meter('modify', 'ali_eni', dict(args, eni_id=eni['id'], description='modified'))
+    meter('info', 'ali_eni_info', dict(eni_ids=[eni['id']]))
+    meter('delete', 'ali_eni', dict(eni_id=eni['id'], state='absent'))
+
+
+@scenario
+def key_pair(meter, run_module, tmp_path):
+    meter('create', 'ali_key_pair', dict(name='kp1'))
+    meter('no-op', 'ali_key_pair', dict(name='kp1'))
+    meter('info', 'ali_key_pair_info', dict(key_pair_name='kp1'))
+    meter('delete', 'ali_key_pair', dict(name='kp1', state='absent'))
+
+
+@scenario
+def route_entry(meter, run_module, tmp_path):
+    vpc, vswitch, group = network(run_module)
+    ids = instances(run_module, vswitch, group, count=1)
+    args = dict(router_id=vpc['vrouter_id'], destination_cidrblock='192.168.0.0/24', nexthop_id=ids[0])
+    meter('create', 'ali_route_entry', args)
+    meter('modify', 'ali_route_entry', dict(args, name='route1'))
+    meter('no-op', 'ali_route_entry', dict(args, name='route1'))
+    meter('info', 'ali_route_entry_info', dict(vrouter_id=vpc['vrouter_id']))
+    meter('delete', 'ali_route_entry', dict(args, state='absent'))
+
+
+@scenario
+def info_filters(meter, run_module, tmp_path):
+    # Sixty of each resource, one in ten tagged env=prod, so that the pages a filter saves show in the bytes
+    vpc, vswitch, group = network(run_module)
+    tagged = dict((i, {'Tag.1.Key': 'env', 'Tag.1.Value': 'prod' if i % 10 == 0 else 'test'}) for i in range(60))
+    vpc_ids = [meter.cloud['vpc'].handle('CreateVpc', dict(tagged[i], VpcName='vpc%d' % i,
+                                                           CidrBlock='10.%d.0.0/16' % i))['VpcId'] for i in range(60)]
+    for i in range(60):
+        meter.cloud['vpc'].handle('CreateVSwitch', dict(tagged[i], VSwitchName='vsw%d' % i, VpcId=vpc['id'],
+                                                        CidrBlock='172.17.%d.0/24' % i, ZoneId=ZONE_ID))
+        meter.cloud['ecs'].handle('CreateDisk', dict(tagged[i], DiskName='disk%d' % i, ZoneId=ZONE_ID))
+    eip_ids = [meter.cloud['vpc'].handle('AllocateEipAddress', dict(tagged[i], Name='eip%d' % i))['AllocationId']
+               for i in range(60)]
+    ok(run_module('ali_instance', dict(image_id=IMAGE_ID, instance_type='ecs.g6.large', count=55,
+                                       vswitch_id=vswitch['id'], security_groups=[group['id']], instance_name='db')))
+    instances(run_module, vswitch, group, count=5)
+
+    meter('info by name_prefix', 'ali_instance_info', dict(name_prefix='web', fields=['instance_name']))
+    meter('info by tag', 'ali_disk_info', dict(tags={'env': 'prod'}))
+    meter('info by tag', 'ali_eip_info', dict(tags={'env': 'prod'}))
+    meter('info by ids', 'ali_eip_info', dict(eip_ids=eip_ids[:5]))
+    meter('info by tag', 'ali_vpc_info', dict(tags={'env': 'prod'}))
+    meter('info by ids', 'ali_vpc_info', dict(vpc_ids=vpc_ids[:5]))
+    meter('info by tag', 'ali_vswitch_info', dict(tags={'env': 'prod'}))
+
+
+# SLB
+
+@scenario
+def slb(meter, run_module, tmp_path):
+    vpc, vswitch, group = network(run_module)
+    ids = instances(run_module, vswitch, group, count=4)
+    args = dict(name='lb1', vswitch_id=vswitch['id'])
+    lb = meter('create', 'ali_slb_lb', args)['load_balancer']
+    meter('no-op', 'ali_slb_lb', args)
+    meter('modify', 'ali_slb_lb', dict(args, internet_charge_type='PayByTraffic', bandwidth=10))
+    meter('info', 'ali_slb_lb_info', dict(name_prefix='lb'))
+
+    listener = dict(load_balancer_id=lb['id'], listener_port=80, backend_server_port=8080, protocol='http',
+                    bandwidth=5, state='present')
+    meter('create', 'ali_slb_listener', listener)
+    meter('modify', 'ali_slb_listener', dict(listener, bandwidth=10))
+    listeners = dict(load_balancer_id=lb['id'], protocol='tcp', backend_server_port=3306,
+                     listeners=[dict(listener_port=p) for p in range(3306, 3316)])
+    meter('listeners', 'ali_slb_listener', listeners)
+    meter('listeners no-op', 'ali_slb_listener', listeners)
+    meter('listeners delete', 'ali_slb_listener', dict(listeners, state='absent'))
+    meter('info', 'ali_slb_listener_info', dict(load_balancer_id=lb['id'], listener_port=80, listener_type='http'))
+    meter('info details', 'ali_slb_lb_info', dict(name_prefix='lb', details=['listeners', 'vserver_groups', 'health']))
+
+    servers = dict(load_balancer_id=lb['id'], backend_servers=[dict(server_ids=ids, weight=50)])
+    meter('create', 'ali_slb_server', servers)
+    meter('no-op', 'ali_slb_server', servers)
+    meter('modify', 'ali_slb_server', dict(servers, backend_servers=[dict(server_ids=ids, weight=60)]))
+    meter('info', 'ali_slb_server_info', dict(load_balancer_id=lb['id']))
+    meter('delete', 'ali_slb_server', dict(load_balancer_id=lb['id'], state='absent',
+                                           backend_servers=[dict(server_id=i) for i in ids]))
+
+    vsg = dict(load_balancer_id=lb['id'], vserver_group_name='vsg1',
+               backend_servers=[dict(server_id=i, port=80, weight=100) for i in ids])
+    meter('create', 'ali_slb_vsg', vsg)
+    meter('no-op', 'ali_slb_vsg', vsg)
+    meter('modify', 'ali_slb_vsg', dict(vsg, backend_servers=[dict(server_id=i, port=80, weight=90) for i in ids]))
+    meter('info', 'ali_slb_vsg_info', dict(load_balancer_id=lb['id']))
+    vsg_id = ok(run_module('ali_slb_vsg', vsg))['vserver_group']['id']
+    # The servers of a group are only health checked through a listener which forwards to it
+    ok(run_module('ali_slb_listener', dict(listener, listener_port=8000, vserver_group_id=vsg_id)))
+    meter('shift', 'ali_slb_traffic_shift', dict(vserver_group_ids=[vsg_id], from_servers=ids[:2], to_servers=ids[2:],
+                                                 steps=2, interval=0, wait_for_healthy=True))
+    ok(run_module('ali_slb_listener', dict(listener, listener_port=8000, state='absent')))
+    meter('delete', 'ali_slb_vsg', dict(load_balancer_id=lb['id'], vserver_group_name='vsg1', state='absent'))
+
+    meter('delete', 'ali_slb_listener', dict(listener, state='absent'))
+    meter('delete', 'ali_slb_lb', dict(name='lb1', state='absent'))
+
+
+# RDS
+
+@scenario
+def rds(meter, run_module, tmp_path):
+    vpc, vswitch, group = network(run_module)
+    args = dict(engine='MySQL', engine_version='8.0', db_instance_class='rds.mysql.t1.small', db_instance_storage=30,
+                db_instance_net_type='Intranet', db_instance_name='db1', security_ips='10.0.0.0/8',
+                pay_type='PostPaid', vswitch_id=vswitch['id'])
+    instance = meter('create', 'ali_rds_instance', args)['instances']
+    meter('no-op', 'ali_rds_instance', dict(db_instance_name='db1'))
+    meter('info', 'ali_rds_instance_info', dict(name_prefix='db'))
+
+    database = dict(db_instance_id=instance['id'], db_name='app', character_set_name='utf8', db_description='d')
+    meter('create', 'ali_rds_database', database)
+    meter('no-op', 'ali_rds_database', database)
+    meter('modify', 'ali_rds_database', dict(database, db_description='modified'))
+    meter('info', 'ali_rds_database_info', dict(db_instance_id=instance['id']))
+
+    account = dict(db_instance_id=instance['id'], account_name='user1', account_password='Passw0rd!',
+                   db_names=['app'], account_privilege='ReadWrite')
+    meter('create', 'ali_rds_account', account)
+    meter('modify', 'ali_rds_account', dict(db_instance_id=instance['id'], account_name='user1',
+                                            account_description='modified'))
+    meter('info', 'ali_rds_account_info', dict(db_instance_id=instance['id']))
+
+    meter('delete', 'ali_rds_account', dict(db_instance_id=instance['id'], account_name='user1', state='absent'))
+    meter('delete', 'ali_rds_database', dict(db_instance_id=instance['id'], db_name='app', state='absent'))
+    meter('delete', 'ali_rds_instance', dict(db_instance_name='db1', state='absent'))
+
+
+# RAM
+
+@scenario
+def ram(meter, run_module, tmp_path):
+    meter('create', 'ali_ram_user', dict(user_name='user1', display_name='U1'))
+    meter('no-op', 'ali_ram_user', dict(user_name='user1', display_name='U1'))
+    meter('modify', 'ali_ram_user', dict(user_name='user1', display_name='U2'))
+    meter('info', 'ali_ram_user_info', dict(name_prefix='user'))
+
+    meter('create', 'ali_ram_group', dict(group_name='group1', comments='c'))
+    meter('no-op', 'ali_ram_group', dict(group_name='group1', comments='c'))
+    meter('info', 'ali_ram_group_info', dict(name_prefix='group'))
+
+    meter('create', 'ali_ram_role', dict(role_name='role1', policy='{"Statement": []}'))
+    meter('no-op', 'ali_ram_role', dict(role_name='role1', policy='{"Statement": []}'))
+    meter('info', 'ali_ram_role_info', dict(name_prefix='role'))
+
+    meter('create', 'ali_ram_policy', dict(policy_name='policy1', policy='{"Statement": []}'))
+    meter('attach', 'ali_ram_policy', dict(policy_name='policy1', user_name='user1', policy_type='Custom'))
+    meter('info', 'ali_ram_policy_info', dict(name_prefix='policy'))
+    meter('detach', 'ali_ram_policy', dict(policy_name='policy1', user_name='user1', policy_type='Custom',
+                                           state='absent'))
+    meter('delete', 'ali_ram_policy', dict(policy_name='policy1', state='absent'))
+
+    meter('delete', 'ali_ram_role', dict(role_name='role1', state='absent'))
+    meter('delete', 'ali_ram_group', dict(group_name='group1', state='absent'))
+    meter('delete', 'ali_ram_user', dict(user_name='user1', state='absent'))
+
+
+# DNS, ROS and OOS
+
+@scenario
+def dns(meter, run_module, tmp_path):
+    meter('create', 'ali_dns_group', dict(group_name='group1'))
+    meter('no-op', 'ali_dns_group', dict(group_name='group1'))
+    meter('info', 'ali_dns_group_info', dict(name_prefix='group'))
+    meter('create', 'ali_dns_domain', dict(domain_name='example.com', remark='r1'))
+    meter('modify', 'ali_dns_domain', dict(domain_name='example.com', remark='r1', group_name='group1'))
+    meter('no-op', 'ali_dns_domain', dict(domain_name='example.com', remark='r1', group_name='group1'))
+    meter('info', 'ali_dns_domain_info', dict(domain_name='example.com'))
+    meter('delete', 'ali_dns_domain', dict(domain_name='example.com', state='absent'))
+    meter('delete', 'ali_dns_group', dict(group_name='group1', state='absent'))
+
+
+@scenario
+def ros(meter, run_module, tmp_path):
+    template = tmp_path / 'stack.json'
+    template.write_text(json.dumps({'ROSTemplateFormatVersion': '2015-09-01',
+                                    'Parameters': {'Name': {'Type': 'String'}}, 'Outputs': {'Out': {'Value': 'v1'}}}))
+    stack = dict(stack_name='stack1', template=str(template), template_parameters={'Name': 'a'})
+    meter('create', 'ali_ros_stack', stack)
+    meter('no-op', 'ali_ros_stack', stack)
+    meter('modify', 'ali_ros_stack', dict(stack, template_parameters={'Name': 'b'}))
+    meter('info', 'ali_ros_stack_info', dict(name_prefix='stack'))
+    meter('delete', 'ali_ros_stack', dict(stack_name='stack1', state='absent'))
+
+
+@scenario
+def oos(meter, run_module, tmp_path):
+    content = json.dumps({'FormatVersion': 'OOS-2019-06-01', 'Description': 'd', 'Parameters': {},
+                          'Tasks': [{'Name': 'a', 'Action': 'ACS::Sleep', 'Properties': {'Duration': 'PT1S'}}]})
+    meter('create', 'ali_oos_template', dict(template_name='template1', content=content))
+    meter('no-op', 'ali_oos_template', dict(template_name='template1', content=content))
+    meter('modify', 'ali_oos_template', dict(template_name='template1', content=content.replace('PT1S', 'PT2S')))
+    meter('info', 'ali_oos_template_info', dict(name_prefix='template'))
+    meter('create', 'ali_oos_execution', dict(template_name='template1', parameters={}))
+    meter('info', 'ali_oos_execution_info', dict(name_prefix='template'))
+    meter('delete', 'ali_oos_execution', dict(template_name='template1', state='absent'))
+    meter('delete', 'ali_oos_template', dict(template_name='template1', state='absent'))
+
+
+# OSS
+
+@scenario
+def oss(meter, run_module, tmp_path):
+    meter('create', 'ali_oss_bucket', dict(bucket='bucket1', state='present'))
+    meter('no-op', 'ali_oss_bucket', dict(bucket='bucket1', state='present'))
+    meter('info', 'ali_oss_bucket_info', dict(bucket_prefix='bucket'))
+    meter('create', 'ali_oss_object', dict(bucket='bucket1', mode='put', object='a/b.txt', content='hello'))
+    meter('info', 'ali_oss_object_info', dict(bucket='bucket1'))
+    meter('delete', 'ali_oss_object', dict(bucket='bucket1', mode='delete', object='a/b.txt'))
+    meter('delete', 'ali_oss_bucket', dict(bucket='bucket1', state='absent'))
+
+
+@pytest.mark.parametrize('name', list(SCENARIOS))
+def test_call_budget(name, meter, run_module, budgets, tmp_path):
+    SCENARIOS[name](meter, run_module, tmp_path)
+    if UPDATE_BUDGETS:
+        budgets[name] = meter.usage
+        return
+    budget = budgets.get(name)
+    assert budget, 'No budget for %s, record one with ALICLOUD_UPDATE_CALL_BUDGETS=true' % name
+    over = []
+    for step, (calls, size) in meter.usage.items():
+        max_calls, max_size = budget.get(step, (0, 0))
+        if calls > max_calls or size > max_size * BYTES_TOLERANCE:
+            over.append('%s: %d calls and %d bytes, budget %d calls and %d bytes' % (step, calls, size,
+                                                                                     max_calls, max_size))
+    assert not over, '\n'.join(over)
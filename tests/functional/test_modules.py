@@ -0,0 +1,903 @@
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Every module of plugins/modules, run through its create, no-op, modify and delete cycle against the fake cloud.
+"""
+
+import os
+import re
+import json
+import time
+
+import pytest
+
+from fake_alicloud import FakeAlicloud
+from fake_alicloud.engine import ApiError
+from helpers import IMAGE_ID, ZONE_ID, ok, network, instances
+
+MODULES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                           'plugins', 'modules')
+
+# footmark builds the numbered parameters of its ESS requests as 'ScalingGroupId' + bytes(i + 1), which is a
+# TypeError on Python 3, so the ESS modules fail as soon as they pass a list of ids or names.
+ESS_FOOTMARK_BUG = pytest.mark.xfail(reason='footmark ESS requests concatenate str and bytes on Python 3',
+                                     strict=False)
+
+
+def test_every_module_has_a_scenario():
+    with open(__file__) as f:
+        covered = set(re.findall(r"'(ali_\w+)'", f.read()))
+    modules = set(name[:-3] for name in os.listdir(MODULES_DIR) if name.startswith('ali_') and name.endswith('.py'))
+    assert sorted(modules - covered) == []
+
+
+def test_fake_cloud_throttling_and_paging(run_module, cloud):
+    cloud.throttle_every = 1
+    result = run_module('ali_vpc', dict(name='vpc1', cidr_block='172.16.0.0/12'))
+    assert result['failed'] and 'Throttling' in result['msg']
+    cloud.throttle_every = 0
+    for i in range(120):
+        cloud['vpc'].handle('CreateVpc', dict(VpcName='vpc%d' % i, CidrBlock='10.%d.0.0/16' % i))
+    cloud.reset_calls()
+    assert len(ok(run_module('ali_vpc_info', dict()))['vpcs']) == 120
+    assert len([c for c in cloud.calls if c.action == 'DescribeVpcs']) >= 2
+
+
+def test_fake_cloud_latency():
+    cloud = FakeAlicloud(latency={'DescribeRegions': 0.05})
+    start = time.time()
+    status, headers, body = cloud.call('ecs.aliyuncs.com', 'GET', '/', dict(Action='DescribeRegions'), b'')
+    assert time.time() - start >= 0.05
+    assert status == 200 and json.loads(body)['Regions']['Region']
+    assert cloud.calls[-1].action == 'DescribeRegions'
+
+
+def test_vpc(run_module):
+    vpc, vswitch, group = network(run_module)
+    assert not ok(run_module('ali_vpc', dict(name='vpc1', cidr_block='172.16.0.0/12')))['changed']
+    assert ok(run_module('ali_vpc', dict(name='vpc1', cidr_block='172.16.0.0/12', description='d')))['changed']
+    assert ok(run_module('ali_vpc_info', dict(name_prefix='vpc')))['ids'] == [vpc['id']]
+    assert ok(run_module('ali_vswitch_info', dict(name_prefix='vsw')))['ids'] == [vswitch['id']]
+    assert ok(run_module('ali_vpc_tag', dict(resource_ids=[vpc['id']], tags={'env': 'test'})))['changed']
+    assert not ok(run_module('ali_vpc_tag', dict(resource_ids=[vpc['id']], tags={'env': 'test'})))['changed']
+    assert ok(run_module('ali_vpc_tag', dict(resource_ids=[vpc['id']], tags={'env': 'test'}, state='absent')))['changed']
+
+    eip = ok(run_module('ali_eip', dict(name='eip1', bandwidth=5)))['eip']
+    assert ok(run_module('ali_eip', dict(ip_address=eip['ip_address'], bandwidth=10)))['changed']
+    assert ok(run_module('ali_eip_info', dict(name_prefix='eip')))['ids'] == [eip['id']]
+
+    ids = instances(run_module, vswitch, group, count=1)
+    route = dict(router_id=vpc['vrouter_id'], destination_cidrblock='192.168.0.0/24', nexthop_id=ids[0],
+                 name='route1')
+    assert ok(run_module('ali_route_entry', route))['changed']
+    # The entry is created unnamed and named by the second run
+    assert ok(run_module('ali_route_entry', route))['route_entry']['route_entry_name'] == 'route1'
+    assert not ok(run_module('ali_route_entry', route))['changed']
+    entries = ok(run_module('ali_route_entry_info', dict(vrouter_id=vpc['vrouter_id'])))['vroute_entries']
+    assert '192.168.0.0/24' in [e['destination_cidr_block'] for e in entries]
+    assert ok(run_module('ali_route_entry', dict(route, state='absent')))['changed']
+
+    assert ok(run_module('ali_eip', dict(ip_address=eip['ip_address'], state='absent')))['changed']
+    ok(run_module('ali_instance', dict(instance_ids=ids, state='absent', force=True)))
+    assert ok(run_module('ali_vswitch', dict(cidr_block='172.16.1.0/24', vpc_id=vpc['id'], state='absent')))['changed']
+
+
+def test_ecs(run_module):
+    vpc, vswitch, group = network(run_module)
+    rules = [dict(ip_protocol='TCP', port_range='22/22', source_cidr_ip='0.0.0.0/0', priority='1')]
+    assert ok(run_module('ali_security_group', dict(name='sg1', vpc_id=vpc['id'], rules=rules)))['changed']
+    assert not ok(run_module('ali_security_group', dict(name='sg1', vpc_id=vpc['id'], rules=rules)))['changed']
+    assert ok(run_module('ali_security_group_info', dict(name_prefix='sg')))['ids'] == [group['id']]
+
+    args = dict(image_id=IMAGE_ID, instance_type='ecs.g6.large', count=2, vswitch_id=vswitch['id'],
+                security_groups=[group['id']], instance_name='web', tags={'app': 'web'})
+    ids = [i['id'] for i in ok(run_module('ali_instance', args))['instances']]
+    assert len(ids) == 2
+    assert not ok(run_module('ali_instance', args))['changed']
+    assert sorted(ok(run_module('ali_instance_info', dict(name_prefix='web')))['ids']) == sorted(ids)
+    assert ok(run_module('ali_instance', dict(instance_ids=ids, state='stopped')))['changed']
+    # The user data is compared by its digest, plain text and base64 text of the same data match
+    stopped = dict(instance_ids=ids, state='stopped', user_data='#!/bin/sh\necho hello\n')
+    assert ok(run_module('ali_instance', stopped))['changed']
+    assert not ok(run_module('ali_instance', stopped))['changed']
+    assert not ok(run_module('ali_instance', dict(stopped, user_data='IyEvYmluL3NoCmVjaG8gaGVsbG8K')))['changed']
+    result = ok(run_module('ali_instance', dict(instance_ids=ids, state='running', wait=True)))
+    assert result['changed'] and [o['current_status'] for o in result['outcomes']] == ['Running', 'Running']
+    result = ok(run_module('ali_instance', dict(instance_ids=ids, state='restarted', wait=True)))
+    assert [i['status'] for i in result['instances']] == ['running', 'running']
+    assert ok(run_module('ali_instance', dict(instance_ids=ids, state='restarted',
+                                              password='Passw0rd!')))['changed']
+    assert ok(run_module('ali_ecs_tag', dict(resource_ids=ids, resource_type='instance', tags={'x': 'y'})))['changed']
+    assert ok(run_module('ali_instance_type_facts', dict(instance_type_families=['ecs.g6'])))['instance_types']
+
+    disk = ok(run_module('ali_disk', dict(zone_id=ZONE_ID, disk_name='disk1', size=20, disk_category='cloud_ssd')))
+    assert ok(run_module('ali_disk', dict(zone_id=ZONE_ID, disk_name='disk1', instance_id=ids[0])))['changed']
+    assert disk['disk']['id'] in ok(run_module('ali_disk_info', dict()))['disk_ids']
+
+    eni = ok(run_module('ali_eni', dict(vswitch_id=vswitch['id'], security_groups=[group['id']], name='eni1')))['interface']
+    assert eni['id'] in ok(run_module('ali_eni_info', dict()))['ids']
+
+    assert ok(run_module('ali_key_pair', dict(name='kp1')))['changed']
+    assert not ok(run_module('ali_key_pair', dict(name='kp1')))['changed']
+    assert [k['name'] for k in ok(run_module('ali_key_pair_info', dict()))['key_pairs']] == ['kp1']
+
+    image = ok(run_module('ali_image', dict(instance_id=ids[0], image_name='img1')))['image']
+    assert ok(run_module('ali_image_info', dict(image_names=['img1'])))['image_ids'] == [image['id']]
+    assert ok(run_module('ali_image', dict(image_id=image['id'], state='absent')))['changed']
+
+    assert ok(run_module('ali_key_pair', dict(name='kp1', state='absent')))['changed']
+    assert ok(run_module('ali_instance', dict(instance_ids=ids, state='absent', force=True)))['changed']
+    assert ok(run_module('ali_security_group', dict(name='sg1', vpc_id=vpc['id'], state='absent')))['changed']
+
+
+def test_instance_placements(run_module, cloud):
+    vpc, vswitch, group = network(run_module)
+    other = ok(run_module('ali_vswitch', dict(name='vsw2', cidr_block='172.16.2.0/24', vpc_id=vpc['id'],
+                                              zone_id='cn-hangzhou-h')))['vswitch']
+    cloud['ecs'].out_of_stock.add(ZONE_ID)
+    args = dict(image_id=IMAGE_ID, instance_type='ecs.g6.large', count=120, security_groups=[group['id']],
+                instance_name='bulk', placements=[dict(vswitch_id=vswitch['id']), dict(vswitch_id=other['id'])])
+    result = ok(run_module('ali_instance', args))
+    assert len(result['instances']) == 120
+    assert set(i['availability_zone'] for i in result['instances']) == set(['cn-hangzhou-h'])
+    # Two batches of 60, and the one which started in the sold out zone moved on to the other one
+    amounts = [int(c.params['Amount']) for c in cloud.calls if c.action == 'RunInstances' and c.status == 200]
+    assert amounts == [60, 60]
+
+    # One StopInstances call per 100 instances, and an instance which can not stop does not hold back the others
+    cloud['ecs'].find('Instance', result['instances'][0]['id'])['Status'] = 'Starting'
+    cloud.reset_calls()
+    stopped = run_module('ali_instance', dict(instance_name='bulk', state='stopped', wait=True))
+    assert stopped['failed'] and stopped['changed'] and '1 of 120' in stopped['msg']
+    assert [o['code'] for o in stopped['outcomes']].count('200') == 119
+    assert [c.action for c in cloud.calls].count('StopInstances') == 2
+
+    cloud['ecs'].out_of_stock.add('cn-hangzhou-h')
+    result = run_module('ali_instance', dict(args, count=121))
+    assert result['failed'] and 'OperationDenied.NoStock' in result['msg'] and result['ids'] == []
+    assert ok(run_module('ali_instance', dict(args, count=0, force=True)))['changed']
+
+
+def test_instance_scale_in(run_module, cloud):
+    vpc, vswitch, group = network(run_module)
+    other = ok(run_module('ali_vswitch', dict(name='vsw2', cidr_block='172.16.2.0/24', vpc_id=vpc['id'],
+                                              zone_id='cn-hangzhou-h')))['vswitch']
+    args = dict(image_id=IMAGE_ID, instance_type='ecs.g6.large', security_groups=[group['id']], instance_name='web',
+                placements=[dict(vswitch_id=vswitch['id']), dict(vswitch_id=other['id'])], force=True)
+    ok(run_module('ali_instance', dict(args, count=4)))
+    created = [i['id'] for i in ok(run_module('ali_instance', dict(args, count=6)))['instances']]
+    zones = dict((i['id'], i['availability_zone']) for i in ok(run_module('ali_instance_info', dict()))['instances'])
+
+    # The newest instance of the fuller zone goes first, then the zones take turns
+    cloud.reset_calls()
+    result = ok(run_module('ali_instance', dict(args, count=3, scale_in_strategy='zone_balance')))
+    assert sorted(zones[i['id']] for i in result['instances']) == [ZONE_ID, 'cn-hangzhou-h', 'cn-hangzhou-h']
+    assert [c.action for c in cloud.calls].count('DeleteInstances') == 1
+    assert 'DeleteInstance' not in [c.action for c in cloud.calls]
+
+    remaining = [i['id'] for i in result['instances']]
+    result = ok(run_module('ali_instance', dict(args, count=1, scale_in_strategy='oldest')))
+    assert [i['id'] for i in result['instances']] == [max(remaining, key=created.index)]
+
+    args.update(force=False)
+    result = run_module('ali_instance', dict(args, count=0))
+    assert result['failed'] and 'please stop them' in result['msg']
+
+
+def test_info_fields(run_module, cloud):
+    vpc, vswitch, group = network(run_module)
+    ids = instances(run_module, vswitch, group)
+
+    # Only the requested fields come back, and the calls which fetch the other ones are skipped
+    cloud.reset_calls()
+    result = ok(run_module('ali_instance_info', dict(fields=['private_ip_address'])))
+    assert sorted(i['id'] for i in result['instances']) == sorted(ids)
+    assert all(sorted(i) == ['id', 'private_ip_address'] for i in result['instances'])
+    assert not set(['DescribeDisks', 'DescribeUserData']) & set(c.action for c in cloud.calls)
+
+    cloud.reset_calls()
+    result = ok(run_module('ali_security_group_info', dict(fields=['vpc_id'])))
+    assert result['groups'] == [dict(id=group['id'], vpc_id=vpc['id'])]
+    assert 'DescribeSecurityGroupAttribute' not in [c.action for c in cloud.calls]
+    result = ok(run_module('ali_security_group_info', dict(fields=['permissions'])))
+    assert sorted(result['groups'][0]) == ['id', 'permissions']
+    assert 'DescribeSecurityGroupAttribute' in [c.action for c in cloud.calls]
+
+
+def test_info_server_filters(run_module, cloud):
+    vpc_ids = [cloud['vpc'].handle('CreateVpc', {'VpcName': 'vpc%d' % i, 'CidrBlock': '10.%d.0.0/16' % i,
+                                                 'Tag.1.Key': 'env', 'Tag.1.Value': 'env%d' % (i % 3)})['VpcId']
+               for i in range(30)]
+
+    # A single tag and the IDs, 20 to a call, are filtered by the API
+    cloud.reset_calls()
+    assert len(ok(run_module('ali_vpc_info', dict(tags={'env': 'env0'})))['ids']) == 10
+    assert [c.params.get('Tag.1.Value') for c in cloud.calls] == ['env0']
+    cloud.reset_calls()
+    assert ok(run_module('ali_vpc_info', dict(vpc_ids=vpc_ids, name_prefix='vpc2')))['ids'] == \
+        [vpc_ids[2]] + vpc_ids[20:30]
+    assert [len(c.params['VpcId'].split(',')) for c in cloud.calls] == [20, 10]
+
+    # Any one of several tags is enough, which the API can't tell, so they are matched here
+    tags = {'env': 'env1', 'team': 'a'}
+    assert len(ok(run_module('ali_vpc_info', dict(tags=tags)))['ids']) == 10
+
+    vpc, vswitch, group = network(run_module)
+    ids = instances(run_module, vswitch, group)
+    ok(run_module('ali_instance', dict(image_id=IMAGE_ID, instance_type='ecs.g6.large', count=2,
+                                       vswitch_id=vswitch['id'], security_groups=[group['id']], instance_name='db')))
+    cloud.reset_calls()
+    assert sorted(ok(run_module('ali_instance_info', dict(name_prefix='we', fields=['id'])))['ids']) == sorted(ids)
+    assert [c.params.get('InstanceName') for c in cloud.calls] == ['we*']
+
+
+def test_security_group_rules(run_module, cloud):
+    vpc = ok(run_module('ali_vpc', dict(name='vpc1', cidr_block='172.16.0.0/12')))['vpc']
+    rules = [dict(ip_protocol='tcp', port_range='%d/%d' % (port, port), source_cidr_ip='10.0.0.0/8')
+             for port in range(1000, 1250)]
+    args = dict(name='sg1', vpc_id=vpc['id'], rules=rules)
+
+    # The rules go 100 to a call, and only the ones which differ are sent
+    cloud.reset_calls()
+    group = ok(run_module('ali_security_group', args))['group']
+    assert len(group['permissions']) == 250
+    assert [c.action for c in cloud.calls].count('AuthorizeSecurityGroup') == 3
+    cloud.reset_calls()
+    assert not ok(run_module('ali_security_group', args))['changed']
+    assert not [c for c in cloud.calls if c.action.startswith(('Authorize', 'Revoke'))]
+
+    cloud.reset_calls()
+    rules = rules[10:] + [dict(ip_protocol='udp', port_range='53/53', source_cidr_ip='10.0.0.0/8', priority=1,
+                               policy='Accept', nic_type='intranet')]
+    group = ok(run_module('ali_security_group', dict(args, rules=rules)))['group']
+    assert len(group['permissions']) == 241
+    assert [c.action for c in cloud.calls if c.action.startswith(('Authorize', 'Revoke'))] == \
+        ['RevokeSecurityGroup', 'AuthorizeSecurityGroup']
+    assert not ok(run_module('ali_security_group', dict(args, rules=rules)))['changed']
+
+    # A rule which only has another description keeps its place and is described again
+    cloud.reset_calls()
+    rules[0] = dict(rules[0], description='ssh')
+    result = ok(run_module('ali_security_group', dict(args, rules=rules)))
+    assert result['changed']
+    assert [c.action for c in cloud.calls if c.action.startswith(('Authorize', 'Revoke', 'Modify'))] == ['ModifySecurityGroupRule']
+    assert [p['description'] for p in result['group']['permissions'] if p['port_range'] == '1010/1010'] == ['ssh']
+    assert not ok(run_module('ali_security_group', dict(args, rules=rules)))['changed']
+
+
+def test_security_group_lookup(run_module, cloud):
+    vpc = ok(run_module('ali_vpc', dict(name='vpc1', cidr_block='172.16.0.0/12')))['vpc']
+    for i in range(120):
+        cloud['ecs'].handle('CreateSecurityGroup', {'VpcId': vpc['id'], 'SecurityGroupName': 'sg%d' % i})
+    # The name is matched by the API, so the lookup is a single page whatever the size of the VPC
+    cloud.reset_calls()
+    group = ok(run_module('ali_security_group', dict(name='sg7', vpc_id=vpc['id'])))
+    assert not group['changed'] and group['group']['group_name'] == 'sg7'
+    lookups = [c for c in cloud.calls if c.action == 'DescribeSecurityGroups']
+    assert len(lookups) == 1 and lookups[0].params['SecurityGroupName'] == 'sg7'
+
+
+def test_security_group_groups(run_module, cloud):
+    vpc = ok(run_module('ali_vpc', dict(name='vpc1', cidr_block='172.16.0.0/12')))['vpc']
+    rule = dict(ip_protocol='tcp', port_range='22/22', source_cidr_ip='10.0.0.0/8')
+    ok(run_module('ali_security_group', dict(name='old', vpc_id=vpc['id'])))
+    ok(run_module('ali_security_group', dict(name='sg0', vpc_id=vpc['id'], rules=[rule])))
+    groups = [dict(name='sg%d' % i, rules=[dict(rule, port_range='%d/%d' % (i + 1000, i + 1000))]) for i in range(20)]
+    args = dict(vpc_id=vpc['id'], groups=groups + [dict(name='old', state='absent')], max_concurrency=8)
+
+    # One listing finds all of the groups, then each group is changed on its own
+    cloud.reset_calls()
+    result = ok(run_module('ali_security_group', args))
+    assert result['changed'] and [g['name'] for g in result['groups']] == ['sg%d' % i for i in range(20)] + ['old']
+    assert [c.action for c in cloud.calls].count('DescribeSecurityGroups') == 1
+    assert [c.action for c in cloud.calls].count('CreateSecurityGroup') == 19
+    assert [c.action for c in cloud.calls].count('DeleteSecurityGroup') == 1
+    assert [p['port_range'] for p in result['groups'][0]['group']['permissions']] == ['1000/1000']
+    assert not ok(run_module('ali_security_group', args))['changed']
+
+    # A group which fails does not stop the others
+    groups[1]['rules'] = [dict(rule, bogus='x')]
+    result = run_module('ali_security_group', dict(args, groups=groups[:2]))
+    assert result['failed'] and 'bogus' in result['msg']
+    groups[1]['rules'] = [dict(rule, port_range='100/100')]
+    groups[2]['vpc_id'] = 'vpc-missing'
+    result = run_module('ali_security_group', dict(args, groups=groups[:3]))
+    assert result['failed'] and result['changed'] and 'sg2' in result['msg']
+    assert [g['changed'] for g in result['groups']] == [False, True, False]
+
+
+def test_security_group_compact_rules(run_module):
+    vpc = ok(run_module('ali_vpc', dict(name='vpc1', cidr_block='172.16.0.0/12')))['vpc']
+    # A rule per host of 10.0.0.0/24 and a rule per port of 8000-8099, overlapping 8050-8120
+    rules = [dict(ip_protocol='tcp', port_range='22/22', source_cidr_ip='10.0.0.%d/32' % i) for i in range(256)]
+    rules += [dict(ip_protocol='tcp', port_range='%d/%d' % (port, port), source_cidr_ip='0.0.0.0/0')
+              for port in range(8000, 8100)]
+    rules += [dict(ip_protocol='tcp', port_range='8050/8120', source_cidr_ip='0.0.0.0/0'),
+              dict(ip_protocol='udp', port_range='53/53', source_cidr_ip='10.0.0.0/25'),
+              dict(ip_protocol='udp', port_range='53/53', source_cidr_ip='10.0.1.0/25'),
+              dict(ip_protocol='icmp', port_range='-1/-1', source_cidr_ip='10.0.0.0/24')]
+    args = dict(name='sg1', vpc_id=vpc['id'], rules=rules, compact_rules=True)
+    group = ok(run_module('ali_security_group', args))['group']
+    assert sorted((p['ip_protocol'].lower(), p['port_range'], p['source_cidr_ip']) for p in group['permissions']) == [
+        ('icmp', '-1/-1', '10.0.0.0/24'), ('tcp', '22/22', '10.0.0.0/24'), ('tcp', '8000/8120', '0.0.0.0/0'),
+        ('udp', '53/53', '10.0.0.0/25'), ('udp', '53/53', '10.0.1.0/25')]
+    assert not ok(run_module('ali_security_group', args))['changed']
+
+
+def test_slb(run_module, cloud):
+    vpc, vswitch, group = network(run_module)
+    ids = instances(run_module, vswitch, group, count=3)
+    lb = ok(run_module('ali_slb_lb', dict(name='lb1', vswitch_id=vswitch['id'])))['load_balancer']
+    assert not ok(run_module('ali_slb_lb', dict(name='lb1', vswitch_id=vswitch['id'])))['changed']
+    assert ok(run_module('ali_slb_lb_info', dict(name_prefix='lb')))['ids'] == [lb['id']]
+    assert ok(run_module('ali_slb_tag', dict(resource_ids=[lb['id']], tags={'x': 'y'})))['changed']
+
+    listener = dict(load_balancer_id=lb['id'], listener_port=80, backend_server_port=8080, protocol='http',
+                    bandwidth=5, state='present')
+    assert ok(run_module('ali_slb_listener', listener))['changed']
+    assert ok(run_module('ali_slb_listener', dict(listener, bandwidth=10)))['listener']['bandwidth'] == 10
+    assert ok(run_module('ali_slb_listener_info', dict(load_balancer_id=lb['id'], listener_port=80,
+                                                       listener_type='http')))['listener']
+
+    servers = dict(load_balancer_id=lb['id'], backend_servers=[dict(server_ids=ids[:2], weight=50)])
+    assert ok(run_module('ali_slb_server', servers))['changed']
+    servers = dict(servers, backend_servers=[dict(server_ids=ids[:2], weight=60)])
+    assert [s['weight'] for s in ok(run_module('ali_slb_server', servers))['backend_servers']] == [60, 60]
+    # A server whose type differs is set as well
+    servers = dict(servers, backend_servers=[dict(server_id=ids[1], weight=60, type='eni')])
+    assert ok(run_module('ali_slb_server', servers))['changed']
+    assert [s['Type'] for s in cloud['slb'].backend_servers[lb['id']]] == ['ecs', 'eni']
+    assert not ok(run_module('ali_slb_server', servers))['changed']
+    assert len(ok(run_module('ali_slb_server_info', dict(load_balancer_id=lb['id'])))['backend_servers']) == 2
+    assert ok(run_module('ali_slb_server', dict(load_balancer_id=lb['id'], backend_servers=[dict(server_id=ids[0])],
+                                                state='absent')))['changed']
+
+    vsg = dict(load_balancer_id=lb['id'], vserver_group_name='vsg1',
+               backend_servers=[dict(server_id=ids[0], port=80, weight=100)])
+    assert ok(run_module('ali_slb_vsg', vsg))['changed']
+    assert ok(run_module('ali_slb_vsg', dict(vsg, backend_servers=[dict(server_id=ids[0], port=80, weight=90),
+                                                                   dict(server_id=ids[2], port=80, weight=100)])))['changed']
+    assert ok(run_module('ali_slb_vsg_info', dict(load_balancer_id=lb['id'])))['ids']
+
+    assert ok(run_module('ali_slb_listener', dict(listener, state='absent')))['changed']
+    assert ok(run_module('ali_slb_vsg', dict(load_balancer_id=lb['id'], vserver_group_name='vsg1',
+                                             state='absent')))['changed']
+    assert ok(run_module('ali_slb_lb', dict(name='lb1', state='absent')))['changed']
+
+
+def test_slb_server_chunks(run_module, cloud):
+    vpc, vswitch, group = network(run_module)
+    ids = instances(run_module, vswitch, group, count=45)
+    lb = ok(run_module('ali_slb_lb', dict(name='lb1', vswitch_id=vswitch['id'])))['load_balancer']
+    servers = dict(load_balancer_id=lb['id'], backend_servers=[dict(server_ids=ids, weight=50)])
+
+    # 20 servers go to a call, and the result is known without describing the load balancer again
+    cloud.reset_calls()
+    result = ok(run_module('ali_slb_server', servers))
+    assert result['changed'] and [s['id'] for s in result['backend_servers']] == ids
+    assert [c.action for c in cloud.calls] == ['DescribeLoadBalancerAttribute'] + ['AddBackendServers'] * 3
+    assert not ok(run_module('ali_slb_server', servers))['changed']
+
+    # Only the servers whose weight differs are set
+    cloud.reset_calls()
+    result = ok(run_module('ali_slb_server', dict(servers, backend_servers=[dict(server_ids=ids[:25], weight=80)])))
+    weights = dict((i, 80 if n < 25 else 50) for n, i in enumerate(ids))
+    assert dict((s['id'], s['weight']) for s in result['backend_servers']) == weights
+    assert [c.action for c in cloud.calls].count('SetBackendServers') == 2
+    assert not ok(run_module('ali_slb_server', dict(servers, backend_servers=[dict(server_ids=ids[:25], weight=80)])))[
+        'changed']
+
+    absent = dict(load_balancer_id=lb['id'], state='absent', backend_servers=[dict(server_id=i) for i in ids[5:]])
+    result = ok(run_module('ali_slb_server', absent))
+    assert result['changed'] and result['backend_servers'] == [dict(id=i, weight=80) for i in ids[:5]]
+    assert not ok(run_module('ali_slb_server', absent))['changed']
+
+
+def test_slb_server_retries_while_busy(run_module, cloud, monkeypatch):
+    vpc, vswitch, group = network(run_module)
+    ids = instances(run_module, vswitch, group, count=45)
+    lb = ok(run_module('ali_slb_lb', dict(name='lb1', vswitch_id=vswitch['id'])))['load_balancer']
+
+    # Every other call is refused while the load balancer is busy with the one before it
+    slb = cloud['slb']
+    add_backend_servers = slb.AddBackendServers
+    refused = []
+
+    def busy(params):
+        refused.append(len(refused) % 2 == 0)
+        if refused[-1]:
+            raise ApiError('ServiceIsConfiguring', 'The specified service is configuring.', 400)
+        return add_backend_servers(params)
+    monkeypatch.setattr(slb, 'AddBackendServers', busy)
+    result = ok(run_module('ali_slb_server', dict(load_balancer_id=lb['id'], backend_servers=[dict(server_ids=ids)])))
+    assert result['changed'] and len(result['backend_servers']) == 45 and refused.count(True) == 3
+
+
+def test_slb_vsg_retries_while_busy(run_module, cloud, monkeypatch):
+    vpc, vswitch, group = network(run_module)
+    ids = instances(run_module, vswitch, group, count=45)
+    lb = ok(run_module('ali_slb_lb', dict(name='lb1', vswitch_id=vswitch['id'])))['load_balancer']
+
+    # The batches added after the group is created are refused once each while the load balancer is busy
+    slb = cloud['slb']
+    add_servers = slb.AddVServerGroupBackendServers
+    refused = []
+
+    def busy(params):
+        refused.append(len(refused) % 2 == 0)
+        if refused[-1]:
+            raise ApiError('ServiceIsConfiguring', 'The specified service is configuring.', 400)
+        return add_servers(params)
+    monkeypatch.setattr(slb, 'AddVServerGroupBackendServers', busy)
+    result = ok(run_module('ali_slb_vsg', dict(load_balancer_id=lb['id'], vserver_group_name='vsg1',
+                                               backend_servers=[dict(server_ids=ids, port=80, weight=100)])))
+    assert result['changed'] and len(result['vserver_group']['backend_servers']) == 45 and refused.count(True) == 2
+
+
+def test_slb_vsg_chunks(run_module, cloud):
+    vpc, vswitch, group = network(run_module)
+    ids = instances(run_module, vswitch, group, count=45)
+    lb = ok(run_module('ali_slb_lb', dict(name='lb1', vswitch_id=vswitch['id'])))['load_balancer']
+    vsg = dict(load_balancer_id=lb['id'], vserver_group_name='vsg1',
+               backend_servers=[dict(server_ids=ids, port=80, weight=100)])
+
+    # The group is created with the first 20 servers and the others are added 20 to a call
+    cloud.reset_calls()
+    group = ok(run_module('ali_slb_vsg', vsg))['vserver_group']
+    assert sorted(s['server_id'] for s in group['backend_servers']) == sorted(ids)
+    actions = [c.action for c in cloud.calls]
+    assert actions.count('CreateVServerGroup') == 1 and actions.count('AddVServerGroupBackendServers') == 2
+    assert not ok(run_module('ali_slb_vsg', vsg))['changed']
+
+    cloud.reset_calls()
+    vsg['backend_servers'] = [dict(server_ids=ids[:30], port=80, weight=50)]
+    group = ok(run_module('ali_slb_vsg', dict(vsg, purge_backend_servers=True)))['vserver_group']
+    assert sorted((s['server_id'], s['weight']) for s in group['backend_servers']) == sorted((i, 50) for i in ids[:30])
+    actions = [c.action for c in cloud.calls]
+    assert actions.count('ModifyVServerGroupBackendServers') == 2 and actions.count('RemoveVServerGroupBackendServers') == 1
+    assert not ok(run_module('ali_slb_vsg', dict(vsg, purge_backend_servers=True)))['changed']
+
+
+def test_slb_vsg_server_on_several_ports(run_module, cloud):
+    vpc, vswitch, group = network(run_module)
+    ids = instances(run_module, vswitch, group, count=1)
+    lb = ok(run_module('ali_slb_lb', dict(name='lb1', vswitch_id=vswitch['id'])))['load_balancer']
+    vsg = dict(load_balancer_id=lb['id'], vserver_group_name='vsg1',
+               backend_servers=[dict(server_id=ids[0], port=80, weight=100)])
+    ok(run_module('ali_slb_vsg', vsg))
+
+    # A second port of the same instance is added beside the first one rather than replacing it
+    cloud.reset_calls()
+    both = dict(vsg, backend_servers=[dict(server_id=ids[0], port=80, weight=100),
+                                      dict(server_id=ids[0], port=8080, weight=50)])
+    group = ok(run_module('ali_slb_vsg', both))['vserver_group']
+    assert sorted((s['port'], s['weight']) for s in group['backend_servers']) == [(80, 100), (8080, 50)]
+    assert [c.action for c in cloud.calls if 'BackendServers' in c.action] == ['AddVServerGroupBackendServers']
+    assert not ok(run_module('ali_slb_vsg', both))['changed']
+    assert not ok(run_module('ali_slb_vsg', vsg))['changed']
+
+    # Purging removes the port which is not given and leaves the other one as it is
+    cloud.reset_calls()
+    group = ok(run_module('ali_slb_vsg', dict(vsg, purge_backend_servers=True)))['vserver_group']
+    assert [(s['port'], s['weight']) for s in group['backend_servers']] == [(80, 100)]
+    assert [c.action for c in cloud.calls if 'BackendServers' in c.action] == ['RemoveVServerGroupBackendServers']
+
+
+def test_slb_listeners(run_module, cloud):
+    vpc, vswitch, group = network(run_module)
+    lb = ok(run_module('ali_slb_lb', dict(name='lb1', vswitch_id=vswitch['id'])))['load_balancer']
+    args = dict(load_balancer_id=lb['id'], protocol='tcp', backend_server_port=8080, bandwidth=5,
+                listeners=[dict(listener_port=p) for p in range(8000, 8030)] +
+                [dict(listener_port=80, protocol='http', backend_server_port=80)])
+    result = ok(run_module('ali_slb_listener', args))
+    assert result['changed']
+    assert [listener['listener_port'] for listener in result['listeners']] == list(range(8000, 8030)) + [80]
+    assert sorted(cloud['slb'].listeners[lb['id']]) == [80] + list(range(8000, 8030))
+    assert cloud['slb'].listeners[lb['id']][80]['ListenerProtocol'] == 'http'
+
+    # The listeners are read with one call each and none of them is written or read again
+    cloud.reset_calls()
+    assert not ok(run_module('ali_slb_listener', args))['changed']
+    assert [c.action for c in cloud.calls].count('DescribeLoadBalancerTCPListenerAttribute') == 30
+    assert len(cloud.calls) == 32
+    # The defaults of the attributes of the other protocols, which the listeners do not have, are not compared
+    tcp = cloud['slb'].handle('DescribeLoadBalancerTCPListenerAttribute', dict(LoadBalancerId=lb['id'], ListenerPort=8000))
+    http = cloud['slb'].handle('DescribeLoadBalancerHTTPListenerAttribute', dict(LoadBalancerId=lb['id'], ListenerPort=80))
+    assert 'StickySession' not in tcp and 'HealthCheckType' not in http and 'PersistenceTimeout' not in http
+
+    args['listeners'][:10] = [dict(listener_port=p, bandwidth=10) for p in range(8000, 8010)]
+    args['listeners'][10:20] = [dict(listener_port=p, state='stopped') for p in range(8010, 8020)]
+    args['listeners'][20:] = [dict(listener_port=p, state='absent') for p in range(8020, 8030)] + [dict(listener_port=81)]
+    cloud.reset_calls()
+    result = ok(run_module('ali_slb_listener', args))
+    assert [listener['bandwidth'] for listener in result['listeners'][:10]] == [10] * 10
+    assert [listener['status'] for listener in result['listeners'][10:20]] == ['stopped'] * 10
+    actions = [c.action for c in cloud.calls]
+    assert actions.count('SetLoadBalancerTCPListenerAttribute') == 10 and actions.count('StopLoadBalancerListener') == 10
+    assert actions.count('DeleteLoadBalancerListener') == 10 and actions.count('CreateLoadBalancerTCPListener') == 1
+    listeners = cloud['slb'].listeners[lb['id']]
+    assert sorted(listeners) == [80, 81] + list(range(8000, 8020))
+    assert listeners[8000]['Bandwidth'] == 10 and listeners[8010]['Status'] == 'stopped'
+    assert not ok(run_module('ali_slb_listener', args))['changed']
+
+    # A listener without a VServer group, which it does not report then, is given one
+    ids = instances(run_module, vswitch, group, count=1)
+    vsg = ok(run_module('ali_slb_vsg', dict(load_balancer_id=lb['id'], vserver_group_name='vsg1',
+                                            backend_servers=[dict(server_ids=ids, port=80)])))['vserver_group']
+    http = dict(load_balancer_id=lb['id'], listener_port=80, protocol='http', backend_server_port=80, bandwidth=5,
+                vserver_group_id=vsg['id'], state='present')
+    assert ok(run_module('ali_slb_listener', http))['changed']
+    assert listeners[80]['VServerGroupId'] == vsg['id']
+    assert not ok(run_module('ali_slb_listener', http))['changed']
+
+
+def test_slb_lb_info_many(run_module, cloud):
+    lb_ids = [cloud['slb'].handle('CreateLoadBalancer', dict(LoadBalancerName='lb%d' % i))['LoadBalancerId']
+              for i in range(25)]
+    for lb_id in lb_ids:
+        cloud['slb'].handle('CreateLoadBalancerTCPListener', dict(LoadBalancerId=lb_id, ListenerPort=80,
+                                                                  BackendServerPort=8080))
+    cloud['slb'].handle('CreateVServerGroup', dict(LoadBalancerId=lb_ids[0], VServerGroupName='vsg1'))
+
+    # The 3 chunks of 10 IDs are read at the same time and the load balancers keep the order of the IDs
+    cloud.reset_calls()
+    result = ok(run_module('ali_slb_lb_info', dict(load_balancer_ids=lb_ids)))
+    assert result['ids'] == lb_ids and 'listeners' not in result['load_balancers'][0]
+    assert [c.action for c in cloud.calls] == ['DescribeLoadBalancers'] * 3
+
+    cloud.reset_calls()
+    result = ok(run_module('ali_slb_lb_info', dict(load_balancer_ids=lb_ids, max_concurrency=8,
+                                                   details=['listeners', 'vserver_groups', 'health'])))
+    lbs = result['load_balancers']
+    assert [lb['listeners'][0]['listener_port'] for lb in lbs] == [80] * 25
+    assert [len(lb['vserver_groups']) for lb in lbs] == [1] + [0] * 24 and lbs[0]['vserver_groups'][0]['name'] == 'vsg1'
+    assert [lb['health'] for lb in lbs] == [[]] * 25
+    actions = [c.action for c in cloud.calls]
+    assert actions.count('DescribeLoadBalancerAttribute') == 25 and actions.count('DescribeVServerGroups') == 25
+    assert actions.count('DescribeHealthStatus') == 25
+
+    # Only the details which fields asks for are read
+    cloud.reset_calls()
+    result = ok(run_module('ali_slb_lb_info', dict(name_prefix='lb', details=['listeners', 'health'],
+                                                   fields=['health'])))
+    assert sorted(result['load_balancers'][0]) == ['health', 'id']
+    assert 'DescribeLoadBalancerAttribute' not in [c.action for c in cloud.calls]
+
+
+def test_slb_traffic_shift(run_module, cloud):
+    vpc, vswitch, group = network(run_module)
+    ids = instances(run_module, vswitch, group, count=50)
+    blue, green = ids[:25], ids[25:]
+    lb = ok(run_module('ali_slb_lb', dict(name='lb1', vswitch_id=vswitch['id'])))['load_balancer']
+    ok(run_module('ali_slb_listener', dict(load_balancer_id=lb['id'], listener_port=80, backend_server_port=8080,
+                                           protocol='http', bandwidth=5, state='present')))
+    ok(run_module('ali_slb_server', dict(load_balancer_id=lb['id'], backend_servers=[
+        dict(server_ids=blue, weight=100), dict(server_ids=green, weight=0)])))
+    vsg = ok(run_module('ali_slb_vsg', dict(load_balancer_id=lb['id'], vserver_group_name='vsg1', backend_servers=[
+        dict(server_ids=blue, port=80, weight=100), dict(server_ids=green, port=80, weight=0)])))['vserver_group']
+    args = dict(load_balancer_ids=[lb['id']], vserver_group_ids=[vsg['id']], from_servers=blue, to_servers=green,
+                steps=4, interval=0, wait_for_healthy=True)
+
+    # Each step sets the 50 weights of the load balancer and of the group with 3 calls each
+    cloud.reset_calls()
+    result = ok(run_module('ali_slb_traffic_shift', args))
+    assert [(s['from_weight'], s['to_weight']) for s in result['steps']] == [(75, 25), (50, 50), (25, 75), (0, 100)]
+    actions = [c.action for c in cloud.calls]
+    assert actions.count('SetBackendServers') == 12 and actions.count('SetVServerGroupAttribute') == 12
+    assert actions.count('DescribeHealthStatus') == 4
+    for target in result['targets']:
+        assert set((s['server_id'], s['weight']) for s in target['backend_servers']) == \
+            set([(i, 0) for i in blue] + [(i, 100) for i in green])
+    servers = ok(run_module('ali_slb_vsg', dict(load_balancer_id=lb['id'], vserver_group_name='vsg1', backend_servers=[
+        dict(server_ids=green, port=80, weight=100)])))
+    assert not servers['changed']
+    assert not ok(run_module('ali_slb_traffic_shift', args))['changed']
+
+    # Going back stops before the first step while the servers to move to are unhealthy
+    cloud['slb'].health[blue[0]] = 'abnormal'
+    result = run_module('ali_slb_traffic_shift', dict(args, from_servers=green, to_servers=blue,
+                                                      health_check_timeout=1))
+    assert result['failed'] and 'step 1' in result['msg'] and not result['changed']
+
+
+def test_slb_traffic_shift_gates_and_resumes(run_module, cloud, monkeypatch):
+    vpc, vswitch, group = network(run_module)
+    ids = instances(run_module, vswitch, group, count=4)
+    blue, green = ids[:2], ids[2:]
+    lb = ok(run_module('ali_slb_lb', dict(name='lb1', vswitch_id=vswitch['id'])))['load_balancer']
+    # The servers to move to are attached with the default weight, as much as the ones to move from
+    ok(run_module('ali_slb_server', dict(load_balancer_id=lb['id'], backend_servers=[dict(server_ids=ids)])))
+    args = dict(load_balancer_ids=[lb['id']], from_servers=blue, to_servers=green, steps=4, interval=0,
+                wait_for_healthy=True, health_check_timeout=10)
+
+    # Without listeners the load balancer does not report the servers, which are not healthy then
+    result = run_module('ali_slb_traffic_shift', args)
+    assert result['failed'] and 'step 1' in result['msg'] and not result['changed']
+
+    # Neither are they while their health can not be described
+    ok(run_module('ali_slb_listener', dict(load_balancer_id=lb['id'], listener_port=80, backend_server_port=8080,
+                                           protocol='http', bandwidth=5, state='present')))
+
+    describe_health_status = cloud['slb'].DescribeHealthStatus
+
+    def throttled(params):
+        raise ApiError('Throttling', 'Request was denied due to request throttling.', 400)
+    monkeypatch.setattr(cloud['slb'], 'DescribeHealthStatus', throttled)
+    result = run_module('ali_slb_traffic_shift', args)
+    assert result['failed'] and 'Throttling' in result['msg'] and not result['changed']
+    monkeypatch.setattr(cloud['slb'], 'DescribeHealthStatus', describe_health_status)
+
+    # Every step is taken, the first one included, and a step refused while the load balancer is busy is retried
+    set_backend_servers = cloud['slb'].SetBackendServers
+    refused = []
+
+    def busy(params):
+        refused.append(len(refused) % 2 == 0)
+        if refused[-1]:
+            raise ApiError('ServiceIsConfiguring', 'The specified service is configuring.', 400)
+        return set_backend_servers(params)
+    monkeypatch.setattr(cloud['slb'], 'SetBackendServers', busy)
+    result = ok(run_module('ali_slb_traffic_shift', args))
+    assert [(s['from_weight'], s['to_weight']) for s in result['steps']] == [(75, 25), (50, 50), (25, 75), (0, 100)]
+    assert refused.count(True) == 4
+    assert not ok(run_module('ali_slb_traffic_shift', args))['changed']
+
+
+def test_slb_server_info_many(run_module, cloud):
+    vpc, vswitch, group = network(run_module)
+    ids = instances(run_module, vswitch, group, count=4)
+    lb_ids = []
+    for i in range(3):
+        lb_id = ok(run_module('ali_slb_lb', dict(name='lb%d' % i, vswitch_id=vswitch['id'])))['load_balancer']['id']
+        for port in (80, 443):
+            ok(run_module('ali_slb_listener', dict(load_balancer_id=lb_id, listener_port=port, backend_server_port=8080,
+                                                   protocol='tcp', bandwidth=5, state='present')))
+        ok(run_module('ali_slb_server', dict(load_balancer_id=lb_id, backend_servers=[dict(server_ids=ids)])))
+        lb_ids.append(lb_id)
+    cloud['slb'].health[ids[0]] = 'abnormal'
+
+    # Every load balancer and port is queried once, and the results are summed up by load balancer and by server
+    cloud.reset_calls()
+    result = ok(run_module('ali_slb_server_info', dict(load_balancer_ids=lb_ids, listener_ports=[80, 443])))
+    assert [c.action for c in cloud.calls] == ['DescribeHealthStatus'] * 6
+    assert len(result['backend_servers']) == 24
+    assert [(s['load_balancer_id'], s['total'], s['healthy']) for s in result['load_balancers']] == \
+        [(lb_id, 8, 6) for lb_id in lb_ids]
+    assert [s['id'] for s in result['servers'] if not s['healthy']] == [ids[0]]
+    assert len(result['servers'][0]['unhealthy']) == 6
+    assert ok(run_module('ali_slb_server_info', dict(load_balancer_ids=lb_ids, wait_for_healthy=0.75)))
+
+    # Only the load balancer which is not healthy enough is queried again
+    for lb_id in lb_ids[1:]:
+        ok(run_module('ali_slb_server', dict(load_balancer_id=lb_id, state='absent',
+                                             backend_servers=[dict(server_id=ids[0])])))
+    cloud.reset_calls()
+    result = run_module('ali_slb_server_info', dict(load_balancer_ids=lb_ids, wait_for_healthy=1, wait_delay=1,
+                                                    wait_timeout=2))
+    assert result['failed'] and lb_ids[0] in result['msg'] and lb_ids[1] not in result['msg']
+    queried = [c.params['LoadBalancerId'] for c in cloud.calls]
+    assert queried.count(lb_ids[0]) == 2 and queried.count(lb_ids[1]) == queried.count(lb_ids[2]) == 1
+
+    # A load balancer which reports no backend servers is not healthy
+    empty = ok(run_module('ali_slb_lb', dict(name='lb3', vswitch_id=vswitch['id'])))['load_balancer']['id']
+    result = run_module('ali_slb_server_info', dict(load_balancer_ids=lb_ids[1:] + [empty], wait_for_healthy=1,
+                                                    wait_delay=1, wait_timeout=2))
+    assert result['failed'] and empty in result['msg'] and lb_ids[1] not in result['msg']
+
+
+def weights(cloud, load_balancer_id):
+    return dict((s['ServerId'], s['Weight']) for s in cloud['slb'].backend_servers[load_balancer_id])
+
+
+def test_instance_rolling_update(run_module, cloud):
+    vpc, vswitch, group = network(run_module)
+    old = instances(run_module, vswitch, group, count=4)
+    lb = ok(run_module('ali_slb_lb', dict(name='lb1', vswitch_id=vswitch['id'])))['load_balancer']
+    ok(run_module('ali_slb_listener', dict(load_balancer_id=lb['id'], listener_port=80, backend_server_port=8080,
+                                           protocol='http', bandwidth=5, state='present')))
+    ok(run_module('ali_slb_server', dict(load_balancer_id=lb['id'], backend_servers=[dict(server_ids=old, weight=100)])))
+
+    image_id = 'centos_7_06_64_20G_alibase_20190711.vhd'
+    args = dict(image_id=image_id, instance_type='ecs.g6.large', count=4, vswitch_id=vswitch['id'],
+                security_groups=[group['id']], instance_name='web',
+                rolling_update=dict(batch_size='50%', load_balancer_ids=[lb['id']]))
+    cloud.reset_calls()
+    result = ok(run_module('ali_instance', args))
+    assert result['changed'] and len(result['instances']) == 4
+    assert set(i['image_id'] for i in result['instances']) == set([image_id])
+    actions = [c.action for c in cloud.calls]
+    assert actions.count('RunInstances') == 2 and actions.count('DeleteInstances') == 2
+    # The old instances of a batch drain before the replacements join
+    assert actions.index('SetBackendServers') < actions.index('AddBackendServers') < actions.index('RemoveBackendServers')
+    servers = ok(run_module('ali_slb_server_info', dict(load_balancer_id=lb['id'])))['backend_servers']
+    assert sorted(s['id'] for s in servers) == sorted(i['id'] for i in result['instances'])
+    assert not set(old) & set(i['id'] for i in ok(run_module('ali_instance_info', dict()))['instances'])
+    assert not ok(run_module('ali_instance', args))['changed']
+
+    # The replacements have to pass the health checks before the old instances go, which get their weights back
+    current = [i['id'] for i in result['instances']]
+    cloud['slb'].health['*'] = 'abnormal'
+    result = run_module('ali_instance', dict(args, image_id=IMAGE_ID))
+    assert result['failed'] and 'healthy' in result['msg'] and len(result['ids']) == 2
+    assert weights(cloud, lb['id']) == dict((i, 100) for i in current)
+
+
+def test_instance_rolling_update_failures(run_module, cloud, monkeypatch):
+    vpc, vswitch, group = network(run_module)
+    old = instances(run_module, vswitch, group, count=4)
+    lb = ok(run_module('ali_slb_lb', dict(name='lb1', vswitch_id=vswitch['id'])))['load_balancer']
+    ok(run_module('ali_slb_listener', dict(load_balancer_id=lb['id'], listener_port=80, backend_server_port=8080,
+                                           protocol='http', bandwidth=5, state='present')))
+    ok(run_module('ali_slb_server', dict(load_balancer_id=lb['id'], backend_servers=[dict(server_ids=old, weight=100)])))
+
+    # The replacements of the batches done so far are reported when a later batch can not be launched
+    ecs = cloud['ecs']
+    run_instances = ecs.RunInstances
+
+    def run_once(params):
+        result = run_instances(params)
+        ecs.out_of_stock.add(ZONE_ID)
+        return result
+    monkeypatch.setattr(ecs, 'RunInstances', run_once)
+    args = dict(image_id='centos_7_06_64_20G_alibase_20190711.vhd', instance_type='ecs.g6.large', count=4,
+                vswitch_id=vswitch['id'], security_groups=[group['id']], instance_name='web',
+                rolling_update=dict(batch_size='50%', load_balancer_ids=[lb['id']]))
+    result = run_module('ali_instance', args)
+    assert result['failed'] and 'NoStock' in result['msg'] and len(result['ids']) == 2
+    current = [i['id'] for i in ok(run_module('ali_instance_info', dict()))['instances']]
+    assert weights(cloud, lb['id']) == dict((i, 100) for i in current) and len(current) == 4
+
+    # A load balancer without listeners never reports the replacements, so they are not healthy on it
+    monkeypatch.setattr(ecs, 'RunInstances', run_instances)
+    ecs.out_of_stock.clear()
+    other = ok(run_module('ali_slb_lb', dict(name='lb2', vswitch_id=vswitch['id'])))['load_balancer']
+    result = run_module('ali_instance', dict(args, rolling_update=dict(batch_size='50%', load_balancer_ids=[lb['id'], other['id']])))
+    assert result['failed'] and 'healthy' in result['msg'] and len(result['ids']) == 2
+    assert weights(cloud, lb['id']) == dict((i, 100) for i in current) and not weights(cloud, other['id'])
+
+
+def test_rds(run_module):
+    vpc, vswitch, group = network(run_module)
+    instance = ok(run_module('ali_rds_instance', dict(
+        engine='MySQL', engine_version='8.0', db_instance_class='rds.mysql.t1.small', db_instance_storage=30,
+        db_instance_net_type='Intranet', db_instance_name='db1', security_ips='10.0.0.0/8', pay_type='PostPaid',
+        vswitch_id=vswitch['id'])))['instances']
+    assert not ok(run_module('ali_rds_instance', dict(db_instance_name='db1')))['changed']
+    assert [i['id'] for i in ok(run_module('ali_rds_instance_info', dict(name_prefix='db')))['instances']] == [instance['id']]
+
+    db = dict(db_instance_id=instance['id'], db_name='app', character_set_name='utf8', db_description='d')
+    assert ok(run_module('ali_rds_database', db))['changed']
+    assert ok(run_module('ali_rds_database', dict(db, db_description='d2')))['changed']
+    assert ok(run_module('ali_rds_database_info', dict(db_instance_id=instance['id'])))['databases']
+
+    account = dict(db_instance_id=instance['id'], account_name='user1', account_password='Passw0rd!',
+                   db_names=['app'], account_privilege='ReadWrite')
+    assert ok(run_module('ali_rds_account', account))['changed']
+    assert ok(run_module('ali_rds_account', dict(db_instance_id=instance['id'], account_name='user1',
+                                                 account_description='x')))['changed']
+    assert ok(run_module('ali_rds_account_info', dict(db_instance_id=instance['id'])))['rds_accounts']
+
+    backup = ok(run_module('ali_rds_backup', dict(db_instance_id=instance['id'], db_name=['app'])))['backup']
+    assert ok(run_module('ali_rds_backup_info', dict(db_instance_id=instance['id'])))['backups']
+    assert ok(run_module('ali_rds_backup', dict(db_instance_id=instance['id'], backup_id=[backup['backup_id']],
+                                                state='absent')))['changed']
+
+    assert ok(run_module('ali_rds_account', dict(db_instance_id=instance['id'], account_name='user1',
+                                                 state='absent')))['changed']
+    assert ok(run_module('ali_rds_database', dict(db_instance_id=instance['id'], db_name='app',
+                                                  state='absent')))['changed']
+    assert ok(run_module('ali_rds_instance', dict(db_instance_name='db1', state='absent')))['changed']
+
+
+def test_ram(run_module):
+    assert ok(run_module('ali_ram_user', dict(user_name='user1', display_name='U1')))['changed']
+    assert not ok(run_module('ali_ram_user', dict(user_name='user1', display_name='U1')))['changed']
+    assert ok(run_module('ali_ram_user', dict(user_name='user1', display_name='U2')))['changed']
+    assert ok(run_module('ali_ram_user_info', dict(name_prefix='user')))['users']
+
+    assert ok(run_module('ali_ram_login_profile', dict(user_name='user1', password='Pass1234!')))['changed']
+    assert ok(run_module('ali_ram_login_profile_info', dict(user_name='user1')))['profile']
+    key = ok(run_module('ali_ram_access_key', dict(user_name='user1')))['access_key']
+    assert ok(run_module('ali_ram_access_key', dict(user_name='user1', user_access_key_id=key['access_key_id'],
+                                                    status='Inactive')))['changed']
+    assert ok(run_module('ali_ram_access_key_info', dict(user_name='user1')))['access_keys']
+
+    assert ok(run_module('ali_ram_group', dict(group_name='group1', comments='c')))['changed']
+    assert ok(run_module('ali_ram_group', dict(group_name='group1', user_name='user1')))['changed']
+    assert ok(run_module('ali_ram_group_info', dict(name_prefix='group')))['groups']
+    assert ok(run_module('ali_ram_role', dict(role_name='role1', policy='{"Statement": []}')))['changed']
+    assert ok(run_module('ali_ram_role_info', dict(name_prefix='role')))['roles']
+
+    assert ok(run_module('ali_ram_policy', dict(policy_name='policy1', policy='{"Statement": []}')))['changed']
+    assert ok(run_module('ali_ram_policy', dict(policy_name='policy1', user_name='user1',
+                                                policy_type='Custom')))['changed']
+    assert ok(run_module('ali_ram_policy_info', dict(name_prefix='policy')))['policies']
+    assert ok(run_module('ali_ram_policy', dict(policy_name='policy1', user_name='user1', policy_type='Custom',
+                                                state='absent')))['changed']
+    assert ok(run_module('ali_ram_policy', dict(policy_name='policy1', state='absent')))['changed']
+
+    assert ok(run_module('ali_ram_group', dict(group_name='group1', user_name='user1', state='absent')))['changed']
+    assert ok(run_module('ali_ram_group', dict(group_name='group1', state='absent')))['changed']
+    assert ok(run_module('ali_ram_role', dict(role_name='role1', state='absent')))['changed']
+    assert ok(run_module('ali_ram_access_key', dict(user_name='user1', user_access_key_id=key['access_key_id'],
+                                                    state='absent')))['changed']
+    assert ok(run_module('ali_ram_login_profile', dict(user_name='user1', state='absent')))['changed']
+    assert ok(run_module('ali_ram_user', dict(user_name='user1', state='absent')))['changed']
+
+
+def test_dns(run_module):
+    assert ok(run_module('ali_dns_group', dict(group_name='group1')))['changed']
+    assert not ok(run_module('ali_dns_group', dict(group_name='group1')))['changed']
+    assert ok(run_module('ali_dns_group_info', dict(name_prefix='group')))['groups']
+    assert ok(run_module('ali_dns_domain', dict(domain_name='example.com', remark='r1')))['changed']
+    assert ok(run_module('ali_dns_domain', dict(domain_name='example.com', remark='r1', group_name='group1')))['changed']
+    assert not ok(run_module('ali_dns_domain', dict(domain_name='example.com', remark='r1',
+                                                    group_name='group1')))['changed']
+    assert ok(run_module('ali_dns_domain_info', dict(domain_name='example.com')))['names'] == ['example.com']
+    assert ok(run_module('ali_dns_domain', dict(domain_name='example.com', state='absent')))['changed']
+    assert ok(run_module('ali_dns_group', dict(group_name='group1', state='absent')))['changed']
+
+
+def test_ess_instance(run_module):
+    result = ok(run_module('ali_ess_instance', dict(group_id='asg-1', state='absent')))
+    assert not result['changed']
+
+
+@ESS_FOOTMARK_BUG
+@pytest.mark.parametrize('name,args', [
+    ('ali_ess_group', dict(name='group1', max_size=2, min_size=0)),
+    ('ali_ess_configuration', dict(group_id='asg-1', image_id=IMAGE_ID, instance_type='ecs.g6.large',
+                                   security_group_id='sg-1', data_disks=[], tags={})),
+    ('ali_ess_rule', dict(group_id='asg-1', adjustment_type='TotalCapacity', adjustment_value=1, name='rule1')),
+    ('ali_ess_task', dict(rule_id='asr-1', launch_time='2026-10-20T00:00Z', name='task1')),
+])
+def test_ess(run_module, name, args):
+    assert ok(run_module(name, args))['changed']
+
+
+def test_ros(run_module, tmp_path):
+    template = tmp_path / 'stack.json'
+    template.write_text(json.dumps({'ROSTemplateFormatVersion': '2015-09-01',
+                                    'Parameters': {'Name': {'Type': 'String'}}, 'Outputs': {'Out': {'Value': 'v1'}}}))
+    stack = dict(stack_name='stack1', template=str(template), template_parameters={'Name': 'a'})
+    assert ok(run_module('ali_ros_stack', stack))['changed']
+    assert not ok(run_module('ali_ros_stack', stack))['changed']
+    assert ok(run_module('ali_ros_stack', dict(stack, template_parameters={'Name': 'b'})))['changed']
+    assert len(ok(run_module('ali_ros_stack_info', dict(name_prefix='stack')))['ids']) == 1
+    assert ok(run_module('ali_ros_stack', dict(stack_name='stack1', state='absent')))['changed']
+
+
+def test_oos(run_module):
+    content = json.dumps({'FormatVersion': 'OOS-2019-06-01', 'Description': 'd', 'Parameters': {},
+                          'Tasks': [{'Name': 'a', 'Action': 'ACS::Sleep', 'Properties': {'Duration': 'PT1S'}}]})
+    assert ok(run_module('ali_oos_template', dict(template_name='template1', content=content)))['changed']
+    assert not ok(run_module('ali_oos_template', dict(template_name='template1', content=content)))['changed']
+    assert ok(run_module('ali_oos_template', dict(template_name='template1',
+                                                  content=content.replace('PT1S', 'PT2S'))))['changed']
+    assert ok(run_module('ali_oos_template_info', dict(name_prefix='template')))['templates']
+    assert ok(run_module('ali_oos_execution', dict(template_name='template1', parameters={}, mode='Debug')))['changed']
+    assert ok(run_module('ali_oos_execution_info', dict(name_prefix='template')))['executions']
+    assert ok(run_module('ali_oos_execution', dict(template_name='template1', state='cancel')))['changed']
+    assert ok(run_module('ali_oos_execution', dict(template_name='template1', state='absent')))['changed']
+    assert ok(run_module('ali_oos_template', dict(template_name='template1', state='absent')))['changed']
+
+
+def test_oss(run_module, tmp_path):
+    assert ok(run_module('ali_oss_bucket', dict(bucket='bucket1', state='present')))['changed']
+    assert ok(run_module('ali_oss_bucket_info', dict(bucket_prefix='bucket')))['bucket_names'] == ['bucket1']
+    assert ok(run_module('ali_oss_object', dict(bucket='bucket1', mode='put', object='a/b.txt',
+                                                content='hello')))['changed']
+    assert ok(run_module('ali_oss_object_info', dict(bucket='bucket1')))['objects']
+    target = tmp_path / 'b.txt'
+    ok(run_module('ali_oss_object', dict(bucket='bucket1', mode='get', object='a/b.txt', file_name=str(target))))
+    assert target.read_text() == 'hello'
+    ok(run_module('ali_oss_object', dict(bucket='bucket1', mode='delete', object='a/b.txt')))
+    assert not ok(run_module('ali_oss_object_info', dict(bucket='bucket1')))['objects']
+    assert ok(run_module('ali_oss_bucket', dict(bucket='bucket1', state='absent')))['changed']
+
+
+def test_market(run_module):
+    products = ok(run_module('ali_market_product_info', dict(name_prefix='Ubuntu')))['products']
+    assert [p['name'] for p in products] == ['Ubuntu 20.04 LAMP']
+    assert [i['display_name'] for i in products[0]['images']] == ['cn-hangzhou Ubuntu 20.04 LAMP']
@@ -0,0 +1,37 @@
+# Copyright (c) 2017-present Alibaba Group Holding Limited. He Guimin <heguimin36@163.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The opt-in cProfile and tracemalloc hook of module_utils.
+"""
+
+import pstats
+
+from helpers import ok
+
+
+def test_module_writes_its_profile(run_module, tmp_path, monkeypatch):
+    monkeypatch.setenv('ALICLOUD_PROFILING_TASK', 'List the VPCs')
+    monkeypatch.setenv('ALICLOUD_PROFILING_HOST', 'localhost')
+    ok(run_module('ali_vpc', dict(name='vpc1', cidr_block='172.16.0.0/12', alicloud_profiling_dir=str(tmp_path))))
+
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert len(files) == 2
+    assert all(name.startswith('ali_vpc-List_the_VPCs-localhost-') for name in files)
+    prof, report = [tmp_path / name for name in files]
+    assert pstats.Stats(str(prof)).total_calls > 0
+    text = report.read_text()
+    assert 'Hottest functions' in text and 'Top 25 allocations' in text
+
+
+def test_module_fails_with_its_profile(run_module, tmp_path, monkeypatch):
+    monkeypatch.setenv('ALICLOUD_PROFILING_DIR', str(tmp_path))
+    result = run_module('ali_disk', dict(disk_name='missing', state='absent'))
+    assert result['failed']
+    assert len(list(tmp_path.glob('ali_disk-*.prof'))) == 1
+
+
+def test_profiling_is_off_by_default(run_module, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ok(run_module('ali_vpc_info', dict()))
+    assert list(tmp_path.iterdir()) == []